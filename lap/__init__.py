@@ -6,12 +6,16 @@ LAPX — Jonker-Volgenant (JV) linear assignment solvers.
 Provided solvers (single-matrix)
 --------------------------------
 - lapmod   : Sparse assignment solver (for sparse cost matrices) by Tomas Kazmar's lap.
+- lapmod_dense : Gates a dense matrix with `gate` and solves it with lapmod by lapx.
+- lapmod_edges : Solves a (row, col, cost) edge list with lapmod by lapx.
 - lapjv    : JV assignment solver by Tomas Kazmar's lap; returns JV-style mappings (x, y).
 - lapjvx   : Enhanced lapjv by lapx; returns SciPy-like outputs (rows, cols).
 - lapjvxa  : Convenience wrapper of lapjvx by lapx; returns (K, 2) assignment pairs.
 - lapjvc   : Classic JV variant by Christoph Heindl's lapsolver; returns (rows, cols).
 - lapjvs   : Enhanced Vadim Markovtsev's lapjv by lapx; returns either style.
 - lapjvsa  : Convenience wrapper of lapjvs by lapx; returns (K, 2) assignment pairs.
+- auction  : Epsilon-scaled auction with parallel bidding by lapx; same I/O as lapjvx.
+- kbest    : K best assignments by Murty's partitioning by lapx; lapjvx-style I/O per assignment.
 
 Provided solvers (batch)
 ------------------------
@@ -19,11 +23,31 @@ Provided solvers (batch)
 - lapjvxa_batch : Batched lapjvxa; returns (totals, pairs_list) or pairs_list with (K_b, 2).
 - lapjvs_batch  : Batched lapjvs; returns (totals, rows_list, cols_list) or (rows_list, cols_list).
 - lapjvsa_batch : Batched lapjvsa; returns (totals, pairs_list) or pairs_list with (K_b, 2).
+- lapjvc_batch  : Batched lapjvc; returns (totals, rows_list, cols_list) or (rows_list, cols_list).
+- lapmod_batch  : Batched lapmod over CSR triples or a block CSR; same outputs as lapjvc_batch.
+- SolverPool    : Long-lived worker threads shared by batch calls through `pool=`.
+- solve_stream  : Solves an iterable of matrices lazily with a bounded in-flight window.
+
+Sparse helpers
+--------------
+- gate     : Builds lapmod's CSR arrays natively from a thresholded dense matrix.
+- edges_to_csr : Builds lapmod's CSR arrays natively from an unsorted edge list.
+
+Incremental
+-----------
+- IncrementalAssignment : Keeps a solution optimal across row/column/cost edits by repairing it.
 
 Notes
 -----
 - All solvers in lapx handle both square and rectangular cost matrices.
 - Batch solvers accept costs shaped (B, N, M) and return per-instance assignments.
+  Each batch is solved in one native call that releases the GIL and spreads
+  instances over native threads. Ragged batches of differently shaped matrices
+  are accepted as a list of 2D arrays or a packed 1D buffer plus `shapes`.
+- lapjv, lapjvx(a) and lapjvs(a) take `n_threads` to split the inner scans of a
+  single large solve (working size >= 4096) over threads; results do not change.
+- `lap.aio` provides awaitable versions of every solver for asyncio code
+  (`import lap.aio`; `await lap.aio.lapjvx(cost)`), running on a shared pool.
 - lapjvs* family wrappers may recompute the total cost from the original input for 
   consistency; this has negligible overhead.
 - For tests and benchmarks, see the official repo: https://github.com/rathaROG/lapx
@@ -34,14 +58,22 @@ import importlib
 
 if TYPE_CHECKING:
     # Single-matrix solvers
-    from ._lapmod_wp import lapmod
+    from ._lapmod_wp import lapmod, lapmod_dense, lapmod_edges, gate, edges_to_csr
     from ._lapjv_wp import lapjv
     from ._lapjvx_wp import lapjvx, lapjvxa
     from ._lapjvc_wp import lapjvc
     from ._lapjvs_wp import lapjvs, lapjvsa
+    from ._auction_wp import auction
+    from ._kbest_wp import kbest
     # Batch solvers
     from ._lapjvx_batch_wp import lapjvx_batch, lapjvxa_batch
     from ._lapjvs_batch_wp import lapjvs_batch, lapjvsa_batch
+    from ._lapjvc_batch_wp import lapjvc_batch
+    from ._lapmod_batch_wp import lapmod_batch
+    from ._pool import SolverPool
+    from ._stream import solve_stream
+    # Incremental
+    from ._incremental import IncrementalAssignment
     # Constants
     from ._lapjv import (  # type: ignore
         LARGE_ as LARGE,
@@ -53,17 +85,30 @@ if TYPE_CHECKING:
 _exports = {
     # Single-matrix solvers
     'lapmod': ("lap._lapmod_wp", "lapmod"),
+    'lapmod_dense': ("lap._lapmod_wp", "lapmod_dense"),
+    'lapmod_edges': ("lap._lapmod_wp", "lapmod_edges"),
     'lapjv': ("lap._lapjv_wp", "lapjv"),
     'lapjvx': ("lap._lapjvx_wp", "lapjvx"),
     'lapjvxa': ("lap._lapjvx_wp", "lapjvxa"),
     'lapjvc': ("lap._lapjvc_wp", "lapjvc"),
     'lapjvs': ("lap._lapjvs_wp", "lapjvs"),
     'lapjvsa': ("lap._lapjvs_wp", "lapjvsa"),
+    'auction': ("lap._auction_wp", "auction"),
+    'kbest': ("lap._kbest_wp", "kbest"),
     # Batch solvers
     'lapjvx_batch': ("lap._lapjvx_batch_wp", "lapjvx_batch"),
     'lapjvxa_batch': ("lap._lapjvx_batch_wp", "lapjvxa_batch"),
     'lapjvs_batch': ("lap._lapjvs_batch_wp", "lapjvs_batch"),
     'lapjvsa_batch': ("lap._lapjvs_batch_wp", "lapjvsa_batch"),
+    'lapjvc_batch': ("lap._lapjvc_batch_wp", "lapjvc_batch"),
+    'lapmod_batch': ("lap._lapmod_batch_wp", "lapmod_batch"),
+    'SolverPool': ("lap._pool", "SolverPool"),
+    'solve_stream': ("lap._stream", "solve_stream"),
+    # Sparse helpers
+    'gate': ("lap._lapmod_wp", "gate"),
+    'edges_to_csr': ("lap._lapmod_wp", "edges_to_csr"),
+    # Incremental
+    'IncrementalAssignment': ("lap._incremental", "IncrementalAssignment"),
     # Constants
     'LARGE': ("lap._lapjv", "LARGE_"),
     'FP_1': ("lap._lapjv", "FP_1_"),
@@ -86,9 +131,15 @@ __description__ = 'Linear assignment problem solvers, including single and batch
 __homepage__ = 'https://github.com/rathaROG/lapx'
 __all__ = [
     # Single-matrix solvers
-    'lapmod', 'lapjv', 'lapjvx', 'lapjvxa', 'lapjvc', 'lapjvs', 'lapjvsa',
+    'lapmod', 'lapmod_dense', 'lapmod_edges', 'lapjv', 'lapjvx', 'lapjvxa', 'lapjvc',
+    'lapjvs', 'lapjvsa', 'auction', 'kbest',
     # Batch solvers
     'lapjvx_batch', 'lapjvxa_batch', 'lapjvs_batch', 'lapjvsa_batch',
+    'lapjvc_batch', 'lapmod_batch', 'SolverPool', 'solve_stream',
+    # Sparse helpers
+    'gate', 'edges_to_csr',
+    # Incremental
+    'IncrementalAssignment',
     # Constants
     'FP_1', 'FP_2', 'FP_DYNAMIC', 'LARGE',
 ]
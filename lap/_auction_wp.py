@@ -0,0 +1,135 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+import numpy as np
+from typing import Optional, Tuple, Union
+
+from ._lapjv import _auction  # type: ignore
+from ._batch_utils import _normalize_threads
+
+
+def auction(
+    cost: np.ndarray,
+    extend_cost: bool = False,
+    cost_limit: float = np.inf,
+    return_cost: bool = True,
+    eps: Optional[float] = None,
+    scale: Optional[float] = None,
+    n_threads: int = 0,
+) -> Union[
+    Tuple[float, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray],
+]:
+    """
+    Solve the Linear Assignment Problem with Bertsekas' auction algorithm,
+    using epsilon scaling and parallel bidding over rows.
+
+    Inputs and outputs are those of `lapjvx`: (total, row_indices,
+    col_indices) like scipy.optimize.linear_sum_assignment.
+
+    Parameters
+    ----------
+    cost : np.ndarray, shape (N, M)
+        2D cost matrix with finite values.
+    extend_cost : bool, default False
+        Permit rectangular inputs by zero-padding to a square matrix.
+    cost_limit : float, default np.inf
+        If finite, augment to size (N+M) with sentinel edges of cost_limit/2,
+        modeling a per-edge reject cost (as in `lapjvx`).
+    return_cost : bool, default True
+        If True, include total assignment cost first (computed on the ORIGINAL input).
+    eps : float, optional
+        Final epsilon, in units of the working costs (after `scale`). The
+        result is within N * eps of the optimum. By default 1 / (N + 1) when
+        the working costs are integers, which makes the result optimal, and
+        (max - min) * 1e-7 / N otherwise.
+    scale : float, optional
+        If given, costs are multiplied by `scale` and rounded to integers
+        before solving, so the auction runs to exact optimality on the scaled
+        problem. Totals are still computed on the ORIGINAL input.
+    n_threads : int, default 0
+        Threads computing the bids of one round. 0 or None uses
+        `os.cpu_count()`. Only used once the working matrix is at least 512
+        wide; the assignment is the same for any value.
+
+    Returns
+    -------
+    If return_cost is True:
+        total_cost : float
+        row_indices : np.ndarray with shape (K,), dtype int64
+        col_indices : np.ndarray with shape (K,), typically dtype int32
+    Else:
+        row_indices, col_indices
+
+    Raises
+    ------
+    ValueError
+        - If `cost` is not 2D, or is rectangular without extend_cost or cost_limit.
+        - If `cost` has non-finite values.
+        - If `eps` or `scale` is not positive.
+
+    Notes
+    -----
+    - Exactness needs N * max|cost| to stay well within the float64 mantissa
+      (about 2**53); beyond that prices lose the eps steps to rounding.
+    - Bids are resolved in a fixed order, so `n_threads` never changes the result.
+    """
+    A = np.asarray(cost)
+    if A.ndim != 2:
+        raise ValueError('2-dimensional array expected')
+    if eps is not None and not eps > 0:
+        raise ValueError('eps must be positive')
+    if scale is not None and not scale > 0:
+        raise ValueError('scale must be positive')
+
+    n_rows0, n_cols0 = A.shape
+    if n_rows0 == 0 or n_cols0 == 0:
+        empty = np.empty((0,), dtype=np.int64)
+        return (0.0, empty, empty.copy()) if return_cost else (empty, empty.copy())
+
+    # Same orientation and augmentation policy as lapjvx
+    transposed = n_rows0 > n_cols0
+    B = np.asarray(A.T if transposed else A, dtype=np.double)
+    R, C = B.shape
+    if R != C and not extend_cost and cost_limit == np.inf:
+        raise ValueError(
+            'Square cost array expected. If cost is intentionally '
+            'non-square, pass extend_cost=True.'
+        )
+    if not np.isfinite(B).all():
+        raise ValueError('Cost matrix values must be finite for auction.')
+
+    if cost_limit < np.inf:
+        W = np.full((R + C, R + C), cost_limit / 2.0)
+        W[R:, C:] = 0.0
+        W[:R, :C] = B
+    elif R != C:
+        W = np.zeros((max(R, C), max(R, C)))
+        W[:R, :C] = B
+    else:
+        W = B
+    if scale is not None:
+        W = np.rint(W * scale)
+    N = W.shape[0]
+
+    if eps is None:
+        span = float(W.max() - W.min())
+        if span == 0.0 or np.array_equal(W, np.rint(W)):
+            eps = 1.0 / (N + 1)
+        else:
+            eps = span * 1e-7 / N
+
+    x_c, _ = _auction(W, float(eps), n_threads=_normalize_threads(n_threads))
+    x_c = x_c[:R]
+    x_c[x_c >= C] = -1
+
+    rows_b = np.nonzero(x_c >= 0)[0].astype(np.int64, copy=False)
+    cols_b = x_c[x_c >= 0]
+    if transposed:
+        row_indices, col_indices = cols_b, rows_b
+    else:
+        row_indices, col_indices = rows_b, cols_b
+
+    if return_cost:
+        opt = float(A[row_indices, col_indices].sum()) if row_indices.size else 0.0
+        return opt, row_indices, col_indices
+    return row_indices, col_indices
@@ -0,0 +1,296 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+import os
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+def _normalize_threads(n_threads: int) -> int:
+    if not n_threads:
+        return max(1, int(os.cpu_count() or 1))
+    return max(1, int(n_threads))
+
+
+def _rows_cols_from_xy(
+    x: np.ndarray, y: np.ndarray, by_row: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten stacked lapjv-style mappings into per-instance (rows, cols) pairs.
+
+    `x` is (B, N) and `y` is (B, M), both with -1 for unassigned entries, in
+    the ORIGINAL orientation. Pairs are ordered exactly like the single-matrix
+    solvers: by row when N <= M, and by column when N > M (the kernel works on
+    the transposed matrix in that case). `by_row` forces row order for
+    solvers that never transpose (lapjvc).
+
+    Returns (counts, rows, cols): counts (B,) int64 holds the number of pairs
+    of each instance, rows/cols are the concatenated int64 pair arrays.
+    """
+    if x.shape[1] > y.shape[1] and not by_row:
+        mask = y >= 0
+        cols = np.nonzero(mask)[1].astype(np.int64, copy=False)
+        rows = y[mask].astype(np.int64, copy=False)
+    else:
+        mask = x >= 0
+        rows = np.nonzero(mask)[1].astype(np.int64, copy=False)
+        cols = x[mask].astype(np.int64, copy=False)
+    counts = mask.sum(axis=1, dtype=np.int64)
+    return counts, rows, cols
+
+
+def _instance_work(shapes: np.ndarray, augmented: bool = False) -> np.ndarray:
+    """
+    Estimated solve work per instance for the schedulers: the cube of the
+    square size the kernel actually solves (max(N, M) when zero-padded,
+    N + M for the cost_limit augmentation). Mirrors the native estimate.
+    """
+    shapes = np.asarray(shapes, dtype=np.float64)
+    dim = shapes.sum(axis=1) if augmented else shapes.max(axis=1, initial=0.0)
+    return dim ** 3
+
+
+def _dense_shapes(A: np.ndarray) -> np.ndarray:
+    # (B, 2) per-instance shapes of a dense (B, N, M) batch, as a broadcast view.
+    return np.broadcast_to(np.array(A.shape[1:], dtype=np.int64), (A.shape[0], 2))
+
+
+def _run_batch(
+    solve, costs, n_threads: int, pool, shapes: np.ndarray, augmented: bool = False, init_v=None
+):
+    """
+    Run a native batch entry `solve(costs, n_threads) -> (totals, x, y, ...)`.
+
+    Without a pool the entry spreads the batch over its own native threads,
+    largest instances first. With a `SolverPool`, the batch is cut into
+    contiguous chunks of about equal estimated work (see `_instance_work`)
+    that the pool's workers solve with one single-threaded native call each.
+    Per-instance warm-start duals `init_v` are passed as a third argument,
+    cut along with `costs`.
+    """
+    extra = () if init_v is None else (init_v,)
+    if pool is None:
+        return solve(costs, _normalize_threads(n_threads), *extra)
+    work = _instance_work(shapes, augmented)
+    return pool._solve_chunks(lambda part, *v0: solve(part, 1, *v0), costs, work, *extra)
+
+
+def _batch_init_v(init_v, shapes: Optional[np.ndarray], n_batch: int, n_cols: int):
+    """
+    Normalize warm-start column duals for a batch solve.
+
+    Dense batches take a (B, M) array. Ragged batches (`shapes` given) take
+    one (M_b,) array per instance, as a sequence, as the flat sum(M_b) array
+    of output="packed", or as the NaN-padded (B, max M_b) array of
+    output="padded"; a list of B (M_b,) float64 arrays is returned.
+    """
+    if init_v is None:
+        return None
+    if shapes is None:
+        v0 = np.asarray(init_v, dtype=np.float64)
+        if v0.shape != (n_batch, n_cols):
+            raise ValueError("init_v must have shape (%d, %d), one dual per column" % (n_batch, n_cols))
+        return v0
+    counts = shapes[:, 1]
+    if isinstance(init_v, np.ndarray) and init_v.ndim == 1:
+        if init_v.shape[0] != int(counts.sum()):
+            raise ValueError("packed init_v must hold sum(M_b) entries")
+        return _split_by_counts(init_v.astype(np.float64, copy=False), counts)
+    if isinstance(init_v, np.ndarray) and init_v.ndim == 2:
+        init_v = [row[:m] for row, m in zip(init_v, counts.tolist())]
+    if len(init_v) != n_batch:
+        raise ValueError("init_v must hold one array per instance")
+    return [np.asarray(v0, dtype=np.float64) for v0 in init_v]
+
+
+def _is_ragged(costs, shapes) -> bool:
+    """True when `costs` is a ragged batch (a sequence of 2D arrays or a packed buffer)."""
+    return shapes is not None or not isinstance(costs, np.ndarray)
+
+
+def _ragged_instances(
+    costs,
+    shapes: Optional[np.ndarray] = None,
+    offsets: Optional[np.ndarray] = None,
+) -> Tuple[List[np.ndarray], np.ndarray]:
+    """
+    Normalize a ragged batch into a list of 2D instances and their shapes.
+
+    `costs` is either a sequence of 2D arrays (`shapes` is None), or a packed
+    1D buffer holding every instance in C order, with `shapes` (B, 2) giving
+    (N_b, M_b) and `offsets` (B,) the start of each instance in the buffer
+    (instances are taken back to back when `offsets` is None). Packed
+    instances are returned as views into the buffer, so nothing is copied.
+
+    Returns (instances, shapes) with shapes as a (B, 2) int64 array.
+    """
+    if shapes is None:
+        instances = [np.asarray(c) for c in costs]
+        for c in instances:
+            if c.ndim != 2:
+                raise ValueError("2-dimensional array expected for every instance")
+        S = np.array([c.shape for c in instances], dtype=np.int64).reshape(-1, 2)
+        return instances, S
+
+    buf = np.asarray(costs)
+    if buf.ndim != 1:
+        raise ValueError("packed costs must be a 1-dimensional buffer")
+    S = np.asarray(shapes, dtype=np.int64)
+    if S.ndim != 2 or S.shape[1] != 2:
+        raise ValueError("shapes must have shape (B, 2)")
+    if np.any(S < 0):
+        raise ValueError("shapes must be non-negative")
+    sizes = S[:, 0] * S[:, 1]
+    if offsets is None:
+        starts = np.zeros((S.shape[0],), dtype=np.int64)
+        np.cumsum(sizes[:-1], out=starts[1:])
+    else:
+        starts = np.asarray(offsets, dtype=np.int64)
+        if starts.shape != (S.shape[0],):
+            raise ValueError("offsets must have shape (B,)")
+    if S.shape[0] and (starts.min() < 0 or (starts + sizes).max() > buf.shape[0]):
+        raise ValueError("packed instance lies outside the cost buffer")
+    instances = [
+        buf[o:o + n * m].reshape(n, m)
+        for o, n, m in zip(starts.tolist(), S[:, 0].tolist(), S[:, 1].tolist())
+    ]
+    return instances, S
+
+
+def _rows_cols_from_packed(
+    x: np.ndarray, y: np.ndarray, shapes: np.ndarray, by_row: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ragged counterpart of `_rows_cols_from_xy`.
+
+    `x`/`y` hold the per-instance mappings packed back to back (sum(N_b) and
+    sum(M_b) entries) and `shapes` is (B, 2). Each instance keeps the pair
+    order of the single-matrix solvers for its own shape.
+    """
+    n_batch = shapes.shape[0]
+    n_rows, n_cols = shapes[:, 0], shapes[:, 1]
+    transposed = (n_rows > n_cols) & (not by_row)
+    seg_x = np.repeat(np.arange(n_batch), n_rows)
+    seg_y = np.repeat(np.arange(n_batch), n_cols)
+    x_start = np.cumsum(n_rows) - n_rows
+    y_start = np.cumsum(n_cols) - n_cols
+
+    # Instances with N <= M read their pairs from x, the others from y.
+    ix = np.nonzero((x >= 0) & ~transposed[seg_x])[0]
+    iy = np.nonzero((y >= 0) & transposed[seg_y])[0]
+    bx, by = seg_x[ix], seg_y[iy]
+    owner = np.concatenate([bx, by])
+    rows = np.concatenate([ix - x_start[bx], y[iy]]).astype(np.int64, copy=False)
+    cols = np.concatenate([x[ix], iy - y_start[by]]).astype(np.int64, copy=False)
+    order = np.argsort(owner, kind="stable")
+    counts = np.bincount(owner, minlength=n_batch).astype(np.int64, copy=False)
+    return counts, rows[order], cols[order]
+
+
+def _split_by_counts(flat: np.ndarray, counts: np.ndarray) -> List[np.ndarray]:
+    # Plain slicing into views; much cheaper than np.split for many small pieces.
+    bounds = np.zeros((counts.shape[0] + 1,), dtype=np.int64)
+    np.cumsum(counts, out=bounds[1:])
+    b = bounds.tolist()
+    return [flat[b[i]:b[i + 1]] for i in range(counts.shape[0])]
+
+
+_OUTPUT_MODES = ("list", "packed", "padded", "xy")
+
+
+def _check_output_mode(output: str) -> None:
+    if output not in _OUTPUT_MODES:
+        raise ValueError(
+            "output must be one of %s, got %r" % (", ".join(map(repr, _OUTPUT_MODES)), output)
+        )
+
+
+def _pairs_from_xy(
+    x: np.ndarray, y: np.ndarray, shapes: Optional[np.ndarray] = None, by_row: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Stacked (B, N)/(B, M) mappings when `shapes` is None, packed otherwise.
+    if shapes is None:
+        return _rows_cols_from_xy(x, y, by_row)
+    return _rows_cols_from_packed(x, y, shapes, by_row)
+
+
+def _padded(values: np.ndarray, counts: np.ndarray, width: int, fill=-1) -> np.ndarray:
+    # Scatter concatenated per-instance values into a (B, width) `fill` filled array.
+    out = np.full((counts.shape[0], width), fill, dtype=values.dtype)
+    owner = np.repeat(np.arange(counts.shape[0]), counts)
+    pos = np.arange(values.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+    out[owner, pos] = values
+    return out
+
+
+def _format_batch_output(
+    x: np.ndarray,
+    y: np.ndarray,
+    shapes: Optional[np.ndarray],
+    output: str,
+    as_pairs: bool,
+    by_row: bool = False,
+) -> Tuple:
+    """
+    Build the batch solver outputs (everything but the totals) for `output`.
+
+    - "list":   rows_list, cols_list (or pairs_list when `as_pairs`).
+    - "packed": offsets (B+1,) plus flat rows, cols (or pairs (K, 2)); the
+                pairs of instance b are [offsets[b]:offsets[b+1]].
+    - "padded": rows, cols (B, K) (or pairs (B, K, 2)) with K = max
+                min(N_b, M_b), trailing slots filled with -1.
+    - "xy":     stacked int32 lapjv-style mappings x (B, N) and y (B, M);
+                ragged batches are padded to the largest N_b/M_b with -1.
+    """
+    _check_output_mode(output)
+    if output == "xy":
+        if shapes is None:
+            return x, y
+        n_max = int(shapes[:, 0].max()) if shapes.shape[0] else 0
+        m_max = int(shapes[:, 1].max()) if shapes.shape[0] else 0
+        return _padded(x, shapes[:, 0], n_max), _padded(y, shapes[:, 1], m_max)
+
+    counts, rows, cols = _pairs_from_xy(x, y, shapes, by_row)
+    if output == "list":
+        if as_pairs:
+            return (_split_by_counts(np.stack([rows, cols], axis=1), counts),)
+        return _split_by_counts(rows, counts), _split_by_counts(cols, counts)
+
+    if output == "packed":
+        offsets = np.zeros((counts.shape[0] + 1,), dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        if as_pairs:
+            return offsets, np.stack([rows, cols], axis=1)
+        return offsets, rows, cols
+
+    # "padded"
+    if shapes is None:
+        width = min(x.shape[1], y.shape[1])
+    else:
+        width = int(shapes.min(axis=1).max()) if shapes.shape[0] else 0
+    rows_p = _padded(rows, counts, width)
+    cols_p = _padded(cols, counts, width)
+    if as_pairs:
+        return (np.stack([rows_p, cols_p], axis=2),)
+    return rows_p, cols_p
+
+
+
+def _format_batch_duals(
+    u: np.ndarray, v: np.ndarray, shapes: Optional[np.ndarray], output: str
+) -> Tuple:
+    """
+    Lay out the row/column duals of a batch solve for `output`.
+
+    Dense batches always give stacked u (B, N) and v (B, M). Ragged batches
+    give lists of per-instance arrays ("list"), the flat arrays packed back
+    to back ("packed"), or (B, max N_b) and (B, max M_b) arrays padded with
+    NaN ("padded", "xy"). Each layout is accepted back as `init_v`.
+    """
+    if shapes is None or output == "packed":
+        return u, v
+    if output == "list":
+        return _split_by_counts(u, shapes[:, 0]), _split_by_counts(v, shapes[:, 1])
+    n_max = int(shapes[:, 0].max()) if shapes.shape[0] else 0
+    m_max = int(shapes[:, 1].max()) if shapes.shape[0] else 0
+    return (_padded(u, shapes[:, 0], n_max, fill=np.nan),
+            _padded(v, shapes[:, 1], m_max, fill=np.nan))
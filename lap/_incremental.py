@@ -0,0 +1,300 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+import numpy as np
+from typing import Optional, Tuple
+
+from ._lapjv import lapjv as _lapjv, _lapjv_resume  # type: ignore
+from ._batch_utils import _normalize_threads
+
+
+class IncrementalAssignment:
+    """
+    Assignment problem kept optimal across small edits.
+
+    Holds a cost matrix together with its optimal matching and duals. Rows
+    and columns can be added, removed or have their costs changed, e.g. as
+    tracks end and detections appear from one frame to the next. Instead of
+    solving the whole problem again, the next query repairs the previous
+    solution: only rows touched by the edits lose their match, and each is
+    re-assigned by one augmenting path over the current duals. With k
+    touched rows this costs about O(k * N^2) rather than O(N^3), and the
+    result is exactly optimal.
+
+    Every matching is that of `lapjvx(cost, extend_cost=True,
+    cost_limit=cost_limit)`: rectangular problems are zero-padded to a
+    square, and a finite `cost_limit` models a per-edge reject cost.
+
+    Parameters
+    ----------
+    cost : np.ndarray, shape (N, M)
+        Initial cost matrix with finite values. May be empty, e.g. (0, 0).
+    cost_limit : float, default np.inf
+        If finite, a row or column may stay unassigned at a cost of
+        cost_limit / 2, as in `lapjvx`.
+    n_threads : int, default 1
+        Threads splitting the O(N) inner scans of a solve. 0 or None uses
+        `os.cpu_count()`. Only used once the working matrix is at least
+        4096 wide; the assignment is the same for any value.
+
+    Examples
+    --------
+    >>> inc = lap.IncrementalAssignment(cost)
+    >>> total, rows, cols = inc.solution()
+    >>> inc.remove_rows([3])              # a track ended
+    >>> inc.add_cols(new_detection_costs)  # (N, k) costs of new detections
+    >>> inc.update_costs(0, slice(None), refreshed_row_0)
+    >>> total, rows, cols = inc.solution()  # repaired, not re-solved
+
+    Notes
+    -----
+    Edits are applied lazily: the repair runs once, on the next call to
+    `solution`, `x`, `y` or `duals`, however many edits came before it.
+    """
+
+    def __init__(self, cost: np.ndarray, cost_limit: float = np.inf, n_threads: int = 1):
+        C = np.array(cost, dtype=np.double)
+        if C.ndim != 2:
+            raise ValueError("cost must be a 2D array")
+        if not np.isfinite(C).all():
+            raise ValueError("cost values must be finite")
+        self._cost = C
+        self._cost_limit = float(cost_limit)
+        self._n_threads = _normalize_threads(n_threads)
+        W = self._working()
+        if W.shape[0]:
+            _, self._x, self._y, _, self._v = _lapjv(W, return_duals=True, n_threads=self._n_threads)
+        else:
+            self._x = np.empty((0,), dtype=np.int32)
+            self._y = np.empty((0,), dtype=np.int32)
+            self._v = np.empty((0,), dtype=np.double)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Queries
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(N, M), the current number of rows and columns."""
+        return self._cost.shape
+
+    @property
+    def cost(self) -> np.ndarray:
+        """Read-only view of the current cost matrix."""
+        view = self._cost.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def x(self) -> np.ndarray:
+        """Column assigned to each row, or -1 (lapjv-style, shape (N,))."""
+        self._repair()
+        N, M = self._cost.shape
+        x = self._x[:N].astype(np.int32)
+        x[x >= M] = -1
+        return x
+
+    @property
+    def y(self) -> np.ndarray:
+        """Row assigned to each column, or -1 (lapjv-style, shape (M,))."""
+        self._repair()
+        N, M = self._cost.shape
+        y = self._y[:M].astype(np.int32)
+        y[y >= N] = -1
+        return y
+
+    def solution(self, return_cost: bool = True):
+        """
+        The current optimal assignment, like `lapjvx`.
+
+        Returns
+        -------
+        If return_cost is True:
+            (total_cost, row_indices, col_indices), indices as int64
+        Else:
+            (row_indices, col_indices)
+        """
+        x = self.x
+        rows = np.nonzero(x >= 0)[0].astype(np.int64, copy=False)
+        cols = x[rows].astype(np.int64)
+        if return_cost:
+            total = float(self._cost[rows, cols].sum()) if rows.size else 0.0
+            return total, rows, cols
+        return rows, cols
+
+    def duals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Row and column duals (u, v) of the current solution, float64 of
+        shapes (N,) and (M,): u[i] + v[j] <= cost[i, j] for all pairs, with
+        equality on the assigned ones. `v` can warm-start `lapjvx(init_v=)`.
+        """
+        self._repair()
+        N, M = self._cost.shape
+        x = self._x[:N]
+        u = self._entries(self._cost, np.arange(N), x) - self._v[x]
+        return u, self._v[:M].copy()
+
+    # ------------------------------------------------------------------
+    # Edits
+
+    def add_rows(self, costs: np.ndarray) -> np.ndarray:
+        """
+        Append rows; `costs` is (k, M). Returns the indices of the new rows.
+        """
+        N, M = self._cost.shape
+        R = self._check_block(costs, (None, M))
+        row_src = np.concatenate([np.arange(N), np.full(R.shape[0], -1)])
+        self._edit(np.vstack([self._cost, R]), row_src, np.arange(M))
+        return np.arange(N, N + R.shape[0])
+
+    def add_cols(self, costs: np.ndarray) -> np.ndarray:
+        """
+        Append columns; `costs` is (N, k). Returns the indices of the new columns.
+        """
+        N, M = self._cost.shape
+        K = self._check_block(costs, (N, None))
+        col_src = np.concatenate([np.arange(M), np.full(K.shape[1], -1)])
+        self._edit(np.hstack([self._cost, K]), np.arange(N), col_src)
+        return np.arange(M, M + K.shape[1])
+
+    def remove_rows(self, rows) -> None:
+        """Remove rows; the remaining rows keep their order and are renumbered."""
+        N, M = self._cost.shape
+        keep = self._keep_mask(rows, N)
+        self._edit(self._cost[keep], np.nonzero(keep)[0], np.arange(M))
+
+    def remove_cols(self, cols) -> None:
+        """Remove columns; the remaining columns keep their order and are renumbered."""
+        N, M = self._cost.shape
+        keep = self._keep_mask(cols, M)
+        self._edit(self._cost[:, keep], np.arange(N), np.nonzero(keep)[0])
+
+    def update_costs(self, rows, cols, values) -> None:
+        """
+        Set ``cost[rows, cols] = values`` with NumPy indexing and broadcasting,
+        e.g. ``update_costs(i, slice(None), new_row)`` or
+        ``update_costs([0, 2], [1, 3], [0.5, 0.7])``.
+        """
+        N, M = self._cost.shape
+        # Edit in place; only the touched entries are compared and checked.
+        row_of = np.broadcast_to(np.arange(N)[:, None], (N, M))[rows, cols]
+        before = np.array(self._cost[rows, cols], dtype=np.double)
+        self._cost[rows, cols] = values
+        after = self._cost[rows, cols]
+        if not np.isfinite(after).all():
+            self._cost[rows, cols] = before
+            raise ValueError("cost values must be finite")
+        changed = np.unique(row_of[before != after])
+        self._edit(self._cost, np.arange(N), np.arange(M), changed)
+
+    # ------------------------------------------------------------------
+    # Internals
+
+    @staticmethod
+    def _check_block(costs, shape) -> np.ndarray:
+        B = np.array(costs, dtype=np.double)
+        if B.ndim != 2 or any(s is not None and s != b for s, b in zip(shape, B.shape)):
+            raise ValueError(
+                "costs must have shape (%s, %s)" % tuple("k" if s is None else s for s in shape))
+        if not np.isfinite(B).all():
+            raise ValueError("cost values must be finite")
+        return B
+
+    @staticmethod
+    def _keep_mask(index, n: int) -> np.ndarray:
+        keep = np.ones(n, dtype=bool)
+        try:
+            keep[index] = False
+        except IndexError:
+            raise ValueError("index out of range") from None
+        return keep
+
+    def _working(self, C: Optional[np.ndarray] = None) -> np.ndarray:
+        # Square working matrix: zero-padded, or augmented with reject edges
+        # (rows N.. are the column sentinels, columns M.. the row sentinels).
+        C = self._cost if C is None else C
+        N, M = C.shape
+        if self._cost_limit < np.inf:
+            W = np.full((N + M, N + M), self._cost_limit / 2.0)
+            W[N:, M:] = 0.0
+        elif N == M:
+            return C
+        else:
+            W = np.zeros((max(N, M), max(N, M)))
+        W[:N, :M] = C
+        return W
+
+    def _entries(self, C: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        # Entries W[rows, cols] of the working matrix of C, without building it.
+        N, M = C.shape
+        real = (rows < N) & (cols < M)
+        if self._cost_limit < np.inf:
+            out = np.where((rows < N) | (cols < M), self._cost_limit / 2.0, 0.0)
+        else:
+            out = np.zeros(np.broadcast(rows, cols).shape)
+        out[real] = C[np.broadcast_to(rows, real.shape)[real],
+                      np.broadcast_to(cols, real.shape)[real]]
+        return out
+
+    def _working_src(self, row_src: np.ndarray, col_src: np.ndarray,
+                     n_old: int, m_old: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Extend the real row/column maps (new index -> old index or -1) to
+        # the working layouts, so dummy rows/columns keep their state too.
+        S_old = self._x.shape[0]
+        if self._cost_limit < np.inf:
+            # Sentinels follow the column (rows) or row (columns) they serve.
+            sent_rows = np.where(col_src >= 0, n_old + col_src, -1)
+            sent_cols = np.where(row_src >= 0, m_old + row_src, -1)
+            return (np.concatenate([row_src, sent_rows]),
+                    np.concatenate([col_src, sent_cols]))
+        # Zero padding: dummies are interchangeable, reuse them in order.
+        S = max(row_src.shape[0], col_src.shape[0])
+        pad_rows = np.arange(n_old, S_old)[:S - row_src.shape[0]]
+        pad_cols = np.arange(m_old, S_old)[:S - col_src.shape[0]]
+        pad_rows = np.concatenate([pad_rows, np.full(S - row_src.shape[0] - pad_rows.shape[0], -1)])
+        pad_cols = np.concatenate([pad_cols, np.full(S - col_src.shape[0] - pad_cols.shape[0], -1)])
+        return (np.concatenate([row_src, pad_rows]).astype(np.int64),
+                np.concatenate([col_src, pad_cols]).astype(np.int64))
+
+    def _edit(self, C: np.ndarray, row_src: np.ndarray, col_src: np.ndarray,
+              changed_rows: Optional[np.ndarray] = None) -> None:
+        # Carry the matching and duals over to the edited problem. Matches of
+        # removed, added or changed rows and of removed columns are dropped;
+        # every other matched row is still at its minimum reduced cost, which
+        # is all the repair needs.
+        n_old, m_old = self._cost.shape
+        w_rows, w_cols = self._working_src(
+            np.asarray(row_src, dtype=np.int64), np.asarray(col_src, dtype=np.int64), n_old, m_old)
+        S = w_rows.shape[0]
+
+        kept_c = w_cols >= 0
+        new_col = np.full(self._x.shape[0] + 1, -1, dtype=np.int64)  # [-1] -> -1
+        new_col[w_cols[kept_c]] = np.nonzero(kept_c)[0]
+        x = np.full(S, -1, dtype=np.int32)
+        kept_r = w_rows >= 0
+        x[kept_r] = new_col[self._x[w_rows[kept_r]]]
+        if changed_rows is not None:
+            x[changed_rows] = -1
+
+        v = np.zeros(S, dtype=np.double)
+        v[kept_c] = self._v[w_cols[kept_c]]
+        matched = np.nonzero(x >= 0)[0]
+        fresh = np.nonzero(~kept_c)[0]
+        if fresh.size and matched.size:
+            # Price new columns so no matched row prefers them.
+            u = self._entries(C, matched, x[matched]) - v[x[matched]]
+            v[fresh] = (self._entries(C, matched[:, None], fresh[None, :]) - u[:, None]).min(axis=0)
+
+        y = np.full(S, -1, dtype=np.int32)
+        y[x[matched]] = matched
+        self._cost = C
+        self._x, self._y, self._v = x, y, v
+        self._dirty = True
+
+    def _repair(self) -> None:
+        if self._dirty:
+            _lapjv_resume(self._working(), self._x, self._y, self._v, self._n_threads)
+            self._dirty = False
+
+    def __repr__(self) -> str:
+        N, M = self._cost.shape
+        return f"IncrementalAssignment(shape=({N}, {M}), cost_limit={self._cost_limit})"
@@ -0,0 +1,119 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+import numpy as np
+from typing import List, Tuple, Union
+
+from ._lapjv import _kbest  # type: ignore
+from ._batch_utils import _normalize_threads
+
+
+def kbest(
+    cost: np.ndarray,
+    k: int,
+    extend_cost: bool = False,
+    cost_limit: float = np.inf,
+    return_cost: bool = True,
+    n_threads: int = 1,
+) -> Union[
+    Tuple[np.ndarray, List[np.ndarray], List[np.ndarray]],
+    Tuple[List[np.ndarray], List[np.ndarray]],
+]:
+    """
+    Find the k best assignments, cheapest first, with Murty's algorithm.
+
+    The search runs natively on the JV kernel: each subproblem starts from
+    its parent's solution and column duals, so it is re-solved with a single
+    augmenting path. All subproblems share one priority queue, and the
+    children of a subproblem are solved on `n_threads` threads.
+
+    Parameters
+    ----------
+    cost : np.ndarray, shape (N, M)
+        2D cost matrix with finite values.
+    k : int
+        Number of assignments wanted (>= 1). Fewer are returned when fewer
+        distinct assignments exist.
+    extend_cost : bool, default False
+        Permit rectangular inputs by zero-padding to a square matrix.
+    cost_limit : float, default np.inf
+        If finite, a row or column may stay unassigned at a cost of
+        cost_limit / 2, as in `lapjvx`.
+    return_cost : bool, default True
+        If True, include the total cost of every assignment first.
+    n_threads : int, default 1
+        Threads solving the subproblems of one partition step. 0 or None
+        uses `os.cpu_count()`. The result is the same for any value.
+
+    Returns
+    -------
+    If return_cost is True:
+        totals : np.ndarray with shape (K,), dtype float64
+            Sum of cost over the assigned pairs of every assignment.
+        rows_list : list of K np.ndarray, dtype int64
+        cols_list : list of K np.ndarray
+    Else:
+        rows_list, cols_list
+
+    Raises
+    ------
+    ValueError
+        - If `cost` is not 2D, or is rectangular without extend_cost or cost_limit.
+        - If `cost` has non-finite values.
+        - If `k` < 1.
+
+    Notes
+    -----
+    - Assignments are ranked by the objective `lapjvx` minimizes, so with a
+      finite cost_limit every unassigned row and column counts
+      cost_limit / 2 towards the rank, but not towards `totals`.
+    - Every assignment is distinct; the first one is that of `lapjvx`.
+    - Ties are ranked deterministically.
+    """
+    A = np.asarray(cost)
+    if A.ndim != 2:
+        raise ValueError('2-dimensional array expected')
+    if k < 1:
+        raise ValueError('k must be >= 1')
+
+    # Same orientation and augmentation policy as lapjvx
+    n_rows0, n_cols0 = A.shape
+    transposed = n_rows0 > n_cols0
+    B = np.asarray(A.T if transposed else A, dtype=np.double)
+    R, C = B.shape
+    if R != C and not extend_cost and cost_limit == np.inf:
+        raise ValueError(
+            'Square cost array expected. If cost is intentionally '
+            'non-square, pass extend_cost=True.'
+        )
+    if not np.isfinite(B).all():
+        raise ValueError('Cost matrix values must be finite for kbest.')
+
+    if cost_limit < np.inf:
+        W = np.full((R + C, R + C), cost_limit / 2.0)
+        W[R:, C:] = 0.0
+        W[:R, :C] = B
+    elif R != C:
+        W = np.zeros((C, C))
+        W[:R, :C] = B
+    else:
+        W = B
+
+    labels, _ = _kbest(W, R, C, int(k), n_threads=_normalize_threads(n_threads))
+
+    rows_list, cols_list = [], []
+    totals = np.zeros((labels.shape[0],), dtype=np.double)
+    for s, x_b in enumerate(labels):
+        rows_b = np.nonzero(x_b >= 0)[0].astype(np.int64, copy=False)
+        cols_b = x_b[x_b >= 0]
+        if transposed:
+            rows, cols = cols_b, rows_b
+        else:
+            rows, cols = rows_b, cols_b
+        if rows.size:
+            totals[s] = A[rows, cols].sum()
+        rows_list.append(rows)
+        cols_list.append(cols)
+
+    if return_cost:
+        return totals, rows_list, cols_list
+    return rows_list, cols_list
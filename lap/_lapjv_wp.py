@@ -1,9 +1,10 @@
 # Copyright (c) 2025 Ratha SIV | MIT License
 
 import numpy as np
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 from ._lapjv import lapjv as _lapjv
+from ._batch_utils import _normalize_threads
 
 
 def lapjv(
@@ -11,9 +12,15 @@ def lapjv(
     extend_cost: bool = False,
     cost_limit: float = np.inf,
     return_cost: bool = True,
+    n_threads: int = 1,
+    init_v: Optional[np.ndarray] = None,
+    return_duals: bool = False,
+    prefer_float32: bool = False,
 ) -> Union[
     Tuple[float, np.ndarray, np.ndarray],
     Tuple[np.ndarray, np.ndarray],
+    Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
 ]:
     """
     Solve the Linear Assignment Problem using the Jonker-Volgenant (JV) algorithm.
@@ -27,16 +34,38 @@ def lapjv(
     cost : np.ndarray, shape (N, M)
         2D cost matrix. Entry cost[i, j] is the cost of assigning row i to column j.
         Any float dtype is accepted; internally a single contiguous float64 buffer is used when needed.
+        Integer costs (with cost_limit=inf) are solved exactly in int32/int64 with int64 duals,
+        and float32 costs on a float32 kernel (see prefer_float32).
     extend_cost : bool, default False
-        Permit rectangular inputs by zero-padding to a square matrix.
-        See the unified augmentation policy below.
+        Permit rectangular inputs; the result is that of zero-padding to a square matrix.
+        Skewed inputs (larger side >= 1.5x the smaller) run on the rectangular kernel
+        without padding; others, and warm starts, are zero-padded. See the policy below.
     cost_limit : float, default np.inf
-        When finite, the solver augments to size (N+M) with sentinel edges of cost_limit/2
-        and a bottom-right zero block. This models a per-edge "reject" cost and allows
-        rectangular inputs even if extend_cost=False.
+        When finite, every row and column may stay unassigned at a cost of cost_limit/2.
+        This models a per-edge "reject" cost and allows rectangular inputs even if
+        extend_cost=False. Rejects are solved natively on the (N, M) input; only with
+        init_v is the (N+M) x (N+M) matrix with sentinel edges of cost_limit/2 and a
+        bottom-right zero block built.
     return_cost : bool, default True
         If True, include the total assignment cost as the first return value.
         The total is computed from the ORIGINAL (un-augmented/unpadded) input array.
+    n_threads : int, default 1
+        Threads splitting the O(N) inner scans of this single solve. 0 or None
+        uses `os.cpu_count()`. Only used once the working matrix is at least
+        4096 wide; the assignment is the same for any value.
+    init_v : np.ndarray with shape (M,), optional
+        Column duals to warm-start from, typically `v` returned by a previous
+        solve (return_duals=True) of a similar matrix. Skips the column
+        reduction phase; the result is still an optimal assignment.
+    return_duals : bool, default False
+        If True, also return the row and column duals (u, v) of the solution,
+        in the ORIGINAL orientation: u[i] + v[j] <= cost[i, j] for all pairs,
+        with equality on the assigned ones.
+    prefer_float32 : bool, default False
+        If True, float64 costs are rounded to float32 and solved by the
+        float32 kernel, halving the memory traffic of the solve. float32
+        inputs always run on it, without an upcast copy. The kernel keeps
+        duals in float32, so the result is optimal up to float32 rounding.
 
     Returns
     -------
@@ -50,11 +79,15 @@ def lapjv(
     Else:
         x : np.ndarray[int32] with shape (N,)
         y : np.ndarray[int32] with shape (M,)
+    If return_duals is True, u (N,) and v (M,) float64 duals are appended.
 
     Unified augmentation policy
     ---------------------------
-    - If cost_limit < inf: always augment to (N+M) to model per-edge rejects (rectangular allowed).
-    - Else if (N != M) or extend_cost=True: zero-pad to a square of size max(N, M).
+    - If cost_limit < inf: per-edge rejects, solved natively without padding; augmented to
+      (N+M) only when warm-starting from init_v (rectangular allowed).
+    - Else if (N != M) or extend_cost=True: if max(N, M) >= 1.5 * min(N, M) and no init_v,
+      solve the (min, max) oriented matrix natively on the rectangular kernel, no padding;
+      otherwise zero-pad to a square of size max(N, M).
     - Else (square, un-augmented): run on the given square matrix.
 
     Notes
@@ -64,4 +97,6 @@ def lapjv(
     - For zero-sized dimensions, the solver returns 0.0 (if requested) and all -1 mappings.
     - This wrapper forwards directly to the Cython implementation without altering dtypes.
     """
-    return _lapjv(cost, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=return_cost)
+    return _lapjv(cost, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=return_cost,
+                  n_threads=_normalize_threads(n_threads), init_v=init_v,
+                  return_duals=return_duals, prefer_float32=prefer_float32)
@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple, Union
+
+from ._lapjvc import lapjvc_batch as _lapjvc_batch  # type: ignore
+from ._lapjvc import lapjvc_batch_ragged as _lapjvc_batch_ragged  # type: ignore
+from ._pool import SolverPool
+from ._batch_utils import (
+    _run_batch, _dense_shapes, _is_ragged, _ragged_instances, _check_output_mode,
+    _format_batch_output
+)
+
+_LAPJVC_DTYPES = (np.int32, np.int64, np.float32, np.float64)
+
+
+def _lapjvc_dtype(dtype: np.dtype) -> np.dtype:
+    # Same kernels as lapjvc(): int32/int64/float32/float64, anything else as float64.
+    return np.dtype(dtype) if dtype in _LAPJVC_DTYPES else np.dtype(np.float64)
+
+
+def lapjvc_batch(
+    costs: Union[np.ndarray, Sequence[np.ndarray]],
+    return_cost: bool = True,
+    n_threads: int = 0,
+    shapes: Optional[np.ndarray] = None,
+    offsets: Optional[np.ndarray] = None,
+    output: str = "list",
+    pool: Optional[SolverPool] = None,
+) -> Tuple[Union[np.ndarray, List[np.ndarray]], ...]:
+    """
+    Batched lapjvc solver running on native threads.
+
+    Every instance is solved exactly as `lapjvc` would: rectangular matrices
+    are handled internally and NaN/inf entries (float types) are forbidden
+    assignments. The whole batch is solved in one native call that releases
+    the GIL once. Batch order is preserved.
+
+    Parameters
+    ----------
+    costs : np.ndarray, shape (B, N, M), or a sequence of 2D arrays
+        Batch of cost matrices (int32, int64, float32 or float64; other dtypes
+        are cast to float64). A list of 2D arrays makes a ragged batch whose
+        instances may all have different shapes; with `shapes` given, `costs`
+        is instead a packed 1D buffer. Instances of a ragged batch are cast to
+        their common dtype.
+    return_cost : bool, default True
+        If True, returns per-instance totals first.
+    n_threads : int, default 0
+        Number of worker threads. 0 or None uses `os.cpu_count()`.
+    shapes : np.ndarray, shape (B, 2), optional
+        (N_b, M_b) of every instance of a packed ragged batch. When given,
+        `costs` must be a 1D buffer holding each instance in C order.
+    offsets : np.ndarray, shape (B,), optional
+        Start of each packed instance in `costs`. Defaults to instances
+        stored back to back.
+    output : {"list", "packed", "padded", "xy"}, default "list"
+        Layout of the assignments, see `lapjvx_batch`.
+    pool : SolverPool, optional
+        Solve on the pool's long-lived workers instead of starting native
+        threads for this call; `n_threads` is then ignored.
+
+    Returns
+    -------
+    If return_cost is True:
+        totals : np.ndarray, shape (B,), in the kernel dtype (as `lapjvc`)
+        followed by the assignments
+    Else:
+        the assignments
+
+    The assignments follow `output` exactly as in `lapjvx_batch`. Pairs are
+    always ordered by row, like `lapjvc`.
+
+    Raises
+    ------
+    ValueError
+        - If `costs` is neither a 3D array nor a ragged batch of 2D arrays.
+        - If `output` is not a known mode.
+    """
+    _check_output_mode(output)
+    if _is_ragged(costs, shapes):
+        instances, S = _ragged_instances(costs, shapes, offsets)
+        dtype = _lapjvc_dtype(np.result_type(*instances) if instances else np.float64)
+        totals, x, y = _run_batch(
+            lambda part, t: _lapjvc_batch_ragged(part, dtype, n_threads=t),
+            instances, n_threads, pool, S,
+        )
+    else:
+        A = np.asarray(costs)
+        if A.ndim != 3:
+            raise ValueError("3-dimensional array expected [B, N, M]")
+        A = np.ascontiguousarray(A, dtype=_lapjvc_dtype(A.dtype))
+        S = None
+        totals, x, y = _run_batch(
+            lambda part, t: _lapjvc_batch(part, n_threads=t),
+            A, n_threads, pool, _dense_shapes(A),
+        )
+    outputs = _format_batch_output(x, y, S, output, as_pairs=False, by_row=True)
+
+    if return_cost:
+        return (totals,) + outputs
+    return outputs
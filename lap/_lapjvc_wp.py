@@ -9,9 +9,12 @@ from ._lapjvc import lapjvc as _lapjvc  # type: ignore
 def lapjvc(
     cost: np.ndarray,
     return_cost: bool = True,
+    return_duals: bool = False,
 ) -> Union[
     Tuple[float, np.ndarray, np.ndarray],
     Tuple[np.ndarray, np.ndarray],
+    Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
 ]:
     """
     Solve the Linear Assignment Problem using the classic dense Jonker-Volgenant algorithm.
@@ -24,11 +27,14 @@ def lapjvc(
     ----------
     cost : np.ndarray, shape (M, N)
         2D cost matrix. Supported dtypes: int32, int64, float32, float64.
-        - Rectangular inputs are handled internally (the dense solver pads as needed).
+        - Rectangular inputs are solved directly on the unpadded matrix, in
+          O(min(M, N)^2 * max(M, N)) time.
         - NaN entries (for float types) are treated as forbidden assignments.
     return_cost : bool, default True
         If True, return (total_cost, row_indices, col_indices).
         If False, return only (row_indices, col_indices).
+    return_duals : bool, default False
+        If True, also return the dual solution of the solve.
 
     Returns
     -------
@@ -41,6 +47,9 @@ def lapjvc(
             Column indices of the assignment.
     Else:
         row_indices, col_indices
+    If return_duals is True, row duals u (M,) and column duals v (N,) are
+    appended, in the dtype of the solve: u[i] + v[j] <= cost[i, j] for all
+    allowed pairs, with equality on the assigned ones.
 
     Notes
     -----
@@ -48,4 +57,4 @@ def lapjvc(
       structured problems, consider using lapjv/lapjvx variants optimized for those cases.
     - Forbidden assignments can be encoded with np.nan (float inputs).
     """
-    return _lapjvc(cost, return_cost=return_cost)
+    return _lapjvc(cost, return_cost=return_cost, return_duals=return_duals)
@@ -1,69 +1,97 @@
 # Copyright (c) 2025 Ratha SIV | MIT License
 
-import os
 import numpy as np
-from typing import List, Tuple, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Sequence, Tuple, Union
 
-from ._lapjvs_wp import lapjvs as _lapjvs_single
-from ._lapjvs_wp import lapjvsa as _lapjvsa_single
+from ._lapjvs import lapjvs_batch_native as _lapjvs_batch_native  # type: ignore
+from ._lapjvs import lapjvs_batch_float32 as _lapjvs_batch_float32  # type: ignore
+from ._lapjvs import lapjvs_ragged_native as _lapjvs_ragged_native  # type: ignore
+from ._lapjvs import lapjvs_ragged_float32 as _lapjvs_ragged_float32  # type: ignore
+from ._pool import SolverPool
+from ._batch_utils import (
+    _run_batch, _dense_shapes, _is_ragged, _ragged_instances, _check_output_mode,
+    _format_batch_output, _format_batch_duals, _batch_init_v
+)
 
 
-def _normalize_threads(n_threads: int) -> int:
-    if n_threads is None or n_threads == 0:
-        cpu = os.cpu_count() or 1
-        return max(1, int(cpu))
-    return max(1, int(n_threads))
-
-
-def _solve_one_jvs(
-    a2d: np.ndarray,
+def _solve_batch_jvs(
+    costs: Union[np.ndarray, Sequence[np.ndarray]],
     extend_cost: bool,
     prefer_float32: bool,
-    jvx_like: bool,
-    return_cost: bool,
-):
-    # Calls the proven single-instance wrapper; it releases the GIL internally.
-    return _lapjvs_single(
-        a2d, extend_cost=extend_cost, return_cost=return_cost,
-        jvx_like=jvx_like, prefer_float32=prefer_float32
-    )
+    n_threads: int,
+    shapes: Optional[np.ndarray] = None,
+    offsets: Optional[np.ndarray] = None,
+    pool: Optional[SolverPool] = None,
+    init_v=None,
+    return_duals: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray], Tuple]:
+    if _is_ragged(costs, shapes):
+        instances, S = _ragged_instances(costs, shapes, offsets)
+        if np.any(S[:, 0] != S[:, 1]) and not extend_cost:
+            raise ValueError("extend_cost=False requires a square cost matrix")
+        # The float32 entry runs every instance in float32; the native entry
+        # follows each instance's dtype, i.e. float64 kernels for float64 input.
+        instances = [
+            c if c.dtype in (np.float32, np.float64) else c.astype(np.float64)
+            for c in instances
+        ]
+        _kernel = _lapjvs_ragged_native if prefer_float32 is False else _lapjvs_ragged_float32
+        totals, x, y, *duals = _run_batch(
+            lambda part, t, v0=None: _kernel(
+                part, n_threads=t, init_v=v0, return_duals=return_duals),
+            instances, n_threads, pool, S, False,
+            _batch_init_v(init_v, S, len(instances), 0),
+        )
+        return totals, x, y, S, tuple(duals)
 
-
-def _solve_one_jvsa(
-    a2d: np.ndarray,
-    extend_cost: bool,
-    prefer_float32: bool,
-    return_cost: bool,
-):
-    return _lapjvsa_single(
-        a2d, extend_cost=extend_cost, return_cost=return_cost,
-        prefer_float32=prefer_float32
+    A = np.asarray(costs)
+    if A.ndim != 3:
+        raise ValueError("3-dimensional array expected [B, N, M]")
+    if A.shape[1] != A.shape[2] and not extend_cost:
+        raise ValueError("extend_cost=False requires a square cost matrix")
+    # Kernel dtype follows the single-instance rules: float32 unless the
+    # caller opts out with float64 input. Totals use the ORIGINAL values.
+    use_f32 = not ((prefer_float32 is False) and (A.dtype == np.float64))
+    if A.dtype not in (np.float32, np.float64):
+        A = A.astype(np.float64)
+    _kernel = _lapjvs_batch_float32 if use_f32 else _lapjvs_batch_native
+    totals, x, y, *duals = _run_batch(
+        lambda part, t, v0=None: _kernel(
+            part, n_threads=t, init_v=v0, return_duals=return_duals),
+        A, n_threads, pool, _dense_shapes(A), False,
+        _batch_init_v(init_v, None, A.shape[0], A.shape[2]),
     )
+    return totals, x, y, None, tuple(duals)
 
 
 def lapjvs_batch(
-    costs: np.ndarray,
+    costs: Union[np.ndarray, Sequence[np.ndarray]],
     extend_cost: bool = False,
     return_cost: bool = True,
     n_threads: int = 0,
     prefer_float32: bool = True,
-) -> Union[
-    Tuple[np.ndarray, List[np.ndarray], List[np.ndarray]],
-    Tuple[List[np.ndarray], List[np.ndarray]]
-]:
+    shapes: Optional[np.ndarray] = None,
+    offsets: Optional[np.ndarray] = None,
+    output: str = "list",
+    pool: Optional[SolverPool] = None,
+    init_v: Optional[Union[np.ndarray, Sequence[np.ndarray]]] = None,
+    return_duals: bool = False,
+) -> Tuple[Union[np.ndarray, List[np.ndarray]], ...]:
     """
-    Batched lapjvs solver with a thread pool.
+    Batched lapjvs solver running on native threads.
 
-    For each 2D cost matrix in a 3D batch, this function runs `lapjvs` and
-    aggregates the per-instance results. It preserves the order of the batch
-    in the outputs.
+    For each 2D cost matrix in a 3D batch, this function solves the instance
+    exactly as `lapjvs` would and aggregates the per-instance results. The
+    whole batch is solved in one native call that releases the GIL once. It
+    preserves the order of the batch in the outputs.
 
     Parameters
     ----------
-    costs : np.ndarray, shape (B, N, M)
+    costs : np.ndarray, shape (B, N, M), or a sequence of 2D arrays
         Batch of cost matrices (float32/float64). Each slice `costs[b]` is
-        a single LAP instance.
+        a single LAP instance. A list of 2D arrays makes a ragged batch whose
+        instances may all have different shapes; with `shapes` given, `costs`
+        is instead a packed 1D buffer.
     extend_cost : bool, default False
         If True, rectangular instances are solved via internal zero-padding.
         If False, each instance must be square or a ValueError is raised.
@@ -76,6 +104,26 @@ def lapjvs_batch(
     prefer_float32 : bool, default True
         Hint to run each kernel in float32 (forwarded to the single solver; 
         see the `lapjvs` for the details).
+    shapes : np.ndarray, shape (B, 2), optional
+        (N_b, M_b) of every instance of a packed ragged batch. When given,
+        `costs` must be a 1D buffer holding each instance in C order.
+    offsets : np.ndarray, shape (B,), optional
+        Start of each packed instance in `costs`. Defaults to instances
+        stored back to back.
+    output : {"list", "packed", "padded", "xy"}, default "list"
+        Layout of the assignments, see Returns.
+    pool : SolverPool, optional
+        Solve on the pool's long-lived workers instead of starting native
+        threads for this call; `n_threads` is then ignored.
+    init_v : np.ndarray or sequence of np.ndarray, optional
+        Column duals to warm-start every instance from, typically the `v`
+        returned by a previous call with return_duals=True: a (B, M) array
+        for a dense batch; for a ragged batch, one (M_b,) array per instance,
+        or the flat or NaN-padded `v` of output="packed"/"padded". The
+        results are still optimal.
+    return_duals : bool, default False
+        If True, append the row and column duals u, v of every instance
+        (float64, ORIGINAL orientation) after the assignments.
 
     Returns
     -------
@@ -83,85 +131,68 @@ def lapjvs_batch(
         totals : np.ndarray, shape (B,), float64
             Total assignment cost for each instance, computed from the ORIGINAL
             per-instance cost matrix.
-        rows_list : List[np.ndarray[int64]]
-            For each b, a 1D array of assigned row indices (length K_b).
-        cols_list : List[np.ndarray[int64]]
-            For each b, a 1D array of assigned col indices (length K_b).
+        followed by the assignments
     Else:
-        rows_list, cols_list
+        the assignments
+
+    The assignments depend on `output`:
+        "list"   : rows_list, cols_list, lists of B int64 arrays (length K_b).
+        "packed" : offsets (B+1,) int64 plus flat int64 rows, cols; instance
+                   b owns rows[offsets[b]:offsets[b+1]].
+        "padded" : rows, cols int64 arrays of shape (B, K), K = min(N, M)
+                   (the largest min(N_b, M_b) for ragged batches), with the
+                   unused trailing slots set to -1.
+        "xy"     : x (B, N), y (B, M) int32 lapjv-style mappings (-1 for
+                   unassigned); ragged batches are padded with -1 to the
+                   largest N_b / M_b.
+
+    With return_duals, u and v follow: (B, N) and (B, M) float64 arrays for a
+    dense batch. For a ragged batch, lists of B arrays ("list"), flat arrays
+    of sum(N_b) and sum(M_b) entries ("packed"), or arrays padded with NaN
+    to the largest N_b / M_b ("padded", "xy").
 
     Raises
     ------
     ValueError
-        - If `costs` is not a 3D array.
+        - If `costs` is neither a 3D array nor a ragged batch of 2D arrays.
         - If any instance is rectangular while `extend_cost=False`.
+        - If `output` is not a known mode.
+        - If `init_v` does not hold one dual per column of every instance.
 
     Notes
     -----
     - Threading:
-      The underlying native kernel releases the GIL, so using multiple threads
-      can accelerate large batches on multi-core systems.
+      Instances are spread over native threads with the GIL released for the
+      whole call, so there is no per-instance Python overhead.
     - Dtypes:
       Each instance may be float32 or float64; the kernel selection and casting
-      follow the single-instance rules. Totals are float64.
+      follow the single-instance rules. Totals are float64. In a ragged
+      batch non-float instances are cast to float64 first.
     """
-    A = np.asarray(costs)
-    if A.ndim != 3:
-        raise ValueError("3-dimensional array expected [B, N, M]")
-
-    B = A.shape[0]
-    threads = _normalize_threads(n_threads)
-
-    totals = np.empty((B,), dtype=np.float64) if return_cost else None
-    rows_list: List[np.ndarray] = [None] * B  # type: ignore
-    cols_list: List[np.ndarray] = [None] * B  # type: ignore
-
-    def work(bi: int):
-        a2d = A[bi]
-        if return_cost:
-            total, rows, cols = _solve_one_jvs(  # type: ignore
-                a2d, extend_cost=extend_cost, prefer_float32=prefer_float32,
-                jvx_like=True, return_cost=True
-            )
-            return bi, total, rows, cols
-        else:
-            rows, cols = _solve_one_jvs(  # type: ignore
-                a2d, extend_cost=extend_cost, prefer_float32=prefer_float32,
-                jvx_like=True, return_cost=False
-            )
-            return bi, None, rows, cols
-
-    if threads == 1 or B == 1:
-        for bi in range(B):
-            idx, t, r, c = work(bi)
-            if return_cost:
-                totals[idx] = float(t)  # type: ignore
-            rows_list[idx] = np.asarray(r, dtype=np.int64)
-            cols_list[idx] = np.asarray(c, dtype=np.int64)
-    else:
-        # Cap workers to the batch size
-        with ThreadPoolExecutor(max_workers=min(threads, B)) as ex:
-            futures = [ex.submit(work, bi) for bi in range(B)]
-            for fut in as_completed(futures):
-                idx, t, r, c = fut.result()
-                if return_cost:
-                    totals[idx] = float(t)  # type: ignore
-                rows_list[idx] = np.asarray(r, dtype=np.int64)
-                cols_list[idx] = np.asarray(c, dtype=np.int64)
+    _check_output_mode(output)
+    totals, x, y, S, duals = _solve_batch_jvs(
+        costs, extend_cost, prefer_float32, n_threads, shapes, offsets, pool, init_v, return_duals
+    )
+    outputs = _format_batch_output(x, y, S, output, as_pairs=False)
+    if return_duals:
+        outputs += _format_batch_duals(*duals, S, output)
 
     if return_cost:
-        return np.asarray(totals, dtype=np.float64), rows_list, cols_list  # type: ignore
-    else:
-        return rows_list, cols_list
+        return (totals,) + outputs
+    return outputs
 
 
 def lapjvsa_batch(
-    costs: np.ndarray,
+    costs: Union[np.ndarray, Sequence[np.ndarray]],
     extend_cost: bool = False,
     return_cost: bool = True,
     n_threads: int = 0,
     prefer_float32: bool = True,
-) -> Union[Tuple[np.ndarray, List[np.ndarray]], List[np.ndarray]]:
+    shapes: Optional[np.ndarray] = None,
+    offsets: Optional[np.ndarray] = None,
+    output: str = "list",
+    pool: Optional[SolverPool] = None,
+) -> Union[Tuple[Union[np.ndarray, List[np.ndarray]], ...], List[np.ndarray], np.ndarray]:
     """
     Batched lapjvsa solver, returning (K_b, 2) arrays per instance.
 
@@ -170,8 +201,9 @@ def lapjvsa_batch(
 
     Parameters
     ----------
-    costs : np.ndarray, shape (B, N, M)
-        Batch of cost matrices.
+    costs : np.ndarray, shape (B, N, M), or a sequence of 2D arrays
+        Batch of cost matrices. A list of 2D arrays (or a packed 1D buffer
+        with `shapes`) makes a ragged batch, see `lapjvs_batch`.
     extend_cost : bool, default False
         If True, rectangular instances are solved via internal zero-padding.
     return_cost : bool, default True
@@ -181,67 +213,47 @@ def lapjvsa_batch(
     prefer_float32 : bool, default True
         Hint to run each kernel in float32 (forwarded to the single solver; 
         see the `lapjvsa` for the details).
+    shapes : np.ndarray, shape (B, 2), optional
+        Instance shapes of a packed ragged batch, see `lapjvs_batch`.
+    offsets : np.ndarray, shape (B,), optional
+        Start of each packed instance in `costs`, see `lapjvs_batch`.
+    output : {"list", "packed", "padded", "xy"}, default "list"
+        Layout of the assignments, see Returns.
+    pool : SolverPool, optional
+        Solve on the pool's long-lived workers instead of starting native
+        threads for this call; `n_threads` is then ignored.
 
     Returns
     -------
     If return_cost is True:
         totals : np.ndarray, shape (B,), float64
-        pairs_list : List[np.ndarray[int64] with shape (K_b, 2)]
+        followed by the assignments
     Else:
-        pairs_list
+        the assignments
+
+    The assignments depend on `output`:
+        "list"   : pairs_list, a list of B int64 arrays of shape (K_b, 2).
+        "packed" : offsets (B+1,) int64 and pairs (sum K_b, 2) int64.
+        "padded" : pairs (B, K, 2) int64 with -1 in the unused slots.
+        "xy"     : x, y stacked mappings, as in `lapjvs_batch`.
 
     Raises
     ------
     ValueError
-        If `costs` is not a 3D array, or if any instance is rectangular while
-        `extend_cost=False`.
+        If `costs` is not a 3D array or ragged batch, if any instance is
+        rectangular while `extend_cost=False`, or if `output` is unknown.
 
     Notes
     -----
     - See `lapjvsa` for details on dtype handling and total-cost accumulation.
     - Results are reassembled in batch order irrespective of threading.
     """
-    A = np.asarray(costs)
-    if A.ndim != 3:
-        raise ValueError("3-dimensional array expected [B, N, M]")
-
-    B = A.shape[0]
-    threads = _normalize_threads(n_threads)
-
-    totals = np.empty((B,), dtype=np.float64) if return_cost else None
-    pairs_list: List[np.ndarray] = [None] * B  # type: ignore
-
-    def work(bi: int):
-        a2d = A[bi]
-        if return_cost:
-            total, pairs = _solve_one_jvsa(
-                a2d, extend_cost=extend_cost, prefer_float32=prefer_float32, return_cost=True
-            )
-            return bi, total, pairs
-        else:
-            pairs = _solve_one_jvsa(
-                a2d, extend_cost=extend_cost, prefer_float32=prefer_float32, return_cost=False
-            )
-            return bi, None, pairs
-
-    if threads == 1 or B == 1:
-        for bi in range(B):
-            idx, t, P = work(bi)
-            if return_cost:
-                totals[idx] = float(t)  # type: ignore
-            pairs_list[idx] = np.asarray(P, dtype=np.int64)
-    else:
-        # Cap workers to the batch size
-        with ThreadPoolExecutor(max_workers=min(threads, B)) as ex:
-            futures = [ex.submit(work, bi) for bi in range(B)]
-            for fut in as_completed(futures):
-                idx, t, P = fut.result()
-                if return_cost:
-                    totals[idx] = float(t)  # type: ignore
-                pairs_list[idx] = np.asarray(P, dtype=np.int64)
+    _check_output_mode(output)
+    totals, x, y, S, _ = _solve_batch_jvs(
+        costs, extend_cost, prefer_float32, n_threads, shapes, offsets, pool
+    )
+    outputs = _format_batch_output(x, y, S, output, as_pairs=True)
 
     if return_cost:
-        return np.asarray(totals, dtype=np.float64), pairs_list  # type: ignore
-    else:
-        return pairs_list
-
+        return (totals,) + outputs
+    return outputs if len(outputs) > 1 else outputs[0]
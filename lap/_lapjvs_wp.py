@@ -7,6 +7,14 @@ from ._lapjvs import lapjvs_native as _lapjvs_native  # type: ignore
 from ._lapjvs import lapjvs_float32 as _lapjvs_float32  # type: ignore
 from ._lapjvs import lapjvsa_native as _lapjvsa_native  # type: ignore
 from ._lapjvs import lapjvsa_float32 as _lapjvsa_float32  # type: ignore
+from ._lapjv import _warm_working_v, _original_duals, _int_working_dtype  # type: ignore
+from ._batch_utils import _normalize_threads
+
+
+def _prefer_rect(n: int, m: int) -> bool:
+    # Same rule as lapjvs_prefer_rect() in the kernel: skewed shapes (n <= m)
+    # are solved unpadded; closer to square, JV on the padded matrix is faster.
+    return 0 < n < m and 2 * m >= 3 * n
 
 
 def lapjvs(
@@ -15,21 +23,26 @@ def lapjvs(
     return_cost: bool = True,
     jvx_like: bool = True,
     prefer_float32: bool = True,
+    n_threads: int = 1,
+    init_v: Optional[np.ndarray] = None,
+    return_duals: bool = False,
 ) -> Union[
     Tuple[float, np.ndarray, np.ndarray],
-    Tuple[np.ndarray, np.ndarray]
+    Tuple[np.ndarray, np.ndarray],
+    Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
 ]:
     """
     This function wraps a high-performance JV solver and provides flexible
     I/O to match either lapjv-style vector outputs (x, y) or lapjvx/SciPy-style
-    pair lists (rows, cols). It handles rectangular inputs by zero-padding to a
-    square matrix internally when requested.
+    pair lists (rows, cols). It handles rectangular inputs as if zero-padded
+    to a square matrix when requested; skewed ones are solved without padding.
 
     Parameters
     ----------
     cost : np.ndarray, shape (n, m)
-        The cost matrix. Must be 2D and a real floating dtype. Values are treated
-        as minimization costs. Rectangular matrices are supported via internal
+        The cost matrix. Must be 2D with a real floating or integer dtype. Values
+        are treated as minimization costs. Rectangular matrices are supported via internal
         zero-padding when `extend_cost=True` or `extend_cost=None and n != m`.
     extend_cost : Optional[bool], default None
         Controls how rectangular inputs are handled:
@@ -54,20 +67,35 @@ def lapjvs(
     prefer_float32 : bool, default True
         When True, the solver kernel runs in float32 to reduce memory bandwidth
         and improve speed. When False and the input is float64, the kernel runs
-        in float64. Regardless of kernel dtype, the returned total cost is
-        recomputed against the ORIGINAL `cost` array.
+        in float64. Integer inputs always run the exact integer kernel instead.
+        Regardless of kernel dtype, the returned total cost is recomputed
+        against the ORIGINAL `cost` array.
+    n_threads : int, default 1
+        Threads splitting the O(n) inner scans of this single solve. 0 or None
+        uses `os.cpu_count()`. Only used once the working matrix is at least
+        4096 wide; the assignment is the same for any value.
+    init_v : np.ndarray with shape (m,), optional
+        Column duals to warm-start from, typically `v` returned by a previous
+        solve (return_duals=True) of a similar matrix. Skips the column
+        reduction phase; the result is still an optimal assignment.
+    return_duals : bool, default False
+        If True, also return the row and column duals (u, v) of the solution,
+        in the ORIGINAL orientation: u[i] + v[j] <= cost[i, j] for all pairs,
+        with equality on the assigned ones (up to the kernel precision).
 
     Returns
     -------
     See `jvx_like` and `return_cost` above for exact signatures. In all cases,
     index arrays are int64 and refer to indices in the ORIGINAL orientation of
-    `cost` (not the internally transposed one).
+    `cost` (not the internally transposed one). If return_duals is True, the
+    float64 duals u (n,) and v (m,) are appended.
 
     Raises
     ------
     ValueError
         - If `cost` is not a 2D array.
         - If `extend_cost=False` and the input matrix is rectangular.
+        - If `init_v` does not have shape (m,) or has non-finite values.
 
     Notes
     -----
@@ -75,10 +103,14 @@ def lapjvs(
       Internally, the solver normalizes orientation so that the working matrix
       has rows <= cols. Rectangular problems are modeled by zero-padding on
       the right and/or bottom to become square. Only assignments within the
-      original (n, m) region are returned and used for the total.
+      original (n, m) region are returned and used for the total. When cols
+      >= 1.5 * rows (and without init_v), the kernel solves the unpadded
+      matrix in O(rows^2 * cols) instead, with the same optimum.
     - Dtype:
       The kernel may operate in float32 or float64, but accumulation for the
       returned total cost is performed in float64 on the ORIGINAL `cost`.
+      Integer costs (up to int64, and uint32) are solved in int32/int64 with
+      int64 duals: no float conversion, and the optimum is exact.
     """
     # Keep the original array to compute the final cost from it (preserves previous behavior)
     A = np.asarray(cost)
@@ -97,16 +129,33 @@ def lapjvs(
 
     n, m = B.shape
     extend = (n != m) if (extend_cost is None) else bool(extend_cost)
+    threads = _normalize_threads(n_threads)
 
     # Choose backend and working dtype for the solver only
+    int_dtype = _int_working_dtype(B.dtype)
     use_float32_kernel = not ((prefer_float32 is False) and (B.dtype == np.float64))
-    if use_float32_kernel:
+    if int_dtype is not None:
+        _kernel = _lapjvs_native
+        work_base = np.ascontiguousarray(B, dtype=int_dtype)
+    elif use_float32_kernel:
         _kernel = _lapjvs_float32
         work_base = np.ascontiguousarray(B, dtype=np.float32)
     else:
         _kernel = _lapjvs_native
         work_base = np.ascontiguousarray(B, dtype=np.float64)
 
+    def _warm(size: int) -> Optional[np.ndarray]:
+        # Working column duals for the kernel (none: cold start)
+        if init_v is None or n == 0:
+            return None
+        v0 = _warm_working_v(B, init_v, transposed, size)
+        return np.rint(v0).astype(np.int64) if int_dtype is not None else v0
+
+    def _duals(work: np.ndarray, x_vec: np.ndarray, v_vec) -> tuple:
+        if not return_duals:
+            return ()
+        return _original_duals(work, x_vec, np.asarray(v_vec, dtype=np.float64), n, m, transposed)
+
     def _rows_cols_from_x(x_vec: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         if x_vec.size == 0:
             return np.empty((0,), dtype=np.int64), np.empty((0,), dtype=np.int64)
@@ -123,17 +172,19 @@ def lapjvs(
         if n != m:
             # Guard (per docstring): if extend_cost=False, require square input
             raise ValueError("extend_cost=False requires a square cost matrix")
-        x_raw_obj, y_raw_obj = _kernel(work_base)
+        x_raw_obj, y_raw_obj, v_obj = _kernel(
+            work_base, n_threads=threads, init_v=_warm(n), return_v=True)
 
         x_raw_b = np.asarray(x_raw_obj, dtype=np.int64)
+        duals = _duals(work_base, x_raw_b, v_obj)
 
         if jvx_like:
             rows_a, cols_a = _rows_cols_from_x(x_raw_b)
             if return_cost:
                 total = float(A[rows_a, cols_a].sum()) if rows_a.size else 0.0
-                return total, rows_a, cols_a
+                return (total, rows_a, cols_a) + duals
             else:
-                return rows_a, cols_a
+                return (rows_a, cols_a) + duals
         else:
             # Return vectors (x, y) in original orientation
             y_raw_b = np.asarray(y_raw_obj, dtype=np.int64)
@@ -141,9 +192,9 @@ def lapjvs(
             if not transposed:
                 if return_cost:
                     total = float(A[np.arange(n), x_raw_b].sum()) if n > 0 else 0.0
-                    return total, x_raw_b, y_raw_b
+                    return (total, x_raw_b, y_raw_b) + duals
                 else:
-                    return x_raw_b, y_raw_b
+                    return (x_raw_b, y_raw_b) + duals
 
             # transposed square should not happen (n0==m0 implies no transpose), but keep safe mapping
             # Build pairs from B then map to A vectors
@@ -156,22 +207,28 @@ def lapjvs(
                 y_out[cols_a] = rows_a
             if return_cost:
                 total = float(A[rows_a, cols_a].sum()) if rows_a.size else 0.0
-                return total, x_out, y_out
+                return (total, x_out, y_out) + duals
             else:
-                return x_out, y_out
-
-    # Rectangular: zero-pad to square (in B space), solve, map back; compute total from ORIGINAL A
-    size = max(n, m)
-    padded = np.empty((size, size), dtype=work_base.dtype)
-    # copy original submatrix
-    padded[:n, :m] = work_base
-    if m < size:
-        padded[:n, m:] = 0
-    if n < size:
-        padded[n:, :] = 0
-
-    x_pad_obj, y_pad_obj = _kernel(padded)
+                return (x_out, y_out) + duals
+
+    if init_v is None and _prefer_rect(n, m):
+        # Skewed rectangular: the kernel solves the (n, m) matrix unpadded
+        padded = work_base
+    else:
+        # Rectangular: zero-pad to square (in B space), solve, map back; compute total from ORIGINAL A
+        size = max(n, m)
+        padded = np.empty((size, size), dtype=work_base.dtype)
+        # copy original submatrix
+        padded[:n, :m] = work_base
+        if m < size:
+            padded[:n, m:] = 0
+        if n < size:
+            padded[n:, :] = 0
+
+    x_pad_obj, y_pad_obj, v_pad_obj = _kernel(
+        padded, n_threads=threads, init_v=_warm(padded.shape[1]), return_v=True)
     x_pad_b = np.asarray(x_pad_obj, dtype=np.int64)
+    duals = _duals(padded, x_pad_b, v_pad_obj)
 
     # Trim to original rectangle (B space), then map to A space if needed
     cols_pad_n = x_pad_b[:n]
@@ -193,7 +250,7 @@ def lapjvs(
 
     if jvx_like:
         total = float(A[rows_a, cols_a].sum()) if (return_cost and rows_a.size) else 0.0
-        return (total, rows_a, cols_a) if return_cost else (rows_a, cols_a)
+        return ((total, rows_a, cols_a) if return_cost else (rows_a, cols_a)) + duals
 
     # lapjv-like outputs (vectorized) in ORIGINAL orientation
     x_out = np.full(n0, -1, dtype=np.int64)
@@ -207,7 +264,7 @@ def lapjvs(
     else:
         total = 0.0
 
-    return (total, x_out, y_out) if return_cost else (x_out, y_out)
+    return ((total, x_out, y_out) if return_cost else (x_out, y_out)) + duals
 
 
 def lapjvsa(
@@ -215,6 +272,7 @@ def lapjvsa(
     extend_cost: Optional[bool] = None,
     return_cost: bool = True,
     prefer_float32: bool = True,
+    n_threads: int = 1,
 ) -> Union[
     Tuple[float, np.ndarray],
     np.ndarray
@@ -228,7 +286,8 @@ def lapjvsa(
     Parameters
     ----------
     cost : np.ndarray, shape (n, m)
-        Cost matrix (float32/float64). Must be 2D.
+        Cost matrix (float32/float64, or integer: solved exactly in int32/int64).
+        Must be 2D.
     extend_cost : Optional[bool], default None
         Rectangular handling:
         - True: Zero-pad to square internally (if needed).
@@ -240,6 +299,10 @@ def lapjvsa(
     prefer_float32 : bool, default True
         Hint to run the solver kernel in float32 for performance. When False and
         the input is float64, the kernel uses float64.
+    n_threads : int, default 1
+        Threads splitting the O(n) inner scans of this single solve. 0 or None
+        uses `os.cpu_count()`. Only used once the working matrix is at least
+        4096 wide; the assignment is the same for any value.
 
     Returns
     -------
@@ -277,16 +340,22 @@ def lapjvsa(
 
     n, m = B.shape
     extend = (n != m) if (extend_cost is None) else bool(extend_cost)
+    threads = _normalize_threads(n_threads)
 
     # Select dtype/backend
-    use_f32 = not ((prefer_float32 is False) and (B.dtype == np.float64))
-    wdtype = np.float32 if use_f32 else (B.dtype if B.dtype in (np.float32, np.float64) else np.float64)
+    int_dtype = _int_working_dtype(B.dtype)
+    use_f32 = int_dtype is None and not ((prefer_float32 is False) and (B.dtype == np.float64))
+    if int_dtype is not None:
+        wdtype = int_dtype
+    else:
+        wdtype = np.float32 if use_f32 else (B.dtype if B.dtype in (np.float32, np.float64) else np.float64)
 
     if not extend:
         if n != m:
             raise ValueError("extend_cost=False requires a square cost matrix")
         work = np.ascontiguousarray(B, dtype=wdtype)
-        pairs_b_obj = (_lapjvsa_float32(work) if use_f32 else _lapjvsa_native(work))
+        pairs_b_obj = (_lapjvsa_float32(work, n_threads=threads) if use_f32
+                       else _lapjvsa_native(work, n_threads=threads))
         pairs_b = np.asarray(pairs_b_obj, dtype=np.int64)
 
         # Map pairs back to original orientation
@@ -304,16 +373,21 @@ def lapjvsa(
             return total, pairs_a
         return pairs_a
 
-    # Rectangular: zero-pad in B space, solve, trim, map back to A
-    size = max(n, m)
-    padded = np.empty((size, size), dtype=wdtype)
-    padded[:n, :m] = B.astype(wdtype, copy=False)
-    if m < size:
-        padded[:n, m:] = 0
-    if n < size:
-        padded[n:, :] = 0
-
-    pairs_pad_b_obj = (_lapjvsa_float32(padded) if use_f32 else _lapjvsa_native(padded))
+    if _prefer_rect(n, m):
+        # Skewed rectangular: the kernel solves the (n, m) matrix unpadded
+        padded = np.ascontiguousarray(B, dtype=wdtype)
+    else:
+        # Rectangular: zero-pad in B space, solve, trim, map back to A
+        size = max(n, m)
+        padded = np.empty((size, size), dtype=wdtype)
+        padded[:n, :m] = B.astype(wdtype, copy=False)
+        if m < size:
+            padded[:n, m:] = 0
+        if n < size:
+            padded[n:, :] = 0
+
+    pairs_pad_b_obj = (_lapjvsa_float32(padded, n_threads=threads) if use_f32
+                       else _lapjvsa_native(padded, n_threads=threads))
     pairs_pad_b = np.asarray(pairs_pad_b_obj, dtype=np.int64)
 
     if pairs_pad_b.size == 0 or n == 0 or m == 0:
@@ -1,41 +1,89 @@
 # Copyright (c) 2025 Ratha SIV | MIT License
 
-import os
 import numpy as np
-from typing import List, Tuple, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-from ._lapjvx import lapjvx as _lapjvx_single  # type: ignore
-from ._lapjvx import lapjvxa as _lapjvxa_single  # type: ignore
-
+from typing import List, Optional, Sequence, Tuple, Union
+
+from ._lapjv import _lapjv_batch, _lapjv_batch_ragged  # type: ignore
+from ._pool import SolverPool
+from ._batch_utils import (
+    _run_batch, _dense_shapes, _is_ragged, _ragged_instances, _check_output_mode,
+    _format_batch_output, _format_batch_duals, _batch_init_v
+)
+
+
+def _solve_batch_jvx(
+    costs: Union[np.ndarray, Sequence[np.ndarray]],
+    extend_cost: bool,
+    cost_limit: float,
+    n_threads: int,
+    shapes: Optional[np.ndarray] = None,
+    offsets: Optional[np.ndarray] = None,
+    pool: Optional[SolverPool] = None,
+    init_v=None,
+    return_duals: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray], Tuple]:
+    if _is_ragged(costs, shapes):
+        instances, S = _ragged_instances(costs, shapes, offsets)
+        if np.any(S[:, 0] != S[:, 1]) and (not extend_cost) and cost_limit == np.inf:
+            raise ValueError(
+                'Square cost array expected. If cost is intentionally '
+                'non-square, pass extend_cost=True.'
+            )
+        totals, x, y, *duals = _run_batch(
+            lambda part, t, v0=None: _lapjv_batch_ragged(
+                part, cost_limit=cost_limit, n_threads=t, init_v=v0, return_duals=return_duals),
+            instances, n_threads, pool, S, cost_limit < np.inf,
+            _batch_init_v(init_v, S, len(instances), 0),
+        )
+        return totals, x, y, S, tuple(duals)
 
-def _normalize_threads(n_threads: int) -> int:
-    if not n_threads:
-        return max(1, int(os.cpu_count() or 1))
-    return max(1, int(n_threads))
+    A = np.asarray(costs)
+    if A.ndim != 3:
+        raise ValueError("3-dimensional array expected [B, N, M]")
+    if A.shape[1] != A.shape[2] and (not extend_cost) and cost_limit == np.inf:
+        raise ValueError(
+            'Square cost array expected. If cost is intentionally '
+            'non-square, pass extend_cost=True.'
+        )
+    # One native call for the whole batch (or per pool chunk); the GIL is
+    # released once inside.
+    A = np.ascontiguousarray(A, dtype=np.double)
+    totals, x, y, *duals = _run_batch(
+        lambda part, t, v0=None: _lapjv_batch(
+            part, cost_limit=cost_limit, n_threads=t, init_v=v0, return_duals=return_duals),
+        A, n_threads, pool, _dense_shapes(A), cost_limit < np.inf,
+        _batch_init_v(init_v, None, A.shape[0], A.shape[2]),
+    )
+    return totals, x, y, None, tuple(duals)
 
 
 def lapjvx_batch(
-    costs: np.ndarray,
+    costs: Union[np.ndarray, Sequence[np.ndarray]],
     extend_cost: bool = False,
     cost_limit: float = np.inf,
     return_cost: bool = True,
     n_threads: int = 0,
-) -> Union[
-    Tuple[np.ndarray, List[np.ndarray], List[np.ndarray]],
-    Tuple[List[np.ndarray], List[np.ndarray]]
-]:
+    shapes: Optional[np.ndarray] = None,
+    offsets: Optional[np.ndarray] = None,
+    output: str = "list",
+    pool: Optional[SolverPool] = None,
+    init_v: Optional[Union[np.ndarray, Sequence[np.ndarray]]] = None,
+    return_duals: bool = False,
+) -> Tuple[Union[np.ndarray, List[np.ndarray]], ...]:
     """
-    Batched lapjvx solver with a thread pool.
+    Batched lapjvx solver running on native threads.
 
     This function applies a JVX-style solver (`lapjvx`) across a batch of cost
-    matrices and aggregates the results. It preserves batch order and supports
-    multi-threaded execution.
+    matrices and aggregates the results. The whole (B, N, M) buffer is handed
+    to the native kernel in one call, which releases the GIL once and spreads
+    instances over native threads. Batch order is preserved.
 
     Parameters
     ----------
-    costs : np.ndarray, shape (B, N, M)
-        Batch of cost matrices (float32/float64).
+    costs : np.ndarray, shape (B, N, M), or a sequence of 2D arrays
+        Batch of cost matrices (float32/float64). A list of 2D arrays makes a
+        ragged batch whose instances may all have different shapes; with
+        `shapes` given, `costs` is instead a packed 1D buffer.
     extend_cost : bool, default False
         If True, rectangular matrices are handled via internal zero-padding.
         If False, instances must be square.
@@ -46,87 +94,99 @@ def lapjvx_batch(
         If True, returns per-instance totals first.
     n_threads : int, default 0
         Number of worker threads. 0 or None uses `os.cpu_count()`.
+    shapes : np.ndarray, shape (B, 2), optional
+        (N_b, M_b) of every instance of a packed ragged batch. When given,
+        `costs` must be a 1D buffer holding each instance in C order.
+    offsets : np.ndarray, shape (B,), optional
+        Start of each packed instance in `costs`. Defaults to instances
+        stored back to back.
+    output : {"list", "packed", "padded", "xy"}, default "list"
+        Layout of the assignments, see Returns.
+    pool : SolverPool, optional
+        Solve on the pool's long-lived workers instead of starting native
+        threads for this call; `n_threads` is then ignored.
+    init_v : np.ndarray or sequence of np.ndarray, optional
+        Column duals to warm-start every instance from, typically the `v`
+        returned by a previous call with return_duals=True: a (B, M) array
+        for a dense batch; for a ragged batch, one (M_b,) array per instance,
+        or the flat or NaN-padded `v` of output="packed"/"padded". The
+        results are still optimal.
+    return_duals : bool, default False
+        If True, append the row and column duals u, v of every instance
+        (float64, ORIGINAL orientation) after the assignments.
 
     Returns
     -------
     If return_cost is True:
         totals : np.ndarray, shape (B,), float64
-        rows_list : List[np.ndarray[int64]] of length B
-        cols_list : List[np.ndarray[int64]] of length B
+        followed by the assignments
     Else:
-        rows_list, cols_list
+        the assignments
+
+    The assignments depend on `output`:
+        "list"   : rows_list, cols_list, lists of B int64 arrays (length K_b).
+        "packed" : offsets (B+1,) int64 plus flat int64 rows, cols; instance
+                   b owns rows[offsets[b]:offsets[b+1]].
+        "padded" : rows, cols int64 arrays of shape (B, K), K = min(N, M)
+                   (the largest min(N_b, M_b) for ragged batches), with the
+                   unused trailing slots set to -1.
+        "xy"     : x (B, N), y (B, M) int32 lapjv-style mappings (-1 for
+                   unassigned); ragged batches are padded with -1 to the
+                   largest N_b / M_b.
+
+    With return_duals, u and v follow: (B, N) and (B, M) float64 arrays for a
+    dense batch. For a ragged batch, lists of B arrays ("list"), flat arrays
+    of sum(N_b) and sum(M_b) entries ("packed"), or arrays padded with NaN
+    to the largest N_b / M_b ("padded", "xy").
 
     Raises
     ------
     ValueError
-        - If `costs` is not a 3D array.
+        - If `costs` is neither a 3D array nor a ragged batch of 2D arrays.
         - If any instance is rectangular while `extend_cost=False`.
+        - If `output` is not a known mode.
+        - If `init_v` does not hold one dual per column of every instance.
 
     Notes
     -----
     - See the single-instance `lapjvx` for detailed behavior around `extend_cost`
-      and `cost_limit`.
+      and `cost_limit`; every instance is solved exactly as `lapjvx` would.
+    - The batch is converted to one contiguous float64 buffer (no copy if it
+      already is one). Ragged instances are converted one by one and are
+      read in place when already contiguous float64.
     """
-    A = np.asarray(costs)
-    if A.ndim != 3:
-        raise ValueError("3-dimensional array expected [B, N, M]")
-    B = A.shape[0]
-    threads = _normalize_threads(n_threads)
-
-    totals = np.empty((B,), dtype=np.float64) if return_cost else None
-    rows_list: List[np.ndarray] = [None] * B  # type: ignore
-    cols_list: List[np.ndarray] = [None] * B  # type: ignore
-
-    def work(bi: int):
-        a2d = A[bi]
-        if return_cost:
-            total, rows, cols = _lapjvx_single(
-                a2d, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=True
-            )
-            return bi, total, rows, cols
-        else:
-            rows, cols = _lapjvx_single(
-                a2d, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=False
-            )
-            return bi, None, rows, cols
-
-    if threads == 1 or B == 1:
-        for bi in range(B):
-            i, t, r, c = work(bi)
-            if return_cost:
-                totals[i] = float(t)  # type: ignore
-            rows_list[i] = np.asarray(r, dtype=np.int64)
-            cols_list[i] = np.asarray(c, dtype=np.int64)
-    else:
-        # Cap workers to the batch size
-        with ThreadPoolExecutor(max_workers=min(threads, B)) as ex:
-            futures = [ex.submit(work, bi) for bi in range(B)]
-            for fut in as_completed(futures):
-                i, t, r, c = fut.result()
-                if return_cost:
-                    totals[i] = float(t)  # type: ignore
-                rows_list[i] = np.asarray(r, dtype=np.int64)
-                cols_list[i] = np.asarray(c, dtype=np.int64)
+    _check_output_mode(output)
+    totals, x, y, S, duals = _solve_batch_jvx(
+        costs, extend_cost, cost_limit, n_threads, shapes, offsets, pool, init_v, return_duals
+    )
+    outputs = _format_batch_output(x, y, S, output, as_pairs=False)
+    if return_duals:
+        outputs += _format_batch_duals(*duals, S, output)
 
     if return_cost:
-        return np.asarray(totals, dtype=np.float64), rows_list, cols_list  # type: ignore
-    return rows_list, cols_list
+        return (totals,) + outputs
+    return outputs
 
 
 def lapjvxa_batch(
-    costs: np.ndarray,
+    costs: Union[np.ndarray, Sequence[np.ndarray]],
     extend_cost: bool = False,
     cost_limit: float = np.inf,
     return_cost: bool = True,
     n_threads: int = 0,
-) -> Union[Tuple[np.ndarray, List[np.ndarray]], List[np.ndarray]]:
+    shapes: Optional[np.ndarray] = None,
+    offsets: Optional[np.ndarray] = None,
+    output: str = "list",
+    pool: Optional[SolverPool] = None,
+) -> Union[Tuple[Union[np.ndarray, List[np.ndarray]], ...], List[np.ndarray], np.ndarray]:
     """
     Batched lapjvxa solver, returning (K_b, 2) arrays per instance.
 
     Parameters
     ----------
-    costs : np.ndarray, shape (B, N, M)
-        Batch of cost matrices.
+    costs : np.ndarray, shape (B, N, M), or a sequence of 2D arrays
+        Batch of cost matrices. A list of 2D arrays (or a packed 1D buffer
+        with `shapes`) makes a ragged batch, see `lapjvx_batch`.
     extend_cost : bool, default False
         If True, rectangular matrices are solved by internal zero-padding.
     cost_limit : float, default np.inf
@@ -135,64 +195,47 @@ def lapjvxa_batch(
         If True, includes per-instance totals as the first returned array.
     n_threads : int, default 0
         Number of worker threads. 0 or None uses `os.cpu_count()`.
+    shapes : np.ndarray, shape (B, 2), optional
+        Instance shapes of a packed ragged batch, see `lapjvx_batch`.
+    offsets : np.ndarray, shape (B,), optional
+        Start of each packed instance in `costs`, see `lapjvx_batch`.
+    output : {"list", "packed", "padded", "xy"}, default "list"
+        Layout of the assignments, see Returns.
+    pool : SolverPool, optional
+        Solve on the pool's long-lived workers instead of starting native
+        threads for this call; `n_threads` is then ignored.
 
     Returns
     -------
     If return_cost is True:
         totals : np.ndarray, shape (B,), float64
-        pairs_list : List[np.ndarray[int64] with shape (K_b, 2)]
+        followed by the assignments
     Else:
-        pairs_list
+        the assignments
+
+    The assignments depend on `output`:
+        "list"   : pairs_list, a list of B int64 arrays of shape (K_b, 2).
+        "packed" : offsets (B+1,) int64 and pairs (sum K_b, 2) int64.
+        "padded" : pairs (B, K, 2) int64 with -1 in the unused slots.
+        "xy"     : x, y stacked mappings, as in `lapjvx_batch`.
 
     Raises
     ------
     ValueError
-        If `costs` is not a 3D array, or if any instance is rectangular while
-        `extend_cost=False`.
+        If `costs` is not a 3D array or ragged batch, if any instance is
+        rectangular while `extend_cost=False`, or if `output` is unknown.
 
     Notes
     -----
     - See `lapjvxa` for single-instance behavior and semantics of `cost_limit`.
     - Results are returned in the original batch order.
     """
-    A = np.asarray(costs)
-    if A.ndim != 3:
-        raise ValueError("3-dimensional array expected [B, N, M]")
-    B = A.shape[0]
-    threads = _normalize_threads(n_threads)
-
-    totals = np.empty((B,), dtype=np.float64) if return_cost else None
-    pairs_list: List[np.ndarray] = [None] * B  # type: ignore
-
-    def work(bi: int):
-        a2d = A[bi]
-        if return_cost:
-            total, pairs = _lapjvxa_single(
-                a2d, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=True
-            )
-            return bi, total, pairs
-        else:
-            pairs = _lapjvxa_single(
-                a2d, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=False
-            )
-            return bi, None, pairs
-
-    if threads == 1 or B == 1:
-        for bi in range(B):
-            i, t, P = work(bi)
-            if return_cost:
-                totals[i] = float(t)  # type: ignore
-            pairs_list[i] = np.asarray(P, dtype=np.int64)
-    else:
-        # Cap workers to the batch size
-        with ThreadPoolExecutor(max_workers=min(threads, B)) as ex:
-            futures = [ex.submit(work, bi) for bi in range(B)]
-            for fut in as_completed(futures):
-                i, t, P = fut.result()
-                if return_cost:
-                    totals[i] = float(t)  # type: ignore
-                pairs_list[i] = np.asarray(P, dtype=np.int64)
+    _check_output_mode(output)
+    totals, x, y, S, _ = _solve_batch_jvx(
+        costs, extend_cost, cost_limit, n_threads, shapes, offsets, pool
+    )
+    outputs = _format_batch_output(x, y, S, output, as_pairs=True)
 
     if return_cost:
-        return np.asarray(totals, dtype=np.float64), pairs_list  # type: ignore
-    return pairs_list
+        return (totals,) + outputs
+    return outputs if len(outputs) > 1 else outputs[0]
@@ -1,10 +1,11 @@
 # Copyright (c) 2025 Ratha SIV | MIT License
 
 import numpy as np
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 from ._lapjvx import lapjvx as _lapjvx  # type: ignore
 from ._lapjvx import lapjvxa as _lapjvxa  # type: ignore
+from ._batch_utils import _normalize_threads
 
 
 def lapjvx(
@@ -12,9 +13,15 @@ def lapjvx(
     extend_cost: bool = False,
     cost_limit: float = np.inf,
     return_cost: bool = True,
+    n_threads: int = 1,
+    init_v: Optional[np.ndarray] = None,
+    return_duals: bool = False,
+    prefer_float32: bool = False,
 ) -> Union[
     Tuple[float, np.ndarray, np.ndarray],
     Tuple[np.ndarray, np.ndarray],
+    Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
 ]:
     """
     Solve the Linear Assignment Problem using the Jonker-Volgenant algorithm,
@@ -24,14 +31,37 @@ def lapjvx(
     ----------
     cost : np.ndarray, shape (N, M)
         2D cost matrix. Any float dtype is accepted; internally a single contiguous
-        float64 working buffer is used when required.
+        float64 working buffer is used when required. Integer costs (with
+        cost_limit=inf) are solved exactly in int32/int64 with int64 duals,
+        and float32 costs on a float32 kernel (see prefer_float32).
     extend_cost : bool, default False
-        Permit rectangular inputs by zero-padding to a square matrix.
+        Permit rectangular inputs; the result is that of zero-padding to a square matrix.
+        Skewed inputs (larger side >= 1.5x the smaller) run on the rectangular kernel
+        without padding; others, and warm starts, are zero-padded.
     cost_limit : float, default np.inf
-        If finite, augment to size (N+M) with sentinel edges of cost_limit/2 and a
-        bottom-right zero block, modeling a per-edge reject cost (allows rectangular inputs).
+        If finite, every row and column may stay unassigned at a cost of cost_limit/2,
+        modeling a per-edge reject cost (allows rectangular inputs). Solved natively on
+        the (N, M) input; only with init_v is it augmented to size (N+M) with sentinel
+        edges of cost_limit/2 and a bottom-right zero block.
     return_cost : bool, default True
         If True, include total assignment cost first (computed on the ORIGINAL input).
+    n_threads : int, default 1
+        Threads splitting the O(N) inner scans of this single solve. 0 or None
+        uses `os.cpu_count()`. Only used once the working matrix is at least
+        4096 wide; the assignment is the same for any value.
+    init_v : np.ndarray with shape (M,), optional
+        Column duals to warm-start from, typically `v` returned by a previous
+        solve (return_duals=True) of a similar matrix. Skips the column
+        reduction phase; the result is still an optimal assignment.
+    return_duals : bool, default False
+        If True, also return the row and column duals (u, v) of the solution,
+        in the ORIGINAL orientation: u[i] + v[j] <= cost[i, j] for all pairs,
+        with equality on the assigned ones.
+    prefer_float32 : bool, default False
+        If True, float64 costs are rounded to float32 and solved by the
+        float32 kernel, halving the memory traffic of the solve. float32
+        inputs always run on it, without an upcast copy. The kernel keeps
+        duals in float32, so the result is optimal up to float32 rounding.
 
     Returns
     -------
@@ -43,6 +73,7 @@ def lapjvx(
             Column indices corresponding to row_indices.
     Else:
         row_indices, col_indices
+    If return_duals is True, u (N,) and v (M,) float64 duals are appended.
 
     Notes
     -----
@@ -51,11 +82,15 @@ def lapjvx(
     - Dtypes of the returned indices follow the Cython implementation:
       row_indices as int64, col_indices often int32 (subject to NumPy/platform).
     - Unified augmentation policy:
-        * cost_limit < inf: augment to (N+M) (rectangular allowed).
-        * elif (N != M) or extend_cost: zero-pad to square max(N, M).
+        * cost_limit < inf: native per-edge rejects, no padding; augmented to (N+M)
+          only with init_v (rectangular allowed).
+        * elif (N != M) or extend_cost: rectangular kernel without padding when
+          max(N, M) >= 1.5 * min(N, M) and no init_v; else zero-pad to square max(N, M).
         * else: run on the given square matrix.
     """
-    return _lapjvx(cost, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=return_cost)
+    return _lapjvx(cost, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=return_cost,
+                   n_threads=_normalize_threads(n_threads), init_v=init_v,
+                   return_duals=return_duals, prefer_float32=prefer_float32)
 
 
 def lapjvxa(
@@ -63,6 +98,8 @@ def lapjvxa(
     extend_cost: bool = False,
     cost_limit: float = np.inf,
     return_cost: bool = True,
+    n_threads: int = 1,
+    prefer_float32: bool = False,
 ) -> Union[
     Tuple[float, np.ndarray],
     np.ndarray,
@@ -75,11 +112,19 @@ def lapjvxa(
     cost : np.ndarray, shape (N, M)
         2D cost matrix.
     extend_cost : bool, default False
-        Permit rectangular inputs by zero-padding to a square matrix.
+        Permit rectangular inputs, solved as in lapjvx (rectangular kernel for
+        skewed shapes, zero-padding to a square matrix otherwise).
     cost_limit : float, default np.inf
-        When finite, augment to (N+M) to model per-edge reject cost (see lapjvx).
+        When finite, rows and columns may stay unassigned at cost_limit/2 each,
+        solved natively without augmentation (see lapjvx).
     return_cost : bool, default True
         If True, include the total cost as the first element.
+    n_threads : int, default 1
+        Threads splitting the O(N) inner scans of this single solve. 0 or None
+        uses `os.cpu_count()`. Only used once the working matrix is at least
+        4096 wide; the assignment is the same for any value.
+    prefer_float32 : bool, default False
+        If True, float64 costs are solved on the float32 kernel (see lapjvx).
 
     Returns
     -------
@@ -95,4 +140,5 @@ def lapjvxa(
     - This is a convenience wrapper over lapjvx that packs (rows, cols) into a (K, 2) array.
     - Total cost is computed on the ORIGINAL input (not augmented or padded).
     """
-    return _lapjvxa(cost, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=return_cost)
+    return _lapjvxa(cost, extend_cost=extend_cost, cost_limit=cost_limit, return_cost=return_cost,
+                    n_threads=_normalize_threads(n_threads), prefer_float32=prefer_float32)
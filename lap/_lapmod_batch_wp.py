@@ -0,0 +1,130 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple, Union
+
+from ._lapjv import _lapmod_batch, FP_DYNAMIC_ as FP_DYNAMIC, LARGE_ as LARGE  # type: ignore
+from ._pool import SolverPool
+from ._batch_utils import _run_batch, _check_output_mode, _format_batch_output
+
+
+def _check_instance(b: int, cc: np.ndarray, ii: np.ndarray, kk: np.ndarray) -> None:
+    # Same checks as lapmod()'s check_cost, reported with the instance index.
+    if ii.ndim != 1 or ii.shape[0] < 2:
+        raise ValueError('Cost matrix has zero rows (instance %d).' % b)
+    if kk.shape[0] == 0:
+        raise ValueError('Cost matrix has zero columns (instance %d).' % b)
+    if cc.shape[0] != kk.shape[0] or ii[0] != 0 or ii[-1] != cc.shape[0]:
+        raise ValueError('Inconsistent CSR arrays cc/ii/kk (instance %d).' % b)
+    if cc.shape[0] > 0xFFFFFFFF:
+        # The batch kernel uses 32-bit indices; lapmod() has 64-bit ones
+        raise ValueError('More than 2**32 - 1 entries, solve with lapmod (instance %d).' % b)
+    if cc.min() < 0:
+        raise ValueError('Cost matrix values must be non-negative (instance %d).' % b)
+    if cc.max() >= LARGE:
+        raise ValueError(
+            'Cost matrix values must be less than %s (instance %d).' % (LARGE, b))
+
+
+def _block_csr_instances(costs, sizes) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    # Split a block-diagonal CSR matrix (global column indices) into per-block
+    # (cc, ii, kk) triples with local indices; cc is sliced without copying.
+    cc, ii, kk = (np.asarray(a) for a in costs)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if sizes.ndim != 1 or np.any(sizes < 0):
+        raise ValueError("sizes must be a 1D array of non-negative block sizes")
+    n_total = int(sizes.sum())
+    if ii.ndim != 1 or ii.shape[0] != n_total + 1:
+        raise ValueError("ii must have sum(sizes) + 1 entries")
+    starts = np.cumsum(sizes) - sizes
+    row_nnz = np.diff(ii.astype(np.int64))
+    row_block = np.repeat(np.arange(sizes.shape[0]), sizes)
+    kk_local = kk.astype(np.int64) - np.repeat(starts[row_block], row_nnz)
+    if np.any(kk_local < 0) or np.any(kk_local >= np.repeat(sizes[row_block], row_nnz)):
+        raise ValueError("block CSR has entries outside the diagonal blocks")
+
+    instances = []
+    for o, n in zip(starts.tolist(), sizes.tolist()):
+        lo, hi = int(ii[o]), int(ii[o + n])
+        instances.append((cc[lo:hi], ii[o:o + n + 1] - lo, kk_local[lo:hi]))
+    return instances
+
+
+def lapmod_batch(
+    costs: Union[Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                 Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    sizes: Optional[np.ndarray] = None,
+    return_cost: bool = True,
+    n_threads: int = 0,
+    fp_version: int = FP_DYNAMIC,
+    output: str = "list",
+    pool: Optional[SolverPool] = None,
+) -> Tuple[Union[np.ndarray, List[np.ndarray]], ...]:
+    """
+    Batched lapmod (sparse JV) solver running on native threads.
+
+    Every instance is a square sparse cost matrix in CSR form, solved exactly
+    as `lapmod(n, cc, ii, kk)` would. The whole batch is solved in one native
+    call that releases the GIL once. Batch order is preserved.
+
+    Parameters
+    ----------
+    costs : list of (cc, ii, kk) triples, or one (cc, ii, kk) block CSR
+        Either one CSR triple per instance (n = len(ii) - 1, see `lapmod` for
+        the layout), or, with `sizes` given, a single CSR triple of a
+        block-diagonal matrix (e.g. from `scipy.sparse.block_diag`) whose
+        diagonal blocks are the instances. Column indices of the block CSR
+        are global.
+    sizes : np.ndarray, shape (B,), optional
+        Size n_b of every diagonal block of a block CSR `costs`.
+    return_cost : bool, default True
+        If True, returns per-instance totals first.
+    n_threads : int, default 0
+        Number of worker threads. 0 or None uses `os.cpu_count()`.
+    fp_version : int, default FP_DYNAMIC
+        Path-finding variant, forwarded to every `lapmod` solve.
+    output : {"list", "packed", "padded", "xy"}, default "list"
+        Layout of the assignments, see `lapjvx_batch`.
+    pool : SolverPool, optional
+        Solve on the pool's long-lived workers instead of starting native
+        threads for this call; `n_threads` is then ignored.
+
+    Returns
+    -------
+    If return_cost is True:
+        totals : np.ndarray, shape (B,), float64
+            Total of each instance; inf when an assigned entry is not stored
+            (as `lapmod`'s cost).
+        followed by the assignments
+    Else:
+        the assignments
+
+    The assignments follow `output` exactly as in `lapjvx_batch`; with
+    output="xy" they are the x/y vectors `lapmod` returns, stacked.
+
+    Raises
+    ------
+    ValueError
+        - If an instance is empty, has negative costs or costs >= LARGE.
+        - If a block CSR is inconsistent with `sizes`.
+        - If `output` is not a known mode.
+    """
+    _check_output_mode(output)
+    if sizes is not None:
+        instances = _block_csr_instances(costs, sizes)
+    else:
+        instances = [tuple(np.asarray(a) for a in triple) for triple in costs]
+    for b, (cc, ii, kk) in enumerate(instances):
+        _check_instance(b, cc, ii, kk)
+
+    n = np.array([ii.shape[0] - 1 for _, ii, _ in instances], dtype=np.int64)
+    S = np.stack([n, n], axis=1)
+    totals, x, y = _run_batch(
+        lambda part, t: _lapmod_batch(part, fp_version=fp_version, n_threads=t),
+        instances, n_threads, pool, S,
+    )
+    outputs = _format_batch_output(x, y, S, output, as_pairs=False)
+
+    if return_cost:
+        return (totals,) + outputs
+    return outputs
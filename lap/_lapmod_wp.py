@@ -3,11 +3,12 @@
 import numpy as np
 import numpy.typing as npt
 from bisect import bisect_left
-from typing import Tuple, Union
+from typing import Any, Optional, Tuple, Union
 
 # import logging
 
-from ._lapjv import _lapmod, FP_DYNAMIC_ as FP_DYNAMIC, LARGE_ as LARGE  # type: ignore
+from ._lapjv import _lapmod, _lapmod_rect, _csr_transpose, _gate, _edges_csr, FP_DYNAMIC_ as FP_DYNAMIC, LARGE_ as LARGE  # type: ignore
+from ._batch_utils import _normalize_threads
 
 
 def _pycrrt(n, cc, ii, kk, free_rows, x, y, v):
@@ -249,11 +250,15 @@ def _pya(n, cc, ii, kk, n_free_rows, free_rows, x, y, v):
             j, x[i] = x[i], j
 
 
-def check_cost(n, cc, ii, kk):
+def _check_shape(n, kk):
     if n == 0:
         raise ValueError('Cost matrix has zero rows.')
     if len(kk) == 0:
         raise ValueError('Cost matrix has zero columns.')
+
+
+def check_cost(n, cc, ii, kk):
+    _check_shape(n, kk)
     lo = cc.min()
     hi = cc.max()
     if lo < 0:
@@ -274,32 +279,161 @@ def get_cost(n, cc, ii, kk, x0):
     return ret
 
 
+def _row_duals(n, cc, ii, kk, x, v):
+    # u[i] = cost[i, x[i]] - v[x[i]], looked up in the CSR rows.
+    rows = np.repeat(np.arange(n), np.diff(ii))
+    at = np.asarray(kk) == np.asarray(x)[rows]
+    u = np.empty((n,), dtype=np.float64)
+    u[rows[at]] = np.asarray(cc, dtype=np.float64)[at] - v[np.asarray(kk)[at]]
+    return u
+
+
+def _is_csr_or_csc(obj) -> bool:
+    # scipy.sparse CSR/CSC matrices and arrays, without importing scipy
+    return getattr(obj, 'format', None) in ('csr', 'csc') and hasattr(obj, 'indptr')
+
+
+def _lapmod_sparse(cost, fast, return_cost, fp_version, return_duals):
+    # Solve a scipy.sparse CSR/CSC cost matrix: stored entries (explicit
+    # zeros included) are the allowed edges, missing ones are infinite.
+    if len(cost.shape) != 2:
+        raise ValueError('2-dimensional sparse matrix expected')
+    if not cost.has_canonical_format:
+        cost = cost.copy()
+        cost.sum_duplicates()
+    return _lapmod_csr(cost.shape, cost.data, cost.indptr, cost.indices, cost.format == 'csc',
+                       fast, return_cost, fp_version, return_duals)
+
+
+def _infeasible(x, n_cols, transposed, return_cost, return_duals):
+    # lapmod's outputs for a problem without a complete assignment: opt =
+    # inf, the stored pairs in x (R,) and y (n_cols,), nan duals.
+    assigned = x >= 0
+    y = np.full((n_cols,), -1, dtype=np.int32)
+    y[x[assigned]] = np.flatnonzero(assigned)
+    if transposed:
+        x, y = y, x
+    res = (np.inf, x, y) if return_cost is True else (x, y)
+    if return_duals:
+        res += (np.full(x.shape, np.nan), np.full(y.shape, np.nan))
+    return res
+
+
+def _lapmod_csr(shape, cc, ii, kk, csc, fast, return_cost, fp_version, return_duals):
+    # Solve the (N, M) matrix stored as canonical CSR arrays (cc, ii, kk), or
+    # as CSC arrays when `csc`. Returns lapmod's outputs with x (N,), y (M,).
+    n_rows0, n_cols0 = shape
+    # Work on the wide orientation (R <= C). The storage of a CSC matrix is
+    # the CSR storage of its transpose, so it is used as is when tall.
+    transposed = n_rows0 > n_cols0
+    R, C = (n_cols0, n_rows0) if transposed else (n_rows0, n_cols0)
+    if csc != transposed:
+        cc, ii, kk = _csr_transpose(C, R, cc, ii, kk)
+
+    if R > 0 and np.any(np.diff(ii[:R + 1]) == 0):
+        # A row without entries (e.g. nothing stored at all) cannot be assigned
+        x = np.full((R,), -1, dtype=np.int32)
+        return _infeasible(x, C, transposed, return_cost, return_duals)
+
+    if R < C and fast is True:
+        # Solved natively on the R rows, in O(nnz + C) memory: a sparse
+        # shortest augmenting path per row instead of squaring the matrix up
+        out = _lapmod_rect(R, C, cc, ii, kk, return_duals=return_duals)
+        opt, x, y = out[:3]
+        if opt == np.inf:
+            return _infeasible(x, C, transposed, return_cost, return_duals)
+        duals = out[3:]
+        if transposed:
+            x, y = y, x
+            duals = duals[::-1]
+        return ((opt, x, y) if return_cost is True else (x, y)) + duals
+
+    cols = None
+    n_cols = C
+    if R < C:
+        # The Python solver (fast=False) takes square matrices only.
+        # Columns without entries can only stay free: drop them (unless that
+        # leaves fewer columns than rows, i.e. the problem is infeasible).
+        used = np.bincount(kk, minlength=C) > 0
+        n_used = int(np.count_nonzero(used))
+        if R <= n_used < C:
+            cols = np.flatnonzero(used)
+            kk = (np.cumsum(used) - 1)[kk]
+            C = n_used
+        # Square up with C - R zero-cost rows; row t covers columns t..t+R,
+        # which lets them take whichever C - R columns the real rows leave.
+        n_pad = C - R
+        if n_pad > 0:
+            cc = np.concatenate([cc, np.zeros((n_pad * (R + 1),), dtype=cc.dtype)])
+            ii = np.concatenate([ii, ii[-1] + (R + 1) * np.arange(1, n_pad + 1)])
+            kk = np.concatenate([kk, (np.arange(n_pad)[:, None] + np.arange(R + 1)).ravel()])
+
+    out = lapmod(C, cc, ii, kk, fast=fast, fp_version=fp_version, return_duals=return_duals)
+    opt, x = out[0], out[1][:R]
+    if opt == np.inf:
+        # No complete assignment: keep only the pairs that are stored
+        rows = np.repeat(np.arange(R), np.diff(ii[:R + 1]))
+        stored = np.zeros((R,), dtype=bool)
+        stored[rows[np.asarray(kk[:ii[R]]) == x[rows]]] = True
+        x = np.where(stored, x, -1).astype(np.int32)
+        if cols is not None:
+            x = np.where(x >= 0, cols[x], -1).astype(np.int32)
+        return _infeasible(x, n_cols, transposed, return_cost, return_duals)
+    if cols is not None:
+        x = np.where(x >= 0, cols[x], -1).astype(np.int32)
+    assigned = x >= 0
+    y = np.full((n_cols,), -1, dtype=np.int32)
+    y[x[assigned]] = np.flatnonzero(assigned)
+    if return_duals:
+        u = out[3][:R]
+        v = np.zeros((n_cols,), dtype=np.float64)
+        v[cols if cols is not None else slice(None)] = out[4][:C]
+    if transposed:
+        x, y = y, x
+        if return_duals:
+            u, v = v, u
+    res = (opt, x, y) if return_cost is True else (x, y)
+    if return_duals:
+        res += (u, v)
+    return res
+
+
 # def lapmod(n, cc, ii, kk, fast=True, return_cost=True, fp_version=FP_DYNAMIC):
 def lapmod(
-    n: int,
-    cc: npt.NDArray[np.floating],
-    ii: npt.NDArray[np.integer],
-    kk: npt.NDArray[np.integer],
+    n: Union[int, Any],
+    cc: Optional[npt.NDArray[np.floating]] = None,
+    ii: Optional[npt.NDArray[np.integer]] = None,
+    kk: Optional[npt.NDArray[np.integer]] = None,
     fast: bool = True,
     return_cost: bool = True,
     fp_version: int = FP_DYNAMIC,
+    return_duals: bool = False,
 ) -> Union[
     Tuple[float, np.ndarray, np.ndarray],
     Tuple[np.ndarray, np.ndarray],
+    Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
 ]:
     """Solve sparse linear assignment problem using Jonker-Volgenant algorithm.
 
-    n: number of rows of the assignment cost matrix
-    cc: 1D array of all finite elements of the assignment cost matrix
+    n: number of rows of the assignment cost matrix, or a scipy.sparse
+       CSR/CSC matrix or array given instead of (n, cc, ii, kk)
+    cc: 1D array of all finite elements of the assignment cost matrix;
+        float32 arrays are solved as float32 (float64 duals), other dtypes
+        in float64
     ii: 1D array of indices of the row starts in cc. The following must hold:
             ii[0] = 0 and ii[n+1] = len(cc).
     kk: 1D array of the column indices so that:
             cost[i, kk[ii[i] + k]] == cc[ii[i] + k].
         Indices within one row must be sorted.
+        64-bit ii or kk (e.g. int64) are solved with 64-bit indices, without
+        a copy, which allows more than 2**32 - 1 entries; other integer
+        dtypes are read as uint32.
     extend_cost: whether or not extend a non-square matrix [default: False]
     cost_limit: an upper limit for a cost of a single assignment
                 [default: np.inf]
     return_cost: whether or not to return the assignment cost
+    return_duals: whether or not to also return the dual solution
 
     Returns (opt, x, y) where:
       opt: cost of the assignment
@@ -307,20 +441,48 @@ def lapmod(
       y: vector of rows assigned to columns
     or (x, y) if return_cost is not True.
 
+    With return_duals, row duals u (n,) and column duals v (n,) (float64)
+    are appended: u[i] + v[j] <= cost[i, j] for every stored entry, with
+    equality on the assigned ones.
+
     When extend_cost and/or cost_limit is set, all unmatched entries will be
     marked by -1 in x/y.
+
+    A scipy.sparse matrix may be (N, M). Its stored entries, explicit zeros
+    included, are the allowed assignments. Canonical CSR with int32 or int64
+    indices and float32/float64 data is solved without a copy. CSC is converted to
+    CSR in native code. Rectangular inputs are solved like lapjv: x (N,) and
+    y (M,) hold -1 for the unassigned side. They are solved natively on
+    their min(N, M) rows, one sparse shortest augmenting path per row, in
+    O(nnz + N + M) memory (fp_version only applies to square inputs); with
+    fast=False they are squared up with zero-cost rows for the Python
+    solver.
+
+    Without a complete assignment (e.g. a row without entries, or no
+    entries at all), opt is inf, x/y keep only stored pairs (-1 elsewhere)
+    and the duals are nan.
     """
     # log = logging.getLogger('lapmod')
 
-    check_cost(n, cc, ii, kk)
+    if _is_csr_or_csc(n):
+        if cc is not None or ii is not None or kk is not None:
+            raise ValueError('cc, ii and kk must not be given with a sparse matrix')
+        return _lapmod_sparse(n, fast, return_cost, fp_version, return_duals)
+    if cc is None or ii is None or kk is None:
+        raise ValueError('cc, ii and kk are required unless n is a sparse matrix')
 
     if fast is True:
-        # log.debug('[----CR & RT & ARR & augmentation ----]')
-        x, y = _lapmod(n, cc, ii, kk, fp_version=fp_version)
+        # The value checks, the solve and the total run without the GIL
+        _check_shape(n, kk)
+        if return_duals:
+            opt, x, y, v = _lapmod(n, cc, ii, kk, fp_version=fp_version, return_duals=True)
+        else:
+            opt, x, y = _lapmod(n, cc, ii, kk, fp_version=fp_version)
     else:
+        check_cost(n, cc, ii, kk)
         cc = np.ascontiguousarray(cc, dtype=np.float64)
-        ii = np.ascontiguousarray(ii, dtype=np.int32)
-        kk = np.ascontiguousarray(kk, dtype=np.int32)
+        ii = np.ascontiguousarray(ii, dtype=np.int64)
+        kk = np.ascontiguousarray(kk, dtype=np.int64)
         x = np.empty((n,), dtype=np.int32)
         y = np.empty((n,), dtype=np.int32)
         v = np.empty((n,), dtype=np.float64)
@@ -329,28 +491,221 @@ def lapmod(
         n_free_rows = _pycrrt(n, cc, ii, kk, free_rows, x, y, v)
         # log.debug(
         #     'free, x, y, v: %s %s %s %s', free_rows[:n_free_rows], x, y, v)
-        if n_free_rows == 0:
-            # log.info('Reduction solved it.')
-            if return_cost is True:
-                return get_cost(n, cc, ii, kk, x), x, y
-            else:
-                return x, y
         for it in range(2):
+            if n_free_rows == 0:
+                # log.info('Reduction solved it.')
+                break
             # log.debug('[---Augmenting row reduction (iteration: %d)---]', it)
             n_free_rows = _pyarr(
                     n, cc, ii, kk, n_free_rows, free_rows, x, y, v)
             # log.debug(
             #   'free, x, y, v: %s %s %s %s', free_rows[:n_free_rows], x, y, v)
-            if n_free_rows == 0:
-                # log.info('Augmenting row reduction solved it.')
-                if return_cost is True:
-                    return get_cost(n, cc, ii, kk, x), x, y
-                else:
-                    return x, y
-        # log.info('[----Augmentation----]')
-        _pya(n, cc, ii, kk, n_free_rows, free_rows, x, y, v)
+        if n_free_rows > 0:
+            # log.info('[----Augmentation----]')
+            _pya(n, cc, ii, kk, n_free_rows, free_rows, x, y, v)
         # log.debug('x, y, v: %s %s %s', x, y, v)
-    if return_cost is True:
-        return get_cost(n, cc, ii, kk, x), x, y
-    else:
-        return x, y
+        opt = get_cost(n, cc, ii, kk, x) if return_cost is True else None
+    out = (opt, x, y) if return_cost is True else (x, y)
+    if return_duals:
+        out += (_row_duals(n, cc, ii, kk, x, v), v)
+    return out
+
+
+def gate(
+    cost: np.ndarray,
+    threshold: float,
+    topk: Optional[int] = None,
+    n_threads: int = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gate a dense cost matrix into the CSR arrays (cc, ii, kk) of `lapmod`.
+
+    Keeps the finite entries with cost <= threshold, optionally only the
+    `topk` smallest of every row. The CSR arrays are built in native code in
+    one pass over the matrix, with column indices sorted within every row.
+
+    Parameters
+    ----------
+    cost : np.ndarray, shape (N, M)
+        2D dense cost matrix. float32 stays float32; other dtypes are read
+        as float64.
+    threshold : float
+        Largest cost kept. np.inf keeps every finite entry.
+    topk : int, optional
+        Keep at most the `topk` smallest gated costs of every row (ties go
+        to the smaller column index). None keeps all of them.
+    n_threads : int, default 0
+        Threads gating blocks of rows. 0 or None uses `os.cpu_count()`.
+        Small matrices are gated on the calling thread.
+
+    Returns
+    -------
+    cc : np.ndarray (nnz,), float64 (float32 for float32 input)
+    ii : np.ndarray (N + 1,), int32 row starts
+    kk : np.ndarray (nnz,), int32 column indices
+    ii and kk are int64 when more than 2**31 - 1 entries are kept.
+
+    Raises
+    ------
+    ValueError
+        - If `cost` is not 2D, `threshold` is NaN or `topk` < 1.
+
+    Examples
+    --------
+    >>> cc, ii, kk = lap.gate(cost, 50.0)
+    >>> total, x, y = lap.lapmod(len(cost), cc, ii, kk)      # square cost
+    >>> M = scipy.sparse.csr_matrix((cc, kk, ii), shape=cost.shape)
+    """
+    A = np.asarray(cost)
+    if A.ndim != 2:
+        raise ValueError('2-dimensional array expected')
+    if np.isnan(threshold):
+        raise ValueError('threshold must not be NaN')
+    if topk is not None and topk < 1:
+        raise ValueError('topk must be >= 1')
+    return _gate(A, float(threshold), int(topk or 0), n_threads=_normalize_threads(n_threads))
+
+
+def lapmod_dense(
+    cost: np.ndarray,
+    threshold: float,
+    topk: Optional[int] = None,
+    fast: bool = True,
+    return_cost: bool = True,
+    fp_version: int = FP_DYNAMIC,
+    return_duals: bool = False,
+    n_threads: int = 0,
+) -> Union[
+    Tuple[float, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray],
+    Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+]:
+    """
+    Gate a dense cost matrix with `gate` and solve it with `lapmod`.
+
+    Entries above `threshold` (and beyond `topk` per row) are forbidden.
+    The (N, M) matrix may be rectangular; outputs are those of lapmod on a
+    sparse matrix: (opt, x, y) with x (N,) and y (M,), -1 where unassigned.
+    When the gated problem has no complete assignment (e.g. a row with no
+    entry under the threshold), opt is inf and x/y keep only allowed pairs.
+
+    Parameters
+    ----------
+    cost, threshold, topk, n_threads
+        See `gate`. n_threads only applies to gating.
+    fast, return_cost, fp_version, return_duals
+        See `lapmod`.
+
+    Examples
+    --------
+    >>> total, x, y = lap.lapmod_dense(cost, threshold=50.0)
+    """
+    A = np.asarray(cost)
+    cc, ii, kk = gate(A, threshold, topk=topk, n_threads=n_threads)
+    return _lapmod_csr(A.shape, cc, ii, kk, False, fast, return_cost, fp_version, return_duals)
+
+
+def edges_to_csr(
+    rows: npt.ArrayLike,
+    cols: npt.ArrayLike,
+    costs: npt.ArrayLike,
+    shape: Optional[Tuple[int, int]] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the CSR arrays (cc, ii, kk) of `lapmod` from an edge list.
+
+    The edges may come in any order and may repeat; a repeated (row, col)
+    keeps its smallest cost. Sorting and merging run in native code in
+    O(E + N + M) (counting sorts), with column indices sorted within every
+    row as lapmod requires.
+
+    Parameters
+    ----------
+    rows, cols : array_like, shape (E,)
+        Integer row and column index of every edge.
+    costs : array_like, shape (E,)
+        Cost of every edge. float32 stays float32; other dtypes are read as
+        float64.
+    shape : (int, int), optional
+        (N, M) of the cost matrix. Defaults to (rows.max() + 1,
+        cols.max() + 1).
+
+    Returns
+    -------
+    cc : np.ndarray (nnz,), float64 (float32 for float32 costs)
+    ii : np.ndarray (N + 1,), int32 row starts
+    kk : np.ndarray (nnz,), int32 column indices
+    ii and kk are int64 for more than 2**31 - 1 edges.
+
+    Raises
+    ------
+    ValueError
+        - If rows, cols and costs are not 1D arrays of the same length.
+        - If an index is outside `shape`, or `shape` is missing for an
+          empty edge list.
+
+    Examples
+    --------
+    >>> cc, ii, kk = lap.edges_to_csr([1, 0, 1], [0, 1, 0], [3.0, 2.0, 1.0])
+    >>> ii, kk, cc
+    (array([0, 1, 2], dtype=int32), array([1, 0], dtype=int32), array([2., 1.]))
+    """
+    return _edges_to_csr(rows, cols, costs, shape)[1:]
+
+
+def _edges_to_csr(rows, cols, costs, shape):
+    # edges_to_csr() returning the resolved (N, M) shape first
+    rows, cols, costs = np.asarray(rows), np.asarray(cols), np.asarray(costs)
+    if rows.ndim != 1 or rows.shape != cols.shape or rows.shape != costs.shape:
+        raise ValueError('rows, cols and costs must be 1D arrays of the same length')
+    if len(rows) > 0 and not (np.issubdtype(rows.dtype, np.integer)
+                              and np.issubdtype(cols.dtype, np.integer)):
+        raise ValueError('rows and cols must be integer arrays')
+    if shape is None:
+        if len(rows) == 0:
+            raise ValueError('shape is required for an empty edge list')
+        shape = (int(rows.max()) + 1, int(cols.max()) + 1)
+    n_rows, n_cols = (int(s) for s in shape)
+    if n_rows < 0 or n_cols < 0:
+        raise ValueError('shape must be non-negative')
+    return ((n_rows, n_cols),) + tuple(_edges_csr(n_rows, n_cols, rows, cols, costs))
+
+
+def lapmod_edges(
+    rows: npt.ArrayLike,
+    cols: npt.ArrayLike,
+    costs: npt.ArrayLike,
+    shape: Optional[Tuple[int, int]] = None,
+    fast: bool = True,
+    return_cost: bool = True,
+    fp_version: int = FP_DYNAMIC,
+    return_duals: bool = False,
+) -> Union[
+    Tuple[float, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray],
+    Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+]:
+    """
+    Solve the sparse assignment problem given by an edge list with `lapmod`.
+
+    The edges are turned into CSR by `edges_to_csr` (unsorted and repeated
+    edges are fine; a repeated edge keeps its smallest cost); missing edges
+    are forbidden. The (N, M) problem may be rectangular; outputs are those
+    of lapmod on a sparse matrix: (opt, x, y) with x (N,) and y (M,), -1
+    where unassigned, and opt = inf when there is no complete assignment.
+
+    Parameters
+    ----------
+    rows, cols, costs, shape
+        See `edges_to_csr`.
+    fast, return_cost, fp_version, return_duals
+        See `lapmod`.
+
+    Examples
+    --------
+    >>> total, x, y = lap.lapmod_edges(rows, cols, costs, shape=(N, M))
+    """
+    shape, cc, ii, kk = _edges_to_csr(rows, cols, costs, shape)
+    return _lapmod_csr(shape, cc, ii, kk, False, fast, return_cost, fp_version, return_duals)
@@ -0,0 +1,150 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+import itertools
+import numpy as np
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, Tuple
+
+from ._batch_utils import _normalize_threads
+
+# Estimated work (see `_batch_utils._instance_work`) below which handing a
+# chunk to another thread costs more than solving it inline.
+_MIN_CHUNK_WORK = float(1 << 16)
+
+
+class SolverPool:
+    """
+    Reusable worker threads for the batch solvers.
+
+    Pass a pool to any batch solver through `pool=` to solve on long-lived
+    workers instead of starting native threads on every call. The batch is
+    cut into contiguous chunks of about equal estimated work, which the
+    workers and the calling thread claim heaviest first, each solving its
+    chunk in a single native call with the GIL released. The native kernels keep their scratch buffers per
+    thread, so with persistent workers those buffers stay allocated and warm
+    from one call to the next (e.g. frame after frame in a tracking loop).
+
+    Parameters
+    ----------
+    n_threads : int, default 0
+        Number of workers. 0 or None uses `os.cpu_count()`. With `executor`
+        given, this is the number of chunks a batch is split into and
+        defaults to the executor's worker count when it can be read.
+    executor : concurrent.futures.Executor, optional
+        Caller-supplied executor to run on. It must run tasks in threads of
+        this process (the kernels work on shared NumPy buffers). The pool
+        never shuts a caller-supplied executor down.
+
+    Examples
+    --------
+    >>> with lap.SolverPool(n_threads=4) as pool:
+    ...     for frame_costs in stream:
+    ...         totals, rows, cols = lap.lapjvx_batch(frame_costs, pool=pool)
+    """
+
+    def __init__(self, n_threads: int = 0, executor: Optional[Executor] = None):
+        if executor is None:
+            self.n_threads = _normalize_threads(n_threads)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.n_threads, thread_name_prefix="lapx"
+            )
+            self._owns_executor = True
+        else:
+            if not n_threads:
+                n_threads = getattr(executor, "_max_workers", 0)
+            self.n_threads = _normalize_threads(n_threads)
+            self._executor = executor
+            self._owns_executor = False
+        self._closed = False
+
+    @property
+    def executor(self) -> Executor:
+        """The executor the pool submits work to."""
+        return self._executor
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """Submit `fn(*args, **kwargs)` to the pool's executor."""
+        if self._closed:
+            raise RuntimeError("SolverPool is closed")
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def close(self, wait: bool = True) -> None:
+        """Shut the workers down (a caller-supplied executor is left running)."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "SolverPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        state = "closed" if self._closed else "open"
+        return f"SolverPool(n_threads={self.n_threads}, {state})"
+
+    def _solve_chunks(
+        self,
+        solve: Callable[..., Tuple[np.ndarray, ...]],
+        costs: Sequence,
+        work: np.ndarray,
+        init_v: Optional[Sequence] = None,
+    ) -> Tuple[np.ndarray, ...]:
+        # Cut the batch into contiguous chunks of about equal estimated work
+        # (`work` is per instance), solve each with one single-threaded native
+        # call and stitch the outputs back together in batch order. Chunks
+        # are claimed dynamically, heaviest first, by the workers and by the
+        # calling thread itself, so a big chunk never starts last and an idle
+        # worker keeps taking the next one. Batches too small to pay for the
+        # hand-off are solved inline. `costs` is a (B, N, M) array or a list
+        # of 2D instances; x/y are stacked or packed accordingly. With
+        # `init_v`, each chunk also gets its slice of the warm-start duals.
+        if self._closed:
+            raise RuntimeError("SolverPool is closed")
+        n_batch = len(costs)
+        total = float(np.sum(work))
+        n_chunks = int(min(n_batch, 4 * self.n_threads, np.ceil(total / _MIN_CHUNK_WORK)))
+        extra = () if init_v is None else (init_v,)
+        if n_chunks <= 1 or self.n_threads == 1:
+            return solve(costs, *extra)
+
+        cum = np.cumsum(work, dtype=np.float64)
+        cuts = np.searchsorted(cum, total * np.arange(1, n_chunks) / n_chunks, side="right")
+        bounds = np.unique(np.concatenate([[0], cuts, [n_batch]])).tolist()
+        n_chunks = len(bounds) - 1
+        chunk_work = [
+            cum[bounds[c + 1] - 1] - (cum[bounds[c] - 1] if bounds[c] else 0.0)
+            for c in range(n_chunks)
+        ]
+        order = sorted(range(n_chunks), key=lambda c: -chunk_work[c])
+        results = [None] * n_chunks
+        claim = itertools.count()  # next() on a count is atomic under the GIL
+
+        def _worker():
+            while True:
+                i = next(claim)
+                if i >= n_chunks:
+                    return
+                c = order[i]
+                lo, hi = bounds[c], bounds[c + 1]
+                results[c] = solve(costs[lo:hi], *(e[lo:hi] for e in extra))
+
+        futures = [self.submit(_worker) for _ in range(min(self.n_threads, n_chunks) - 1)]
+        try:
+            _worker()
+        finally:
+            # Workers that never started have nothing left to claim; do not
+            # wait on them (the executor may be busy with our own caller).
+            for f in futures:
+                f.cancel()
+            for f in futures:
+                if not f.cancelled():
+                    f.result()
+        return tuple(np.concatenate([r[i] for r in results]) for i in range(len(results[0])))
@@ -0,0 +1,148 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+import collections
+import importlib
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from ._pool import SolverPool
+
+_STREAM_SOLVERS = {
+    'lapmod': ("lap._lapmod_wp", "lapmod"),
+    'lapmod_dense': ("lap._lapmod_wp", "lapmod_dense"),
+    'lapmod_edges': ("lap._lapmod_wp", "lapmod_edges"),
+    'lapjv': ("lap._lapjv_wp", "lapjv"),
+    'lapjvx': ("lap._lapjvx_wp", "lapjvx"),
+    'lapjvxa': ("lap._lapjvx_wp", "lapjvxa"),
+    'lapjvc': ("lap._lapjvc_wp", "lapjvc"),
+    'lapjvs': ("lap._lapjvs_wp", "lapjvs"),
+    'lapjvsa': ("lap._lapjvs_wp", "lapjvsa"),
+    'auction': ("lap._auction_wp", "auction"),
+}
+
+
+def _resolve_solver(solver: Union[str, Callable]) -> Callable:
+    if callable(solver):
+        return solver
+    if solver not in _STREAM_SOLVERS:
+        raise ValueError(
+            f"Unknown solver {solver!r}; expected one of {sorted(_STREAM_SOLVERS)} or a callable")
+    mod_path, attr = _STREAM_SOLVERS[solver]
+    fn = getattr(importlib.import_module(mod_path), attr)
+    if solver == 'lapmod':
+        return lambda item, **kwargs: fn(*item, **kwargs) if isinstance(item, tuple) \
+            else fn(item, **kwargs)
+    if solver == 'lapmod_edges':
+        return lambda item, **kwargs: fn(*item, **kwargs)
+    return fn
+
+
+def solve_stream(
+    costs: Iterable[Any],
+    solver: Union[str, Callable] = "lapjvx",
+    n_threads: int = 0,
+    max_in_flight: Optional[int] = None,
+    ordered: bool = True,
+    pool: Optional[SolverPool] = None,
+    **kwargs,
+) -> Iterator[Any]:
+    """
+    Solve a (possibly endless) stream of problems on worker threads.
+
+    Problems are pulled from `costs` lazily, only when fewer than
+    `max_in_flight` are being solved or waiting to be yielded. Memory stays
+    flat however long the stream is, while all workers stay busy. The
+    solvers release the GIL, so the solves run in parallel.
+
+    Parameters
+    ----------
+    costs : iterable
+        Cost matrices, e.g. a generator. For solver="lapmod" every item is an
+        (n, cc, ii, kk) tuple or a scipy.sparse CSR/CSC matrix; for
+        solver="lapmod_edges" a (rows, cols, costs) tuple.
+    solver : str or callable, default "lapjvx"
+        One of "lapjv", "lapjvx", "lapjvxa", "lapjvc", "lapjvs", "lapjvsa",
+        "auction", "lapmod", "lapmod_dense" (pass threshold=...),
+        "lapmod_edges", or any callable taking one item (plus `kwargs`).
+    n_threads : int, default 0
+        Number of worker threads when no `pool` is given. 0 or None uses
+        `os.cpu_count()`.
+    max_in_flight : int, optional
+        Maximum number of problems taken from `costs` but not yet yielded.
+        Defaults to twice the number of workers.
+    ordered : bool, default True
+        If True, results are yielded in input order. If False, they are
+        yielded as soon as they are ready, as (index, result) pairs.
+    pool : SolverPool, optional
+        Pool to run on; it is left open. Without it a pool is created for the
+        stream and closed when the stream ends or is closed.
+    **kwargs
+        Forwarded to every solver call, e.g. extend_cost=True.
+
+    Yields
+    ------
+    The solver's result for every item (ordered=True), or (index, result)
+    pairs in completion order (ordered=False).
+
+    Raises
+    ------
+    ValueError
+        - If `solver` is unknown or `max_in_flight` < 1.
+    Exceptions raised by a solve are re-raised when its result is due;
+    the problems still in flight are then cancelled or awaited.
+
+    Examples
+    --------
+    >>> for total, rows, cols in lap.solve_stream(frames, extend_cost=True):
+    ...     ...
+    """
+    solve = _resolve_solver(solver)
+    owns_pool = pool is None
+    if owns_pool:
+        pool = SolverPool(n_threads=n_threads)
+    if max_in_flight is None:
+        max_in_flight = 2 * pool.n_threads
+    elif max_in_flight < 1:
+        if owns_pool:
+            pool.close()
+        raise ValueError("max_in_flight must be >= 1")
+    return _stream(solve, iter(costs), pool, owns_pool, max_in_flight, ordered, kwargs)
+
+
+def _stream(solve, items, pool, owns_pool, max_in_flight, ordered, kwargs):
+    # Generator body of solve_stream(), split out so argument errors are
+    # raised at call time rather than on the first next().
+    in_flight = collections.deque() if ordered else {}
+    index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(in_flight) < max_in_flight:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future = pool.submit(solve, item, **kwargs)
+                if ordered:
+                    in_flight.append(future)
+                else:
+                    in_flight[future] = index
+                index += 1
+            if not in_flight:
+                return
+            if ordered:
+                yield in_flight.popleft().result()
+            else:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield in_flight.pop(future), future.result()
+    finally:
+        # Early exit (error, break, close()): drop what has not started and
+        # let running solves finish before their inputs go away.
+        pending = list(in_flight)
+        for future in pending:
+            future.cancel()
+        wait(pending)
+        if owns_pool:
+            pool.close()
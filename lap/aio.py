@@ -0,0 +1,154 @@
+# Copyright (c) 2025 Ratha SIV | MIT License
+
+"""
+Awaitable front-end for the lapx solvers.
+
+Every solver of `lap` has an awaitable twin here taking the same arguments,
+e.g. ``await lap.aio.lapjvx(cost, extend_cost=True)``. Solves run on a shared
+`lap.SolverPool` (or the `pool=` given per call), never on the event loop, and
+the native kernels release the GIL, so the loop stays responsive while large
+problems are being solved.
+
+Concurrency is capped per event loop: at most `max_concurrency` solves run at
+once (default: the pool's thread count) and further calls wait their turn
+without blocking the loop. Cancelling a call that has not started drops it;
+a solve that is already running cannot be interrupted, so it finishes in the
+background and keeps its slot until then.
+
+Examples
+--------
+>>> import lap.aio
+>>> total, rows, cols = await lap.aio.lapjvx(cost, extend_cost=True)
+>>> lap.aio.configure(max_concurrency=2)
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from typing import Any, Callable, Optional
+
+from ._pool import SolverPool
+
+_lock = threading.Lock()
+_default_pool: Optional[SolverPool] = None
+_owns_default_pool = False
+_max_concurrency: Optional[int] = None
+# One semaphore per event loop (asyncio primitives must not cross loops)
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+    weakref.WeakKeyDictionary()
+
+
+def configure(pool: Optional[SolverPool] = None, max_concurrency: Optional[int] = None) -> None:
+    """
+    Set the shared pool and the concurrency cap used by the awaitable solvers.
+
+    Parameters
+    ----------
+    pool : SolverPool, optional
+        Pool to run solves on when a call passes no `pool=`. The previous
+        shared pool is closed if it was created by this module.
+    max_concurrency : int, optional
+        Maximum number of solves running at once per event loop. Defaults to
+        the shared pool's `n_threads`. Applies to event loops that have not
+        awaited a solver yet.
+    """
+    global _default_pool, _owns_default_pool, _max_concurrency
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
+    with _lock:
+        if pool is not None:
+            if _default_pool is not None and _owns_default_pool:
+                _default_pool.close(wait=False)
+            _default_pool, _owns_default_pool = pool, False
+        _max_concurrency = max_concurrency
+        _limiters.clear()
+
+
+def get_pool() -> SolverPool:
+    """Return the shared pool, creating it on first use."""
+    global _default_pool, _owns_default_pool
+    with _lock:
+        if _default_pool is None or _default_pool.closed:
+            _default_pool, _owns_default_pool = SolverPool(), True
+        return _default_pool
+
+
+def _limiter(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    sem = _limiters.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(_max_concurrency or get_pool().n_threads)
+        _limiters[loop] = sem
+    return sem
+
+
+def _release_soon(loop: asyncio.AbstractEventLoop, sem: asyncio.Semaphore) -> None:
+    try:
+        loop.call_soon_threadsafe(sem.release)
+    except RuntimeError:
+        pass  # the loop is closed; its semaphore is gone with it
+
+
+async def _run(fn: Callable, *args, pool: Optional[SolverPool] = None, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    sem = _limiter(loop)
+    await sem.acquire()
+    try:
+        future = (pool or get_pool()).submit(fn, *args, **kwargs)
+    except BaseException:
+        sem.release()
+        raise
+    # The slot is freed when the solve really ends, not when the awaiting
+    # task does, so cancelled-but-running solves still count against the cap.
+    future.add_done_callback(lambda _: _release_soon(loop, sem))
+    # Cancelling the awaiting task cancels `future` if it has not started.
+    return await asyncio.wrap_future(future)
+
+
+def _awaitable(name: str) -> Callable:
+    import lap
+    solver = getattr(lap, name)
+
+    # Batch solvers take their own `pool=`; here it selects where the call
+    # runs and the batch is solved with its native threads (`n_threads`).
+    @functools.wraps(solver)
+    async def wrapper(*args, pool: Optional[SolverPool] = None, **kwargs):
+        return await _run(solver, *args, pool=pool, **kwargs)
+
+    wrapper.__doc__ = (
+        f"Awaitable `lap.{name}`; same arguments and results. `pool` selects the "
+        f"SolverPool the call runs on (default: the shared pool).\n\n"
+        f"Original documentation\n----------------------\n{solver.__doc__ or ''}"
+    )
+    wrapper.__module__ = __name__
+    wrapper.__qualname__ = name
+    return wrapper
+
+
+__all__ = [
+    'configure', 'get_pool',
+    # Single-matrix solvers
+    'lapmod', 'lapmod_dense', 'lapmod_edges', 'lapjv', 'lapjvx', 'lapjvxa', 'lapjvc',
+    'lapjvs', 'lapjvsa', 'auction', 'kbest',
+    # Batch solvers
+    'lapjvx_batch', 'lapjvxa_batch', 'lapjvs_batch', 'lapjvsa_batch',
+    'lapjvc_batch', 'lapmod_batch',
+]
+
+lapmod = _awaitable('lapmod')
+lapmod_dense = _awaitable('lapmod_dense')
+lapmod_edges = _awaitable('lapmod_edges')
+lapjv = _awaitable('lapjv')
+lapjvx = _awaitable('lapjvx')
+lapjvxa = _awaitable('lapjvxa')
+lapjvc = _awaitable('lapjvc')
+lapjvs = _awaitable('lapjvs')
+lapjvsa = _awaitable('lapjvsa')
+auction = _awaitable('auction')
+kbest = _awaitable('kbest')
+lapjvx_batch = _awaitable('lapjvx_batch')
+lapjvxa_batch = _awaitable('lapjvxa_batch')
+lapjvs_batch = _awaitable('lapjvs_batch')
+lapjvsa_batch = _awaitable('lapjvsa_batch')
+lapjvc_batch = _awaitable('lapjvc_batch')
+lapmod_batch = _awaitable('lapmod_batch')
@@ -134,10 +134,14 @@ def main_setup():
     SRC_DIR_JV = os.path.join('src', '_lapjv')
     SRC_DIR_JVC = os.path.join('src', '_lapjvc')
     SRC_DIR_JVS = os.path.join('src', '_lapjvs')
+    SRC_DIR_COMMON = os.path.join('src', '_common')
 
     # Source files for lapjv/lapmod
     lapjvcpp = os.path.join(SRC_DIR_JV, 'lapjv.cpp')
     lapmodcpp = os.path.join(SRC_DIR_JV, 'lapmod.cpp')
+    lapjvbatchcpp = os.path.join(SRC_DIR_JV, 'lapjv_batch.cpp')
+    auctioncpp = os.path.join(SRC_DIR_JV, 'auction.cpp')
+    kbestcpp = os.path.join(SRC_DIR_JV, 'kbest.cpp')
     _lapjvpyx = os.path.join(SRC_DIR_JV, '_lapjv.pyx')
 
     # Source file for lapjvx/lapjvxa
@@ -149,47 +153,53 @@ def main_setup():
     # Source file for lapjvs
     lapjvscpp = os.path.join(SRC_DIR_JVS, 'lapjvs.cpp')
 
-    # C++ standard on different platforms
+    # C++ standard on different platforms (native batch solvers use std::thread)
     if sys.platform == "win32":
         # extra_compile_args = ["/std:c++17"]
         extra_compile_args = ["/std:c++latest"]
+        extra_link_args = []
     else:
-        extra_compile_args = ["-std=c++17"]
+        extra_compile_args = ["-std=c++17", "-pthread"]
+        extra_link_args = ["-pthread"]
 
     # Extension for lapjv/lapmod
     ext_jv = Extension(
         name='lap._lapjv',
-        sources=[_lapjvpyx, lapjvcpp, lapmodcpp],
-        include_dirs=[include_numpy(), SRC_DIR_JV, PACKAGE_PATH],
+        sources=[_lapjvpyx, lapjvcpp, lapmodcpp, lapjvbatchcpp, auctioncpp, kbestcpp],
+        include_dirs=[include_numpy(), SRC_DIR_JV, SRC_DIR_COMMON, PACKAGE_PATH],
         language='c++',
         extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
     )
 
     # Extension for lapjvx/lapjvxa
     ext_jvx = Extension(
         name='lap._lapjvx',
         sources=[_lapjvxpyx, lapjvcpp],
-        include_dirs=[include_numpy(), SRC_DIR_JV, PACKAGE_PATH],
+        include_dirs=[include_numpy(), SRC_DIR_JV, SRC_DIR_COMMON, PACKAGE_PATH],
         language='c++',
         extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
     )
 
     # Extension for lapjvc
     ext_jvc = Extension(
         name='lap._lapjvc',
         sources=[lapjvccpp],
-        include_dirs=[include_pybind11(), SRC_DIR_JVC, PACKAGE_PATH],
+        include_dirs=[include_pybind11(), SRC_DIR_JVC, SRC_DIR_COMMON, PACKAGE_PATH],
         language='c++',
         extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
     )
 
     # Extension for lapjvs
     ext_jvs = Extension(
         name='lap._lapjvs',
         sources=[lapjvscpp],
-        include_dirs=[include_numpy(), SRC_DIR_JVS, PACKAGE_PATH],
+        include_dirs=[include_numpy(), SRC_DIR_JVS, SRC_DIR_COMMON, PACKAGE_PATH],
         language='c++',
         extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
     )
 
     # Safe, high-performance Cython directives
@@ -0,0 +1,213 @@
+// Copyright (c) 2025 Ratha SIV | MIT License
+
+#ifndef LAPX_PARALLEL_H
+#define LAPX_PARALLEL_H
+
+#include <algorithm>
+#include <atomic>
+#include <cmath>
+#include <cstddef>
+#include <numeric>
+#include <exception>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace lapx {
+
+/// @brief Resolve a requested thread count.
+/// @param n_threads requested threads; <= 0 means all hardware threads
+/// @param n_items number of independent work items (threads are capped to it)
+inline int resolve_threads(int n_threads, std::size_t n_items) {
+  if (n_threads <= 0) {
+    n_threads = static_cast<int>(std::thread::hardware_concurrency());
+    if (n_threads <= 0) n_threads = 1;
+  }
+  if (static_cast<std::size_t>(n_threads) > n_items) {
+    n_threads = static_cast<int>(n_items);
+  }
+  return std::max(1, n_threads);
+}
+
+/// @brief Run fn(k) for every k in [0, n_items) on native threads.
+///
+/// Items are handed out through a shared atomic counter, so a worker that
+/// finishes early simply picks up the next item instead of idling. The
+/// calling thread works as one of the workers. Must be called without the
+/// GIL held; fn must not touch Python objects. The first exception thrown by
+/// fn is rethrown on the calling thread once all workers have joined.
+template <typename F>
+void parallel_for(std::size_t n_items, int n_threads, F &&fn) {
+  if (n_items == 0) return;
+  const int threads = resolve_threads(n_threads, n_items);
+  if (threads == 1) {
+    for (std::size_t k = 0; k < n_items; k++) fn(k);
+    return;
+  }
+
+  std::atomic<std::size_t> next(0);
+  std::exception_ptr error;
+  std::mutex error_mutex;
+
+  auto worker = [&]() {
+    try {
+      for (;;) {
+        const std::size_t k = next.fetch_add(1, std::memory_order_relaxed);
+        if (k >= n_items) break;
+        fn(k);
+      }
+    } catch (...) {
+      std::lock_guard<std::mutex> lock(error_mutex);
+      if (!error) error = std::current_exception();
+      next.store(n_items, std::memory_order_relaxed);  // drain remaining work
+    }
+  };
+
+  std::vector<std::thread> pool;
+  pool.reserve(threads - 1);
+  try {
+    for (int t = 1; t < threads; t++) pool.emplace_back(worker);
+  } catch (...) {
+    // Could not start every thread; the ones that did start still finish the work.
+  }
+  worker();
+  for (auto &th : pool) th.join();
+  if (error) std::rethrow_exception(error);
+}
+
+/// Work units below which grouping items into one claim pays off (and per
+/// thread below which starting another thread does not). One unit is roughly
+/// one inner-loop step of a JV solve, i.e. an n x n instance weighs n^3.
+constexpr double kMinChunkWork = 4096.0;
+constexpr double kMinThreadWork = 32768.0;
+
+/// @brief Size-aware parallel_for for batches of heterogeneous items.
+///
+/// weight(k) estimates the cost of item k. Items are handed out largest
+/// first, so a big instance never starts last and leaves one thread
+/// finishing the tail alone. Consecutive small items are grouped into chunks
+/// of about kMinChunkWork, and no more threads are started than the total
+/// work can keep busy. Load balancing among the threads is the dynamic claim
+/// of parallel_for: a thread that runs out of work takes the next chunk.
+template <typename W, typename F>
+void parallel_for_weighted(std::size_t n_items, int n_threads, W &&weight, F &&fn) {
+  if (n_items == 0) return;
+  int threads = resolve_threads(n_threads, n_items);
+  if (threads > 1) {
+    std::vector<double> w(n_items);
+    double total = 0.0;
+    for (std::size_t k = 0; k < n_items; k++) {
+      w[k] = weight(k);
+      total += w[k];
+    }
+    threads = std::min(threads, static_cast<int>(std::ceil(total / kMinThreadWork)));
+    if (threads > 1) {
+      std::vector<std::size_t> order(n_items);
+      std::iota(order.begin(), order.end(), std::size_t(0));
+      std::stable_sort(order.begin(), order.end(),
+                       [&](std::size_t a, std::size_t b) { return w[a] > w[b]; });
+      const double grain = std::min(kMinChunkWork, total / (8.0 * threads));
+      std::vector<std::size_t> bounds(1, 0);
+      double acc = 0.0;
+      for (std::size_t i = 0; i < n_items; i++) {
+        acc += w[order[i]];
+        if (acc >= grain) {
+          bounds.push_back(i + 1);
+          acc = 0.0;
+        }
+      }
+      if (bounds.back() != n_items) bounds.push_back(n_items);
+      parallel_for(bounds.size() - 1, threads, [&](std::size_t c) {
+        for (std::size_t i = bounds[c]; i < bounds[c + 1]; i++) fn(order[i]);
+      });
+      return;
+    }
+  }
+  for (std::size_t k = 0; k < n_items; k++) fn(k);
+}
+
+/// Inner-loop length below which splitting one scan over a Team costs more
+/// in synchronization than it saves.
+constexpr std::size_t kMinParallelScan = 4096;
+
+/// @brief Split [0, n) into `size` contiguous parts; part t is [*lo, *hi).
+inline void split_range(std::size_t n, int t, int size, std::size_t *lo, std::size_t *hi) {
+  *lo = n * static_cast<std::size_t>(t) / static_cast<std::size_t>(size);
+  *hi = n * static_cast<std::size_t>(t + 1) / static_cast<std::size_t>(size);
+}
+
+/// @brief A fixed team of native threads for fine-grained fork/join.
+///
+/// Made for splitting the O(n) inner scans of one large solve, where a
+/// parallel region runs many thousand times and starting threads each time
+/// would cost more than the scan itself. run(fn) calls fn(t) for every
+/// member t in [0, size()) and returns once all have finished; the calling
+/// thread is member 0. Between regions the workers spin briefly and then
+/// yield, so they wake up fast without starving the caller on busy
+/// machines. fn must not throw and must not touch Python objects.
+class Team {
+ public:
+  explicit Team(int n_threads) : size_(resolve_threads(n_threads, 1u << 16)) {
+    try {
+      for (int t = 1; t < size_; t++) threads_.emplace_back(&Team::worker, this, t);
+    } catch (...) {
+      size_ = static_cast<int>(threads_.size()) + 1;  // run with the threads we got
+    }
+  }
+
+  ~Team() {
+    stop_.store(true, std::memory_order_relaxed);
+    generation_.fetch_add(1, std::memory_order_release);
+    for (auto &th : threads_) th.join();
+  }
+
+  Team(const Team &) = delete;
+  Team &operator=(const Team &) = delete;
+
+  int size() const { return size_; }
+
+  template <typename F>
+  void run(F &fn) {
+    if (size_ == 1) {
+      fn(0);
+      return;
+    }
+    task_ = [](void *ctx, int t) { (*static_cast<F *>(ctx))(t); };
+    ctx_ = &fn;
+    pending_.store(size_ - 1, std::memory_order_relaxed);
+    generation_.fetch_add(1, std::memory_order_release);
+    fn(0);
+    for (unsigned spin = 0; pending_.load(std::memory_order_acquire) != 0; spin++) {
+      if (spin >= kSpins) std::this_thread::yield();
+    }
+  }
+
+ private:
+  static constexpr unsigned kSpins = 1u << 12;
+
+  void worker(int t) {
+    unsigned seen = 0;
+    for (;;) {
+      unsigned gen;
+      for (unsigned spin = 0; (gen = generation_.load(std::memory_order_acquire)) == seen; spin++) {
+        if (spin >= kSpins) std::this_thread::yield();
+      }
+      seen = gen;
+      if (stop_.load(std::memory_order_relaxed)) return;
+      task_(ctx_, t);
+      pending_.fetch_sub(1, std::memory_order_release);
+    }
+  }
+
+  int size_;
+  std::vector<std::thread> threads_;
+  std::atomic<unsigned> generation_{0};
+  std::atomic<int> pending_{0};
+  std::atomic<bool> stop_{false};
+  void (*task_)(void *, int) = nullptr;
+  void *ctx_ = nullptr;
+};
+
+}  // namespace lapx
+
+#endif  // LAPX_PARALLEL_H
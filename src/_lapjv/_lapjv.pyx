@@ -8,12 +8,14 @@ import numpy as np
 cimport numpy as cnp
 cimport cython
 from libc.stdlib cimport malloc, free
+from libc.stdint cimport int32_t, int64_t, uint64_t
 
 
 cdef extern from "lapjv.h" nogil:
     ctypedef signed int int_t
     ctypedef unsigned int uint_t
     cdef int LARGE
+    cdef char START_RESUME
     cdef enum fp_t:
         FP_1
         FP_2
@@ -21,14 +23,313 @@ cdef extern from "lapjv.h" nogil:
     int lapjv_internal(const uint_t n,
                        double *cost[],
                        int_t *x,
-                       int_t *y)
+                       int_t *y,
+                       double *v,
+                       char start,
+                       int n_threads)
+    int lapjv_reject_internal(const uint_t n_rows,
+                              const uint_t n_cols,
+                              double *cost[],
+                              const double cost_limit,
+                              int_t *x,
+                              int_t *y,
+                              double *u,
+                              double *v,
+                              int n_threads)
+    int lapjv_rect_internal(const uint_t n_rows,
+                            const uint_t n_cols,
+                            double *cost[],
+                            int_t *x,
+                            int_t *y,
+                            double *u,
+                            double *v,
+                            int n_threads)
+    int lapjv_internal_i32(const uint_t n,
+                           int32_t *cost[],
+                           int_t *x,
+                           int_t *y,
+                           int64_t *v,
+                           char start,
+                           int n_threads)
+    int lapjv_internal_i64(const uint_t n,
+                           int64_t *cost[],
+                           int_t *x,
+                           int_t *y,
+                           int64_t *v,
+                           char start,
+                           int n_threads)
+    int lapjv_internal_f32(const uint_t n,
+                           float *cost[],
+                           int_t *x,
+                           int_t *y,
+                           float *v,
+                           char start,
+                           int n_threads)
+    int lapjv_reject_internal_f32(const uint_t n_rows,
+                                  const uint_t n_cols,
+                                  float *cost[],
+                                  const float cost_limit,
+                                  int_t *x,
+                                  int_t *y,
+                                  float *u,
+                                  float *v,
+                                  int n_threads)
+    int lapjv_rect_internal_f32(const uint_t n_rows,
+                                const uint_t n_cols,
+                                float *cost[],
+                                int_t *x,
+                                int_t *y,
+                                float *u,
+                                float *v,
+                                int n_threads)
+    int lapjv_rect_internal_i32(const uint_t n_rows,
+                                const uint_t n_cols,
+                                int32_t *cost[],
+                                int_t *x,
+                                int_t *y,
+                                int64_t *u,
+                                int64_t *v,
+                                int n_threads)
+    int lapjv_rect_internal_i64(const uint_t n_rows,
+                                const uint_t n_cols,
+                                int64_t *cost[],
+                                int_t *x,
+                                int_t *y,
+                                int64_t *u,
+                                int64_t *v,
+                                int n_threads)
+    bint lapjv_prefer_rect(const uint_t n_rows, const uint_t n_cols)
     int lapmod_internal(const uint_t n,
                         double *cc,
                         uint_t *ii,
                         uint_t *kk,
                         int_t *x,
                         int_t *y,
+                        double *v,
                         fp_t fp_version)
+    int lapmod_internal_f32(const uint_t n,
+                            float *cc,
+                            uint_t *ii,
+                            uint_t *kk,
+                            int_t *x,
+                            int_t *y,
+                            double *v,
+                            fp_t fp_version)
+    int lapmod_internal_i64(const uint_t n,
+                            double *cc,
+                            uint64_t *ii,
+                            uint64_t *kk,
+                            int_t *x,
+                            int_t *y,
+                            double *v,
+                            fp_t fp_version)
+    int lapmod_internal_f32_i64(const uint_t n,
+                                float *cc,
+                                uint64_t *ii,
+                                uint64_t *kk,
+                                int_t *x,
+                                int_t *y,
+                                double *v,
+                                fp_t fp_version)
+    int lapmod_rect_internal(const uint_t n_rows,
+                             const uint_t n_cols,
+                             double *cc,
+                             uint_t *ii,
+                             uint_t *kk,
+                             int_t *x,
+                             int_t *y,
+                             double *u,
+                             double *v)
+    int lapmod_rect_internal_f32(const uint_t n_rows,
+                                 const uint_t n_cols,
+                                 float *cc,
+                                 uint_t *ii,
+                                 uint_t *kk,
+                                 int_t *x,
+                                 int_t *y,
+                                 double *u,
+                                 double *v)
+    int lapmod_rect_internal_i64(const uint_t n_rows,
+                                 const uint_t n_cols,
+                                 double *cc,
+                                 uint64_t *ii,
+                                 uint64_t *kk,
+                                 int_t *x,
+                                 int_t *y,
+                                 double *u,
+                                 double *v)
+    int lapmod_rect_internal_f32_i64(const uint_t n_rows,
+                                     const uint_t n_cols,
+                                     float *cc,
+                                     uint64_t *ii,
+                                     uint64_t *kk,
+                                     int_t *x,
+                                     int_t *y,
+                                     double *u,
+                                     double *v)
+    int lapmod_check(const size_t nnz, const double *cc)
+    int lapmod_check_f32(const size_t nnz, const float *cc)
+    double lapmod_total(const uint_t n,
+                        const double *cc,
+                        const uint_t *ii,
+                        const uint_t *kk,
+                        const int_t *x)
+    double lapmod_total_f32(const uint_t n,
+                            const float *cc,
+                            const uint_t *ii,
+                            const uint_t *kk,
+                            const int_t *x)
+    double lapmod_total_i64(const uint_t n,
+                            const double *cc,
+                            const uint64_t *ii,
+                            const uint64_t *kk,
+                            const int_t *x)
+    double lapmod_total_f32_i64(const uint_t n,
+                                const float *cc,
+                                const uint64_t *ii,
+                                const uint64_t *kk,
+                                const int_t *x)
+    void lapmod_transpose(const uint_t n_rows,
+                          const uint_t n_cols,
+                          const double *cc,
+                          const uint_t *ii,
+                          const uint_t *kk,
+                          double *cc_t,
+                          uint_t *ii_t,
+                          uint_t *kk_t)
+    void lapmod_transpose_f32(const uint_t n_rows,
+                              const uint_t n_cols,
+                              const float *cc,
+                              const uint_t *ii,
+                              const uint_t *kk,
+                              float *cc_t,
+                              uint_t *ii_t,
+                              uint_t *kk_t)
+    void lapmod_transpose_i64(const uint_t n_rows,
+                              const uint_t n_cols,
+                              const double *cc,
+                              const uint64_t *ii,
+                              const uint64_t *kk,
+                              double *cc_t,
+                              uint64_t *ii_t,
+                              uint64_t *kk_t)
+    void lapmod_transpose_f32_i64(const uint_t n_rows,
+                                  const uint_t n_cols,
+                                  const float *cc,
+                                  const uint64_t *ii,
+                                  const uint64_t *kk,
+                                  float *cc_t,
+                                  uint64_t *ii_t,
+                                  uint64_t *kk_t)
+    void *lapmod_gate(const uint_t n_rows,
+                      const uint_t n_cols,
+                      const double *cost,
+                      const double threshold,
+                      const uint_t topk,
+                      uint64_t *ii,
+                      size_t *nnz,
+                      int n_threads)
+    void *lapmod_gate_f32(const uint_t n_rows,
+                          const uint_t n_cols,
+                          const float *cost,
+                          const float threshold,
+                          const uint_t topk,
+                          uint64_t *ii,
+                          size_t *nnz,
+                          int n_threads)
+    void lapmod_gate_collect(void *gated, double *cc, uint_t *kk)
+    void lapmod_gate_collect_f32(void *gated, float *cc, uint_t *kk)
+    void lapmod_gate_collect_i64(void *gated, double *cc, uint64_t *kk)
+    void lapmod_gate_collect_f32_i64(void *gated, float *cc, uint64_t *kk)
+    int lapmod_edges(const uint_t n_rows,
+                     const uint_t n_cols,
+                     const size_t nnz,
+                     const int64_t *rows,
+                     const int64_t *cols,
+                     const double *costs,
+                     double *cc,
+                     uint_t *ii,
+                     uint_t *kk,
+                     size_t *nnz_out)
+    int lapmod_edges_f32(const uint_t n_rows,
+                         const uint_t n_cols,
+                         const size_t nnz,
+                         const int64_t *rows,
+                         const int64_t *cols,
+                         const float *costs,
+                         float *cc,
+                         uint_t *ii,
+                         uint_t *kk,
+                         size_t *nnz_out)
+    int lapmod_edges_i64(const uint_t n_rows,
+                         const uint_t n_cols,
+                         const size_t nnz,
+                         const int64_t *rows,
+                         const int64_t *cols,
+                         const double *costs,
+                         double *cc,
+                         uint64_t *ii,
+                         uint64_t *kk,
+                         size_t *nnz_out)
+    int lapmod_edges_f32_i64(const uint_t n_rows,
+                             const uint_t n_cols,
+                             const size_t nnz,
+                             const int64_t *rows,
+                             const int64_t *cols,
+                             const float *costs,
+                             float *cc,
+                             uint64_t *ii,
+                             uint64_t *kk,
+                             size_t *nnz_out)
+    int lapjv_batch_internal(const uint_t n_batch,
+                             const uint_t n_rows,
+                             const uint_t n_cols,
+                             const double *costs,
+                             const double cost_limit,
+                             int_t *x,
+                             int_t *y,
+                             double *totals,
+                             int n_threads,
+                             const double *init_v,
+                             double *u,
+                             double *v)
+    int lapmod_batch_internal(const uint_t n_batch,
+                              const uint_t *n,
+                              double *const *cc,
+                              uint_t *const *ii,
+                              uint_t *const *kk,
+                              fp_t fp_version,
+                              int_t *x,
+                              int_t *y,
+                              double *totals,
+                              int n_threads)
+    int lapjv_ragged_internal(const uint_t n_batch,
+                              const double *const *costs,
+                              const uint_t *n_rows,
+                              const uint_t *n_cols,
+                              const double cost_limit,
+                              int_t *x,
+                              int_t *y,
+                              double *totals,
+                              int n_threads,
+                              const double *const *init_v,
+                              double *u,
+                              double *v)
+    int auction_internal(const uint_t n,
+                         const double *cost,
+                         const double eps_final,
+                         int_t *x,
+                         int_t *y,
+                         int n_threads)
+    int kbest_internal(const uint_t n,
+                       const double *cost,
+                       const uint_t n_part,
+                       const uint_t n_real_cols,
+                       const uint_t k,
+                       int_t *labels,
+                       double *objectives,
+                       uint_t *n_found,
+                       int n_threads)
 
 LARGE_ = LARGE
 FP_1_ = FP_1
@@ -36,13 +337,199 @@ FP_2_ = FP_2
 FP_DYNAMIC_ = FP_DYNAMIC
 
 
+def _warm_working_v(B, init_v, bint transposed, Py_ssize_t N):
+    """
+    Working column duals (N,) for a warm start from `init_v`, the column
+    duals of the ORIGINAL matrix. When the kernel solves the transpose B, its
+    columns are the original rows and start from the row reduction
+    min_j(cost[i, j] - init_v[j]). Extra (padding/sentinel) columns start at 0.
+    """
+    v0 = np.asarray(init_v, dtype=np.double)
+    cdef Py_ssize_t n_cols0 = B.shape[0] if transposed else B.shape[1]
+    if v0.shape != (n_cols0,):
+        raise ValueError('init_v must have shape (%d,), one dual per column.' % n_cols0)
+    if not np.isfinite(v0).all():
+        raise ValueError('init_v values must be finite.')
+    v_c = np.zeros((N,), dtype=np.double)
+    if transposed:
+        v_c[:B.shape[1]] = (B - v0[:, None]).min(axis=0)
+    else:
+        v_c[:B.shape[1]] = v0
+    return v_c
+
+
+def _original_duals(cost_c, x_c, v_c, Py_ssize_t R, Py_ssize_t C, bint transposed):
+    """
+    Row/column duals (u, v) of the solved working problem, restricted to the
+    real rows/columns and mapped to the ORIGINAL orientation. The dual of a
+    working row is the reduced cost of its match (its row minimum), so
+    u[i] + v[j] <= cost[i, j] with equality on the assigned pairs.
+    """
+    x_r = x_c[:R]
+    u_w = cost_c[np.arange(R), x_r] - v_c[x_r]
+    v_w = v_c[:C].copy()
+    if transposed:
+        return v_w, u_w
+    return u_w, v_w
+
+
+def _lapjv_reject(cnp.ndarray cost not None, double cost_limit, int n_threads=1,
+                  bint f32=False):
+    """
+    Solve an (N, M) problem with per-row/column rejects at cost_limit / 2 on
+    its own rows, without the (N+M)^2 augmented matrix. Used for a finite
+    cost_limit without init_v; f32 solves in float32. Returns int32 x (N,),
+    y (M,) (-1 = unassigned) and float64 duals u (N,), v (M,) in the input
+    orientation.
+    """
+    wdt = np.float32 if f32 else np.double
+    A = np.ascontiguousarray(cost, dtype=wdt)
+    cdef Py_ssize_t R = A.shape[0]
+    cdef Py_ssize_t C = A.shape[1]
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = np.full((R,), -1, dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = np.full((C,), -1, dtype=np.int32)
+    u_c = np.full((R,), cost_limit / 2.0, dtype=wdt)
+    v_c = np.full((C,), cost_limit / 2.0, dtype=wdt)
+    if R == 0 or C == 0:
+        return x_c, y_c, u_c.astype(np.double), v_c.astype(np.double)
+    cdef void *u_ptr = cnp.PyArray_DATA(u_c)
+    cdef void *v_ptr = cnp.PyArray_DATA(v_c)
+
+    cdef char *base = <char *> cnp.PyArray_DATA(A)
+    cdef Py_ssize_t stride = A.strides[0]
+    cdef void **cost_ptr = <void **> malloc(R * sizeof(void *))
+    if cost_ptr == NULL:
+        raise MemoryError('Out of memory.')
+    cdef Py_ssize_t i
+    for i in range(R):
+        cost_ptr[i] = base + i * stride
+    cdef int ret
+    with nogil:
+        if f32:
+            ret = lapjv_reject_internal_f32(<uint_t> R, <uint_t> C, <float **> cost_ptr,
+                                            <float> cost_limit, &x_c[0], &y_c[0],
+                                            <float *> u_ptr, <float *> v_ptr, n_threads)
+        else:
+            ret = lapjv_reject_internal(<uint_t> R, <uint_t> C, <double **> cost_ptr,
+                                        cost_limit, &x_c[0], &y_c[0],
+                                        <double *> u_ptr, <double *> v_ptr, n_threads)
+    free(cost_ptr)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapjv_reject_internal returned %d).' % ret)
+    return x_c, y_c, u_c.astype(np.double, copy=False), v_c.astype(np.double, copy=False)
+
+
+def _int_working_dtype(dt):
+    """
+    Kernel cost dtype for an integer cost dtype: int32 when it holds every
+    value, int64 for int64/uint32, None otherwise (floats, uint64, bool).
+    """
+    if (dt.kind == 'i' and dt.itemsize <= 4) or (dt.kind == 'u' and dt.itemsize <= 2):
+        return np.int32
+    if dt == np.int64 or dt == np.uint32:
+        return np.int64
+    return None
+
+
+def _kernel_dtype(dt, bint prefer_float32=False):
+    """
+    Kernel cost dtype other than float64 for costs of dtype `dt`, or None:
+    int32/int64 for integers (see _int_working_dtype), float32 for float16
+    and float32 costs, and for any float costs with prefer_float32.
+    """
+    wdt = _int_working_dtype(dt)
+    if wdt is None and dt.kind == 'f' and (dt.itemsize <= 4 or prefer_float32):
+        wdt = np.float32
+    return wdt
+
+
+def _lapjv_typed(cnp.ndarray A not None, wdt, int n_threads=1, init_v=None):
+    """
+    Solve with the int32/int64 kernels (exact, int64 duals) or the float32
+    one, per the kernel cost dtype `wdt`, without a float64 working copy.
+    Same orientation and padding as the float64 path with cost_limit == inf;
+    the caller checks squareness. Returns int32 x (N,), y (M,) and float64
+    duals (u, v) in the input orientation.
+    """
+    cdef bint transposed = A.shape[0] > A.shape[1]
+    B = np.ascontiguousarray(A.T if transposed else A, dtype=wdt)
+    cdef Py_ssize_t R = B.shape[0]
+    cdef Py_ssize_t C = B.shape[1]
+    cdef uint_t N = <uint_t>C
+    cdef char warm = init_v is not None
+    cdef bint rect = not warm and lapjv_prefer_rect(<uint_t> R, <uint_t> C)
+    # 0: int32, 1: int64, 2: float32
+    cdef int kind = 0 if wdt is np.int32 else (1 if wdt is np.int64 else 2)
+
+    cost_c = B
+    if R != C and not rect:
+        cost_c = np.zeros((N, N), dtype=wdt)
+        cost_c[:R, :C] = B
+    vdt = np.float32 if kind == 2 else np.int64
+    if warm:
+        v_c = _warm_working_v(B, init_v, transposed, N)
+        v_c = (v_c if kind == 2 else np.rint(v_c)).astype(vdt)
+    else:
+        v_c = np.empty((N,), dtype=vdt)
+    cdef void *v_ptr = cnp.PyArray_DATA(v_c)
+
+    cdef char *base = <char *> cnp.PyArray_DATA(cost_c)
+    cdef Py_ssize_t stride = cost_c.strides[0]
+    cdef void **cost_ptr = <void **> malloc(N * sizeof(void *))
+    if cost_ptr == NULL:
+        raise MemoryError('Out of memory.')
+    cdef Py_ssize_t i
+    for i in range(R if rect else N):
+        cost_ptr[i] = base + i * stride
+
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = np.empty((N,), dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = np.empty((N,), dtype=np.int32)
+    cdef int ret
+    with nogil:
+        if rect and kind == 0:
+            ret = lapjv_rect_internal_i32(<uint_t> R, N, <int32_t **> cost_ptr,
+                                          &x_c[0], &y_c[0], NULL, <int64_t *> v_ptr, n_threads)
+        elif rect and kind == 1:
+            ret = lapjv_rect_internal_i64(<uint_t> R, N, <int64_t **> cost_ptr,
+                                          &x_c[0], &y_c[0], NULL, <int64_t *> v_ptr, n_threads)
+        elif rect:
+            ret = lapjv_rect_internal_f32(<uint_t> R, N, <float **> cost_ptr,
+                                          &x_c[0], &y_c[0], NULL, <float *> v_ptr, n_threads)
+        elif kind == 0:
+            ret = lapjv_internal_i32(N, <int32_t **> cost_ptr, &x_c[0], &y_c[0],
+                                     <int64_t *> v_ptr, warm, n_threads)
+        elif kind == 1:
+            ret = lapjv_internal_i64(N, <int64_t **> cost_ptr, &x_c[0], &y_c[0],
+                                     <int64_t *> v_ptr, warm, n_threads)
+        else:
+            ret = lapjv_internal_f32(N, <float **> cost_ptr, &x_c[0], &y_c[0],
+                                     <float *> v_ptr, warm, n_threads)
+    free(cost_ptr)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapjv kernel returned %d).' % ret)
+    u_o, v_o = _original_duals(cost_c, x_c, v_c, R, C, transposed)
+
+    x_w = x_c[:R]
+    y_w = np.full((C,), -1, dtype=np.int32)
+    mask = x_w >= 0
+    y_w[x_w[mask]] = np.nonzero(mask)[0]
+    if transposed:
+        x_w, y_w = y_w, x_w
+    return x_w, y_w, u_o.astype(np.double), v_o.astype(np.double)
+
+
 # Improved efficiency by raphaelreme
 # https://github.com/rathaROG/lapx/pull/7
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def lapjv(cnp.ndarray cost not None, char extend_cost=False,
-          double cost_limit=np.inf, char return_cost=True):
+          double cost_limit=np.inf, char return_cost=True, int n_threads=1,
+          init_v=None, char return_duals=False, char prefer_float32=False):
     """
     Solve the Linear Assignment Problem using the Jonker-Volgenant (JV) algorithm.
 
@@ -55,15 +542,31 @@ def lapjv(cnp.ndarray cost not None, char extend_cost=False,
     cost : (N, M) ndarray
         Cost matrix. Entry cost[i, j] is the cost of assigning row i to column j.
         Any float dtype is accepted; a contiguous float64 working buffer is used only if needed.
+        Integer costs (with cost_limit=inf) are solved exactly in int32/int64 with int64 duals.
     extend_cost : bool, optional (default: False)
-        Whether to permit non-square inputs via zero-padding to a square matrix.
+        Whether to permit non-square inputs, with the result of zero-padding to a
+        square matrix (skewed inputs run on the rectangular kernel, unpadded).
         See the unified augmentation policy below.
     cost_limit : float, optional (default: np.inf)
-        If finite, augment to an (N+M) x (N+M) matrix with sentinel costs
-        cost_limit/2 and a 0 block in the bottom-right. This models per-edge
-        reject costs and allows rectangular inputs even when extend_cost=False.
+        If finite, every row and column may stay unassigned at a cost of
+        cost_limit/2, which models per-edge reject costs and allows
+        rectangular inputs even when extend_cost=False. Solved natively on
+        the (N, M) input; only with init_v is the (N+M) x (N+M) matrix with
+        sentinel costs cost_limit/2 and a 0 block in the bottom-right built.
     return_cost : bool, optional (default: True)
         Whether to return the total assignment cost as the first return value.
+    n_threads : int, optional (default: 1)
+        Threads splitting the inner scans of this one solve (0: all cores).
+        Only used for working sizes >= 4096; the result does not depend on it.
+    init_v : (M,) array_like, optional
+        Column duals to warm-start from, e.g. `v` of a previous solve of a
+        similar matrix. The result is still optimal.
+    return_duals : bool, optional (default: False)
+        Whether to also return the duals (u, v) of the solution.
+    prefer_float32 : bool, optional (default: False)
+        Whether to solve float64 costs in float32 (rounded), halving the
+        memory traffic of the solve. float32 inputs always run in float32.
+        The float32 kernel is optimal up to float32 rounding.
 
     Returns
     -------
@@ -74,13 +577,19 @@ def lapjv(cnp.ndarray cost not None, char extend_cost=False,
         x[i] = assigned column index for row i, or -1 if unassigned.
     y : (M,) ndarray of int32
         y[j] = assigned row index for column j, or -1 if unassigned.
+    u, v : (N,) and (M,) ndarray of float64
+        Row and column duals (only if return_duals=True).
 
     Unified augmentation policy
     ---------------------------
-    - If cost_limit < inf: always augment to (N+M) to model per-edge rejects.
+    - If cost_limit < inf: per-edge rejects, solved natively without padding
+      (augmented to (N+M) only when warm-starting from init_v).
       Rectangular inputs are allowed regardless of extend_cost.
-    - Else if (N != M) or extend_cost=True: zero-pad to a square of size max(N, M).
-      Rectangular inputs are allowed when extend_cost=True.
+    - Else if (N != M) or extend_cost=True: same result as zero-padding to a
+      square of size max(N, M). Skewed inputs (max >= 1.5 * min) are solved
+      natively on the (min, max) oriented matrix in O(min^2 max); others, and
+      warm starts from init_v, are zero-padded. Rectangular inputs are allowed
+      when extend_cost=True.
     - Else (square, un-augmented): run on the given square matrix.
 
     Notes
@@ -101,10 +610,44 @@ def lapjv(cnp.ndarray cost not None, char extend_cost=False,
 
     # Fast exits for empty dimensions
     if n_rows0 == 0 or n_cols0 == 0:
+        out = (np.full((n_rows0,), -1, dtype=np.int32), np.full((n_cols0,), -1, dtype=np.int32))
         if return_cost:
-            return 0.0, np.full((n_rows0,), -1, dtype=np.int32), np.full((n_cols0,), -1, dtype=np.int32)
-        else:
-            return np.full((n_rows0,), -1, dtype=np.int32), np.full((n_cols0,), -1, dtype=np.int32)
+            out = (0.0,) + out
+        if return_duals:
+            out += (np.zeros((n_rows0,), dtype=np.double), np.zeros((n_cols0,), dtype=np.double))
+        return out
+
+    # Kernel cost dtype: integer and float32 costs skip the float64 copy
+    kdt = _kernel_dtype(A.dtype, prefer_float32)
+
+    # Finite cost_limit: rejects are handled natively on the input rows
+    if cost_limit < np.inf and init_v is None:
+        x_out, y_out, u_r, v_r = _lapjv_reject(A, cost_limit, n_threads, kdt is np.float32)
+        out = (x_out, y_out)
+        if return_cost:
+            rr = np.nonzero(x_out >= 0)[0]
+            out = (float(A[rr, x_out[rr]].sum()) if rr.size else 0.0,) + out
+        if return_duals:
+            out += (u_r, v_r)
+        return out
+
+    # Permit rectangular when cost_limit < inf (augment) or extend_cost=True (zero-pad); otherwise require square
+    if n_rows0 != n_cols0 and (not extend_cost) and cost_limit == np.inf:
+        raise ValueError(
+            'Square cost array expected. If cost is intentionally '
+            'non-square, pass extend_cost=True or set a finite cost_limit.'
+        )
+
+    # Integer costs (exact int32/int64 kernels) and the float32 kernel
+    if kdt is not None and cost_limit == np.inf:
+        x_out, y_out, u_r, v_r = _lapjv_typed(A, kdt, n_threads, init_v)
+        out = (x_out, y_out)
+        if return_cost:
+            rr = np.nonzero(x_out >= 0)[0]
+            out = (float(A[rr, x_out[rr]].sum()) if rr.size else 0.0,) + out
+        if return_duals:
+            out += (u_r, v_r)
+        return out
 
     # Normalize orientation: kernel sees rows <= cols
     cdef bint transposed = False
@@ -122,13 +665,6 @@ def lapjv(cnp.ndarray cost not None, char extend_cost=False,
     cdef Py_ssize_t R = B.shape[0]  # working rows (<= cols)
     cdef Py_ssize_t C = B.shape[1]  # working cols
 
-    # Permit rectangular when cost_limit < inf (augment) or extend_cost=True (zero-pad); otherwise require square
-    if R != C and (not extend_cost) and cost_limit == np.inf:
-        raise ValueError(
-            'Square cost array expected. If cost is intentionally '
-            'non-square, pass extend_cost=True or set a finite cost_limit.'
-        )
-
     cdef uint_t N
     cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] cost_c = B
     cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] cost_c_extended
@@ -141,6 +677,9 @@ def lapjv(cnp.ndarray cost not None, char extend_cost=False,
         cost_c_extended[R:, C:] = 0.0
         cost_c_extended[:R, :C] = cost_c
         cost_c = cost_c_extended
+    elif init_v is None and lapjv_prefer_rect(<uint_t> R, <uint_t> C):
+        # Skewed rectangular: solved natively on the R x C rows, no padding
+        N = <uint_t>C
     elif R != C or extend_cost:
         # Zero-pad to square max(R, C); if already square and extend_cost=True, keep as-is
         N = <uint_t>max(R, C)
@@ -154,12 +693,19 @@ def lapjv(cnp.ndarray cost not None, char extend_cost=False,
         # Square, un-augmented
         N = <uint_t>R
 
+    # Column duals: warm-start values in, solution duals out
+    cdef char warm = init_v is not None
+    cdef bint rect = (not warm and cost_limit == np.inf
+                      and lapjv_prefer_rect(<uint_t> R, <uint_t> C))
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] v_c = \
+        _warm_working_v(B, init_v, transposed, N) if warm else np.empty((N,), dtype=np.double)
+
     # Build row-pointer view for kernel
     cdef double **cost_ptr = <double **> malloc(N * sizeof(double *))
     if cost_ptr == NULL:
         raise MemoryError('Out of memory.')
     cdef int i
-    for i in range(N):
+    for i in range(R if rect else N):
         cost_ptr[i] = &cost_c[i, 0]
 
     # Outputs for kernel space (size N)
@@ -168,13 +714,19 @@ def lapjv(cnp.ndarray cost not None, char extend_cost=False,
 
     cdef int ret
     with nogil:
-        ret = lapjv_internal(N, cost_ptr, &x_c[0], &y_c[0])
+        if rect:
+            ret = lapjv_rect_internal(<uint_t> R, N, cost_ptr, &x_c[0], &y_c[0],
+                                      NULL, &v_c[0], n_threads)
+        else:
+            ret = lapjv_internal(N, cost_ptr, &x_c[0], &y_c[0], &v_c[0], warm, n_threads)
     free(cost_ptr)
 
     if ret != 0:
         if ret == -1:
             raise MemoryError('Out of memory.')
-        raise RuntimeError('Unknown error (lapjv_internal returned %d).' % ret)
+        raise RuntimeError('Unknown error (lapjv kernel returned %d).' % ret)
+    if return_duals:
+        duals = _original_duals(cost_c, x_c, v_c, R, C, transposed)
 
     # Trim to working rectangle (B space) and clean artificial matches
     cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_trim
@@ -222,36 +774,680 @@ def lapjv(cnp.ndarray cost not None, char extend_cost=False,
         else:
             opt = 0.0
 
-    if return_cost:
-        return opt, x_out, y_out
-    else:
-        return x_out, y_out
+    out = (opt, x_out, y_out) if return_cost else (x_out, y_out)
+    if return_duals:
+        out += duals
+    return out
+
+
+def _check_batch_init_v(v0, tuple shape):
+    if v0.shape != shape:
+        raise ValueError('init_v must have shape %s, one dual per column.' % (shape,))
+    if not np.isfinite(v0).all():
+        raise ValueError('init_v values must be finite.')
+    return v0
 
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
+def _lapjv_batch(cnp.ndarray costs not None, double cost_limit=np.inf,
+                 int n_threads=0, init_v=None, char return_duals=False):
+    """
+    Internal function called from lapjvx_batch() and lapjvxa_batch().
+
+    Solves every (N, M) slice of a (B, N, M) batch with the same policy as
+    lapjv() while the GIL is released once for the whole batch. Instances are
+    spread over `n_threads` native threads (0 means all hardware threads).
+
+    Returns (totals, x, y) with totals (B,) float64, x (B, N) and y (B, M)
+    int32 lapjv-style mappings in the ORIGINAL orientation (-1 = unassigned).
+    `init_v` (B, M) warm-starts every instance from column duals; with
+    `return_duals`, the duals u (B, N) and v (B, M) are appended.
+    """
+    if costs.ndim != 3:
+        raise ValueError('3-dimensional array expected [B, N, M]')
+
+    cdef cnp.ndarray[cnp.double_t, ndim=3, mode='c'] A = \
+        np.ascontiguousarray(costs, dtype=np.double)
+    cdef Py_ssize_t n_batch = A.shape[0]
+    cdef Py_ssize_t n_rows = A.shape[1]
+    cdef Py_ssize_t n_cols = A.shape[2]
+
+    cdef cnp.ndarray[int_t, ndim=2, mode='c'] x_c = \
+        np.full((n_batch, n_rows), -1, dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=2, mode='c'] y_c = \
+        np.full((n_batch, n_cols), -1, dtype=np.int32)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] totals = \
+        np.zeros((n_batch,), dtype=np.double)
+    cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] u_c = \
+        np.zeros((n_batch if return_duals else 0, n_rows if return_duals else 0), dtype=np.double)
+    cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] v_c = \
+        np.zeros((n_batch if return_duals else 0, n_cols if return_duals else 0), dtype=np.double)
+    cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] v0
+    cdef const double *v0_ptr = NULL
+    if init_v is not None:
+        v0 = _check_batch_init_v(np.ascontiguousarray(init_v, dtype=np.double), (n_batch, n_cols))
+        if v0.size:
+            v0_ptr = &v0[0, 0]
+
+    if n_batch == 0 or n_rows == 0 or n_cols == 0:
+        return (totals, x_c, y_c, u_c, v_c) if return_duals else (totals, x_c, y_c)
+
+    cdef double *u_ptr = &u_c[0, 0] if return_duals else NULL
+    cdef double *v_ptr = &v_c[0, 0] if return_duals else NULL
+    cdef int ret
+    with nogil:
+        ret = lapjv_batch_internal(<uint_t> n_batch, <uint_t> n_rows, <uint_t> n_cols,
+                                   &A[0, 0, 0], cost_limit, &x_c[0, 0], &y_c[0, 0],
+                                   &totals[0], n_threads, v0_ptr, u_ptr, v_ptr)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapjv_batch_internal returned %d).' % ret)
+
+    return (totals, x_c, y_c, u_c, v_c) if return_duals else (totals, x_c, y_c)
+
+
+def _lapjv_batch_ragged(list costs not None, double cost_limit=np.inf,
+                        int n_threads=0, list init_v=None, char return_duals=False):
+    """
+    Internal function called from lapjvx_batch() and lapjvxa_batch().
+
+    Ragged counterpart of _lapjv_batch(): `costs` is a list of 2-D matrices
+    whose shapes may differ. Matrices that are already C-contiguous float64
+    are read in place; nothing is packed or padded up front.
+
+    Returns (totals, x, y) with totals (B,) float64 and x/y int32 mappings
+    packed back to back in batch order: x holds sum(N_b) entries and y holds
+    sum(M_b) entries (-1 = unassigned). `init_v` is a list of (M_b,) column
+    duals to warm-start from; with `return_duals`, the duals u and v are
+    appended, packed like x and y.
+    """
+    cdef Py_ssize_t n_batch = len(costs)
+    cdef list mats = [np.ascontiguousarray(c, dtype=np.double) for c in costs]
+    cdef cnp.ndarray[uint_t, ndim=1, mode='c'] n_rows = \
+        np.empty((n_batch,), dtype=np.uint32)
+    cdef cnp.ndarray[uint_t, ndim=1, mode='c'] n_cols = \
+        np.empty((n_batch,), dtype=np.uint32)
+    cdef cnp.ndarray A
+    cdef Py_ssize_t b, sum_rows = 0, sum_cols = 0
+    for b in range(n_batch):
+        A = mats[b]
+        if A.ndim != 2:
+            raise ValueError('2-dimensional array expected for every instance')
+        n_rows[b] = <uint_t> A.shape[0]
+        n_cols[b] = <uint_t> A.shape[1]
+        sum_rows += A.shape[0]
+        sum_cols += A.shape[1]
+
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = \
+        np.full((sum_rows,), -1, dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = \
+        np.full((sum_cols,), -1, dtype=np.int32)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] totals = \
+        np.zeros((n_batch,), dtype=np.double)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] u_c = \
+        np.zeros((sum_rows if return_duals else 0,), dtype=np.double)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] v_c = \
+        np.zeros((sum_cols if return_duals else 0,), dtype=np.double)
+    cdef list v0s = None
+    if init_v is not None:
+        if len(init_v) != n_batch:
+            raise ValueError('init_v must hold one array per instance.')
+        v0s = [_check_batch_init_v(np.ascontiguousarray(v0, dtype=np.double), (n_cols[b],))
+               for b, v0 in enumerate(init_v)]
+
+    if n_batch == 0:
+        return (totals, x_c, y_c, u_c, v_c) if return_duals else (totals, x_c, y_c)
+
+    cdef const double **cost_ptrs = <const double **> malloc(n_batch * sizeof(double *))
+    cdef const double **v0_ptrs = NULL
+    if cost_ptrs == NULL:
+        raise MemoryError('Out of memory.')
+    if v0s is not None:
+        v0_ptrs = <const double **> malloc(n_batch * sizeof(double *))
+        if v0_ptrs == NULL:
+            free(cost_ptrs)
+            raise MemoryError('Out of memory.')
+    for b in range(n_batch):
+        A = mats[b]
+        cost_ptrs[b] = <const double *> cnp.PyArray_DATA(A)
+        if v0s is not None:
+            A = v0s[b]
+            v0_ptrs[b] = <const double *> cnp.PyArray_DATA(A)
+
+    # Zero-length outputs have no element to point at; the kernel never
+    # writes through them in that case.
+    cdef int_t *x_ptr = &x_c[0] if sum_rows > 0 else NULL
+    cdef int_t *y_ptr = &y_c[0] if sum_cols > 0 else NULL
+    cdef double *u_ptr = &u_c[0] if return_duals and sum_rows > 0 else NULL
+    cdef double *v_ptr = &v_c[0] if return_duals and sum_cols > 0 else NULL
+    cdef int ret
+    with nogil:
+        ret = lapjv_ragged_internal(<uint_t> n_batch, cost_ptrs, &n_rows[0], &n_cols[0],
+                                    cost_limit, x_ptr, y_ptr, &totals[0], n_threads,
+                                    v0_ptrs, u_ptr, v_ptr)
+    free(cost_ptrs)
+    free(v0_ptrs)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapjv_ragged_internal returned %d).' % ret)
+
+    return (totals, x_c, y_c, u_c, v_c) if return_duals else (totals, x_c, y_c)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef bint _wide_index(ii, kk):
+    # 64-bit kernels when ii or kk already hold 64-bit integers: they are
+    # then viewed rather than narrowed, and ii can count past 2**32 - 1
+    return np.asarray(ii).dtype.itemsize == 8 or np.asarray(kk).dtype.itemsize == 8
+
+
+def _csr_index(a, bint wide):
+    """
+    uint64 (wide) or uint32 index array of `a` for the sparse kernels.
+    Contiguous int64/int32 arrays of that width (e.g. scipy.sparse
+    indptr/indices) are viewed, not copied.
+    """
+    a = np.asarray(a)
+    dtype = np.uint64 if wide else np.uint32
+    if a.dtype.kind in 'iu' and a.dtype.itemsize == np.dtype(dtype).itemsize \
+            and a.flags.c_contiguous:
+        return a.view(dtype)
+    return np.ascontiguousarray(a, dtype=dtype)
+
+
+def _csr_transpose(const uint_t n_rows, const uint_t n_cols,
+                   cnp.ndarray cc not None, ii not None, kk not None):
+    """
+    Transpose the n_rows x n_cols CSR matrix (cc, ii, kk) natively, with the
+    GIL released. Also converts the storage of a CSC matrix to CSR. Returns
+    (cc_t, ii_t, kk_t) with sorted column indices per row; cc_t is float32
+    for float32 cc and float64 otherwise, ii_t/kk_t are int64 for 64-bit
+    ii or kk and int32 otherwise.
+    """
+    cdef bint f32 = cc.dtype == np.float32
+    cdef bint wide = _wide_index(ii, kk)
+    cdef cnp.ndarray cc_c = np.ascontiguousarray(cc, dtype=np.float32 if f32 else np.double)
+    cdef cnp.ndarray ii_c = _csr_index(ii, wide)
+    cdef cnp.ndarray kk_c = _csr_index(kk, wide)
+    cdef Py_ssize_t nnz = int(ii_c[n_rows]) - int(ii_c[0])
+    cdef cnp.ndarray cc_t = np.empty((nnz,), dtype=cc_c.dtype)
+    cdef cnp.ndarray ii_t = np.empty((n_cols + 1,), dtype=ii_c.dtype)
+    cdef cnp.ndarray kk_t = np.empty((nnz,), dtype=ii_c.dtype)
+    cdef void *cc_ptr = cnp.PyArray_DATA(cc_c)
+    cdef void *cc_t_ptr = cnp.PyArray_DATA(cc_t)
+    cdef void *ii_ptr = cnp.PyArray_DATA(ii_c)
+    cdef void *kk_ptr = cnp.PyArray_DATA(kk_c)
+    cdef void *ii_t_ptr = cnp.PyArray_DATA(ii_t)
+    cdef void *kk_t_ptr = cnp.PyArray_DATA(kk_t)
+    with nogil:
+        if f32 and wide:
+            lapmod_transpose_f32_i64(n_rows, n_cols, <float *> cc_ptr, <uint64_t *> ii_ptr,
+                                     <uint64_t *> kk_ptr, <float *> cc_t_ptr,
+                                     <uint64_t *> ii_t_ptr, <uint64_t *> kk_t_ptr)
+        elif wide:
+            lapmod_transpose_i64(n_rows, n_cols, <double *> cc_ptr, <uint64_t *> ii_ptr,
+                                 <uint64_t *> kk_ptr, <double *> cc_t_ptr,
+                                 <uint64_t *> ii_t_ptr, <uint64_t *> kk_t_ptr)
+        elif f32:
+            lapmod_transpose_f32(n_rows, n_cols, <float *> cc_ptr, <uint_t *> ii_ptr,
+                                 <uint_t *> kk_ptr, <float *> cc_t_ptr,
+                                 <uint_t *> ii_t_ptr, <uint_t *> kk_t_ptr)
+        else:
+            lapmod_transpose(n_rows, n_cols, <double *> cc_ptr, <uint_t *> ii_ptr,
+                             <uint_t *> kk_ptr, <double *> cc_t_ptr,
+                             <uint_t *> ii_t_ptr, <uint_t *> kk_t_ptr)
+    itype = np.int64 if wide else np.int32
+    return cc_t, ii_t.view(itype), kk_t.view(itype)
+
+
+def _gate(cnp.ndarray cost not None, double threshold, uint_t topk=0, int n_threads=0):
+    """
+    Internal function called from gate().
+
+    Gates the 2D `cost` (float32 stays float32, others become float64) into
+    CSR natively, with the GIL released: one pass over the matrix, by blocks
+    of rows on up to n_threads threads. topk = 0 keeps every gated entry.
+    Returns (cc, ii, kk) with ii (N+1,) and kk (nnz,) int32, or int64 when
+    nnz > 2**31 - 1.
+    """
+    cdef bint f32 = cost.dtype == np.float32
+    cdef cnp.ndarray A = np.ascontiguousarray(cost, dtype=np.float32 if f32 else np.double)
+    cdef uint_t n_rows = <uint_t> A.shape[0]
+    cdef uint_t n_cols = <uint_t> A.shape[1]
+    cdef cnp.ndarray[uint64_t, ndim=1, mode='c'] ii_c = np.zeros((n_rows + 1,), dtype=np.uint64)
+    cdef void *a_ptr = cnp.PyArray_DATA(A)
+    cdef float threshold_f = <float> threshold
+    cdef size_t nnz = 0
+    cdef void *gated
+    with nogil:
+        if f32:
+            gated = lapmod_gate_f32(n_rows, n_cols, <float *> a_ptr, threshold_f, topk,
+                                    &ii_c[0], &nnz, n_threads)
+        else:
+            gated = lapmod_gate(n_rows, n_cols, <double *> a_ptr, threshold, topk,
+                                &ii_c[0], &nnz, n_threads)
+    if gated == NULL:
+        raise MemoryError('Out of memory.')
+    cdef bint wide = nnz > 2147483647
+    cdef cnp.ndarray cc_c
+    cdef cnp.ndarray kk_c
+    try:
+        cc_c = np.empty((nnz,), dtype=A.dtype)
+        kk_c = np.empty((nnz,), dtype=np.uint64 if wide else np.uint32)
+    except MemoryError:
+        if f32:
+            lapmod_gate_collect_f32(gated, NULL, NULL)
+        else:
+            lapmod_gate_collect(gated, NULL, NULL)
+        raise
+    cdef void *cc_ptr = cnp.PyArray_DATA(cc_c)
+    cdef void *kk_ptr = cnp.PyArray_DATA(kk_c)
+    with nogil:
+        if f32 and wide:
+            lapmod_gate_collect_f32_i64(gated, <float *> cc_ptr, <uint64_t *> kk_ptr)
+        elif wide:
+            lapmod_gate_collect_i64(gated, <double *> cc_ptr, <uint64_t *> kk_ptr)
+        elif f32:
+            lapmod_gate_collect_f32(gated, <float *> cc_ptr, <uint_t *> kk_ptr)
+        else:
+            lapmod_gate_collect(gated, <double *> cc_ptr, <uint_t *> kk_ptr)
+    if wide:
+        return cc_c, ii_c.view(np.int64), kk_c.view(np.int64)
+    return cc_c, ii_c.astype(np.int32), kk_c.view(np.int32)
+
+
+def _edges_csr(const uint_t n_rows, const uint_t n_cols,
+               rows not None, cols not None, cnp.ndarray costs not None):
+    """
+    Internal function called from edges_to_csr().
+
+    Builds the CSR arrays of the n_rows x n_cols matrix given by the edge
+    list (rows, cols, costs) natively, with the GIL released: counting sorts
+    by column then by row, and duplicate edges merged to their minimum cost.
+    Returns (cc, ii, kk) with ii (n_rows + 1,) and kk (nnz,) int32, or int64
+    for more than 2**31 - 1 edges; cc is float32 for float32 costs and
+    float64 otherwise.
+    """
+    cdef bint f32 = costs.dtype == np.float32
+    cdef cnp.ndarray cost_c = np.ascontiguousarray(costs, dtype=np.float32 if f32 else np.double)
+    cdef cnp.ndarray[int64_t, ndim=1, mode='c'] rows_c = np.ascontiguousarray(rows, dtype=np.int64)
+    cdef cnp.ndarray[int64_t, ndim=1, mode='c'] cols_c = np.ascontiguousarray(cols, dtype=np.int64)
+    cdef size_t nnz = <size_t> cost_c.shape[0]
+    cdef bint wide = nnz > 2147483647
+    cdef cnp.ndarray cc_c = np.empty((nnz,), dtype=cost_c.dtype)
+    cdef cnp.ndarray ii_c = np.empty((n_rows + 1,), dtype=np.uint64 if wide else np.uint32)
+    cdef cnp.ndarray kk_c = np.empty((nnz,), dtype=ii_c.dtype)
+    cdef const int64_t *rows_ptr = <int64_t *> cnp.PyArray_DATA(rows_c)
+    cdef const int64_t *cols_ptr = <int64_t *> cnp.PyArray_DATA(cols_c)
+    cdef void *cost_ptr = cnp.PyArray_DATA(cost_c)
+    cdef void *cc_ptr = cnp.PyArray_DATA(cc_c)
+    cdef void *ii_ptr = cnp.PyArray_DATA(ii_c)
+    cdef void *kk_ptr = cnp.PyArray_DATA(kk_c)
+    cdef size_t nnz_out = 0
+    cdef int ret
+    with nogil:
+        if f32 and wide:
+            ret = lapmod_edges_f32_i64(n_rows, n_cols, nnz, rows_ptr, cols_ptr,
+                                       <float *> cost_ptr, <float *> cc_ptr,
+                                       <uint64_t *> ii_ptr, <uint64_t *> kk_ptr, &nnz_out)
+        elif wide:
+            ret = lapmod_edges_i64(n_rows, n_cols, nnz, rows_ptr, cols_ptr,
+                                   <double *> cost_ptr, <double *> cc_ptr,
+                                   <uint64_t *> ii_ptr, <uint64_t *> kk_ptr, &nnz_out)
+        elif f32:
+            ret = lapmod_edges_f32(n_rows, n_cols, nnz, rows_ptr, cols_ptr,
+                                   <float *> cost_ptr, <float *> cc_ptr,
+                                   <uint_t *> ii_ptr, <uint_t *> kk_ptr, &nnz_out)
+        else:
+            ret = lapmod_edges(n_rows, n_cols, nnz, rows_ptr, cols_ptr,
+                               <double *> cost_ptr, <double *> cc_ptr,
+                               <uint_t *> ii_ptr, <uint_t *> kk_ptr, &nnz_out)
+    if ret == -1:
+        raise MemoryError('Out of memory.')
+    if ret == -2:
+        raise ValueError('Edge indices must be within the matrix shape.')
+    itype = np.int64 if wide else np.int32
+    return cc_c[:nnz_out], ii_c.view(itype), kk_c[:nnz_out].view(itype)
+
+
 def _lapmod(const uint_t n,
             cnp.ndarray cc not None,
             cnp.ndarray ii not None,
             cnp.ndarray kk not None,
-            fp_t fp_version=FP_DYNAMIC):
-    """Internal function called from lapmod(..., fast=True)."""
-    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] cc_c = \
-        np.ascontiguousarray(cc, dtype=np.double)
-    cdef cnp.ndarray[uint_t, ndim=1, mode='c'] ii_c = \
-        np.ascontiguousarray(ii, dtype=np.uint32)
-    cdef cnp.ndarray[uint_t, ndim=1, mode='c'] kk_c = \
-        np.ascontiguousarray(kk, dtype=np.uint32)
+            fp_t fp_version=FP_DYNAMIC,
+            char return_duals=False):
+    """
+    Internal function called from lapmod(..., fast=True). float32 costs are
+    read as is (float64 duals); others are solved in float64. 64-bit ii or
+    kk select the 64-bit index kernels, others are read as uint32. The value
+    checks of check_cost, the solve and the total run with the GIL released.
+
+    Returns (total, x, y), plus the column duals v (n,) float64 with
+    return_duals. total is inf when an assigned entry is not stored.
+    """
+    cdef bint f32 = cc.dtype == np.float32
+    cdef bint wide = _wide_index(ii, kk)
+    cdef cnp.ndarray cc_c = np.ascontiguousarray(cc, dtype=np.float32 if f32 else np.double)
+    cdef cnp.ndarray ii_c = _csr_index(ii, wide)
+    cdef cnp.ndarray kk_c = _csr_index(kk, wide)
     cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = \
         np.empty((n,), dtype=np.int32)
     cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = \
         np.empty((n,), dtype=np.int32)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] v_c = \
+        np.empty((n if return_duals else 0,), dtype=np.double)
 
-    cdef int_t ret = lapmod_internal(n, &cc_c[0], &ii_c[0], &kk_c[0], 
-                                     &x_c[0], &y_c[0], fp_version)
+    cdef size_t nnz = <size_t> cc_c.shape[0]
+    cdef void *cc_ptr = cnp.PyArray_DATA(cc_c)
+    cdef void *ii_ptr = cnp.PyArray_DATA(ii_c)
+    cdef void *kk_ptr = cnp.PyArray_DATA(kk_c)
+    cdef double *v_ptr = &v_c[0] if return_duals else NULL
+    cdef double total = 0
+    cdef int_t ret
+    with nogil:
+        ret = lapmod_check_f32(nnz, <float *> cc_ptr) if f32 else \
+            lapmod_check(nnz, <double *> cc_ptr)
+        if ret == 0 and wide:
+            if f32:
+                ret = lapmod_internal_f32_i64(n, <float *> cc_ptr, <uint64_t *> ii_ptr,
+                                              <uint64_t *> kk_ptr, &x_c[0], &y_c[0],
+                                              v_ptr, fp_version)
+            else:
+                ret = lapmod_internal_i64(n, <double *> cc_ptr, <uint64_t *> ii_ptr,
+                                          <uint64_t *> kk_ptr, &x_c[0], &y_c[0],
+                                          v_ptr, fp_version)
+        elif ret == 0:
+            if f32:
+                ret = lapmod_internal_f32(n, <float *> cc_ptr, <uint_t *> ii_ptr,
+                                          <uint_t *> kk_ptr, &x_c[0], &y_c[0],
+                                          v_ptr, fp_version)
+            else:
+                ret = lapmod_internal(n, <double *> cc_ptr, <uint_t *> ii_ptr,
+                                      <uint_t *> kk_ptr, &x_c[0], &y_c[0],
+                                      v_ptr, fp_version)
+        if ret == 0 and wide:
+            if f32:
+                total = lapmod_total_f32_i64(n, <float *> cc_ptr, <uint64_t *> ii_ptr,
+                                             <uint64_t *> kk_ptr, &x_c[0])
+            else:
+                total = lapmod_total_i64(n, <double *> cc_ptr, <uint64_t *> ii_ptr,
+                                         <uint64_t *> kk_ptr, &x_c[0])
+        elif ret == 0:
+            if f32:
+                total = lapmod_total_f32(n, <float *> cc_ptr, <uint_t *> ii_ptr,
+                                         <uint_t *> kk_ptr, &x_c[0])
+            else:
+                total = lapmod_total(n, <double *> cc_ptr, <uint_t *> ii_ptr,
+                                     <uint_t *> kk_ptr, &x_c[0])
     if ret != 0:
+        if ret == -4:
+            raise ValueError('Cost matrix values must be non-negative.')
+        if ret == -5:
+            raise ValueError('Cost matrix values must be less than %s' % LARGE)
         if ret == -1:
             raise MemoryError('Out of memory.')
         raise RuntimeError('Unknown error (lapmod_internal returned %d).' % ret)
 
+    if return_duals:
+        return total, x_c, y_c, v_c
+    return total, x_c, y_c
+
+
+def _lapmod_rect(const uint_t n_rows, const uint_t n_cols,
+                 cnp.ndarray cc not None,
+                 cnp.ndarray ii not None,
+                 cnp.ndarray kk not None,
+                 char return_duals=False):
+    """
+    Internal function for rectangular lapmod inputs (n_rows < n_cols): solved
+    on the CSR rows with a sparse shortest augmenting path per row, without
+    squaring the matrix up. Dtypes and checks as in _lapmod.
+
+    Returns (total, x (n_rows,), y (n_cols,)), plus the duals u (n_rows,) and
+    v (n_cols,) float64 with return_duals. Rows that cannot be assigned keep
+    x = -1 and make total inf.
+    """
+    cdef bint f32 = cc.dtype == np.float32
+    cdef bint wide = _wide_index(ii, kk)
+    cdef cnp.ndarray cc_c = np.ascontiguousarray(cc, dtype=np.float32 if f32 else np.double)
+    cdef cnp.ndarray ii_c = _csr_index(ii, wide)
+    cdef cnp.ndarray kk_c = _csr_index(kk, wide)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = \
+        np.empty((n_rows,), dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = \
+        np.empty((n_cols,), dtype=np.int32)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] u_c = \
+        np.empty((n_rows if return_duals else 0,), dtype=np.double)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] v_c = \
+        np.empty((n_cols if return_duals else 0,), dtype=np.double)
+
+    cdef size_t nnz = <size_t> cc_c.shape[0]
+    cdef void *cc_ptr = cnp.PyArray_DATA(cc_c)
+    cdef void *ii_ptr = cnp.PyArray_DATA(ii_c)
+    cdef void *kk_ptr = cnp.PyArray_DATA(kk_c)
+    cdef double *u_ptr = &u_c[0] if return_duals else NULL
+    cdef double *v_ptr = &v_c[0] if return_duals else NULL
+    cdef double total = 0
+    cdef int ret
+    with nogil:
+        ret = lapmod_check_f32(nnz, <float *> cc_ptr) if f32 else \
+            lapmod_check(nnz, <double *> cc_ptr)
+        if ret == 0 and wide:
+            if f32:
+                ret = lapmod_rect_internal_f32_i64(n_rows, n_cols, <float *> cc_ptr,
+                                                   <uint64_t *> ii_ptr, <uint64_t *> kk_ptr,
+                                                   &x_c[0], &y_c[0], u_ptr, v_ptr)
+            else:
+                ret = lapmod_rect_internal_i64(n_rows, n_cols, <double *> cc_ptr,
+                                               <uint64_t *> ii_ptr, <uint64_t *> kk_ptr,
+                                               &x_c[0], &y_c[0], u_ptr, v_ptr)
+        elif ret == 0:
+            if f32:
+                ret = lapmod_rect_internal_f32(n_rows, n_cols, <float *> cc_ptr,
+                                               <uint_t *> ii_ptr, <uint_t *> kk_ptr,
+                                               &x_c[0], &y_c[0], u_ptr, v_ptr)
+            else:
+                ret = lapmod_rect_internal(n_rows, n_cols, <double *> cc_ptr,
+                                           <uint_t *> ii_ptr, <uint_t *> kk_ptr,
+                                           &x_c[0], &y_c[0], u_ptr, v_ptr)
+        if ret == 0 and wide:
+            if f32:
+                total = lapmod_total_f32_i64(n_rows, <float *> cc_ptr, <uint64_t *> ii_ptr,
+                                             <uint64_t *> kk_ptr, &x_c[0])
+            else:
+                total = lapmod_total_i64(n_rows, <double *> cc_ptr, <uint64_t *> ii_ptr,
+                                         <uint64_t *> kk_ptr, &x_c[0])
+        elif ret == 0:
+            if f32:
+                total = lapmod_total_f32(n_rows, <float *> cc_ptr, <uint_t *> ii_ptr,
+                                         <uint_t *> kk_ptr, &x_c[0])
+            else:
+                total = lapmod_total(n_rows, <double *> cc_ptr, <uint_t *> ii_ptr,
+                                     <uint_t *> kk_ptr, &x_c[0])
+    if ret != 0:
+        if ret == -4:
+            raise ValueError('Cost matrix values must be non-negative.')
+        if ret == -5:
+            raise ValueError('Cost matrix values must be less than %s' % LARGE)
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapmod_rect_internal returned %d).' % ret)
+
+    if return_duals:
+        return total, x_c, y_c, u_c, v_c
+    return total, x_c, y_c
+
+
+def _lapmod_batch(list costs not None, fp_t fp_version=FP_DYNAMIC, int n_threads=0):
+    """
+    Internal function called from lapmod_batch().
+
+    `costs` is a list of validated (cc, ii, kk) CSR triples, one non-empty
+    square instance each (n = len(ii) - 1). All instances are solved with
+    lapmod_internal in one call on native threads with the GIL released.
+
+    Returns (totals, x, y) with totals (B,) float64 (inf when an assigned
+    entry is not stored) and int32 x/y packed back to back (sum(n) entries).
+    """
+    cdef Py_ssize_t n_batch = len(costs)
+    cdef list keep = []
+    cdef cnp.ndarray[uint_t, ndim=1, mode='c'] n_c = np.empty((n_batch,), dtype=np.uint32)
+    cdef cnp.ndarray cc_c, ii_c, kk_c
+    cdef Py_ssize_t b, total_n = 0
+    for b in range(n_batch):
+        cc, ii, kk = costs[b]
+        cc_c = np.ascontiguousarray(cc, dtype=np.double)
+        ii_c = np.ascontiguousarray(ii, dtype=np.uint32)
+        kk_c = np.ascontiguousarray(kk, dtype=np.uint32)
+        keep.append((cc_c, ii_c, kk_c))
+        n_c[b] = <uint_t> (ii_c.shape[0] - 1)
+        total_n += ii_c.shape[0] - 1
+
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = np.empty((total_n,), dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = np.empty((total_n,), dtype=np.int32)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] totals = \
+        np.zeros((n_batch,), dtype=np.double)
+    if n_batch == 0:
+        return totals, x_c, y_c
+
+    cdef double **cc_ptrs = <double **> malloc(n_batch * sizeof(double *))
+    cdef uint_t **ii_ptrs = <uint_t **> malloc(n_batch * sizeof(uint_t *))
+    cdef uint_t **kk_ptrs = <uint_t **> malloc(n_batch * sizeof(uint_t *))
+    if cc_ptrs == NULL or ii_ptrs == NULL or kk_ptrs == NULL:
+        free(cc_ptrs)
+        free(ii_ptrs)
+        free(kk_ptrs)
+        raise MemoryError('Out of memory.')
+    for b in range(n_batch):
+        cc_c, ii_c, kk_c = keep[b]
+        cc_ptrs[b] = <double *> cnp.PyArray_DATA(cc_c)
+        ii_ptrs[b] = <uint_t *> cnp.PyArray_DATA(ii_c)
+        kk_ptrs[b] = <uint_t *> cnp.PyArray_DATA(kk_c)
+
+    cdef int ret
+    with nogil:
+        ret = lapmod_batch_internal(<uint_t> n_batch, &n_c[0], cc_ptrs, ii_ptrs, kk_ptrs,
+                                    fp_version, &x_c[0], &y_c[0], &totals[0], n_threads)
+    free(cc_ptrs)
+    free(ii_ptrs)
+    free(kk_ptrs)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapmod_batch_internal returned %d).' % ret)
+    return totals, x_c, y_c
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _auction(cnp.ndarray cost not None, double eps_final, int n_threads=1):
+    """
+    Internal function called from auction().
+
+    Solves a square float64 cost matrix by epsilon-scaled auction down to
+    `eps_final`, with the GIL released. Returns the (x, y) int32 mappings.
+    """
+    cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] A = \
+        np.ascontiguousarray(cost, dtype=np.double)
+    if A.shape[0] != A.shape[1]:
+        raise ValueError('Square cost array expected.')
+    cdef Py_ssize_t n = A.shape[0]
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = \
+        np.full((n,), -1, dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = \
+        np.full((n,), -1, dtype=np.int32)
+    if n == 0:
+        return x_c, y_c
+
+    cdef int ret
+    with nogil:
+        ret = auction_internal(<uint_t> n, &A[0, 0], eps_final,
+                               &x_c[0], &y_c[0], n_threads)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (auction_internal returned %d).' % ret)
     return x_c, y_c
+
+
+def _lapjv_resume(cnp.ndarray cost not None,
+                  cnp.ndarray[int_t, ndim=1, mode='c'] x not None,
+                  cnp.ndarray[int_t, ndim=1, mode='c'] y not None,
+                  cnp.ndarray[cnp.double_t, ndim=1, mode='c'] v not None,
+                  int n_threads=1):
+    """
+    Internal function called from IncrementalAssignment.
+
+    Completes a partial matching (x, y) of a square float64 cost matrix in
+    place, updating the column duals v. Every matched row must be at its
+    minimum reduced cost cost[i, j] - v[j]; only rows with x[i] < 0 are then
+    assigned, with the GIL released, and the result is optimal.
+    """
+    cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] A = \
+        np.ascontiguousarray(cost, dtype=np.double)
+    if A.shape[0] != A.shape[1]:
+        raise ValueError('Square cost array expected.')
+    cdef Py_ssize_t n = A.shape[0]
+    if x.shape[0] != n or y.shape[0] != n or v.shape[0] != n:
+        raise ValueError('x, y and v must have one entry per row/column.')
+    if n == 0:
+        return
+
+    cdef double **cost_ptr = <double **> malloc(n * sizeof(double *))
+    if cost_ptr == NULL:
+        raise MemoryError('Out of memory.')
+    cdef Py_ssize_t i
+    for i in range(n):
+        cost_ptr[i] = &A[i, 0]
+
+    cdef int ret
+    with nogil:
+        ret = lapjv_internal(<uint_t> n, cost_ptr, &x[0], &y[0], &v[0],
+                             START_RESUME, n_threads)
+    free(cost_ptr)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapjv_internal returned %d).' % ret)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _kbest(cnp.ndarray cost not None, Py_ssize_t n_part, Py_ssize_t n_real_cols,
+           Py_ssize_t k, int n_threads=1):
+    """
+    Internal function called from kbest().
+
+    Finds the k best assignments of a square float64 working matrix by
+    Murty's partitioning, with the GIL released. Only the first `n_part`
+    rows are partitioned on; columns from `n_real_cols` on are treated as
+    interchangeable reject columns (label -1).
+
+    Returns (labels, objectives): int32 labels (K, n_part) and float64
+    working objectives (K,), cheapest first, with K <= k.
+    """
+    cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] A = \
+        np.ascontiguousarray(cost, dtype=np.double)
+    if A.shape[0] != A.shape[1]:
+        raise ValueError('Square cost array expected.')
+    cdef Py_ssize_t n = A.shape[0]
+    cdef cnp.ndarray[int_t, ndim=2, mode='c'] labels = \
+        np.empty((k, n_part), dtype=np.int32)
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] objectives = \
+        np.empty((k,), dtype=np.double)
+    cdef uint_t n_found = 0
+    cdef int ret
+    with nogil:
+        ret = kbest_internal(<uint_t> n, <double *> cnp.PyArray_DATA(A), <uint_t> n_part,
+                             <uint_t> n_real_cols, <uint_t> k,
+                             <int_t *> cnp.PyArray_DATA(labels),
+                             <double *> cnp.PyArray_DATA(objectives), &n_found, n_threads)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (kbest_internal returned %d).' % ret)
+    return labels[:n_found], objectives[:n_found]
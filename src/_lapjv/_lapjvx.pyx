@@ -15,6 +15,7 @@ cimport numpy as cnp
 cimport cython
 
 from libc.stdlib cimport malloc, free
+from libc.stdint cimport int32_t, int64_t
 
 cdef extern from "lapjv.h" nogil:
     ctypedef signed int int_t
@@ -27,12 +28,274 @@ cdef extern from "lapjv.h" nogil:
     int lapjv_internal(const uint_t n,
                        double *cost[],
                        int_t *x,
-                       int_t *y)
+                       int_t *y,
+                       double *v,
+                       char start,
+                       int n_threads)
+    int lapjv_reject_internal(const uint_t n_rows,
+                              const uint_t n_cols,
+                              double *cost[],
+                              const double cost_limit,
+                              int_t *x,
+                              int_t *y,
+                              double *u,
+                              double *v,
+                              int n_threads)
+    int lapjv_rect_internal(const uint_t n_rows,
+                            const uint_t n_cols,
+                            double *cost[],
+                            int_t *x,
+                            int_t *y,
+                            double *u,
+                            double *v,
+                            int n_threads)
+    int lapjv_internal_i32(const uint_t n,
+                           int32_t *cost[],
+                           int_t *x,
+                           int_t *y,
+                           int64_t *v,
+                           char start,
+                           int n_threads)
+    int lapjv_internal_i64(const uint_t n,
+                           int64_t *cost[],
+                           int_t *x,
+                           int_t *y,
+                           int64_t *v,
+                           char start,
+                           int n_threads)
+    int lapjv_internal_f32(const uint_t n,
+                           float *cost[],
+                           int_t *x,
+                           int_t *y,
+                           float *v,
+                           char start,
+                           int n_threads)
+    int lapjv_reject_internal_f32(const uint_t n_rows,
+                                  const uint_t n_cols,
+                                  float *cost[],
+                                  const float cost_limit,
+                                  int_t *x,
+                                  int_t *y,
+                                  float *u,
+                                  float *v,
+                                  int n_threads)
+    int lapjv_rect_internal_f32(const uint_t n_rows,
+                                const uint_t n_cols,
+                                float *cost[],
+                                int_t *x,
+                                int_t *y,
+                                float *u,
+                                float *v,
+                                int n_threads)
+    int lapjv_rect_internal_i32(const uint_t n_rows,
+                                const uint_t n_cols,
+                                int32_t *cost[],
+                                int_t *x,
+                                int_t *y,
+                                int64_t *u,
+                                int64_t *v,
+                                int n_threads)
+    int lapjv_rect_internal_i64(const uint_t n_rows,
+                                const uint_t n_cols,
+                                int64_t *cost[],
+                                int_t *x,
+                                int_t *y,
+                                int64_t *u,
+                                int64_t *v,
+                                int n_threads)
+    bint lapjv_prefer_rect(const uint_t n_rows, const uint_t n_cols)
+
+
+def _warm_working_v(B, init_v, bint transposed, Py_ssize_t N):
+    """
+    Working column duals (N,) for a warm start from `init_v`, the column
+    duals of the ORIGINAL matrix. When the kernel solves the transpose B, its
+    columns are the original rows and start from the row reduction
+    min_j(cost[i, j] - init_v[j]). Extra (padding/sentinel) columns start at 0.
+    """
+    v0 = np.asarray(init_v, dtype=np.double)
+    cdef Py_ssize_t n_cols0 = B.shape[0] if transposed else B.shape[1]
+    if v0.shape != (n_cols0,):
+        raise ValueError('init_v must have shape (%d,), one dual per column.' % n_cols0)
+    if not np.isfinite(v0).all():
+        raise ValueError('init_v values must be finite.')
+    v_c = np.zeros((N,), dtype=np.double)
+    if transposed:
+        v_c[:B.shape[1]] = (B - v0[:, None]).min(axis=0)
+    else:
+        v_c[:B.shape[1]] = v0
+    return v_c
+
+
+def _original_duals(cost_c, x_c, v_c, Py_ssize_t R, Py_ssize_t C, bint transposed):
+    """
+    Row/column duals (u, v) of the solved working problem, restricted to the
+    real rows/columns and mapped to the ORIGINAL orientation. The dual of a
+    working row is the reduced cost of its match (its row minimum), so
+    u[i] + v[j] <= cost[i, j] with equality on the assigned pairs.
+    """
+    x_r = x_c[:R]
+    u_w = cost_c[np.arange(R), x_r] - v_c[x_r]
+    v_w = v_c[:C].copy()
+    if transposed:
+        return v_w, u_w
+    return u_w, v_w
+
+
+def _lapjv_reject(cnp.ndarray cost not None, double cost_limit, int n_threads=1,
+                  bint f32=False):
+    """
+    Solve an (N, M) problem with per-row/column rejects at cost_limit / 2 on
+    its own rows, without the (N+M)^2 augmented matrix. Used for a finite
+    cost_limit without init_v; f32 solves in float32. Returns int32 x (N,),
+    y (M,) (-1 = unassigned) and float64 duals u (N,), v (M,) in the input
+    orientation.
+    """
+    wdt = np.float32 if f32 else np.double
+    A = np.ascontiguousarray(cost, dtype=wdt)
+    cdef Py_ssize_t R = A.shape[0]
+    cdef Py_ssize_t C = A.shape[1]
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = np.full((R,), -1, dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = np.full((C,), -1, dtype=np.int32)
+    u_c = np.full((R,), cost_limit / 2.0, dtype=wdt)
+    v_c = np.full((C,), cost_limit / 2.0, dtype=wdt)
+    if R == 0 or C == 0:
+        return x_c, y_c, u_c.astype(np.double), v_c.astype(np.double)
+    cdef void *u_ptr = cnp.PyArray_DATA(u_c)
+    cdef void *v_ptr = cnp.PyArray_DATA(v_c)
+
+    cdef char *base = <char *> cnp.PyArray_DATA(A)
+    cdef Py_ssize_t stride = A.strides[0]
+    cdef void **cost_ptr = <void **> malloc(R * sizeof(void *))
+    if cost_ptr == NULL:
+        raise MemoryError('Out of memory.')
+    cdef Py_ssize_t i
+    for i in range(R):
+        cost_ptr[i] = base + i * stride
+    cdef int ret
+    with nogil:
+        if f32:
+            ret = lapjv_reject_internal_f32(<uint_t> R, <uint_t> C, <float **> cost_ptr,
+                                            <float> cost_limit, &x_c[0], &y_c[0],
+                                            <float *> u_ptr, <float *> v_ptr, n_threads)
+        else:
+            ret = lapjv_reject_internal(<uint_t> R, <uint_t> C, <double **> cost_ptr,
+                                        cost_limit, &x_c[0], &y_c[0],
+                                        <double *> u_ptr, <double *> v_ptr, n_threads)
+    free(cost_ptr)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapjv_reject_internal returned %d).' % ret)
+    return x_c, y_c, u_c.astype(np.double, copy=False), v_c.astype(np.double, copy=False)
+
+
+def _int_working_dtype(dt):
+    """
+    Kernel cost dtype for an integer cost dtype: int32 when it holds every
+    value, int64 for int64/uint32, None otherwise (floats, uint64, bool).
+    """
+    if (dt.kind == 'i' and dt.itemsize <= 4) or (dt.kind == 'u' and dt.itemsize <= 2):
+        return np.int32
+    if dt == np.int64 or dt == np.uint32:
+        return np.int64
+    return None
+
+
+def _kernel_dtype(dt, bint prefer_float32=False):
+    """
+    Kernel cost dtype other than float64 for costs of dtype `dt`, or None:
+    int32/int64 for integers (see _int_working_dtype), float32 for float16
+    and float32 costs, and for any float costs with prefer_float32.
+    """
+    wdt = _int_working_dtype(dt)
+    if wdt is None and dt.kind == 'f' and (dt.itemsize <= 4 or prefer_float32):
+        wdt = np.float32
+    return wdt
+
+
+def _lapjv_typed(cnp.ndarray A not None, wdt, int n_threads=1, init_v=None):
+    """
+    Solve with the int32/int64 kernels (exact, int64 duals) or the float32
+    one, per the kernel cost dtype `wdt`, without a float64 working copy.
+    Same orientation and padding as the float64 path with cost_limit == inf;
+    the caller checks squareness. Returns int32 x (N,), y (M,) and float64
+    duals (u, v) in the input orientation.
+    """
+    cdef bint transposed = A.shape[0] > A.shape[1]
+    B = np.ascontiguousarray(A.T if transposed else A, dtype=wdt)
+    cdef Py_ssize_t R = B.shape[0]
+    cdef Py_ssize_t C = B.shape[1]
+    cdef uint_t N = <uint_t>C
+    cdef char warm = init_v is not None
+    cdef bint rect = not warm and lapjv_prefer_rect(<uint_t> R, <uint_t> C)
+    # 0: int32, 1: int64, 2: float32
+    cdef int kind = 0 if wdt is np.int32 else (1 if wdt is np.int64 else 2)
+
+    cost_c = B
+    if R != C and not rect:
+        cost_c = np.zeros((N, N), dtype=wdt)
+        cost_c[:R, :C] = B
+    vdt = np.float32 if kind == 2 else np.int64
+    if warm:
+        v_c = _warm_working_v(B, init_v, transposed, N)
+        v_c = (v_c if kind == 2 else np.rint(v_c)).astype(vdt)
+    else:
+        v_c = np.empty((N,), dtype=vdt)
+    cdef void *v_ptr = cnp.PyArray_DATA(v_c)
+
+    cdef char *base = <char *> cnp.PyArray_DATA(cost_c)
+    cdef Py_ssize_t stride = cost_c.strides[0]
+    cdef void **cost_ptr = <void **> malloc(N * sizeof(void *))
+    if cost_ptr == NULL:
+        raise MemoryError('Out of memory.')
+    cdef Py_ssize_t i
+    for i in range(R if rect else N):
+        cost_ptr[i] = base + i * stride
+
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_c = np.empty((N,), dtype=np.int32)
+    cdef cnp.ndarray[int_t, ndim=1, mode='c'] y_c = np.empty((N,), dtype=np.int32)
+    cdef int ret
+    with nogil:
+        if rect and kind == 0:
+            ret = lapjv_rect_internal_i32(<uint_t> R, N, <int32_t **> cost_ptr,
+                                          &x_c[0], &y_c[0], NULL, <int64_t *> v_ptr, n_threads)
+        elif rect and kind == 1:
+            ret = lapjv_rect_internal_i64(<uint_t> R, N, <int64_t **> cost_ptr,
+                                          &x_c[0], &y_c[0], NULL, <int64_t *> v_ptr, n_threads)
+        elif rect:
+            ret = lapjv_rect_internal_f32(<uint_t> R, N, <float **> cost_ptr,
+                                          &x_c[0], &y_c[0], NULL, <float *> v_ptr, n_threads)
+        elif kind == 0:
+            ret = lapjv_internal_i32(N, <int32_t **> cost_ptr, &x_c[0], &y_c[0],
+                                     <int64_t *> v_ptr, warm, n_threads)
+        elif kind == 1:
+            ret = lapjv_internal_i64(N, <int64_t **> cost_ptr, &x_c[0], &y_c[0],
+                                     <int64_t *> v_ptr, warm, n_threads)
+        else:
+            ret = lapjv_internal_f32(N, <float **> cost_ptr, &x_c[0], &y_c[0],
+                                     <float *> v_ptr, warm, n_threads)
+    free(cost_ptr)
+    if ret != 0:
+        if ret == -1:
+            raise MemoryError('Out of memory.')
+        raise RuntimeError('Unknown error (lapjv kernel returned %d).' % ret)
+    u_o, v_o = _original_duals(cost_c, x_c, v_c, R, C, transposed)
+
+    x_w = x_c[:R]
+    y_w = np.full((C,), -1, dtype=np.int32)
+    mask = x_w >= 0
+    y_w[x_w[mask]] = np.nonzero(mask)[0]
+    if transposed:
+        x_w, y_w = y_w, x_w
+    return x_w, y_w, u_o.astype(np.double), v_o.astype(np.double)
+
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
-           double cost_limit=np.inf, char return_cost=True):
+           double cost_limit=np.inf, char return_cost=True, int n_threads=1,
+           init_v=None, char return_duals=False, char prefer_float32=False):
     """
     Solve linear assignment problem using Jonker-Volgenant algorithm,
     returning (row_indices, col_indices) like scipy.optimize.linear_sum_assignment.
@@ -42,16 +305,30 @@ def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
 
     Unified augmentation policy
     ---------------------------
-    - If cost_limit < inf: augment to (N+M) with cost_limit/2 sentinels (rectangular allowed).
-    - Elif (N != M) or extend_cost: zero-pad to square max(N, M) (rectangular allowed when extend_cost=True).
+    - If cost_limit < inf: rows/columns may stay unassigned at cost_limit/2, solved
+      natively on the (N, M) input (rectangular allowed). Only a warm start from
+      init_v augments to (N+M) with cost_limit/2 sentinels.
+    - Elif (N != M) or extend_cost: same result as zero-padding to square max(N, M)
+      (rectangular allowed when extend_cost=True). Skewed inputs (max >= 1.5 * min)
+      are solved natively in O(min^2 max); others, and warm starts from init_v,
+      are zero-padded.
     - Else (square, un-augmented): run on the given square.
 
+    Warm start: `init_v` (M,) column duals, e.g. `v` of a previous solve of
+    a similar matrix, skip the column reduction; the result is still optimal.
+
+    Kernel dtype: integer costs run on exact int32/int64 kernels and float32
+    costs on a float32 kernel (optimal up to float32 rounding), without a
+    float64 copy. prefer_float32=True sends float64 costs to it too.
+
     Returns
     -------
     opt : float
         Total cost (if return_cost=True), computed on the ORIGINAL input (not padded).
     row_indices : (K,) ndarray (np.where -> int64)
     col_indices : (K,) ndarray (sliced from x_c -> int32)
+    u, v : (N,) and (M,) float64 ndarrays
+        Row and column duals (if return_duals=True).
     """
     if cost.ndim != 2:
         raise ValueError('2-dimensional array expected')
@@ -63,10 +340,55 @@ def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
 
     # Fast exits for empty dims
     if n_rows0 == 0 or n_cols0 == 0:
+        out = (np.empty((0,), dtype=np.int64), np.empty((0,), dtype=np.int64))
         if return_cost:
-            return 0.0, np.empty((0,), dtype=np.int64), np.empty((0,), dtype=np.int64)
+            out = (0.0,) + out
+        if return_duals:
+            out += (np.zeros((n_rows0,), dtype=np.double), np.zeros((n_cols0,), dtype=np.double))
+        return out
+
+    # Kernel cost dtype: integer and float32 costs skip the float64 copy
+    kdt = _kernel_dtype(A.dtype, prefer_float32)
+
+    # Finite cost_limit: rejects are handled natively on the input rows
+    if cost_limit < np.inf and init_v is None:
+        x_r, y_r, u_r, v_r = _lapjv_reject(A, cost_limit, n_threads, kdt is np.float32)
+        # Same pair order and dtypes as the transposed path for tall inputs
+        if n_rows0 > n_cols0:
+            cols_r = np.nonzero(y_r >= 0)[0].astype(np.int64, copy=False)
+            rows_r = y_r[cols_r]
         else:
-            return np.empty((0,), dtype=np.int64), np.empty((0,), dtype=np.int64)
+            rows_r = np.nonzero(x_r >= 0)[0].astype(np.int64, copy=False)
+            cols_r = x_r[rows_r]
+        out = (rows_r, cols_r)
+        if return_cost:
+            out = (float(A[rows_r, cols_r].sum()) if rows_r.size else 0.0,) + out
+        if return_duals:
+            out += (u_r, v_r)
+        return out
+
+    # Gate: rectangular error only if extend_cost=False and cost_limit==inf
+    if n_rows0 != n_cols0 and (not extend_cost) and cost_limit == np.inf:
+        raise ValueError(
+            'Square cost array expected. If cost is intentionally '
+            'non-square, pass extend_cost=True.'
+        )
+
+    # Integer costs (exact int32/int64 kernels) and the float32 kernel
+    if kdt is not None and cost_limit == np.inf:
+        x_r, y_r, u_r, v_r = _lapjv_typed(A, kdt, n_threads, init_v)
+        if n_rows0 > n_cols0:
+            cols_r = np.nonzero(y_r >= 0)[0].astype(np.int64, copy=False)
+            rows_r = y_r[cols_r]
+        else:
+            rows_r = np.nonzero(x_r >= 0)[0].astype(np.int64, copy=False)
+            cols_r = x_r[rows_r]
+        out = (rows_r, cols_r)
+        if return_cost:
+            out = (float(A[rows_r, cols_r].sum()) if rows_r.size else 0.0,) + out
+        if return_duals:
+            out += (u_r, v_r)
+        return out
 
     # Normalize orientation: kernel sees rows <= cols
     cdef bint transposed = False
@@ -83,13 +405,6 @@ def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
     cdef Py_ssize_t R = B.shape[0]
     cdef Py_ssize_t C = B.shape[1]
 
-    # Gate: rectangular error only if extend_cost=False and cost_limit==inf
-    if R != C and (not extend_cost) and cost_limit == np.inf:
-        raise ValueError(
-            'Square cost array expected. If cost is intentionally '
-            'non-square, pass extend_cost=True.'
-        )
-
     cdef uint_t N
     cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] cost_c = B
     cdef cnp.ndarray[cnp.double_t, ndim=2, mode='c'] cost_c_extended
@@ -101,6 +416,9 @@ def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
         cost_c_extended[R:, C:] = 0.0
         cost_c_extended[:R, :C] = cost_c
         cost_c = cost_c_extended
+    elif init_v is None and lapjv_prefer_rect(<uint_t> R, <uint_t> C):
+        # Skewed rectangular: solved natively on the R x C rows, no padding
+        N = <uint_t>C
     elif R != C or extend_cost:
         N = <uint_t>max(R, C)
         if R != C:
@@ -112,12 +430,19 @@ def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
     else:
         N = <uint_t>R
 
+    # Column duals: warm-start values in, solution duals out
+    cdef char warm = init_v is not None
+    cdef bint rect = (not warm and cost_limit == np.inf
+                      and lapjv_prefer_rect(<uint_t> R, <uint_t> C))
+    cdef cnp.ndarray[cnp.double_t, ndim=1, mode='c'] v_c = \
+        _warm_working_v(B, init_v, transposed, N) if warm else np.empty((N,), dtype=np.double)
+
     # Build row-pointer view
     cdef double **cost_ptr = <double **> malloc(N * sizeof(double *))
     if cost_ptr == NULL:
         raise MemoryError('Out of memory when allocating cost_ptr')
     cdef int i
-    for i in range(N):
+    for i in range(R if rect else N):
         cost_ptr[i] = &cost_c[i, 0]
 
     # Allocate x/y
@@ -126,13 +451,19 @@ def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
 
     cdef int ret
     with nogil:
-        ret = lapjv_internal(<uint_t> N, cost_ptr, &x_c[0], &y_c[0])
+        if rect:
+            ret = lapjv_rect_internal(<uint_t> R, N, cost_ptr, &x_c[0], &y_c[0],
+                                      NULL, &v_c[0], n_threads)
+        else:
+            ret = lapjv_internal(<uint_t> N, cost_ptr, &x_c[0], &y_c[0], &v_c[0], warm, n_threads)
 
     free(cost_ptr)
     if ret != 0:
         if ret == -1:
             raise MemoryError('Out of memory.')
-        raise RuntimeError('Unknown error (lapjv_internal returned %d).' % ret)
+        raise RuntimeError('Unknown error (lapjv kernel returned %d).' % ret)
+    if return_duals:
+        duals = _original_duals(cost_c, x_c, v_c, R, C, transposed)
 
     # Trim to working rectangle (B-space) and clean artificial matches
     cdef cnp.ndarray[int_t, ndim=1, mode='c'] x_trim
@@ -165,10 +496,10 @@ def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
         else:
             opt = 0.0
 
-    if return_cost:
-        return opt, row_indices, col_indices
-    else:
-        return row_indices, col_indices
+    out = (opt, row_indices, col_indices) if return_cost else (row_indices, col_indices)
+    if return_duals:
+        out += duals
+    return out
 
 
 # The function lapjvxa is a wrapper of lapjvx which returns 
@@ -177,21 +508,24 @@ def lapjvx(cnp.ndarray cost not None, char extend_cost=False,
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def lapjvxa(cnp.ndarray cost not None, char extend_cost=False,
-            double cost_limit=np.inf, char return_cost=True):
+            double cost_limit=np.inf, char return_cost=True, int n_threads=1,
+            char prefer_float32=False):
     """
     Like lapjvx, but returns assignment pairs as a (K,2) ndarray of (row, col).
     Uses int32 pairs to match legacy behavior.
     """
     if return_cost:
         opt, row_indices, col_indices = lapjvx(cost, extend_cost=extend_cost,
-                                               cost_limit=cost_limit, return_cost=True)
+                                               cost_limit=cost_limit, return_cost=True,
+                                               n_threads=n_threads, prefer_float32=prefer_float32)
         assignments = np.empty((row_indices.shape[0], 2), dtype=np.int32)
         assignments[:, 0] = row_indices
         assignments[:, 1] = col_indices
         return opt, assignments
     else:
         row_indices, col_indices = lapjvx(cost, extend_cost=extend_cost,
-                                          cost_limit=cost_limit, return_cost=False)
+                                          cost_limit=cost_limit, return_cost=False,
+                                          n_threads=n_threads, prefer_float32=prefer_float32)
         assignments = np.empty((row_indices.shape[0], 2), dtype=np.int32)
         assignments[:, 0] = row_indices
         assignments[:, 1] = col_indices
@@ -0,0 +1,166 @@
+// Copyright (c) 2025 Ratha SIV | MIT License
+
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <limits>
+#include <memory>
+#include <new>
+#include <vector>
+
+#include "lapjv.h"
+#include "parallel.h"
+
+/**
+ * Forward auction algorithm (Bertsekas) with epsilon scaling for a dense
+ * n x n minimization problem, with Jacobi (parallel) bidding.
+ *
+ * Every round, all unassigned rows bid at once: row i picks the column j
+ * minimizing cost[i][j] + p[j] and raises p[j] by the gap to its second
+ * best column plus eps. Bids are computed in parallel over the rows and then
+ * resolved serially in row-list order (highest price wins, earlier bidder on
+ * ties), so the result does not depend on the number of threads. Each phase
+ * restarts the assignment with the prices of the previous phase and a
+ * smaller eps; the final assignment is within n * eps_final of the optimum,
+ * hence optimal for integer costs when eps_final < 1 / n.
+ */
+
+/** Columns of a row below which a parallel bidding round is not worth it. */
+static const std::size_t kMinAuctionTeamDim = 512;
+
+/** Ratio by which eps shrinks from one scaling phase to the next. */
+static const cost_t kEpsScaling = 5.0;
+
+
+int auction_internal(const uint_t n, const cost_t *cost, const cost_t eps_final,
+                     int_t *x, int_t *y, int n_threads)
+{
+    if (n == 0) {
+        return 0;
+    }
+    if (n == 1) {
+        x[0] = 0;
+        y[0] = 0;
+        return 0;
+    }
+
+    try {
+        std::unique_ptr<lapx::Team> team;
+        if (n_threads != 1 && n >= kMinAuctionTeamDim) {
+            team.reset(new lapx::Team(n_threads));
+            if (team->size() == 1) {
+                team.reset();
+            }
+        }
+
+        const std::size_t nn = (std::size_t)n * n;
+        cost_t lo = cost[0], hi = cost[0];
+        for (std::size_t k = 1; k < nn; k++) {
+            lo = std::min(lo, cost[k]);
+            hi = std::max(hi, cost[k]);
+        }
+
+        std::vector<cost_t> p(n, 0.0);
+        std::vector<int_t> bidders, next;
+        std::vector<int_t> bid_col(n);
+        std::vector<cost_t> bid_price(n);
+        std::vector<cost_t> best(n, -std::numeric_limits<cost_t>::infinity());
+        std::vector<int_t> winner(n, -1);
+        std::vector<int_t> touched;
+        bidders.reserve(n);
+        next.reserve(n);
+        touched.reserve(n);
+
+        cost_t eps = std::max((hi - lo) / 4.0, eps_final);
+        for (;;) {
+            std::fill(x, x + n, -1);
+            std::fill(y, y + n, -1);
+            bidders.resize(n);
+            for (uint_t i = 0; i < n; i++) {
+                bidders[i] = i;
+            }
+
+            while (!bidders.empty()) {
+                const std::size_t n_bidders = bidders.size();
+                auto bid = [&](std::size_t k_lo, std::size_t k_hi) {
+                    for (std::size_t k = k_lo; k < k_hi; k++) {
+                        const cost_t *ci = cost + (std::size_t)bidders[k] * n;
+                        cost_t w1 = ci[0] + p[0];
+                        cost_t w2 = std::numeric_limits<cost_t>::infinity();
+                        int_t j1 = 0;
+                        for (uint_t j = 1; j < n; j++) {
+                            const cost_t w = ci[j] + p[j];
+                            if (w < w1) {
+                                w2 = w1;
+                                w1 = w;
+                                j1 = j;
+                            } else if (w < w2) {
+                                w2 = w;
+                            }
+                        }
+                        bid_col[k] = j1;
+                        bid_price[k] = p[j1] + (w2 - w1) + eps;
+                        if (!(bid_price[k] > p[j1])) {
+                            // eps lost to rounding on huge prices: still
+                            // raise the price so the auction terminates.
+                            bid_price[k] = std::nextafter(
+                                p[j1], std::numeric_limits<cost_t>::infinity());
+                        }
+                    }
+                };
+                if (team && n_bidders * n >= lapx::kMinParallelScan) {
+                    auto fn = [&](int t) {
+                        std::size_t k_lo, k_hi;
+                        lapx::split_range(n_bidders, t, team->size(), &k_lo, &k_hi);
+                        bid(k_lo, k_hi);
+                    };
+                    team->run(fn);
+                } else {
+                    bid(0, n_bidders);
+                }
+
+                // Resolve: every column goes to its highest bid.
+                touched.clear();
+                for (std::size_t k = 0; k < n_bidders; k++) {
+                    const int_t j = bid_col[k];
+                    if (winner[j] < 0) {
+                        touched.push_back(j);
+                    }
+                    if (bid_price[k] > best[j]) {
+                        best[j] = bid_price[k];
+                        winner[j] = bidders[k];
+                    }
+                }
+                next.clear();
+                for (std::size_t k = 0; k < n_bidders; k++) {
+                    if (winner[bid_col[k]] != bidders[k]) {
+                        next.push_back(bidders[k]);
+                    }
+                }
+                for (const int_t j : touched) {
+                    const int_t i = winner[j];
+                    if (y[j] >= 0) {
+                        x[y[j]] = -1;
+                        next.push_back(y[j]);
+                    }
+                    y[j] = i;
+                    x[i] = j;
+                    p[j] = best[j];
+                    best[j] = -std::numeric_limits<cost_t>::infinity();
+                    winner[j] = -1;
+                }
+                bidders.swap(next);
+            }
+
+            if (eps <= eps_final) {
+                break;
+            }
+            eps = std::max(eps / kEpsScaling, eps_final);
+        }
+    } catch (const std::bad_alloc &) {
+        return -1;
+    } catch (...) {
+        return -2;
+    }
+    return 0;
+}
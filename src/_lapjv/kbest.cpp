@@ -0,0 +1,343 @@
+// Copyright (c) 2025 Ratha SIV | MIT License
+
+#include <algorithm>
+#include <cstddef>
+#include <limits>
+#include <map>
+#include <memory>
+#include <new>
+#include <utility>
+#include <vector>
+
+#include "lapjv.h"
+#include "parallel.h"
+
+/**
+ * K best assignments of a dense n x n problem by Murty's partitioning.
+ *
+ * Every node of the search is a subproblem: some rows are fixed to their
+ * column, some (row, column) pairs are forbidden, and the node keeps the
+ * optimal matching x of what is left together with its column duals v.
+ * Popping the cheapest node yields the next best assignment; it is then
+ * split into children, one per free row r_c: rows r_1..r_{c-1} are fixed
+ * as in x and (r_c, x[r_c]) is forbidden. A child's matching is its
+ * parent's with row r_c freed, and every other row is still at its minimum
+ * reduced cost under the parent's v (forbidding a pair or removing fixed
+ * columns only touches r_c), so lapjv_internal(START_RESUME) re-solves it
+ * with one augmenting path instead of from scratch. The children of one
+ * node are independent and are solved on native threads.
+ *
+ * Only the first n_part rows are partitioned on. Columns n_real_cols.. are
+ * interchangeable "reject" columns (padding or cost_limit sentinels), so a
+ * row's label is its column if real and -1 otherwise; rows n_part.. are
+ * padding/sentinel rows whose matching follows from the labels. This keeps
+ * every reported assignment distinct.
+ */
+
+namespace {
+
+struct Node {
+    cost_t objective;
+    std::vector<int_t> x;                            // working column of every row
+    std::vector<cost_t> v;                           // column duals
+    std::vector<char> fixed;                         // n_part flags
+    std::vector<std::pair<int_t, int_t>> forbidden;  // (row, label), label -1 = reject
+};
+
+typedef std::multimap<std::pair<cost_t, std::size_t>, std::unique_ptr<Node>> queue_t;
+
+struct Problem {
+    uint_t n;
+    const cost_t *cost;
+    uint_t n_part;
+    uint_t n_real_cols;
+    cost_t forbid;  // stands for +inf: exceeds the cost of any feasible matching
+
+    int_t label(const int_t j) const { return j < (int_t)n_real_cols ? j : -1; }
+};
+
+
+/**
+ * Child `c` of `parent`, with `free_rows` the parent's unfixed rows in
+ * partition order. Returns null when the child has no feasible matching.
+ */
+std::unique_ptr<Node> solve_child(const Problem &p, const Node &parent,
+                                  const std::vector<int_t> &free_rows, const std::size_t c)
+{
+    const uint_t n = p.n;
+    std::unique_ptr<Node> child(new Node());
+    child->fixed = parent.fixed;
+    for (std::size_t k = 0; k < c; k++) {
+        child->fixed[free_rows[k]] = 1;
+    }
+    const int_t r = free_rows[c];
+    child->forbidden = parent.forbidden;
+    child->forbidden.emplace_back(r, p.label(parent.x[r]));
+
+    // Active rows and columns of the child, and where each column went.
+    std::vector<int_t> rows, cols, col_pos(n, -1);
+    std::vector<char> taken(n, 0);
+    cost_t fixed_cost = 0;
+    for (uint_t i = 0; i < p.n_part; i++) {
+        if (child->fixed[i]) {
+            taken[parent.x[i]] = 1;
+            fixed_cost += p.cost[(std::size_t)i * n + parent.x[i]];
+        }
+    }
+    for (uint_t i = 0; i < n; i++) {
+        if (i >= p.n_part || !child->fixed[i]) {
+            rows.push_back(i);
+        }
+        if (!taken[i]) {
+            col_pos[i] = (int_t)cols.size();
+            cols.push_back(i);
+        }
+    }
+    const uint_t m = (uint_t)rows.size();
+
+    std::vector<cost_t> sub((std::size_t)m * m);
+    std::vector<int_t> row_pos(n, -1);
+    for (uint_t a = 0; a < m; a++) {
+        const cost_t *src = p.cost + (std::size_t)rows[a] * n;
+        cost_t *dst = sub.data() + (std::size_t)a * m;
+        for (uint_t b = 0; b < m; b++) {
+            dst[b] = src[cols[b]];
+        }
+        row_pos[rows[a]] = a;
+    }
+    for (const auto &f : child->forbidden) {
+        const int_t a = row_pos[f.first];
+        if (a < 0) {
+            continue;  // the row has been fixed since
+        }
+        cost_t *dst = sub.data() + (std::size_t)a * m;
+        if (f.second >= 0) {
+            if (col_pos[f.second] >= 0) {
+                dst[col_pos[f.second]] = p.forbid;
+            }
+        } else {
+            for (uint_t b = 0; b < m; b++) {
+                if (cols[b] >= (int_t)p.n_real_cols) {
+                    dst[b] = p.forbid;
+                }
+            }
+        }
+    }
+
+    std::vector<cost_t *> ptrs(m);
+    std::vector<int_t> x(m), y(m, -1);
+    std::vector<cost_t> v(m);
+    for (uint_t a = 0; a < m; a++) {
+        ptrs[a] = sub.data() + (std::size_t)a * m;
+        x[a] = rows[a] == r ? -1 : col_pos[parent.x[rows[a]]];
+        if (x[a] >= 0) {
+            y[x[a]] = a;
+        }
+        v[a] = parent.v[cols[a]];
+    }
+    const int ret = lapjv_internal(m, ptrs.data(), x.data(), y.data(), v.data(),
+                                   START_RESUME, 1);
+    if (ret == -1) {
+        throw std::bad_alloc();
+    }
+
+    child->objective = fixed_cost;
+    child->x = parent.x;
+    child->v = parent.v;
+    for (uint_t a = 0; a < m; a++) {
+        const cost_t c_ab = ptrs[a][x[a]];
+        if (c_ab >= p.forbid) {
+            return nullptr;
+        }
+        child->objective += c_ab;
+        child->x[rows[a]] = cols[x[a]];
+        child->v[cols[a]] = v[a];
+    }
+    return child;
+}
+
+
+/**
+ * Lower bound on the objective of every child of `node`: the node's duals
+ * stay feasible for a child, and the dual of the freed row r_c can rise to
+ * its smallest reduced cost over the columns still allowed to it. Infinite
+ * when no column is left, i.e. the child has no matching.
+ */
+std::vector<cost_t> child_bounds(const Problem &p, const Node &node,
+                                 const std::vector<int_t> &free_rows)
+{
+    const uint_t n = p.n;
+    std::vector<char> gone(n, 0), blocked(n, 0);
+    for (uint_t i = 0; i < p.n_part; i++) {
+        if (node.fixed[i]) {
+            gone[node.x[i]] = 1;
+        }
+    }
+    std::vector<cost_t> bound(free_rows.size());
+    for (std::size_t c = 0; c < free_rows.size(); c++) {
+        const int_t r = free_rows[c];
+        const cost_t *cost_r = p.cost + (std::size_t)r * n;
+        const int_t own = p.label(node.x[r]);
+        bool no_reject = own < 0;
+        for (const auto &f : node.forbidden) {
+            if (f.first == r) {
+                if (f.second >= 0) {
+                    blocked[f.second] = 1;
+                } else {
+                    no_reject = true;
+                }
+            }
+        }
+        cost_t min = std::numeric_limits<cost_t>::infinity();
+        for (uint_t j = 0; j < n; j++) {
+            if (gone[j] || blocked[j] || (int_t)j == own
+                || (no_reject && j >= p.n_real_cols)) {
+                continue;
+            }
+            min = std::min(min, cost_r[j] - node.v[j]);
+        }
+        for (const auto &f : node.forbidden) {
+            if (f.first == r && f.second >= 0) {
+                blocked[f.second] = 0;
+            }
+        }
+        const cost_t u_r = cost_r[node.x[r]] - node.v[node.x[r]];
+        bound[c] = node.objective + (min - u_r);
+        gone[node.x[r]] = 1;  // r_c is fixed in the later children
+    }
+    return bound;
+}
+
+}  // namespace
+
+
+/**
+ * Up to k best assignments of the n x n row-major `cost`, cheapest first.
+ * labels (k x n_part) receives the label of every partition row (column, or
+ * -1 for a reject column), objectives the total working cost, and n_found
+ * how many assignments exist (<= k). Children are solved on n_threads
+ * threads (<= 0: all cores); the result does not depend on it.
+ */
+int kbest_internal(const uint_t n, const cost_t *cost, const uint_t n_part,
+                   const uint_t n_real_cols, const uint_t k, int_t *labels,
+                   cost_t *objectives, uint_t *n_found, int n_threads)
+{
+    *n_found = 0;
+    if (k == 0) {
+        return 0;
+    }
+    try {
+        Problem p = {n, cost, n_part, n_real_cols, 0};
+        cost_t lo = 0, hi = 0;
+        if (n > 0) {
+            lo = hi = cost[0];
+            for (std::size_t e = 1; e < (std::size_t)n * n; e++) {
+                lo = std::min(lo, cost[e]);
+                hi = std::max(hi, cost[e]);
+            }
+        }
+        // One forbidden pair already costs more than any feasible matching.
+        p.forbid = hi + (hi - lo) * (cost_t)(n + 1) + 1;
+
+        std::unique_ptr<Node> root(new Node());
+        root->x.assign(n, -1);
+        root->v.assign(n, 0);
+        root->fixed.assign(n_part, 0);
+        root->objective = 0;
+        if (n > 0) {
+            std::vector<cost_t> work(cost, cost + (std::size_t)n * n);
+            std::vector<cost_t *> ptrs(n);
+            std::vector<int_t> y(n);
+            for (uint_t i = 0; i < n; i++) {
+                ptrs[i] = work.data() + (std::size_t)i * n;
+            }
+            const int ret = lapjv_internal(n, ptrs.data(), root->x.data(), y.data(),
+                                           root->v.data(), START_COLD, n_threads);
+            if (ret != 0) {
+                return ret;
+            }
+            for (uint_t i = 0; i < n; i++) {
+                root->objective += cost[(std::size_t)i * n + root->x[i]];
+            }
+        }
+
+        // Ordered by (objective, creation order), so ties pop deterministically.
+        queue_t queue;
+        std::size_t seq = 0;
+        const cost_t key0 = root->objective;
+        queue.emplace(std::make_pair(key0, seq++), std::move(root));
+
+        while (!queue.empty() && *n_found < k) {
+            std::unique_ptr<Node> node = std::move(queue.begin()->second);
+            queue.erase(queue.begin());
+            int_t *out = labels + (std::size_t)(*n_found) * n_part;
+            for (uint_t i = 0; i < n_part; i++) {
+                out[i] = p.label(node->x[i]);
+            }
+            objectives[*n_found] = node->objective;
+            ++*n_found;
+            const std::size_t wanted = k - *n_found;
+            if (wanted == 0) {
+                break;
+            }
+
+            std::vector<int_t> free_rows;
+            for (uint_t i = 0; i < n_part; i++) {
+                if (!node->fixed[i]) {
+                    free_rows.push_back(i);
+                }
+            }
+            const std::vector<cost_t> bound = child_bounds(p, *node, free_rows);
+            std::vector<std::size_t> order;
+            for (std::size_t c = 0; c < free_rows.size(); c++) {
+                if (bound[c] < std::numeric_limits<cost_t>::infinity()) {
+                    order.push_back(c);
+                }
+            }
+            std::stable_sort(order.begin(), order.end(),
+                             [&](std::size_t a, std::size_t b) { return bound[a] < bound[b]; });
+
+            // Solve the children in waves, most promising first, and skip the
+            // rest once their bound cannot beat the `wanted` cheapest nodes.
+            const std::size_t wave = (std::size_t)lapx::resolve_threads(n_threads, order.size()) * 4;
+            std::vector<std::unique_ptr<Node>> children(free_rows.size());
+            for (std::size_t lo = 0; lo < order.size();) {
+                std::size_t hi = std::min(order.size(), lo + wave);
+                if (queue.size() >= wanted) {
+                    const cost_t worst = std::prev(queue.end())->first.first;
+                    std::size_t stop = lo;
+                    while (stop < hi && bound[order[stop]] < worst) {
+                        stop++;
+                    }
+                    hi = stop;
+                }
+                if (hi == lo) {
+                    break;
+                }
+                lapx::parallel_for_weighted(
+                    hi - lo, n_threads,
+                    [&](std::size_t w) { return (double)(n - order[lo + w]) * (n - order[lo + w]); },
+                    [&](std::size_t w) {
+                        children[order[lo + w]] = solve_child(p, *node, free_rows, order[lo + w]);
+                    });
+                for (std::size_t w = lo; w < hi; w++) {
+                    std::unique_ptr<Node> &child = children[order[w]];
+                    if (child) {
+                        const cost_t key = child->objective;
+                        queue.emplace(std::make_pair(key, seq++), std::move(child));
+                    }
+                }
+                // Nodes beyond the `wanted` cheapest can never be reported.
+                while (queue.size() > wanted) {
+                    queue.erase(std::prev(queue.end()));
+                }
+                lo = hi;
+            }
+        }
+    } catch (const std::bad_alloc &) {
+        return -1;
+    } catch (...) {
+        return -2;
+    }
+    return 0;
+}
@@ -1,31 +1,178 @@
 #include <stdio.h>
 #include <stdlib.h>
+#include <stdint.h>
 #include <string.h>
 
+#include <limits>
+#include <vector>
+
 #include "lapjv.h"
+#include "parallel.h"
+
+/**
+ * Intra-instance threading: with a lapx::Team, the O(n) inner scans over the
+ * columns of one row (column reduction, reduction transfer, the two minima
+ * of augmenting row reduction and the relaxation in _scan_dense) are split
+ * over the team once they are at least lapx::kMinParallelScan long. Each
+ * split reproduces the serial tie-breaking exactly, so the assignment is
+ * the same for any thread count. team == NULL runs everything serially.
+ */
+typedef lapx::Team team_t;
+
+
+static inline bool _split(const team_t *team, const uint_t len)
+{
+    return team != NULL && len >= lapx::kMinParallelScan;
+}
+
+
+/**
+ * "No value yet" sentinel of the dual/distance type A: infinity for floating
+ * point, the largest value for the integer kernels (exact arithmetic, so no
+ * epsilon is needed; only compared against, never added to).
+ */
+template <typename A>
+static inline A _inf()
+{
+    return std::numeric_limits<A>::has_infinity ? std::numeric_limits<A>::infinity()
+                                                : std::numeric_limits<A>::max();
+}
+
+
+/** min over j in [0, n), j != skip, of cost_i[j] - v[j] (infinity if n == 1). */
+template <typename T, typename A>
+static A _min_reduced(const uint_t n, const T *cost_i, const A *v,
+                      const uint_t skip, team_t *team)
+{
+    auto scan = [&](uint_t lo, uint_t hi) {
+        A min = _inf<A>();
+        for (uint_t j = lo; j < hi; j++) {
+            if (j == skip) {
+                continue;
+            }
+            const A c = cost_i[j] - v[j];
+            if (c < min) {
+                min = c;
+            }
+        }
+        return min;
+    };
+    if (!_split(team, n)) {
+        return scan(0, n);
+    }
+    std::vector<A> part(team->size());
+    auto fn = [&](int t) {
+        size_t lo, hi;
+        lapx::split_range(n, t, team->size(), &lo, &hi);
+        part[t] = scan((uint_t)lo, (uint_t)hi);
+    };
+    team->run(fn);
+    A min = _inf<A>();
+    for (A m : part) {
+        if (m < min) {
+            min = m;
+        }
+    }
+    return min;
+}
+
+
+/**
+ * Smallest and second smallest cost_i[j] - v[j] with their columns, with the
+ * tie-breaking of the serial scan: (v1, j1) is the first minimum, (v2, j2)
+ * the first minimum of the rest, and j2 = -1 (v2 infinite) when n == 1.
+ * The serial scan keeps the two smallest (value, column) pairs in
+ * lexicographic order, so it is enough to feed each part's two best pairs,
+ * in column order, into the state of the part before.
+ */
+template <typename T, typename A>
+static void _two_min_reduced(const uint_t n, const T *cost_i, const A *v, team_t *team,
+                             A *pv1, int_t *pj1, A *pv2, int_t *pj2)
+{
+    struct top2 { A v1, v2; int_t j1, j2; };
+    auto feed = [](top2 &s, const A c, const int_t j) {
+        if (c < s.v2) {
+            if (c >= s.v1) {
+                s.v2 = c;
+                s.j2 = j;
+            } else {
+                s.v2 = s.v1;
+                s.v1 = c;
+                s.j2 = s.j1;
+                s.j1 = j;
+            }
+        }
+    };
+    auto scan = [&](top2 &s, uint_t lo, uint_t hi) {
+        for (uint_t j = lo; j < hi; j++) {
+            feed(s, cost_i[j] - v[j], j);
+        }
+    };
+    top2 s = {cost_i[0] - v[0], _inf<A>(), 0, -1};
+    if (!_split(team, n)) {
+        scan(s, 1, n);
+    } else {
+        const A inf = _inf<A>();
+        std::vector<top2> part(team->size(), top2{inf, inf, -1, -1});
+        auto fn = [&](int t) {
+            size_t lo, hi;
+            lapx::split_range(n, t, team->size(), &lo, &hi);
+            scan(part[t], t == 0 ? 1 : (uint_t)lo, (uint_t)hi);
+        };
+        team->run(fn);
+        for (const top2 &p : part) {
+            const int_t a = p.j1 < p.j2 || p.j2 < 0 ? p.j1 : p.j2;
+            const int_t b = a == p.j1 ? p.j2 : p.j1;
+            if (a >= 0) {
+                feed(s, a == p.j1 ? p.v1 : p.v2, a);
+            }
+            if (b >= 0) {
+                feed(s, b == p.j1 ? p.v1 : p.v2, b);
+            }
+        }
+    }
+    *pv1 = s.v1;
+    *pj1 = s.j1;
+    *pv2 = s.v2;
+    *pj2 = s.j2;
+}
 
 /** Column-reduction and reduction transfer for a dense cost matrix. */
-int_t _ccrrt_dense(const uint_t n, cost_t *cost[],
-                   int_t *free_rows, int_t *x, int_t *y, cost_t *v)
+template <typename T, typename A>
+static int_t _ccrrt_dense(const uint_t n, T *cost[],
+                          int_t *free_rows, int_t *x, int_t *y, A *v, team_t *team)
 {
     int_t n_free_rows;
     boolean *unique;
 
     for (uint_t i = 0; i < n; i++) {
         x[i] = -1;
-        v[i] = LARGE;
+        v[i] = _inf<A>();
         y[i] = 0;
     }
 
-    for (uint_t i = 0; i < n; i++) {
-        for (uint_t j = 0; j < n; j++) {
-            const cost_t c = cost[i][j];
-            if (c < v[j]) {
-                v[j] = c;
-                y[j] = i;
+    // Every column's minimum is independent: split the columns.
+    auto reduce = [&](uint_t lo, uint_t hi) {
+        for (uint_t i = 0; i < n; i++) {
+            for (uint_t j = lo; j < hi; j++) {
+                const T c = cost[i][j];
+                if (c < v[j]) {
+                    v[j] = c;
+                    y[j] = i;
+                }
+                PRINTF("i=%d, j=%d, c[i,j]=%f, v[j]=%f y[j]=%d\n", i, j, c, v[j], y[j]);
             }
-            PRINTF("i=%d, j=%d, c[i,j]=%f, v[j]=%f y[j]=%d\n", i, j, c, v[j], y[j]);
         }
+    };
+    if (_split(team, n)) {
+        auto fn = [&](int t) {
+            size_t lo, hi;
+            lapx::split_range(n, t, team->size(), &lo, &hi);
+            reduce((uint_t)lo, (uint_t)hi);
+        };
+        team->run(fn);
+    } else {
+        reduce(0, n);
     }
 
     PRINT_COST_ARRAY(v, n);
@@ -52,18 +199,11 @@ int_t _ccrrt_dense(const uint_t n, cost_t *cost[],
             free_rows[n_free_rows++] = i;
         } else if (unique[i]) {
             const int_t j = x[i];
-            cost_t min = LARGE;
-            for (uint_t j2 = 0; j2 < n; j2++) {
-                if (j2 == (uint_t)j) {
-                    continue;
-                }
-                const cost_t c = cost[i][j2] - v[j2];
-                if (c < min) {
-                    min = c;
-                }
-            }
+            const A min = _min_reduced(n, cost[i], v, (uint_t)j, team);
             PRINTF("v[%d] = %f - %f\n", j, v[j], min);
-            v[j] -= min;
+            if (min < _inf<A>()) {
+                v[j] -= min;
+            }
         }
     }
 
@@ -73,8 +213,9 @@ int_t _ccrrt_dense(const uint_t n, cost_t *cost[],
 
 
 /** Augmenting row reduction for a dense cost matrix. */
-int_t _carr_dense(const uint_t n, cost_t *cost[], const uint_t n_free_rows,
-                  int_t *free_rows, int_t *x, int_t *y, cost_t *v)
+template <typename T, typename A>
+static int_t _carr_dense(const uint_t n, T *cost[], const uint_t n_free_rows,
+                         int_t *free_rows, int_t *x, int_t *y, A *v, team_t *team)
 {
     uint_t current = 0;
     int_t new_free_rows = 0;
@@ -87,35 +228,17 @@ int_t _carr_dense(const uint_t n, cost_t *cost[], const uint_t n_free_rows,
     while (current < n_free_rows) {
         int_t i0;
         int_t j1, j2;
-        cost_t v1, v2, v1_new;
+        A v1, v2, v1_new;
         boolean v1_lowers;
         rr_cnt++;
         PRINTF("current = %d rr_cnt = %d\n", current, rr_cnt);
         const int_t free_i = free_rows[current++];
-        j1 = 0;
-        v1 = cost[free_i][0] - v[0];
-        j2 = -1;
-        v2 = LARGE;
-
-        for (uint_t j = 1; j < n; j++) {
-            PRINTF("%d = %f %d = %f\n", j1, v1, j2, v2);
-            const cost_t c = cost[free_i][j] - v[j];
-            if (c < v2) {
-                if (c >= v1) {
-                    v2 = c;
-                    j2 = j;
-                } else {
-                    v2 = v1;
-                    v1 = c;
-                    j2 = j1;
-                    j1 = j;
-                }
-            }
-        }
+        _two_min_reduced(n, cost[free_i], v, team, &v1, &j1, &v2, &j2);
 
         i0 = y[j1];
-        v1_new = v[j1] - (v2 - v1);
-        v1_lowers = v1_new < v[j1];
+        // j2 < 0 (n == 1) leaves v2 at the sentinel; keep integer duals from overflowing.
+        v1_new = j2 >= 0 ? v[j1] - (v2 - v1) : v[j1];
+        v1_lowers = j2 >= 0 && v1_new < v[j1];
 
         PRINTF("%d %d 1=%d,%f 2=%d,%f v1'=%f(%d,%g) \n", 
                free_i, i0, j1, v1, j2, v2, v1_new, v1_lowers, v[j1] - v1_new);
@@ -150,10 +273,11 @@ int_t _carr_dense(const uint_t n, cost_t *cost[], const uint_t n_free_rows,
 
 
 /** Find columns with minimum d[j] and put them on the SCAN list. */
-uint_t _find_dense(const uint_t n, uint_t lo, cost_t *d, int_t *cols, int_t *y)
+template <typename A>
+static uint_t _find_dense(const uint_t n, uint_t lo, A *d, int_t *cols, int_t *y)
 {
     uint_t hi = lo + 1;
-    cost_t mind = d[cols[lo]];
+    A mind = d[cols[lo]];
 
     for (uint_t k = hi; k < n; k++) {
         int_t j = cols[k];
@@ -175,20 +299,61 @@ uint_t _find_dense(const uint_t n, uint_t lo, cost_t *d, int_t *cols, int_t *y)
  * Scan all columns in TODO starting from arbitrary column in SCAN
  * and try to decrease d of the TODO columns using the SCAN column.
  */
-int_t _scan_dense(const uint_t n, cost_t *cost[], uint_t *plo, uint_t*phi,
-                  cost_t *d, int_t *cols, int_t *pred, int_t *y, cost_t *v)
+template <typename T, typename A>
+static int_t _scan_dense(const uint_t n, T *cost[], uint_t *plo, uint_t*phi,
+                         A *d, int_t *cols, int_t *pred, int_t *y, A *v,
+                         team_t *team, std::vector<std::vector<uint_t> > &hits)
 {
     uint_t lo = *plo;
     uint_t hi = *phi;
-    cost_t h, cred_ij;
+    A h, cred_ij;
 
     while (lo != hi) {
         int_t j = cols[lo++];
         const int_t i = y[j];
-        const cost_t mind = d[j];
+        const A mind = d[j];
         h = cost[i][j] - v[j] - mind;
         PRINTF("i=%d j=%d h=%f\n", i, j, h);
 
+        if (_split(team, n - hi)) {
+            // Relax all TODO columns in parallel, recording where d drops to
+            // mind; then replay those positions in order, which is exactly
+            // what the serial loop below does with them. Relaxing columns the
+            // serial loop would skip after its early return is harmless: they
+            // are neither on the path nor among the ready columns.
+            const T *cost_i = cost[i];
+            const uint_t todo = hi;
+            auto fn = [&](int t) {
+                size_t k_lo, k_hi;
+                lapx::split_range(n - todo, t, team->size(), &k_lo, &k_hi);
+                std::vector<uint_t> &hit = hits[t];
+                hit.clear();
+                for (uint_t k = todo + (uint_t)k_lo; k < todo + (uint_t)k_hi; k++) {
+                    const int_t jk = cols[k];
+                    const A c = cost_i[jk] - v[jk] - h;
+                    if (c < d[jk]) {
+                        d[jk] = c;
+                        pred[jk] = i;
+                        if (c == mind) {
+                            hit.push_back(k);
+                        }
+                    }
+                }
+            };
+            team->run(fn);
+            for (const std::vector<uint_t> &hit : hits) {
+                for (uint_t k : hit) {
+                    j = cols[k];
+                    if (y[j] < 0) {
+                        return j;
+                    }
+                    cols[k] = cols[hi];
+                    cols[hi++] = j;
+                }
+            }
+            continue;
+        }
+
         // For all columns in TODO
         for (uint_t k = hi; k < n; k++) {
             j = cols[k];
@@ -218,17 +383,19 @@ int_t _scan_dense(const uint_t n, cost_t *cost[], uint_t *plo, uint_t*phi,
  * This is a dense matrix version.
  * @return The closest free column index.
  */
-int_t find_path_dense(const uint_t n, cost_t *cost[], const int_t start_i, 
-                      int_t *y, cost_t *v, int_t *pred)
+template <typename T, typename A>
+static int_t find_path_dense(const uint_t n, T *cost[], const int_t start_i, 
+                             int_t *y, A *v, int_t *pred,
+                             team_t *team, std::vector<std::vector<uint_t> > &hits)
 {
     uint_t lo = 0, hi = 0;
     int_t final_j = -1;
     uint_t n_ready = 0;
     int_t *cols;
-    cost_t *d;
+    A *d;
 
     NEW(cols, int_t, n);
-    NEW(d, cost_t, n);
+    NEW(d, A, n);
 
     for (uint_t i = 0; i < n; i++) {
         cols[i] = i;
@@ -258,7 +425,7 @@ int_t find_path_dense(const uint_t n, cost_t *cost[], const int_t start_i,
         if (final_j == -1) {
             PRINTF("%d..%d -> scan\n", lo, hi);
             final_j = _scan_dense(
-                    n, cost, &lo, &hi, d, cols, pred, y, v);
+                    n, cost, &lo, &hi, d, cols, pred, y, v, team, hits);
             PRINT_COST_ARRAY(d, n);
             PRINT_INDEX_ARRAY(cols, n);
             PRINT_INDEX_ARRAY(pred, n);
@@ -268,7 +435,7 @@ int_t find_path_dense(const uint_t n, cost_t *cost[], const int_t start_i,
     PRINTF("found final_j=%d\n", final_j);
     PRINT_INDEX_ARRAY(cols, n);
     {
-        const cost_t mind = d[cols[lo]];
+        const A mind = d[cols[lo]];
         for (uint_t k = 0; k < n_ready; k++) {
             const int_t j = cols[k];
             v[j] += d[j] - mind;
@@ -283,10 +450,12 @@ int_t find_path_dense(const uint_t n, cost_t *cost[], const int_t start_i,
 
 
 /** Augment for a dense cost matrix. */
-int_t _ca_dense(const uint_t n, cost_t *cost[], const uint_t n_free_rows,
-                int_t *free_rows, int_t *x, int_t *y, cost_t *v)
+template <typename T, typename A>
+static int_t _ca_dense(const uint_t n, T *cost[], const uint_t n_free_rows,
+                       int_t *free_rows, int_t *x, int_t *y, A *v, team_t *team)
 {
     int_t *pred;
+    std::vector<std::vector<uint_t> > hits(team != NULL ? team->size() : 0);
 
     NEW(pred, int_t, n);
 
@@ -295,7 +464,7 @@ int_t _ca_dense(const uint_t n, cost_t *cost[], const uint_t n_free_rows,
         uint_t k = 0;
 
         PRINTF("looking at free_i=%d\n", *pfree_i);
-        j = find_path_dense(n, cost, *pfree_i, y, v, pred);
+        j = find_path_dense(n, cost, *pfree_i, y, v, pred, team, hits);
         ASSERT(j >= 0);
         ASSERT(j < n);
 
@@ -319,28 +488,466 @@ int_t _ca_dense(const uint_t n, cost_t *cost[], const uint_t n_free_rows,
 }
 
 
-/** Solve dense sparse LAP. */
-int lapjv_internal(const uint_t n, cost_t *cost[], int_t *x, int_t *y)
+/**
+ * Warm start from given column duals v: every row whose cheapest reduced
+ * cost cost[i][j] - v[j] sits in a still free column j takes that (tight)
+ * column, the other rows are left free for augmenting row reduction.
+ */
+template <typename T, typename A>
+static int_t _warm_dense(const uint_t n, T *cost[], int_t *free_rows,
+                         int_t *x, int_t *y, const A *v)
+{
+    int_t n_free_rows = 0;
+
+    for (uint_t j = 0; j < n; j++) {
+        y[j] = -1;
+    }
+    for (uint_t i = 0; i < n; i++) {
+        const T *ci = cost[i];
+        uint_t j_min = 0;
+        A h_min = ci[0] - v[0];
+        for (uint_t j = 1; j < n; j++) {
+            const A h = ci[j] - v[j];
+            if (h < h_min) {
+                h_min = h;
+                j_min = j;
+            }
+        }
+        if (y[j_min] < 0) {
+            x[i] = j_min;
+            y[j_min] = i;
+        } else {
+            x[i] = -1;
+            free_rows[n_free_rows++] = i;
+        }
+    }
+    return n_free_rows;
+}
+
+
+/**
+ * Solve dense sparse LAP. With n_threads != 1 and n >= lapx::kMinParallelScan
+ * the inner scans run on a team of n_threads threads (<= 0: all cores).
+ *
+ * v (may be NULL) receives the column duals of the solution. With start
+ * START_WARM, v must hold initial column duals (e.g. from a previous solve
+ * of a similar matrix): the column reduction is skipped and every row whose
+ * cheapest column is still free starts matched to it (see _warm_dense). Any
+ * v is a valid start, so the result is still optimal; good prices leave
+ * little work. With START_RESUME, x/y also hold a partial matching in which
+ * every matched row i is at its minimum cost[i][x[i]] - v[x[i]] (e.g. an
+ * optimal solution with a few rows unmatched after an edit); only the rows
+ * with x[i] < 0 are then (re)assigned.
+ */
+template <typename T, typename A>
+static int _lapjv_dense(const uint_t n, T *cost[], int_t *x, int_t *y,
+                        A *v, char start, int n_threads)
 {
     int ret;
     int_t *free_rows;
-    cost_t *v;
+    A *v_own = NULL;
+    team_t *team = NULL;
 
     NEW(free_rows, int_t, n);
-    NEW(v, cost_t, n);
-    ret = _ccrrt_dense(n, cost, free_rows, x, y, v);
+    if (v == NULL) {
+        if ((v_own = (A *)malloc(sizeof(A) * n)) == 0) {
+            FREE(free_rows);
+            return -1;
+        }
+        v = v_own;
+        start = START_COLD;
+    }
+    if (n_threads != 1 && n >= lapx::kMinParallelScan) {
+        try {
+            team = new team_t(n_threads);
+        } catch (...) {
+            team = NULL;  // fall back to the serial path
+        }
+        if (team != NULL && team->size() == 1) {
+            delete team;
+            team = NULL;
+        }
+    }
+
+    if (start == START_RESUME) {
+        ret = 0;
+        for (uint_t i = 0; i < n; i++) {
+            if (x[i] < 0) {
+                free_rows[ret++] = i;
+            }
+        }
+    } else if (start == START_WARM) {
+        ret = _warm_dense(n, cost, free_rows, x, y, v);
+    } else {
+        ret = _ccrrt_dense(n, cost, free_rows, x, y, v, team);
+    }
     int i = 0;
 
     while (ret > 0 && i < 2) {
-        ret = _carr_dense(n, cost, ret, free_rows, x, y, v);
+        ret = _carr_dense(n, cost, ret, free_rows, x, y, v, team);
         i++;
     }
 
     if (ret > 0) {
-        ret = _ca_dense(n, cost, ret, free_rows, x, y, v);
+        ret = _ca_dense(n, cost, ret, free_rows, x, y, v, team);
     }
 
-    FREE(v);
+    delete team;
+
+    FREE(v_own);
     FREE(free_rows);
     return ret;
 }
+
+int lapjv_internal(const uint_t n, cost_t *cost[], int_t *x, int_t *y,
+                   cost_t *v, char start, int n_threads)
+{
+    return _lapjv_dense(n, cost, x, y, v, start, n_threads);
+}
+
+
+/**
+ * lapjv_internal for integer costs: the duals and path lengths are int64_t
+ * and all arithmetic is exact, so ties are resolved without any epsilon.
+ * int32 costs cannot overflow; int64 costs need differences of duals and
+ * costs to stay within int64 (|cost| below about 2**62 / n is safe).
+ */
+int lapjv_internal_i32(const uint_t n, int32_t *cost[], int_t *x, int_t *y,
+                       int64_t *v, char start, int n_threads)
+{
+    return _lapjv_dense(n, cost, x, y, v, start, n_threads);
+}
+
+
+int lapjv_internal_i64(const uint_t n, int64_t *cost[], int_t *x, int_t *y,
+                       int64_t *v, char start, int n_threads)
+{
+    return _lapjv_dense(n, cost, x, y, v, start, n_threads);
+}
+
+
+/**
+ * lapjv_internal in float32: costs, duals and path lengths are all float,
+ * which halves the memory traffic. Optimal up to float32 rounding.
+ */
+int lapjv_internal_f32(const uint_t n, float *cost[], int_t *x, int_t *y,
+                       float *v, char start, int n_threads)
+{
+    return _lapjv_dense(n, cost, x, y, v, start, n_threads);
+}
+
+
+/**
+ * Shortest augmenting path from the free row s for _sap_solve, in the
+ * shifted costs c[i][j] - shift (duals: v_j <= 0, and v_j < 0 only on
+ * assigned columns). With `rejects`, every row may also leave to an implicit
+ * "reject" at cost 0 (u_i <= 0). Updates u/v so the path becomes tight and
+ * augments along it; the path ends in a free column or in the reject of
+ * some row on it, whose column is then passed back towards s.
+ */
+template <typename T, typename A>
+static void _sap_path(const uint_t n_cols, T *cost[], const A shift,
+                      const boolean rejects, const int_t s, int_t *x, int_t *y,
+                      A *u, A *v, std::vector<int_t> &cols, std::vector<A> &d,
+                      std::vector<int_t> &pred, std::vector<A> &row_d,
+                      std::vector<int_t> &tree, team_t *team)
+{
+    const A inf = _inf<A>();
+    for (uint_t j = 0; j < n_cols; j++) {
+        cols[j] = j;
+        d[j] = inf;
+    }
+    tree.clear();
+    A best_reject = inf;  // distance to the reject of row reject_i
+    int_t reject_i = -1;
+    int_t final_j = -1;
+    A dist = 0;           // label of the row being expanded
+    int_t i = s;
+    uint_t lo = 0;
+    A D;
+
+    for (;;) {
+        // Expand row i: its reject, then relax the unscanned columns while
+        // looking for the next closest one (first free, else first in `cols`
+        // order on ties).
+        row_d[i] = dist;
+        tree.push_back(i);
+        if (rejects && dist - u[i] < best_reject) {
+            best_reject = dist - u[i];
+            reject_i = i;
+        }
+        const T *ci = cost[i];
+        const A h = dist - shift - u[i];
+        auto relax = [&](uint_t k_lo, uint_t k_hi, A *pmin, uint_t *pk) {
+            A min = inf;
+            uint_t k_min = k_hi;
+            for (uint_t k = k_lo; k < k_hi; k++) {
+                const int_t j = cols[k];
+                const A c = ci[j] - v[j] + h;
+                if (c < d[j]) {
+                    d[j] = c;
+                    pred[j] = i;
+                }
+                // Ties go to a free column, which ends the path at once.
+                if (d[j] < min || (d[j] == min && min < inf && y[j] < 0 && y[cols[k_min]] >= 0)) {
+                    min = d[j];
+                    k_min = k;
+                }
+            }
+            *pmin = min;
+            *pk = k_min;
+        };
+        A min;
+        uint_t k_min;
+        if (_split(team, n_cols - lo)) {
+            std::vector<A> part_min(team->size());
+            std::vector<uint_t> part_k(team->size());
+            auto fn = [&](int t) {
+                size_t k_lo, k_hi;
+                lapx::split_range(n_cols - lo, t, team->size(), &k_lo, &k_hi);
+                relax(lo + (uint_t)k_lo, lo + (uint_t)k_hi, &part_min[t], &part_k[t]);
+            };
+            team->run(fn);
+            min = inf;
+            k_min = n_cols;
+            for (int t = 0; t < team->size(); t++) {
+                if (part_min[t] < min || (part_min[t] == min && min < inf &&
+                                          y[cols[part_k[t]]] < 0 && y[cols[k_min]] >= 0)) {
+                    min = part_min[t];
+                    k_min = part_k[t];
+                }
+            }
+        } else {
+            relax(lo, n_cols, &min, &k_min);
+        }
+
+        if (k_min >= n_cols && !rejects) {
+            // Only infinite costs left: take the next column anyway, like
+            // the square kernel does, and leave the duals alone below.
+            k_min = lo;
+            pred[cols[lo]] = i;
+        }
+        if (k_min >= n_cols || best_reject < min) {
+            D = best_reject;
+            break;
+        }
+        const int_t j = cols[k_min];
+        cols[k_min] = cols[lo];
+        cols[lo++] = j;
+        if (y[j] < 0) {
+            D = min;
+            final_j = j;
+            break;
+        }
+        i = y[j];
+        dist = min;
+    }
+
+    // Dual update: scanned columns and the rows of the tree move by D minus
+    // their label, which keeps all reduced costs >= 0 and makes the path tight.
+    if (D < inf) {
+        const uint_t n_scanned = final_j >= 0 ? lo - 1 : lo;
+        for (uint_t k = 0; k < n_scanned; k++) {
+            const int_t j = cols[k];
+            v[j] -= D - d[j];
+        }
+        for (const int_t r : tree) {
+            u[r] += D - row_d[r];
+        }
+    }
+
+    int_t j = final_j;
+    if (j < 0) {
+        // Ends in a reject: that row leaves its column to its predecessor.
+        j = x[reject_i];
+        x[reject_i] = -1;
+        if (reject_i == s) {
+            return;
+        }
+    }
+    for (;;) {
+        const int_t r = pred[j];
+        y[j] = r;
+        SWAP_INDICES(j, x[r]);
+        if (r == s) {
+            break;
+        }
+    }
+}
+
+
+/**
+ * Shortest augmenting path solver shared by lapjv_reject_internal and
+ * lapjv_rect_internal, working directly on the n_rows x n_cols rows of
+ * `cost` shifted by -shift. Without `rejects` every row is assigned, which
+ * needs n_rows <= n_cols. Duals are written as u + offset / v + offset.
+ */
+template <typename T, typename A>
+static int _sap_solve(const uint_t n_rows, const uint_t n_cols, T *cost[],
+                      const A shift, const boolean rejects, const A offset,
+                      int_t *x, int_t *y, A *u, A *v, int n_threads)
+{
+    team_t *team = NULL;
+    try {
+        const A inf = _inf<A>();
+        std::vector<A> u_w(n_rows), v_w(n_cols, 0);
+        std::vector<int_t> free_rows;
+
+        for (uint_t j = 0; j < n_cols; j++) {
+            y[j] = -1;
+        }
+        // Row reduction (capped by the free reject, if any); each row takes
+        // its cheapest column if it is still free (and beats the reject).
+        for (uint_t i = 0; i < n_rows; i++) {
+            const T *ci = cost[i];
+            int_t j_min = -1;
+            A h_min = rejects ? 0 : inf;
+            for (uint_t j = 0; j < n_cols; j++) {
+                const A h = ci[j] - shift;
+                if (h < h_min) {
+                    h_min = h;
+                    j_min = j;
+                }
+            }
+            x[i] = -1;
+            u_w[i] = j_min < 0 ? 0 : h_min;
+            if (j_min < 0) {
+                if (!rejects) {
+                    free_rows.push_back(i);  // only infinite costs
+                }
+                continue;
+            }
+            if (y[j_min] < 0) {
+                x[i] = j_min;
+                y[j_min] = i;
+            } else {
+                free_rows.push_back(i);
+            }
+        }
+
+        if (!free_rows.empty()) {
+            if (n_threads != 1 && n_cols >= lapx::kMinParallelScan) {
+                try {
+                    team = new team_t(n_threads);
+                } catch (...) {
+                    team = NULL;  // fall back to the serial path
+                }
+                if (team != NULL && team->size() == 1) {
+                    delete team;
+                    team = NULL;
+                }
+            }
+            std::vector<int_t> cols(n_cols), pred(n_cols), tree;
+            std::vector<A> d(n_cols), row_d(n_rows);
+            for (const int_t s : free_rows) {
+                _sap_path(n_cols, cost, shift, rejects, s, x, y, u_w.data(), v_w.data(),
+                          cols, d, pred, row_d, tree, team);
+            }
+            delete team;
+            team = NULL;
+        }
+
+        if (u != NULL) {
+            for (uint_t i = 0; i < n_rows; i++) {
+                u[i] = u_w[i] + offset;
+            }
+        }
+        if (v != NULL) {
+            for (uint_t j = 0; j < n_cols; j++) {
+                v[j] = v_w[j] + offset;
+            }
+        }
+    } catch (const std::bad_alloc &) {
+        delete team;
+        return -1;
+    } catch (...) {
+        delete team;
+        return -2;
+    }
+    return 0;
+}
+
+
+/**
+ * Solve a dense n_rows x n_cols LAP in which every row and column may stay
+ * unassigned at a cost of cost_limit / 2 (as lapjv's cost_limit does with
+ * the (n_rows + n_cols)^2 augmented matrix), directly on the rows of `cost`.
+ * Subtracting cost_limit from every cost turns this into assigning each row
+ * to a column or to a free reject, which needs no extra matrix.
+ *
+ * x/y receive the assignment (-1 = unassigned). u and v (may be NULL)
+ * receive duals with u[i] + v[j] <= cost[i][j], equality on assigned pairs
+ * and u[i] = cost_limit / 2 (v[j] = cost_limit / 2) on unassigned rows
+ * (columns). With n_threads != 1 the column scans of wide problems run on a
+ * team of threads; the result does not depend on it.
+ */
+int lapjv_reject_internal(const uint_t n_rows, const uint_t n_cols, cost_t *cost[],
+                          const cost_t cost_limit, int_t *x, int_t *y,
+                          cost_t *u, cost_t *v, int n_threads)
+{
+    return _sap_solve<cost_t, cost_t>(n_rows, n_cols, cost, cost_limit, TRUE, cost_limit / 2,
+                                      x, y, u, v, n_threads);
+}
+
+
+/** lapjv_reject_internal in float32 (see lapjv_internal_f32). */
+int lapjv_reject_internal_f32(const uint_t n_rows, const uint_t n_cols, float *cost[],
+                              const float cost_limit, int_t *x, int_t *y,
+                              float *u, float *v, int n_threads)
+{
+    return _sap_solve<float, float>(n_rows, n_cols, cost, cost_limit, TRUE, cost_limit / 2,
+                                    x, y, u, v, n_threads);
+}
+
+
+/**
+ * Solve a dense rectangular LAP with n_rows <= n_cols directly on the rows
+ * of `cost`: every row is assigned and n_cols - n_rows columns stay free,
+ * as when zero-padding to a square matrix, but in O(n_rows^2 n_cols) time
+ * and without the padded copy.
+ *
+ * x/y receive the assignment (y = -1 on free columns). u and v (may be
+ * NULL) receive duals with u[i] + v[j] <= cost[i][j], equality on assigned
+ * pairs, and v[j] = 0 >= v[k] for every free column j and assigned k.
+ * n_threads is used as in lapjv_reject_internal.
+ */
+int lapjv_rect_internal(const uint_t n_rows, const uint_t n_cols, cost_t *cost[],
+                        int_t *x, int_t *y, cost_t *u, cost_t *v, int n_threads)
+{
+    if (n_rows > n_cols) {
+        return -3;
+    }
+    return _sap_solve<cost_t, cost_t>(n_rows, n_cols, cost, 0, FALSE, 0, x, y, u, v, n_threads);
+}
+
+
+/** lapjv_rect_internal for integer costs, with exact int64_t duals (see lapjv_internal_i32). */
+int lapjv_rect_internal_i32(const uint_t n_rows, const uint_t n_cols, int32_t *cost[],
+                            int_t *x, int_t *y, int64_t *u, int64_t *v, int n_threads)
+{
+    if (n_rows > n_cols) {
+        return -3;
+    }
+    return _sap_solve<int32_t, int64_t>(n_rows, n_cols, cost, 0, FALSE, 0, x, y, u, v, n_threads);
+}
+
+
+int lapjv_rect_internal_i64(const uint_t n_rows, const uint_t n_cols, int64_t *cost[],
+                            int_t *x, int_t *y, int64_t *u, int64_t *v, int n_threads)
+{
+    if (n_rows > n_cols) {
+        return -3;
+    }
+    return _sap_solve<int64_t, int64_t>(n_rows, n_cols, cost, 0, FALSE, 0, x, y, u, v, n_threads);
+}
+
+
+/** lapjv_rect_internal in float32 (see lapjv_internal_f32). */
+int lapjv_rect_internal_f32(const uint_t n_rows, const uint_t n_cols, float *cost[],
+                            int_t *x, int_t *y, float *u, float *v, int n_threads)
+{
+    if (n_rows > n_cols) {
+        return -3;
+    }
+    return _sap_solve<float, float>(n_rows, n_cols, cost, 0, FALSE, 0, x, y, u, v, n_threads);
+}
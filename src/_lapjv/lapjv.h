@@ -1,6 +1,9 @@
 #ifndef LAPJV_H
 #define LAPJV_H
 
+#include <cstddef>
+#include <stdint.h>
+
 #define LARGE 1000000
 
 #if !defined TRUE
@@ -16,6 +19,7 @@
 
 #if 0
 #include <assert.h>
+#include <stdint.h>
 #define ASSERT(cond) assert(cond)
 #define PRINTF(fmt, ...) printf(fmt, ##__VA_ARGS__)
 #define PRINT_COST_ARRAY(a, n) \
@@ -56,12 +60,210 @@ typedef double cost_t;
 typedef char boolean;
 typedef enum fp_t { FP_1 = 1, FP_2 = 2, FP_DYNAMIC = 3 } fp_t;
 
+/* How lapjv_internal starts: from scratch, from the column duals in v, or
+ * from a partial matching x/y whose matched rows are tight under v. */
+#define START_COLD 0
+#define START_WARM 1
+#define START_RESUME 2
+
 extern int_t lapjv_internal(
     const uint_t n, cost_t *cost[],
-    int_t *x, int_t *y);
+    int_t *x, int_t *y, cost_t *v, char start, int n_threads);
+
+/* Integer costs, solved exactly with int64_t duals. */
+extern int lapjv_internal_i32(
+    const uint_t n, int32_t *cost[],
+    int_t *x, int_t *y, int64_t *v, char start, int n_threads);
+
+extern int lapjv_internal_i64(
+    const uint_t n, int64_t *cost[],
+    int_t *x, int_t *y, int64_t *v, char start, int n_threads);
+
+/* float32 costs, duals and path lengths. */
+extern int lapjv_internal_f32(
+    const uint_t n, float *cost[],
+    int_t *x, int_t *y, float *v, char start, int n_threads);
+
+extern int lapjv_reject_internal(
+    const uint_t n_rows, const uint_t n_cols, cost_t *cost[],
+    const cost_t cost_limit, int_t *x, int_t *y,
+    cost_t *u, cost_t *v, int n_threads);
+
+extern int lapjv_reject_internal_f32(
+    const uint_t n_rows, const uint_t n_cols, float *cost[],
+    const float cost_limit, int_t *x, int_t *y,
+    float *u, float *v, int n_threads);
+
+extern int lapjv_rect_internal(
+    const uint_t n_rows, const uint_t n_cols, cost_t *cost[],
+    int_t *x, int_t *y, cost_t *u, cost_t *v, int n_threads);
+
+extern int lapjv_rect_internal_i32(
+    const uint_t n_rows, const uint_t n_cols, int32_t *cost[],
+    int_t *x, int_t *y, int64_t *u, int64_t *v, int n_threads);
+
+extern int lapjv_rect_internal_i64(
+    const uint_t n_rows, const uint_t n_cols, int64_t *cost[],
+    int_t *x, int_t *y, int64_t *u, int64_t *v, int n_threads);
+
+extern int lapjv_rect_internal_f32(
+    const uint_t n_rows, const uint_t n_cols, float *cost[],
+    int_t *x, int_t *y, float *u, float *v, int n_threads);
+
+/* Whether lapjv_rect_internal should solve an n_rows x n_cols problem
+ * (n_rows <= n_cols): closer to square than 2:3, JV on the zero-padded
+ * square matrix is faster. */
+static inline int lapjv_prefer_rect(const uint_t n_rows, const uint_t n_cols)
+{
+    return n_rows < n_cols && 2 * (double)n_cols >= 3 * (double)n_rows;
+}
 
 extern int_t lapmod_internal(
     const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
-    int_t *x, int_t *y, fp_t fp_version);
+    int_t *x, int_t *y, cost_t *v, fp_t fp_version);
+
+extern int lapmod_internal_f32(
+    const uint_t n, float *cc, uint_t *ii, uint_t *kk,
+    int_t *x, int_t *y, cost_t *v, fp_t fp_version);
+
+/* The _i64 variants of the sparse functions take 64-bit ii/kk. */
+extern int lapmod_internal_i64(
+    const uint_t n, cost_t *cc, uint64_t *ii, uint64_t *kk,
+    int_t *x, int_t *y, cost_t *v, fp_t fp_version);
+
+extern int lapmod_internal_f32_i64(
+    const uint_t n, float *cc, uint64_t *ii, uint64_t *kk,
+    int_t *x, int_t *y, cost_t *v, fp_t fp_version);
+
+/* Rectangular sparse LAP (n_rows <= n_cols) without squaring it up; rows
+ * that cannot be assigned keep x = -1. u/v may be NULL. 0 or -1 (memory). */
+extern int lapmod_rect_internal(
+    const uint_t n_rows, const uint_t n_cols, cost_t *cc, uint_t *ii, uint_t *kk,
+    int_t *x, int_t *y, cost_t *u, cost_t *v);
+
+extern int lapmod_rect_internal_f32(
+    const uint_t n_rows, const uint_t n_cols, float *cc, uint_t *ii, uint_t *kk,
+    int_t *x, int_t *y, cost_t *u, cost_t *v);
+
+extern int lapmod_rect_internal_i64(
+    const uint_t n_rows, const uint_t n_cols, cost_t *cc, uint64_t *ii, uint64_t *kk,
+    int_t *x, int_t *y, cost_t *u, cost_t *v);
+
+extern int lapmod_rect_internal_f32_i64(
+    const uint_t n_rows, const uint_t n_cols, float *cc, uint64_t *ii, uint64_t *kk,
+    int_t *x, int_t *y, cost_t *u, cost_t *v);
+
+/* 0 if the nnz stored costs are in [0, LARGE); -4 (negative), -5 (>= LARGE). */
+extern int lapmod_check(const std::size_t nnz, const cost_t *cc);
+
+extern int lapmod_check_f32(const std::size_t nnz, const float *cc);
+
+/* Sum of the assigned stored costs; +inf when x[i] is not stored in row i. */
+extern cost_t lapmod_total(
+    const uint_t n, const cost_t *cc, const uint_t *ii, const uint_t *kk,
+    const int_t *x);
+
+extern cost_t lapmod_total_f32(
+    const uint_t n, const float *cc, const uint_t *ii, const uint_t *kk,
+    const int_t *x);
+
+extern cost_t lapmod_total_i64(
+    const uint_t n, const cost_t *cc, const uint64_t *ii, const uint64_t *kk,
+    const int_t *x);
+
+extern cost_t lapmod_total_f32_i64(
+    const uint_t n, const float *cc, const uint64_t *ii, const uint64_t *kk,
+    const int_t *x);
+
+/* CSR transpose (also CSC -> CSR); output rows have sorted column indices. */
+extern void lapmod_transpose(
+    const uint_t n_rows, const uint_t n_cols, const cost_t *cc,
+    const uint_t *ii, const uint_t *kk,
+    cost_t *cc_t, uint_t *ii_t, uint_t *kk_t);
+
+extern void lapmod_transpose_f32(
+    const uint_t n_rows, const uint_t n_cols, const float *cc,
+    const uint_t *ii, const uint_t *kk,
+    float *cc_t, uint_t *ii_t, uint_t *kk_t);
+
+extern void lapmod_transpose_i64(
+    const uint_t n_rows, const uint_t n_cols, const cost_t *cc,
+    const uint64_t *ii, const uint64_t *kk,
+    cost_t *cc_t, uint64_t *ii_t, uint64_t *kk_t);
+
+extern void lapmod_transpose_f32_i64(
+    const uint_t n_rows, const uint_t n_cols, const float *cc,
+    const uint64_t *ii, const uint64_t *kk,
+    float *cc_t, uint64_t *ii_t, uint64_t *kk_t);
+
+/* Gate a dense cost matrix into CSR: fills the 64-bit ii and *nnz and
+ * returns the entries (NULL when out of memory); lapmod_gate_collect copies
+ * them to cc/kk (NULL: drop them) and frees them. */
+extern void *lapmod_gate(
+    const uint_t n_rows, const uint_t n_cols, const cost_t *cost,
+    const cost_t threshold, const uint_t topk, uint64_t *ii,
+    std::size_t *nnz, int n_threads);
+
+extern void *lapmod_gate_f32(
+    const uint_t n_rows, const uint_t n_cols, const float *cost,
+    const float threshold, const uint_t topk, uint64_t *ii,
+    std::size_t *nnz, int n_threads);
+
+extern void lapmod_gate_collect(void *gated, cost_t *cc, uint_t *kk);
+
+extern void lapmod_gate_collect_f32(void *gated, float *cc, uint_t *kk);
+
+extern void lapmod_gate_collect_i64(void *gated, cost_t *cc, uint64_t *kk);
+
+extern void lapmod_gate_collect_f32_i64(void *gated, float *cc, uint64_t *kk);
+
+/* CSR from an edge list, columns sorted and duplicates merged to their
+ * minimum cost; cc/kk must hold nnz entries. 0, -1 (out of memory) or -2
+ * (index out of range). */
+extern int lapmod_edges(
+    const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+    const int64_t *rows, const int64_t *cols, const cost_t *costs,
+    cost_t *cc, uint_t *ii, uint_t *kk, std::size_t *nnz_out);
+
+extern int lapmod_edges_f32(
+    const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+    const int64_t *rows, const int64_t *cols, const float *costs,
+    float *cc, uint_t *ii, uint_t *kk, std::size_t *nnz_out);
+
+extern int lapmod_edges_i64(
+    const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+    const int64_t *rows, const int64_t *cols, const cost_t *costs,
+    cost_t *cc, uint64_t *ii, uint64_t *kk, std::size_t *nnz_out);
+
+extern int lapmod_edges_f32_i64(
+    const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+    const int64_t *rows, const int64_t *cols, const float *costs,
+    float *cc, uint64_t *ii, uint64_t *kk, std::size_t *nnz_out);
+
+extern int lapjv_batch_internal(
+    const uint_t n_batch, const uint_t n_rows, const uint_t n_cols,
+    const cost_t *costs, const cost_t cost_limit,
+    int_t *x, int_t *y, cost_t *totals, int n_threads,
+    const cost_t *init_v, cost_t *u, cost_t *v);
+
+extern int lapjv_ragged_internal(
+    const uint_t n_batch, const cost_t *const *costs,
+    const uint_t *n_rows, const uint_t *n_cols, const cost_t cost_limit,
+    int_t *x, int_t *y, cost_t *totals, int n_threads,
+    const cost_t *const *init_v, cost_t *u, cost_t *v);
+
+extern int lapmod_batch_internal(
+    const uint_t n_batch, const uint_t *n, cost_t *const *cc,
+    uint_t *const *ii, uint_t *const *kk, fp_t fp_version,
+    int_t *x, int_t *y, cost_t *totals, int n_threads);
+
+extern int auction_internal(
+    const uint_t n, const cost_t *cost, const cost_t eps_final,
+    int_t *x, int_t *y, int n_threads);
+
+extern int kbest_internal(
+    const uint_t n, const cost_t *cost, const uint_t n_part,
+    const uint_t n_real_cols, const uint_t k, int_t *labels,
+    cost_t *objectives, uint_t *n_found, int n_threads);
 
 #endif // LAPJV_H
@@ -0,0 +1,358 @@
+// Copyright (c) 2025 Ratha SIV | MIT License
+
+#include <algorithm>
+#include <atomic>
+#include <cstddef>
+#include <limits>
+#include <new>
+#include <vector>
+
+#include "lapjv.h"
+#include "parallel.h"
+
+/**
+ * Initial working column duals from column duals init_v of the ORIGINAL
+ * matrix. When the kernel solves the transpose, its columns are the original
+ * rows and get the row reduction min_j(a[i][j] - init_v[j]) instead. Extra
+ * columns of the augmented matrix start at 0; any start is valid.
+ */
+static void _warm_v(const uint_t n_rows0, const uint_t n_cols0, const cost_t *a,
+                    const cost_t *init_v, const boolean transposed,
+                    const uint_t N, cost_t *v)
+{
+    uint_t C;
+    if (transposed) {
+        for (uint_t i = 0; i < n_rows0; i++) {
+            const cost_t *ai = a + (std::size_t)i * n_cols0;
+            cost_t m = ai[0] - init_v[0];
+            for (uint_t j = 1; j < n_cols0; j++) {
+                m = std::min(m, ai[j] - init_v[j]);
+            }
+            v[i] = m;
+        }
+        C = n_rows0;
+    } else {
+        std::copy(init_v, init_v + n_cols0, v);
+        C = n_cols0;
+    }
+    std::fill(v + C, v + N, 0.0);
+}
+
+
+/**
+ * Duals of the solved working problem, restricted to the real rows/columns
+ * and mapped to the ORIGINAL orientation: u of a working row is the reduced
+ * cost of its match, which the JV invariants make its row minimum.
+ */
+static void _duals(const uint_t R, const uint_t C, cost_t *const *rows,
+                   const int_t *x, const cost_t *v, const boolean transposed,
+                   cost_t *u_out, cost_t *v_out)
+{
+    cost_t *row_duals = transposed ? v_out : u_out;
+    cost_t *col_duals = transposed ? u_out : v_out;
+    for (uint_t i = 0; i < R; i++) {
+        row_duals[i] = rows[i][x[i]] - v[x[i]];
+    }
+    std::copy(v, v + C, col_duals);
+}
+
+
+/**
+ * Solve one (n_rows0, n_cols0) instance the same way lapjv()/lapjvx() do in
+ * Cython: a finite cost_limit without init_v goes to lapjv_reject_internal on
+ * the input rows; otherwise normalize orientation so the kernel sees rows <=
+ * cols, and run lapjv_rect_internal on rectangular inputs or lapjv_internal on
+ * the square, augmented (cost_limit < inf) or zero-padded (warm rectangular) one
+ * and map the result back to the ORIGINAL orientation as lapjv-style mapping
+ * vectors. The total is accumulated from the original
+ * costs. Working buffers are thread_local and reused across instances.
+ *
+ * init_v (n_cols0 entries, may be NULL) warm-starts the solve from column
+ * duals in the ORIGINAL orientation; see _warm_v. u/v (n_rows0/n_cols0
+ * entries, may be NULL) receive the row/column duals of the solution in the
+ * ORIGINAL orientation: u[i] + v[j] <= a[i][j], with equality on matches.
+ */
+static int _lapjv_solve_one(const uint_t n_rows0, const uint_t n_cols0, const cost_t *a,
+                            const cost_t cost_limit,
+                            int_t *x_out, int_t *y_out, cost_t *total,
+                            const cost_t *init_v = NULL,
+                            cost_t *u_out = NULL, cost_t *v_out = NULL)
+{
+    static thread_local std::vector<cost_t> work;
+    static thread_local std::vector<cost_t *> rows;
+    static thread_local std::vector<int_t> x_c, y_c;
+    static thread_local std::vector<cost_t> v_c;
+
+    for (uint_t i = 0; i < n_rows0; i++) {
+        x_out[i] = -1;
+    }
+    for (uint_t j = 0; j < n_cols0; j++) {
+        y_out[j] = -1;
+    }
+    *total = 0;
+    if (n_rows0 == 0 || n_cols0 == 0) {
+        if (u_out != NULL && v_out != NULL) {
+            std::fill(u_out, u_out + n_rows0, 0.0);
+            std::fill(v_out, v_out + n_cols0, 0.0);
+        }
+        return 0;
+    }
+
+    if (cost_limit < std::numeric_limits<cost_t>::infinity() && init_v == NULL) {
+        // Finite cost_limit: rejects are handled natively on the input rows.
+        static thread_local std::vector<cost_t> u_r, v_r;
+        rows.resize(n_rows0);
+        u_r.resize(n_rows0);
+        v_r.resize(n_cols0);
+        for (uint_t i = 0; i < n_rows0; i++) {
+            rows[i] = const_cast<cost_t *>(a) + (std::size_t)i * n_cols0;
+        }
+        const int ret = lapjv_reject_internal(n_rows0, n_cols0, rows.data(), cost_limit,
+                                              x_out, y_out, u_r.data(), v_r.data(), 1);
+        if (ret != 0) {
+            return ret;
+        }
+        if (u_out != NULL && v_out != NULL) {
+            std::copy(u_r.begin(), u_r.end(), u_out);
+            std::copy(v_r.begin(), v_r.end(), v_out);
+        }
+        for (uint_t i = 0; i < n_rows0; i++) {
+            if (x_out[i] >= 0) {
+                *total += a[(std::size_t)i * n_cols0 + x_out[i]];
+            }
+        }
+        return 0;
+    }
+
+    const boolean transposed = n_rows0 > n_cols0;
+    const uint_t R = transposed ? n_cols0 : n_rows0;  // working rows (<= cols)
+    const uint_t C = transposed ? n_rows0 : n_cols0;  // working cols
+    const boolean augment = cost_limit < std::numeric_limits<cost_t>::infinity();
+    // Augmented: (R+C) square with sentinels; padded or square: C x C.
+    const uint_t N = augment ? R + C : C;
+
+    rows.resize(N);
+    x_c.resize(N);
+    y_c.resize(N);
+    v_c.resize(N);
+
+    // Skewed rectangular without warm start: the R x C rows are solved natively.
+    const boolean rect = !augment && init_v == NULL && lapjv_prefer_rect(R, C);
+
+    if (!transposed && !augment && (R == C || rect)) {
+        // Square, un-augmented or rectangular: run on the input buffer directly.
+        for (uint_t i = 0; i < R; i++) {
+            rows[i] = const_cast<cost_t *>(a) + (std::size_t)i * C;
+        }
+    } else if (rect) {
+        work.resize((std::size_t)R * C);
+        cost_t *w = work.data();
+        for (uint_t i = 0; i < R; i++) {
+            cost_t *wi = w + (std::size_t)i * C;
+            for (uint_t j = 0; j < C; j++) {
+                wi[j] = a[(std::size_t)j * n_cols0 + i];
+            }
+            rows[i] = wi;
+        }
+    } else {
+        work.resize((std::size_t)N * N);
+        cost_t *w = work.data();
+        for (uint_t i = 0; i < N; i++) {
+            cost_t *wi = w + (std::size_t)i * N;
+            if (i < R) {
+                if (transposed) {
+                    for (uint_t j = 0; j < C; j++) {
+                        wi[j] = a[(std::size_t)j * n_cols0 + i];
+                    }
+                } else {
+                    const cost_t *ai = a + (std::size_t)i * n_cols0;
+                    for (uint_t j = 0; j < C; j++) {
+                        wi[j] = ai[j];
+                    }
+                }
+                for (uint_t j = C; j < N; j++) {
+                    wi[j] = cost_limit / 2.0;
+                }
+            } else {
+                const cost_t fill = augment ? cost_limit / 2.0 : 0;
+                for (uint_t j = 0; j < C; j++) {
+                    wi[j] = fill;
+                }
+                for (uint_t j = C; j < N; j++) {
+                    wi[j] = 0;
+                }
+            }
+            rows[i] = wi;
+        }
+    }
+
+    if (init_v != NULL) {
+        _warm_v(n_rows0, n_cols0, a, init_v, transposed, N, v_c.data());
+    }
+    const int ret = rect
+        ? lapjv_rect_internal(R, C, rows.data(), x_c.data(), y_c.data(), NULL, v_c.data(), 1)
+        : lapjv_internal(N, rows.data(), x_c.data(), y_c.data(), v_c.data(),
+                         init_v != NULL ? START_WARM : START_COLD, 1);
+    if (ret != 0) {
+        return ret;
+    }
+    if (u_out != NULL && v_out != NULL) {
+        _duals(R, C, rows.data(), x_c.data(), v_c.data(), transposed, u_out, v_out);
+    }
+
+    // Keep real (row, col) matches only and map to the ORIGINAL orientation.
+    for (uint_t i = 0; i < R; i++) {
+        const int_t j = x_c[i];
+        if (j < 0 || (uint_t)j >= C) {
+            continue;
+        }
+        if (transposed) {
+            x_out[j] = i;
+            y_out[i] = j;
+        } else {
+            x_out[i] = j;
+            y_out[j] = i;
+        }
+    }
+    for (uint_t i = 0; i < n_rows0; i++) {
+        if (x_out[i] >= 0) {
+            *total += a[(std::size_t)i * n_cols0 + x_out[i]];
+        }
+    }
+    return 0;
+}
+
+
+/** Estimated work of one instance in the kernel that solves it. */
+static double _lapjv_work(const uint_t n_rows, const uint_t n_cols, const cost_t cost_limit)
+{
+    // Natively solved with rejects: about one shortest path over the columns per row
+    if (cost_limit < std::numeric_limits<cost_t>::infinity()) {
+        const double lo = n_rows < n_cols ? n_rows : n_cols;
+        return lo * n_rows * n_cols;
+    }
+    // Skewed rectangular: R shortest paths over C columns, R = min and C = max
+    const uint_t lo = n_rows < n_cols ? n_rows : n_cols;
+    const uint_t hi = n_rows > n_cols ? n_rows : n_cols;
+    if (lapjv_prefer_rect(lo, hi)) {
+        return (double)lo * lo * hi;
+    }
+    return (double)hi * hi * hi;
+}
+
+
+/**
+ * Run solve(b) for every instance on native threads, largest instances
+ * first (see lapx::parallel_for_weighted); returns the first non-zero status.
+ */
+template <typename W, typename F>
+static int _lapjv_run_batch(const uint_t n_batch, int n_threads, W &&work, F &&solve)
+{
+    std::atomic<int> status(0);
+    try {
+        lapx::parallel_for_weighted(n_batch, n_threads, work, [&](std::size_t b) {
+            if (status.load(std::memory_order_relaxed) != 0) {
+                return;
+            }
+            const int ret = solve(b);
+            if (ret != 0) {
+                int expected = 0;
+                status.compare_exchange_strong(expected, ret);
+            }
+        });
+    } catch (const std::bad_alloc &) {
+        return -1;
+    } catch (...) {
+        return -2;
+    }
+    return status.load();
+}
+
+
+/** Solve a dense (n_batch, n_rows, n_cols) batch of LAPs on native threads. */
+int lapjv_batch_internal(const uint_t n_batch, const uint_t n_rows, const uint_t n_cols,
+                         const cost_t *costs, const cost_t cost_limit,
+                         int_t *x, int_t *y, cost_t *totals, int n_threads,
+                         const cost_t *init_v, cost_t *u, cost_t *v)
+{
+    const std::size_t stride = (std::size_t)n_rows * n_cols;
+    const double w = _lapjv_work(n_rows, n_cols, cost_limit);
+    auto work = [w](std::size_t) { return w; };
+    return _lapjv_run_batch(n_batch, n_threads, work, [&](std::size_t b) {
+        return _lapjv_solve_one(n_rows, n_cols, costs + b * stride, cost_limit,
+                                x + b * n_rows, y + b * n_cols, totals + b,
+                                init_v != NULL ? init_v + b * n_cols : NULL,
+                                u != NULL ? u + b * n_rows : NULL,
+                                v != NULL ? v + b * n_cols : NULL);
+    });
+}
+
+
+/**
+ * Solve a ragged batch: instance b is an (n_rows[b], n_cols[b]) C-contiguous
+ * matrix at costs[b]. Outputs are packed back to back: x holds sum(n_rows)
+ * entries and y holds sum(n_cols) entries, in batch order. init_v (may be
+ * NULL) points to the n_cols[b] initial column duals of every instance; u/v
+ * (may be NULL) are packed like x/y.
+ */
+int lapjv_ragged_internal(const uint_t n_batch, const cost_t *const *costs,
+                          const uint_t *n_rows, const uint_t *n_cols,
+                          const cost_t cost_limit,
+                          int_t *x, int_t *y, cost_t *totals, int n_threads,
+                          const cost_t *const *init_v, cost_t *u, cost_t *v)
+{
+    std::vector<std::size_t> x_off, y_off;
+    try {
+        x_off.resize((std::size_t)n_batch + 1);
+        y_off.resize((std::size_t)n_batch + 1);
+    } catch (const std::bad_alloc &) {
+        return -1;
+    }
+    x_off[0] = y_off[0] = 0;
+    for (uint_t b = 0; b < n_batch; b++) {
+        x_off[b + 1] = x_off[b] + n_rows[b];
+        y_off[b + 1] = y_off[b] + n_cols[b];
+    }
+    auto work = [&](std::size_t b) { return _lapjv_work(n_rows[b], n_cols[b], cost_limit); };
+    return _lapjv_run_batch(n_batch, n_threads, work, [&](std::size_t b) {
+        return _lapjv_solve_one(n_rows[b], n_cols[b], costs[b], cost_limit,
+                                x + x_off[b], y + y_off[b], totals + b,
+                                init_v != NULL ? init_v[b] : NULL,
+                                u != NULL ? u + x_off[b] : NULL,
+                                v != NULL ? v + y_off[b] : NULL);
+    });
+}
+
+
+/**
+ * Solve a batch of sparse (CSR) LAPs with lapmod_internal on native threads.
+ * Instance b is n[b] x n[b] with arrays cc[b], ii[b] (n[b] + 1 entries) and
+ * kk[b]. Outputs are packed back to back: x and y hold sum(n) entries.
+ */
+int lapmod_batch_internal(const uint_t n_batch, const uint_t *n, cost_t *const *cc,
+                          uint_t *const *ii, uint_t *const *kk, fp_t fp_version,
+                          int_t *x, int_t *y, cost_t *totals, int n_threads)
+{
+    std::vector<std::size_t> off;
+    try {
+        off.resize((std::size_t)n_batch + 1);
+    } catch (const std::bad_alloc &) {
+        return -1;
+    }
+    off[0] = 0;
+    for (uint_t b = 0; b < n_batch; b++) {
+        off[b + 1] = off[b] + n[b];
+    }
+    const cost_t no_limit = std::numeric_limits<cost_t>::infinity();
+    auto work = [&](std::size_t b) { return _lapjv_work(n[b], n[b], no_limit); };
+    return _lapjv_run_batch(n_batch, n_threads, work, [&](std::size_t b) {
+        int_t *xb = x + off[b];
+        int_t *yb = y + off[b];
+        const int ret = lapmod_internal(n[b], cc[b], ii[b], kk[b], xb, yb, NULL, fp_version);
+        if (ret != 0) {
+            return ret;
+        }
+        totals[b] = lapmod_total(n[b], cc[b], ii[b], kk[b], xb);
+        return 0;
+    });
+}
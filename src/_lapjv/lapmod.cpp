@@ -2,11 +2,21 @@
 #include <stdlib.h>
 #include <string.h>
 
+#include <algorithm>
+#include <cmath>
+#include <functional>
+#include <limits>
+#include <new>
+#include <utility>
+#include <vector>
+
 #include "lapjv.h"
+#include "parallel.h"
 
 /** Column-reduction and reduction transfer for a sparse cost matrix. */
-int_t _ccrrt_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
-                    int_t *free_rows, int_t *x, int_t *y, cost_t *v)
+template <typename T, typename I>
+static int_t _ccrrt_sparse(const uint_t n, T *cc, I *ii, I *kk,
+                           int_t *free_rows, int_t *x, int_t *y, cost_t *v)
 {
     int_t n_free_rows;
     boolean *unique;
@@ -18,7 +28,7 @@ int_t _ccrrt_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
     }
 
     for (uint_t i = 0; i < n; i++) {
-        for (uint_t k = ii[i]; k < ii[i+1]; k++) {
+        for (I k = ii[i]; k < ii[i+1]; k++) {
             const int_t j = kk[k];
             const cost_t c = cc[k];
             if (c < v[j]) {
@@ -55,7 +65,7 @@ int_t _ccrrt_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
             const int_t j = x[i];
             cost_t min = LARGE;
 
-            for (uint_t k = ii[i]; k < ii[i+1]; k++) {
+            for (I k = ii[i]; k < ii[i+1]; k++) {
                 const int_t j2 = kk[k];
                 if (j2 == j) {
                     continue;
@@ -77,9 +87,10 @@ int_t _ccrrt_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
 
 
 /** Augmenting row reduction for a sparse cost matrix. */
-int_t _carr_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk, 
-                   const uint_t n_free_rows, int_t *free_rows, 
-                   int_t *x, int_t *y, cost_t *v)
+template <typename T, typename I>
+static int_t _carr_sparse(const uint_t n, T *cc, I *ii, I *kk, 
+                          const uint_t n_free_rows, int_t *free_rows, 
+                          int_t *x, int_t *y, cost_t *v)
 {
     uint_t current = 0;
     int_t new_free_rows = 0;
@@ -99,7 +110,7 @@ int_t _carr_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
         PRINTF("current = %d rr_cnt = %d\n", current, rr_cnt);
         const int_t free_i = free_rows[current++];
         if (ii[free_i+1] - ii[free_i] > 0) {
-            const uint_t k = ii[free_i];
+            const I k = ii[free_i];
             j1 = kk[k];
             v1 = cc[k] - v[j1];
         } else {
@@ -110,7 +121,7 @@ int_t _carr_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
         j2 = -1;
         v2 = LARGE;
 
-        for (uint_t k = ii[free_i]+1; k < ii[free_i+1]; k++) {
+        for (I k = ii[free_i]+1; k < ii[free_i+1]; k++) {
             PRINTF("%d = %f %d = %f\n", j1, v1, j2, v2);
             const int_t j = kk[k];
             const cost_t c = cc[k] - v[j];
@@ -213,19 +224,21 @@ int_t _find_sparse_2(cost_t *d, int_t *scan, const uint_t n_todo, int_t *todo, b
  * Scan all columns in TODO starting from arbitrary column in SCAN and try to
  * decrease d of the TODO columns using the SCAN column.
  */
-int_t _scan_sparse_1(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
-                     uint_t *plo, uint_t *phi, cost_t *d, int_t *cols, 
-                     int_t *pred, int_t *y, cost_t *v)
+template <typename T, typename I>
+static int_t _scan_sparse_1(const uint_t n, T *cc, I *ii, I *kk,
+                            uint_t *plo, uint_t *phi, cost_t *d, int_t *cols, 
+                            int_t *pred, int_t *y, cost_t *v)
 {
     uint_t lo = *plo;
     uint_t hi = *phi;
     cost_t h, cred_ij;
 
+    // rev_kk[j]: offset of column j within row i's entries, -1 if not stored
     int_t *rev_kk;
     NEW(rev_kk, int_t, n);
 
     while (lo != hi) {
-        int_t kj;
+        I kj;
         int_t j = cols[lo++];
         const int_t i = y[j];
         const cost_t mind = d[j];
@@ -234,18 +247,18 @@ int_t _scan_sparse_1(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
             rev_kk[k] = -1;
         }
 
-        for (uint_t k = ii[i]; k < ii[i+1]; k++) {
+        for (I k = ii[i]; k < ii[i+1]; k++) {
             const int_t j = kk[k];
-            rev_kk[j] = k;
+            rev_kk[j] = (int_t)(k - ii[i]);
         }
 
         PRINTF("?%d kk[%d:%d]=", j, ii[i], ii[i+1]);
         PRINT_INDEX_ARRAY(kk + ii[i], ii[i+1] - ii[i]);
 
-        kj = rev_kk[j];
-        if (kj == -1) {
+        if (rev_kk[j] == -1) {
             continue;
         }
+        kj = ii[i] + rev_kk[j];
 
         ASSERT(kk[kj] == j);
         h = cc[kj] - v[j] - mind;
@@ -256,9 +269,10 @@ int_t _scan_sparse_1(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
             j = cols[k];
             PRINTF("?%d kk[%d:%d]=", j, ii[i], ii[i+1]);
             PRINT_INDEX_ARRAY(kk + ii[i], ii[i+1] - ii[i]);
-            if ((kj = rev_kk[j]) == -1) {
+            if (rev_kk[j] == -1) {
                 continue;
             }
+            kj = ii[i] + rev_kk[j];
             ASSERT(kk[kj] == j);
             cred_ij = cc[kj] - v[j] - h;
             if (cred_ij < d[j]) {
@@ -288,11 +302,12 @@ int_t _scan_sparse_1(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
  * Scan all columns in TODO starting from arbitrary column in SCAN and try to
  * decrease d of the TODO columns using the SCAN column.
  */
-int_t _scan_sparse_2(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk, 
-                     uint_t *plo, uint_t *phi, cost_t *d, int_t *pred, 
-                     boolean *done, uint_t *pn_ready, int_t *ready, 
-                     int_t *scan, uint_t *pn_todo, int_t *todo, 
-                     boolean *added, int_t *y, cost_t *v)
+template <typename T, typename I>
+static int_t _scan_sparse_2(const uint_t n, T *cc, I *ii, I *kk, 
+                            uint_t *plo, uint_t *phi, cost_t *d, int_t *pred, 
+                            boolean *done, uint_t *pn_ready, int_t *ready, 
+                            int_t *scan, uint_t *pn_todo, int_t *todo, 
+                            boolean *added, int_t *y, cost_t *v)
 {
     uint_t lo = *plo;
     uint_t hi = *phi;
@@ -308,27 +323,27 @@ int_t _scan_sparse_2(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
     }
 
     while (lo != hi) {
-        int_t kj;
+        I kj;
         int_t j = scan[lo++];
         const int_t i = y[j];
         ready[n_ready++] = j;
         const cost_t mind = d[j];
 
-        for (uint_t k = ii[i]; k < ii[i+1]; k++) {
+        for (I k = ii[i]; k < ii[i+1]; k++) {
             const int_t j = kk[k];
-            rev_kk[j] = k;
+            rev_kk[j] = (int_t)(k - ii[i]);
         }
 
         PRINTF("?%d kk[%d:%d]=", j, ii[i], ii[i+1]);
         PRINT_INDEX_ARRAY(kk + ii[i], ii[i+1] - ii[i]);
-        kj = rev_kk[j];
-        ASSERT(kj != -1);
+        ASSERT(rev_kk[j] != -1);
+        kj = ii[i] + rev_kk[j];
         ASSERT(kk[kj] == j);
         h = cc[kj] - v[j] - mind;
         PRINTF("i=%d j=%d kj=%d h=%f\n", i, j, kj, h);
 
         // For all columns in TODO
-        for (uint_t k = 0; k < ii[i+1] - ii[i]; k++) {
+        for (I k = 0; k < ii[i+1] - ii[i]; k++) {
             j = kk[ii[i] + k];
             if (done[j]) {
                 continue;
@@ -355,7 +370,7 @@ int_t _scan_sparse_2(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
             }
         }
 
-        for (uint_t k = ii[i]; k < ii[i+1]; k++) {
+        for (I k = ii[i]; k < ii[i+1]; k++) {
             const int_t j = kk[k];
             rev_kk[j] = -1;
         }
@@ -376,8 +391,9 @@ int_t _scan_sparse_2(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
  * This version loops over all column indices (some of which might be inf).
  * @return The closest free column index.
  */
-int_t find_path_sparse_1(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
-                         const int_t start_i, int_t *y, cost_t *v,int_t *pred)
+template <typename T, typename I>
+static int_t find_path_sparse_1(const uint_t n, T *cc, I *ii, I *kk,
+                                const int_t start_i, int_t *y, cost_t *v,int_t *pred)
 {
     uint_t lo = 0, hi = 0;
     int_t final_j = -1;
@@ -394,7 +410,7 @@ int_t find_path_sparse_1(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
         pred[i] = start_i;
     }
 
-    for (uint_t i = ii[start_i]; i < ii[start_i + 1]; i++) {
+    for (I i = ii[start_i]; i < ii[start_i + 1]; i++) {
         const int_t j = kk[i];
         d[j] = cc[i] - v[j];
     }
@@ -447,8 +463,9 @@ int_t find_path_sparse_1(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
  * This version loops over non-inf column indices (which requires some additional bookkeeping).
  * @return The closest free column index.
  */
-int_t find_path_sparse_2(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
-                         const int_t start_i, int_t *y, cost_t *v, int_t *pred)
+template <typename T, typename I>
+static int_t find_path_sparse_2(const uint_t n, T *cc, I *ii, I *kk,
+                                const int_t start_i, int_t *y, cost_t *v, int_t *pred)
 {
     uint_t lo = 0, hi = 0;
     int_t final_j = -1;
@@ -473,7 +490,7 @@ int_t find_path_sparse_2(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
         pred[i] = start_i;
     }
 
-    for (uint_t i = ii[start_i]; i < ii[start_i + 1]; i++) {
+    for (I i = ii[start_i]; i < ii[start_i + 1]; i++) {
         const int_t j = kk[i];
         d[j] = cc[i] - v[j];
         todo[i - ii[start_i]] = j;
@@ -536,7 +553,9 @@ int_t find_path_sparse_2(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
     }
 
     PRINTF("found final_j=%d\n", final_j);
-    {
+    // An empty SCAN list means the unsolvable fallback above: there is no
+    // shortest path length to update the duals with.
+    if (lo < hi) {
         const cost_t mind = d[scan[lo]];
         for (uint_t k = 0; k < n_ready; k++) {
             const int_t j = ready[k];
@@ -556,8 +575,9 @@ int_t find_path_sparse_2(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
 
 
 /** Find path using one of the two find_path variants selected based on sparsity. */
-int_t find_path_sparse_dynamic(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
-                               const int_t start_i, int_t *y, cost_t *v, int_t *pred)
+template <typename T, typename I>
+static int_t find_path_sparse_dynamic(const uint_t n, T *cc, I *ii, I *kk,
+                                      const int_t start_i, int_t *y, cost_t *v, int_t *pred)
 {
     const uint_t n_i = ii[start_i+1] - ii[start_i];
     // XXX: wouldnt it be better to decide for the whole matrix?
@@ -569,36 +589,39 @@ int_t find_path_sparse_dynamic(const uint_t n, cost_t *cc, uint_t *ii, uint_t *k
 }
 
 
-typedef int_t (*fp_function_t)(const uint_t, cost_t *, uint_t *, uint_t *, 
-                               const int_t, int_t *, cost_t *, int_t *);
+template <typename T, typename I>
+using fp_function_t = int_t (*)(const uint_t, T *, I *, I *,
+                                const int_t, int_t *, cost_t *, int_t *);
 
-fp_function_t get_better_find_path(const uint_t n, uint_t *ii)
+template <typename T, typename I>
+static fp_function_t<T, I> get_better_find_path(const uint_t n, I *ii)
 {
-    const double sparsity = ii[n] / (double)(n * n);
+    const double sparsity = ii[n] / ((double)n * n);
     if (sparsity > 0.25) {
         PRINTF("Using find_path_sparse_1 for sparsity=%f\n", sparsity);
-        return find_path_sparse_1;
+        return find_path_sparse_1<T, I>;
     } else {
         PRINTF("Using find_path_sparse_2 for sparsity=%f\n", sparsity);
-        return find_path_sparse_2;
+        return find_path_sparse_2<T, I>;
     }
 }
 
 
 /** Augment for a sparse cost matrix. */
-int_t _ca_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk, const uint_t n_free_rows,
-                 int_t *free_rows, int_t *x, int_t *y, cost_t *v, int fp_version)
+template <typename T, typename I>
+static int_t _ca_sparse(const uint_t n, T *cc, I *ii, I *kk, const uint_t n_free_rows,
+                        int_t *free_rows, int_t *x, int_t *y, cost_t *v, int fp_version)
 {
     int_t *pred;
 
     NEW(pred, int_t, n);
 
-    fp_function_t fp;
+    fp_function_t<T, I> fp;
     switch (fp_version) {
-        case FP_1: fp = find_path_sparse_1; break;
-        case FP_2: fp = find_path_sparse_2; break;
-        case FP_DYNAMIC: fp = get_better_find_path(n, ii); break;
-        default: return -2;
+        case FP_1: fp = find_path_sparse_1<T, I>; break;
+        case FP_2: fp = find_path_sparse_2<T, I>; break;
+        case FP_DYNAMIC: fp = get_better_find_path<T, I>(n, ii); break;
+        default: FREE(pred); return -2;
     }
 
     for (int_t *pfree_i = free_rows; pfree_i < free_rows + n_free_rows; pfree_i++) {
@@ -630,16 +653,27 @@ int_t _ca_sparse(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk, const uint_
 }
 
 
-/** Solve square sparse LAP. */
-int lapmod_internal(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
-                    int_t *x, int_t *y, fp_t fp_version)
+/**
+ * Solve square sparse LAP. v (may be NULL) receives the column duals of the
+ * solution: cc[k] - v[kk[k]] is smallest at the assigned entry of each row.
+ * The duals are double for any cost type T.
+ */
+template <typename T, typename I>
+static int _lapmod(const uint_t n, T *cc, I *ii, I *kk,
+                   int_t *x, int_t *y, cost_t *v, fp_t fp_version)
 {
     int ret;
     int_t *free_rows;
-    cost_t *v;
+    cost_t *v_own = 0;
 
     NEW(free_rows, int_t, n);
-    NEW(v, cost_t, n);
+    if (v == 0) {
+        if ((v_own = (cost_t *)malloc(sizeof(cost_t) * n)) == 0) {
+            FREE(free_rows);
+            return -1;
+        }
+        v = v_own;
+    }
     ret = _ccrrt_sparse(n, cc, ii, kk, free_rows, x, y, v);
     int i = 0;
 
@@ -651,8 +685,644 @@ int lapmod_internal(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
         ret = _ca_sparse(n, cc, ii, kk, ret, free_rows, x, y, v, fp_version);
     }
 
-    FREE(v);
+    FREE(v_own);
     FREE(free_rows);
     
     return ret;
 }
+
+
+int lapmod_internal(const uint_t n, cost_t *cc, uint_t *ii, uint_t *kk,
+                    int_t *x, int_t *y, cost_t *v, fp_t fp_version)
+{
+    return _lapmod(n, cc, ii, kk, x, y, v, fp_version);
+}
+
+
+/** lapmod_internal for float32 costs, read as is; the duals stay double. */
+int lapmod_internal_f32(const uint_t n, float *cc, uint_t *ii, uint_t *kk,
+                        int_t *x, int_t *y, cost_t *v, fp_t fp_version)
+{
+    return _lapmod(n, cc, ii, kk, x, y, v, fp_version);
+}
+
+
+/** lapmod_internal with 64-bit ii/kk, for more than 2**32 - 1 entries. */
+int lapmod_internal_i64(const uint_t n, cost_t *cc, uint64_t *ii, uint64_t *kk,
+                        int_t *x, int_t *y, cost_t *v, fp_t fp_version)
+{
+    return _lapmod(n, cc, ii, kk, x, y, v, fp_version);
+}
+
+
+int lapmod_internal_f32_i64(const uint_t n, float *cc, uint64_t *ii, uint64_t *kk,
+                            int_t *x, int_t *y, cost_t *v, fp_t fp_version)
+{
+    return _lapmod(n, cc, ii, kk, x, y, v, fp_version);
+}
+
+
+/** Heap entry of _sap_path_sparse: on equal labels free columns come first. */
+struct _sap_entry {
+    cost_t d;
+    int_t j;
+    boolean assigned;
+    bool operator>(const _sap_entry &o) const {
+        return d > o.d || (d == o.d && assigned > o.assigned);
+    }
+};
+
+
+/**
+ * Shortest augmenting path from the free row s of a sparse LAP with
+ * n_rows <= n_cols for _lapmod_rect: Dijkstra over the stored entries in
+ * the reduced costs cc - u - v, with a binary heap, so a path costs
+ * O(E log E) in the E entries it reaches instead of O(n_cols) per step.
+ * Updates u/v so the path becomes tight and augments along it. Returns
+ * FALSE, leaving everything unchanged, when no free column is reachable.
+ * d/pred/state are n_cols long and state is all 0 between calls.
+ */
+template <typename T, typename I>
+static boolean _sap_path_sparse(const T *cc, const I *ii, const I *kk, const int_t s,
+                                int_t *x, int_t *y, cost_t *u, cost_t *v,
+                                std::vector<cost_t> &d, std::vector<int_t> &pred,
+                                std::vector<char> &state, std::vector<int_t> &touched,
+                                std::vector<int_t> &scanned, std::vector<int_t> &tree,
+                                std::vector<cost_t> &row_d, std::vector<_sap_entry> &heap)
+{
+    const std::greater<_sap_entry> later;
+    touched.clear();
+    scanned.clear();
+    tree.clear();
+    heap.clear();
+    int_t i = s;
+    int_t final_j = -1;
+    cost_t dist = 0;  // label of the row being expanded
+
+    for (;;) {
+        // Expand row i: relax its stored columns not scanned yet (state 2)
+        row_d[i] = dist;
+        tree.push_back(i);
+        const cost_t h = dist - u[i];
+        for (I k = ii[i]; k < ii[i + 1]; k++) {
+            const int_t j = kk[k];
+            if (state[j] == 2) {
+                continue;
+            }
+            const cost_t c = cc[k] - v[j] + h;
+            if (state[j] == 0 || c < d[j]) {
+                if (state[j] == 0) {
+                    state[j] = 1;
+                    touched.push_back(j);
+                }
+                d[j] = c;
+                pred[j] = i;
+                heap.push_back({c, j, y[j] >= 0});
+                std::push_heap(heap.begin(), heap.end(), later);
+            }
+        }
+        // Closest unscanned column; stale heap entries are skipped
+        int_t j = -1;
+        while (!heap.empty()) {
+            std::pop_heap(heap.begin(), heap.end(), later);
+            const _sap_entry e = heap.back();
+            heap.pop_back();
+            if (state[e.j] != 2 && e.d <= d[e.j]) {
+                j = e.j;
+                break;
+            }
+        }
+        if (j < 0) {
+            break;
+        }
+        state[j] = 2;
+        scanned.push_back(j);
+        if (y[j] < 0) {
+            final_j = j;
+            break;
+        }
+        i = y[j];
+        dist = d[j];
+    }
+    for (const int_t j : touched) {
+        state[j] = 0;
+    }
+    if (final_j < 0) {
+        return FALSE;
+    }
+
+    // Dual update: scanned columns and the rows of the tree move by D minus
+    // their label, which keeps all reduced costs >= 0 and makes the path tight.
+    const cost_t D = d[final_j];
+    for (const int_t j : scanned) {
+        v[j] -= D - d[j];
+    }
+    for (const int_t r : tree) {
+        u[r] += D - row_d[r];
+    }
+
+    int_t j = final_j;
+    for (;;) {
+        const int_t r = pred[j];
+        y[j] = r;
+        SWAP_INDICES(j, x[r]);
+        if (r == s) {
+            break;
+        }
+    }
+    return TRUE;
+}
+
+
+/**
+ * Solve a sparse rectangular LAP with n_rows <= n_cols directly on its CSR
+ * rows: every row is assigned if possible and n_cols - n_rows columns stay
+ * free, as when squaring it up with zero-cost rows, but in O(nnz + n_cols)
+ * memory. Row reduction, then one sparse shortest augmenting path per
+ * remaining free row. Rows that cannot be assigned keep x[i] = -1.
+ *
+ * u and v (may be NULL) receive duals with u[i] + v[j] <= cc for every
+ * stored entry, equality on assigned pairs, and v[j] = 0 >= v[k] for every
+ * free column j and assigned k. Returns 0 or -1 when out of memory.
+ */
+template <typename T, typename I>
+static int _lapmod_rect(const uint_t n_rows, const uint_t n_cols, const T *cc,
+                        const I *ii, const I *kk, int_t *x, int_t *y,
+                        cost_t *u, cost_t *v)
+{
+    try {
+        std::vector<cost_t> u_w(n_rows, 0), v_w(n_cols, 0);
+        std::vector<int_t> free_rows;
+
+        for (uint_t j = 0; j < n_cols; j++) {
+            y[j] = -1;
+        }
+        // Row reduction: each row takes its cheapest column if still free
+        for (uint_t i = 0; i < n_rows; i++) {
+            x[i] = -1;
+            if (ii[i] == ii[i + 1]) {
+                continue;  // no entries: stays unassigned
+            }
+            I k_min = ii[i];
+            for (I k = ii[i] + 1; k < ii[i + 1]; k++) {
+                if (cc[k] < cc[k_min]) {
+                    k_min = k;
+                }
+            }
+            u_w[i] = cc[k_min];
+            const int_t j = kk[k_min];
+            if (y[j] < 0) {
+                x[i] = j;
+                y[j] = i;
+            } else {
+                free_rows.push_back(i);
+            }
+        }
+
+        if (!free_rows.empty()) {
+            std::vector<cost_t> d(n_cols), row_d(n_rows);
+            std::vector<int_t> pred(n_cols), touched, scanned, tree;
+            std::vector<char> state(n_cols, 0);
+            std::vector<_sap_entry> heap;
+            for (const int_t s : free_rows) {
+                _sap_path_sparse(cc, ii, kk, s, x, y, u_w.data(), v_w.data(), d, pred,
+                                 state, touched, scanned, tree, row_d, heap);
+            }
+        }
+
+        if (u != NULL) {
+            std::copy(u_w.begin(), u_w.end(), u);
+        }
+        if (v != NULL) {
+            std::copy(v_w.begin(), v_w.end(), v);
+        }
+    } catch (const std::bad_alloc &) {
+        return -1;
+    }
+    return 0;
+}
+
+
+int lapmod_rect_internal(const uint_t n_rows, const uint_t n_cols, cost_t *cc,
+                         uint_t *ii, uint_t *kk, int_t *x, int_t *y,
+                         cost_t *u, cost_t *v)
+{
+    return _lapmod_rect(n_rows, n_cols, cc, ii, kk, x, y, u, v);
+}
+
+
+int lapmod_rect_internal_f32(const uint_t n_rows, const uint_t n_cols, float *cc,
+                             uint_t *ii, uint_t *kk, int_t *x, int_t *y,
+                             cost_t *u, cost_t *v)
+{
+    return _lapmod_rect(n_rows, n_cols, cc, ii, kk, x, y, u, v);
+}
+
+
+int lapmod_rect_internal_i64(const uint_t n_rows, const uint_t n_cols, cost_t *cc,
+                             uint64_t *ii, uint64_t *kk, int_t *x, int_t *y,
+                             cost_t *u, cost_t *v)
+{
+    return _lapmod_rect(n_rows, n_cols, cc, ii, kk, x, y, u, v);
+}
+
+
+int lapmod_rect_internal_f32_i64(const uint_t n_rows, const uint_t n_cols, float *cc,
+                                 uint64_t *ii, uint64_t *kk, int_t *x, int_t *y,
+                                 cost_t *u, cost_t *v)
+{
+    return _lapmod_rect(n_rows, n_cols, cc, ii, kk, x, y, u, v);
+}
+
+
+/**
+ * Check the nnz stored costs of a sparse LAP: -4 if one is negative, else
+ * -5 if one is >= LARGE, else 0. NaNs pass, as in lapmod's check_cost.
+ */
+template <typename T>
+static int _lapmod_check(const std::size_t nnz, const T *cc)
+{
+    boolean negative = FALSE, large = FALSE;
+    for (std::size_t k = 0; k < nnz; k++) {
+        negative |= cc[k] < 0;
+        large |= cc[k] >= LARGE;
+    }
+    return negative ? -4 : (large ? -5 : 0);
+}
+
+
+int lapmod_check(const std::size_t nnz, const cost_t *cc)
+{
+    return _lapmod_check(nnz, cc);
+}
+
+
+int lapmod_check_f32(const std::size_t nnz, const float *cc)
+{
+    return _lapmod_check(nnz, cc);
+}
+
+
+/** Sum of the assigned sparse costs; +inf when a row's column is not stored. */
+template <typename T, typename I>
+static cost_t _lapmod_total(const uint_t n, const T *cc, const I *ii,
+                            const I *kk, const int_t *x)
+{
+    cost_t total = 0;
+    for (uint_t i = 0; i < n; i++) {
+        if (x[i] < 0) {
+            return std::numeric_limits<cost_t>::infinity();
+        }
+        const I *lo = kk + ii[i];
+        const I *hi = kk + ii[i + 1];
+        const I *k = std::lower_bound(lo, hi, (I)x[i]);
+        if (k == hi || *k != (I)x[i]) {
+            return std::numeric_limits<cost_t>::infinity();
+        }
+        total += cc[k - kk];
+    }
+    return total;
+}
+
+
+cost_t lapmod_total(const uint_t n, const cost_t *cc, const uint_t *ii,
+                    const uint_t *kk, const int_t *x)
+{
+    return _lapmod_total(n, cc, ii, kk, x);
+}
+
+
+cost_t lapmod_total_f32(const uint_t n, const float *cc, const uint_t *ii,
+                        const uint_t *kk, const int_t *x)
+{
+    return _lapmod_total(n, cc, ii, kk, x);
+}
+
+
+cost_t lapmod_total_i64(const uint_t n, const cost_t *cc, const uint64_t *ii,
+                        const uint64_t *kk, const int_t *x)
+{
+    return _lapmod_total(n, cc, ii, kk, x);
+}
+
+
+cost_t lapmod_total_f32_i64(const uint_t n, const float *cc, const uint64_t *ii,
+                            const uint64_t *kk, const int_t *x)
+{
+    return _lapmod_total(n, cc, ii, kk, x);
+}
+
+
+/**
+ * Transpose an n_rows x n_cols CSR matrix (cc, ii, kk) into (cc_t, ii_t,
+ * kk_t) with n_cols + 1 row starts. The storage of a CSC matrix is the CSR
+ * storage of its transpose, so this also converts CSC to CSR. Counting sort
+ * in O(nnz + n_rows + n_cols): the column indices of every output row come
+ * out sorted, whatever the order within the input rows.
+ */
+template <typename T, typename I>
+static void _lapmod_transpose(const uint_t n_rows, const uint_t n_cols, const T *cc,
+                              const I *ii, const I *kk,
+                              T *cc_t, I *ii_t, I *kk_t)
+{
+    std::fill(ii_t, ii_t + n_cols + 1, 0);
+    for (I k = ii[0]; k < ii[n_rows]; k++) {
+        ii_t[kk[k] + 1]++;
+    }
+    for (uint_t j = 0; j < n_cols; j++) {
+        ii_t[j + 1] += ii_t[j];
+    }
+    // ii_t[j] is the next free slot of output row j while scattering
+    for (uint_t i = 0; i < n_rows; i++) {
+        for (I k = ii[i]; k < ii[i + 1]; k++) {
+            const I dst = ii_t[kk[k]]++;
+            kk_t[dst] = i;
+            cc_t[dst] = cc[k];
+        }
+    }
+    for (uint_t j = n_cols; j > 0; j--) {
+        ii_t[j] = ii_t[j - 1];
+    }
+    ii_t[0] = 0;
+}
+
+
+void lapmod_transpose(const uint_t n_rows, const uint_t n_cols, const cost_t *cc,
+                      const uint_t *ii, const uint_t *kk,
+                      cost_t *cc_t, uint_t *ii_t, uint_t *kk_t)
+{
+    _lapmod_transpose(n_rows, n_cols, cc, ii, kk, cc_t, ii_t, kk_t);
+}
+
+
+void lapmod_transpose_f32(const uint_t n_rows, const uint_t n_cols, const float *cc,
+                          const uint_t *ii, const uint_t *kk,
+                          float *cc_t, uint_t *ii_t, uint_t *kk_t)
+{
+    _lapmod_transpose(n_rows, n_cols, cc, ii, kk, cc_t, ii_t, kk_t);
+}
+
+
+void lapmod_transpose_i64(const uint_t n_rows, const uint_t n_cols, const cost_t *cc,
+                          const uint64_t *ii, const uint64_t *kk,
+                          cost_t *cc_t, uint64_t *ii_t, uint64_t *kk_t)
+{
+    _lapmod_transpose(n_rows, n_cols, cc, ii, kk, cc_t, ii_t, kk_t);
+}
+
+
+void lapmod_transpose_f32_i64(const uint_t n_rows, const uint_t n_cols, const float *cc,
+                              const uint64_t *ii, const uint64_t *kk,
+                              float *cc_t, uint64_t *ii_t, uint64_t *kk_t)
+{
+    _lapmod_transpose(n_rows, n_cols, cc, ii, kk, cc_t, ii_t, kk_t);
+}
+
+
+/** Gated entries of a block of rows, in CSR order. */
+template <typename T>
+struct _gate_block {
+    std::vector<T> cc;
+    std::vector<uint_t> kk;
+};
+
+
+/**
+ * Gate the rows [lo, hi) of a dense n_cols-wide cost matrix into `block`:
+ * keep the finite costs <= threshold, and with topk > 0 only the topk
+ * smallest of every row (ties to the smaller column). Columns stay sorted.
+ * Row counts go to ii[i + 1].
+ */
+template <typename T>
+static void _gate_rows(const uint_t lo, const uint_t hi, const uint_t n_cols, const T *cost,
+                       const T threshold, const uint_t topk, uint64_t *ii,
+                       _gate_block<T> &block, std::vector<std::pair<T, uint_t>> &row)
+{
+    for (uint_t i = lo; i < hi; i++) {
+        const T *c = cost + (std::size_t)i * n_cols;
+        const std::size_t start = block.kk.size();
+        if (topk == 0 || topk >= n_cols) {
+            for (uint_t j = 0; j < n_cols; j++) {
+                if (c[j] <= threshold && std::isfinite(c[j])) {
+                    block.cc.push_back(c[j]);
+                    block.kk.push_back(j);
+                }
+            }
+        } else {
+            row.clear();
+            for (uint_t j = 0; j < n_cols; j++) {
+                if (c[j] <= threshold && std::isfinite(c[j])) {
+                    row.emplace_back(c[j], j);
+                }
+            }
+            if (row.size() > topk) {
+                std::nth_element(row.begin(), row.begin() + topk, row.end());
+                row.resize(topk);
+                std::sort(row.begin(), row.end(),
+                          [](const std::pair<T, uint_t> &a, const std::pair<T, uint_t> &b) {
+                              return a.second < b.second;
+                          });
+            }
+            for (const auto &e : row) {
+                block.cc.push_back(e.first);
+                block.kk.push_back(e.second);
+            }
+        }
+        ii[i + 1] = block.kk.size() - start;
+    }
+}
+
+
+/**
+ * Gate a dense n_rows x n_cols cost matrix (C order) into CSR in one pass
+ * over the matrix, on up to n_threads threads by blocks of rows. Fills the
+ * row starts ii (n_rows + 1) and *nnz, and returns the gated entries, to be
+ * copied out by _gate_collect; NULL when out of memory.
+ */
+template <typename T>
+static void *_gate(const uint_t n_rows, const uint_t n_cols, const T *cost, const T threshold,
+                   const uint_t topk, uint64_t *ii, std::size_t *nnz, int n_threads)
+{
+    const double work = (double)n_rows * n_cols;
+    int threads = lapx::resolve_threads(n_threads, n_rows);
+    threads = std::max(1, std::min(threads, (int)std::ceil(work / lapx::kMinThreadWork)));
+    const std::size_t n_blocks = threads == 1 ? 1 : std::min<std::size_t>(n_rows, 4 * (std::size_t)threads);
+    std::vector<_gate_block<T>> *blocks = nullptr;
+    try {
+        blocks = new std::vector<_gate_block<T>>(n_blocks);
+        lapx::parallel_for(n_blocks, threads, [&](std::size_t b) {
+            std::size_t lo, hi;
+            lapx::split_range(n_rows, (int)b, (int)n_blocks, &lo, &hi);
+            std::vector<std::pair<T, uint_t>> row;
+            _gate_rows(lo, hi, n_cols, cost, threshold, topk, ii, (*blocks)[b], row);
+        });
+    } catch (const std::bad_alloc &) {
+        delete blocks;
+        return nullptr;
+    }
+    ii[0] = 0;
+    for (uint_t i = 0; i < n_rows; i++) {
+        ii[i + 1] += ii[i];
+    }
+    *nnz = 0;
+    for (const auto &block : *blocks) {
+        *nnz += block.kk.size();
+    }
+    return blocks;
+}
+
+
+/** Copy the entries gated by _gate to cc/kk (nnz each) and free them. */
+template <typename T, typename I>
+static void _gate_collect(void *gated, T *cc, I *kk)
+{
+    auto *blocks = static_cast<std::vector<_gate_block<T>> *>(gated);
+    if (cc != nullptr && kk != nullptr) {
+        std::size_t off = 0;
+        for (const auto &block : *blocks) {
+            std::copy(block.cc.begin(), block.cc.end(), cc + off);
+            std::copy(block.kk.begin(), block.kk.end(), kk + off);
+            off += block.kk.size();
+        }
+    }
+    delete blocks;
+}
+
+
+void *lapmod_gate(const uint_t n_rows, const uint_t n_cols, const cost_t *cost,
+                  const cost_t threshold, const uint_t topk, uint64_t *ii,
+                  std::size_t *nnz, int n_threads)
+{
+    return _gate(n_rows, n_cols, cost, threshold, topk, ii, nnz, n_threads);
+}
+
+
+void *lapmod_gate_f32(const uint_t n_rows, const uint_t n_cols, const float *cost,
+                      const float threshold, const uint_t topk, uint64_t *ii,
+                      std::size_t *nnz, int n_threads)
+{
+    return _gate(n_rows, n_cols, cost, threshold, topk, ii, nnz, n_threads);
+}
+
+
+void lapmod_gate_collect(void *gated, cost_t *cc, uint_t *kk)
+{
+    _gate_collect(gated, cc, kk);
+}
+
+
+void lapmod_gate_collect_f32(void *gated, float *cc, uint_t *kk)
+{
+    _gate_collect(gated, cc, kk);
+}
+
+
+void lapmod_gate_collect_i64(void *gated, cost_t *cc, uint64_t *kk)
+{
+    _gate_collect(gated, cc, kk);
+}
+
+
+void lapmod_gate_collect_f32_i64(void *gated, float *cc, uint64_t *kk)
+{
+    _gate_collect(gated, cc, kk);
+}
+
+
+/**
+ * Build CSR from the edge list (rows, cols, costs) of an n_rows x n_cols
+ * matrix, in O(nnz + n_rows + n_cols): a stable counting sort by column,
+ * then one by row, so columns come out sorted within every row. Duplicate
+ * edges are merged keeping the smallest cost. cc/kk hold nnz entries and
+ * ii n_rows + 1; *nnz_out gets the merged count. Returns 0, -1 when out of
+ * memory, -2 when an index is out of range.
+ */
+template <typename T, typename I>
+static int _lapmod_edges(const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+                         const int64_t *rows, const int64_t *cols, const T *costs,
+                         T *cc, I *ii, I *kk, std::size_t *nnz_out)
+{
+    std::vector<std::size_t> col_start, order;
+    try {
+        col_start.assign((std::size_t)n_cols + 1, 0);
+        order.resize(nnz);
+    } catch (const std::bad_alloc &) {
+        return -1;
+    }
+    std::fill(ii, ii + n_rows + 1, 0);
+    for (std::size_t e = 0; e < nnz; e++) {
+        if (rows[e] < 0 || rows[e] >= (int64_t)n_rows || cols[e] < 0 || cols[e] >= (int64_t)n_cols) {
+            return -2;
+        }
+        ii[rows[e] + 1]++;
+        col_start[cols[e] + 1]++;
+    }
+    for (uint_t j = 0; j < n_cols; j++) {
+        col_start[j + 1] += col_start[j];
+    }
+    for (uint_t i = 0; i < n_rows; i++) {
+        ii[i + 1] += ii[i];
+    }
+    // Edges by column, then scattered by row in that order
+    for (std::size_t e = 0; e < nnz; e++) {
+        order[col_start[cols[e]]++] = e;
+    }
+    for (std::size_t e : order) {
+        const I dst = ii[rows[e]]++;
+        kk[dst] = (I)cols[e];
+        cc[dst] = costs[e];
+    }
+    // ii[i] now ends row i: merge duplicates in place, restoring the starts
+    I out = 0, lo = 0;
+    for (uint_t i = 0; i < n_rows; i++) {
+        const I hi = ii[i];
+        ii[i] = out;
+        for (I k = lo; k < hi; k++) {
+            if (out > ii[i] && kk[out - 1] == kk[k]) {
+                if (cc[k] < cc[out - 1]) {
+                    cc[out - 1] = cc[k];
+                }
+            } else {
+                kk[out] = kk[k];
+                cc[out] = cc[k];
+                out++;
+            }
+        }
+        lo = hi;
+    }
+    ii[n_rows] = out;
+    *nnz_out = out;
+    return 0;
+}
+
+
+int lapmod_edges(const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+                 const int64_t *rows, const int64_t *cols, const cost_t *costs,
+                 cost_t *cc, uint_t *ii, uint_t *kk, std::size_t *nnz_out)
+{
+    return _lapmod_edges(n_rows, n_cols, nnz, rows, cols, costs, cc, ii, kk, nnz_out);
+}
+
+
+int lapmod_edges_f32(const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+                     const int64_t *rows, const int64_t *cols, const float *costs,
+                     float *cc, uint_t *ii, uint_t *kk, std::size_t *nnz_out)
+{
+    return _lapmod_edges(n_rows, n_cols, nnz, rows, cols, costs, cc, ii, kk, nnz_out);
+}
+
+
+int lapmod_edges_i64(const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+                     const int64_t *rows, const int64_t *cols, const cost_t *costs,
+                     cost_t *cc, uint64_t *ii, uint64_t *kk, std::size_t *nnz_out)
+{
+    return _lapmod_edges(n_rows, n_cols, nnz, rows, cols, costs, cc, ii, kk, nnz_out);
+}
+
+
+int lapmod_edges_f32_i64(const uint_t n_rows, const uint_t n_cols, const std::size_t nnz,
+                         const int64_t *rows, const int64_t *cols, const float *costs,
+                         float *cc, uint64_t *ii, uint64_t *kk, std::size_t *nnz_out)
+{
+    return _lapmod_edges(n_rows, n_cols, nnz, rows, cols, costs, cc, ii, kk, nnz_out);
+}
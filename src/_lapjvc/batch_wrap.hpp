@@ -0,0 +1,130 @@
+#pragma once
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <cstdint>
+#include <vector>
+
+#include "dense_wrap.hpp"
+#include "parallel.h"
+
+/**
+    Batch entry points for lapjvc: every instance is solved by lapjvc_solve_one()
+    on native threads with the GIL released once for the whole batch.
+*/
+
+namespace py = pybind11;
+
+template<typename T>
+using carray = py::array_t<T, py::array::c_style | py::array::forcecast>;
+
+// Solve instance b at data[b] into x + x_off[b], y + y_off[b] for every b,
+// largest instances first. Must be called without the GIL held.
+template<typename T>
+static void lapjvc_run_batch(const std::vector<const T *> &data,
+                             const std::vector<int> &nrows, const std::vector<int> &ncols,
+                             const std::vector<size_t> &x_off, const std::vector<size_t> &y_off,
+                             int *x, int *y, T *totals, int n_threads) {
+    auto work = [&](size_t b) {
+        const double dim = nrows[b] > ncols[b] ? nrows[b] : ncols[b];
+        return dim * dim * dim;
+    };
+    lapx::parallel_for_weighted(data.size(), n_threads, work, [&](size_t b) {
+        lapjvc_solve_one<T>(data[b], nrows[b], ncols[b], x + x_off[b], y + y_off[b], totals + b);
+    });
+}
+
+// Shared tail of both entry points: allocate outputs, solve, return (totals, x, y).
+template<typename T>
+static py::tuple lapjvc_batch_solve(const std::vector<const T *> &data,
+                                    const std::vector<int> &nrows, const std::vector<int> &ncols,
+                                    std::vector<py::ssize_t> x_shape, std::vector<py::ssize_t> y_shape,
+                                    int n_threads) {
+    const size_t n_batch = data.size();
+    std::vector<size_t> x_off(n_batch + 1, 0), y_off(n_batch + 1, 0);
+    for (size_t b = 0; b < n_batch; ++b) {
+        x_off[b + 1] = x_off[b] + nrows[b];
+        y_off[b + 1] = y_off[b] + ncols[b];
+    }
+    py::array_t<T> totals(static_cast<py::ssize_t>(n_batch));
+    py::array_t<int> x(x_shape), y(y_shape);
+    int *xp = x.mutable_data();
+    int *yp = y.mutable_data();
+    T *tp = totals.mutable_data();
+    {
+        py::gil_scoped_release release;
+        lapjvc_run_batch<T>(data, nrows, ncols, x_off, y_off, xp, yp, tp, n_threads);
+    }
+    return py::make_tuple(totals, x, y);
+}
+
+// Dense (B, N, M) batch. Returns totals (B,) in the input dtype and int32 x (B, N), y (B, M).
+template<typename T>
+static py::tuple lapjvc_batch_dense(py::array costs_obj, int n_threads) {
+    carray<T> costs = carray<T>::ensure(costs_obj);
+    if (!costs)
+        throw py::error_already_set();
+    if (costs.ndim() != 3)
+        throw std::invalid_argument("3-dimensional array expected [B, N, M]");
+    const py::ssize_t n_batch = costs.shape(0), n = costs.shape(1), m = costs.shape(2);
+    std::vector<const T *> data(n_batch);
+    std::vector<int> nrows(n_batch, int(n)), ncols(n_batch, int(m));
+    const T *base = costs.data();
+    for (py::ssize_t b = 0; b < n_batch; ++b)
+        data[b] = base + (size_t)b * n * m;
+    return lapjvc_batch_solve<T>(data, nrows, ncols, {n_batch, n}, {n_batch, m}, n_threads);
+}
+
+// Ragged batch: a list of 2D arrays of the same dtype. Returns totals (B,) and
+// int32 x/y mappings packed back to back (sum(N_b) and sum(M_b) entries).
+template<typename T>
+static py::tuple lapjvc_batch_ragged(py::list costs_list, int n_threads) {
+    const size_t n_batch = costs_list.size();
+    std::vector<carray<T>> mats;
+    mats.reserve(n_batch);
+    std::vector<const T *> data(n_batch);
+    std::vector<int> nrows(n_batch), ncols(n_batch);
+    py::ssize_t sum_rows = 0, sum_cols = 0;
+    for (size_t b = 0; b < n_batch; ++b) {
+        mats.push_back(carray<T>::ensure(costs_list[b]));
+        if (!mats.back())
+            throw py::error_already_set();
+        if (mats.back().ndim() != 2)
+            throw std::invalid_argument("2-dimensional array expected for every instance");
+        data[b] = mats.back().data();
+        nrows[b] = int(mats.back().shape(0));
+        ncols[b] = int(mats.back().shape(1));
+        sum_rows += nrows[b];
+        sum_cols += ncols[b];
+    }
+    return lapjvc_batch_solve<T>(data, nrows, ncols, {sum_rows}, {sum_cols}, n_threads);
+}
+
+// The kernel dtype follows `dtype` (int32, int64, float32 or float64).
+template<template<typename> class Fn, typename... Args>
+static py::tuple lapjvc_dispatch(py::dtype dtype, Args&&... args) {
+    if (dtype.is(py::dtype::of<int32_t>()))
+        return Fn<int32_t>::call(std::forward<Args>(args)...);
+    if (dtype.is(py::dtype::of<int64_t>()))
+        return Fn<int64_t>::call(std::forward<Args>(args)...);
+    if (dtype.is(py::dtype::of<float>()))
+        return Fn<float>::call(std::forward<Args>(args)...);
+    if (dtype.is(py::dtype::of<double>()))
+        return Fn<double>::call(std::forward<Args>(args)...);
+    throw py::type_error("costs must be int32, int64, float32 or float64");
+}
+
+template<typename T> struct lapjvc_dense_fn {
+    static py::tuple call(py::array costs, int n_threads) { return lapjvc_batch_dense<T>(costs, n_threads); }
+};
+template<typename T> struct lapjvc_ragged_fn {
+    static py::tuple call(py::list costs, int n_threads) { return lapjvc_batch_ragged<T>(costs, n_threads); }
+};
+
+py::tuple lapjvc_batch_dense_wrap(py::array costs, int n_threads) {
+    return lapjvc_dispatch<lapjvc_dense_fn>(costs.dtype(), costs, n_threads);
+}
+
+py::tuple lapjvc_batch_ragged_wrap(py::list costs, py::dtype dtype, int n_threads) {
+    return lapjvc_dispatch<lapjvc_ragged_fn>(dtype, costs, n_threads);
+}
@@ -10,17 +10,21 @@
 	graphs.  In practice, it solves 1000x1000 problems in around 1
 	second.
 
-	cost[i][j] = cost for pairing left node i with right node j
+	cost[i * n + j] = cost for pairing left node i with right node j
+	(a flat, row-major n x n buffer)
 	Lmate[i] = index of right node that left node i pairs with
 	Rmate[j] = index of left node that right node j pairs with
-	The values in cost[i][j] may be positive or negative.  To perform
-	maximization, simply negate the cost[][] matrix.
+	The values in cost may be positive or negative.  To perform
+	maximization, simply negate the cost matrix.
+	u_out/v_out (n each, may be null) receive the row/column duals:
+	u[i] + v[j] <= cost[i * n + j], with equality on the matched pairs.
 
 	Taken from https://github.com/jaehyunp/
 	Adapted by https://github.com/cheind
 */
 template<class T>
-void solve_dense(const std::vector< std::vector<T> > &cost, std::vector<int> &Lmate, std::vector<int> &Rmate)
+void solve_dense(const T *cost, const int n, std::vector<int> &Lmate, std::vector<int> &Rmate,
+                 T *u_out = nullptr, T *v_out = nullptr)
 {
 	
 	//////////////////////////////////////////////////////////////////////
@@ -31,31 +35,31 @@ void solve_dense(const std::vector< std::vector<T> > &cost, std::vector<int> &Lm
 	// graphs.  In practice, it solves 1000x1000 problems in around 1
 	// second.
 	//
-	//   cost[i][j] = cost for pairing left node i with right node j
+	//   cost[i * n + j] = cost for pairing left node i with right node j
 	//   Lmate[i] = index of right node that left node i pairs with
 	//   Rmate[j] = index of left node that right node j pairs with
 	//
-	// The values in cost[i][j] may be positive or negative.  To perform
-	// maximization, simply negate the cost[][] matrix.
+	// The values in cost may be positive or negative.  To perform
+	// maximization, simply negate the cost matrix.
 	//////////////////////////////////////////////////////////////////////
 
 	typedef std::vector<T> VD;
-	typedef std::vector<VD> VVD;
 	typedef std::vector<int> VI;
 
-	// assumes square matrices
-	const int n = int(cost.size());
+	// assumes square matrices; row i starts at cost + i * n
+	auto row = [cost, n](int i) { return cost + (size_t)i * n; };
 
 	// construct dual feasible solution
 	VD u(n);
 	VD v(n);
 	for (int i = 0; i < n; i++) {
-		u[i] = cost[i][0];
-		for (int j = 1; j < n; j++) u[i] = std::min(u[i], cost[i][j]);
+		const T *ci = row(i);
+		u[i] = ci[0];
+		for (int j = 1; j < n; j++) u[i] = std::min(u[i], ci[j]);
 	}
 	for (int j = 0; j < n; j++) {
-		v[j] = cost[0][j] - u[0];
-		for (int i = 1; i < n; i++) v[j] = std::min(v[j], cost[i][j] - u[i]);
+		v[j] = cost[j] - u[0];
+		for (int i = 1; i < n; i++) v[j] = std::min(v[j], row(i)[j] - u[i]);
 	}
 
 	// construct primal solution satisfying complementary slackness
@@ -63,9 +67,10 @@ void solve_dense(const std::vector< std::vector<T> > &cost, std::vector<int> &Lm
 	Rmate = VI(n, -1);
 	int mated = 0;
 	for (int i = 0; i < n; i++) {
+		const T *ci = row(i);
 		for (int j = 0; j < n; j++) {
 			if (Rmate[j] != -1) continue;
-			if (fabs(cost[i][j] - u[i] - v[j]) < 1e-10) {
+			if (fabs(ci[j] - u[i] - v[j]) < 1e-10) {
 				Lmate[i] = j;
 				Rmate[j] = i;
 				mated++;
@@ -88,8 +93,9 @@ void solve_dense(const std::vector< std::vector<T> > &cost, std::vector<int> &Lm
 		// initialize Dijkstra
 		fill(dad.begin(), dad.end(), -1);
 		fill(seen.begin(), seen.end(), 0);
+		const T *cs = row(s);
 		for (int k = 0; k < n; k++)
-			dist[k] = cost[s][k] - u[s] - v[k];
+			dist[k] = cs[k] - u[s] - v[k];
 
 		int j = 0;
 		while (true) {
@@ -107,9 +113,10 @@ void solve_dense(const std::vector< std::vector<T> > &cost, std::vector<int> &Lm
 
 			// relax neighbors
 			const int i = Rmate[j];
+			const T *ci = row(i);
 			for (int k = 0; k < n; k++) {
 				if (seen[k]) continue;
-				const T new_dist = dist[j] + cost[i][k] - u[i] - v[k];
+				const T new_dist = dist[j] + ci[k] - u[i] - v[k];
 				if (dist[k] > new_dist) {
 					dist[k] = new_dist;
 					dad[k] = j;
@@ -138,4 +145,126 @@ void solve_dense(const std::vector< std::vector<T> > &cost, std::vector<int> &Lm
 
 		mated++;
 	}
+
+	if (u_out) std::copy(u.begin(), u.end(), u_out);
+	if (v_out) std::copy(v.begin(), v.end(), v_out);
+}
+
+/**
+	Rectangular variant of solve_dense for nrows <= ncols: every row is
+	matched and ncols - nrows columns stay free, with the same optimum as
+	zero-padding to an ncols x ncols matrix but in O(nrows^2 ncols) time and
+	without the padded rows.
+
+	cost[i * ncols + j] = cost for pairing left node i with right node j
+	Lmate (nrows) and Rmate (ncols, -1 = free) receive the matching.
+	Duals start from the row minima and v = 0, and v only decreases on
+	columns that get matched, so every free column keeps the largest dual.
+	u_out (nrows) and v_out (ncols), may be null, receive the duals.
+*/
+template<class T>
+void solve_rect(const T *cost, const int nrows, const int ncols, std::vector<int> &Lmate,
+                std::vector<int> &Rmate, T *u_out = nullptr, T *v_out = nullptr)
+{
+	typedef std::vector<T> VD;
+	typedef std::vector<int> VI;
+
+	auto row = [cost, ncols](int i) { return cost + (size_t)i * ncols; };
+
+	// construct dual feasible solution
+	VD u(nrows);
+	VD v(ncols, T(0));
+	for (int i = 0; i < nrows; i++) {
+		const T *ci = row(i);
+		u[i] = ci[0];
+		for (int j = 1; j < ncols; j++) u[i] = std::min(u[i], ci[j]);
+	}
+
+	// construct primal solution satisfying complementary slackness
+	Lmate = VI(nrows, -1);
+	Rmate = VI(ncols, -1);
+	int mated = 0;
+	for (int i = 0; i < nrows; i++) {
+		const T *ci = row(i);
+		for (int j = 0; j < ncols; j++) {
+			if (Rmate[j] != -1) continue;
+			if (fabs(ci[j] - u[i] - v[j]) < 1e-10) {
+				Lmate[i] = j;
+				Rmate[j] = i;
+				mated++;
+				break;
+			}
+		}
+	}
+
+	VD dist(ncols);
+	VI dad(ncols);
+	VI seen(ncols);
+
+	// repeat until every row is matched
+	int s = 0;
+	while (mated < nrows) {
+
+		// find an unmatched left node
+		while (Lmate[s] != -1) s++;
+
+		// initialize Dijkstra
+		fill(dad.begin(), dad.end(), -1);
+		fill(seen.begin(), seen.end(), 0);
+		const T *cs = row(s);
+		for (int k = 0; k < ncols; k++)
+			dist[k] = cs[k] - u[s] - v[k];
+
+		int j = 0;
+		while (true) {
+
+			// find closest; ties go to a free column, which ends the search
+			j = -1;
+			for (int k = 0; k < ncols; k++) {
+				if (seen[k]) continue;
+				if (j == -1 || dist[k] < dist[j] ||
+				    (dist[k] == dist[j] && Rmate[k] == -1 && Rmate[j] != -1)) j = k;
+			}
+			seen[j] = 1;
+
+			// termination condition
+			if (Rmate[j] == -1) break;
+
+			// relax neighbors
+			const int i = Rmate[j];
+			const T *ci = row(i);
+			for (int k = 0; k < ncols; k++) {
+				if (seen[k]) continue;
+				const T new_dist = dist[j] + ci[k] - u[i] - v[k];
+				if (dist[k] > new_dist) {
+					dist[k] = new_dist;
+					dad[k] = j;
+				}
+			}
+		}
+
+		// update dual variables
+		for (int k = 0; k < ncols; k++) {
+			if (k == j || !seen[k]) continue;
+			const int i = Rmate[k];
+			v[k] += dist[k] - dist[j];
+			u[i] -= dist[k] - dist[j];
+		}
+		u[s] += dist[j];
+
+		// augment along path
+		while (dad[j] >= 0) {
+			const int d = dad[j];
+			Rmate[j] = Rmate[d];
+			Lmate[Rmate[j]] = j;
+			j = d;
+		}
+		Rmate[j] = s;
+		Lmate[s] = j;
+
+		mated++;
+	}
+
+	if (u_out) std::copy(u.begin(), u.end(), u_out);
+	if (v_out) std::copy(v.begin(), v.end(), v_out);
 }
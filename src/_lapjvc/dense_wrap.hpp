@@ -1,3 +1,5 @@
+#pragma once
+
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include <algorithm>
@@ -22,43 +24,50 @@
 
 namespace py = pybind11;
 
-template<typename T, int ExtraFlags>
-py::tuple solve_dense_wrap(py::array_t<T, ExtraFlags> input1, bool return_cost = true) {
-    auto buf1 = input1.request();
-
-    if (buf1.ndim != 2)
-        throw std::runtime_error("Number of dimensions must be two");
-
-    const int nrows = int(buf1.shape[0]);
-    const int ncols = int(buf1.shape[1]);
-
-    if (nrows == 0 || ncols == 0) {
-        if (return_cost)
-            return py::make_tuple(T(0), py::array(), py::array());
-        else
-            return py::make_tuple(py::array(), py::array());
-    }
-
-    T *data = (T *)buf1.ptr;
+/**
+    Whether solve_rect() should solve an r x n problem (r <= n). solve_dense() has
+    no reduction phases that benefit from the padded rows, so this holds for any
+    rectangular shape.
+*/
+inline bool lapjvc_prefer_rect(const int r, const int n) {
+    return r < n;
+}
 
-    bool any_finite = false;
+/**
+    Solve one (nrows, ncols) instance stored row-major at `data` without touching
+    any Python object, so it may run with the GIL released. x (nrows) and y (ncols)
+    receive lapjv-style mappings (-1 = unassigned or forbidden) and `total` the sum
+    of the selected costs. u (nrows) and v (ncols), if given, receive the duals of
+    the real rows/columns (zero when nothing can be assigned). Rectangular shapes
+    are solved by solve_rect() without zero padding.
+*/
+template<typename T>
+void lapjvc_solve_one(const T *data, const int nrows, const int ncols,
+                      int *x, int *y, T *total, T *u = nullptr, T *v = nullptr) {
+    std::fill(x, x + nrows, -1);
+    std::fill(y, y + ncols, -1);
+    *total = T(0);
+    if (u) std::fill(u, u + nrows, T(0));
+    if (v) std::fill(v, v + ncols, T(0));
+    if (nrows == 0 || ncols == 0)
+        return;
+
+    bool any_finite = false, all_finite = true;
     double max_abs_cost_d = 0.0;
-    for (int i = 0; i < nrows * ncols; ++i) {
+    for (long long i = 0; i < (long long)nrows * ncols; ++i) {
         // We cast to double for the finiteness check. For integer T this is always finite.
         double dv = static_cast<double>(data[i]);
         if (std::isfinite(dv)) {
             any_finite = true;
             // Use fabs on double to avoid template pitfalls and integer overflow on abs(INT_MIN).
             max_abs_cost_d = std::max(max_abs_cost_d, std::fabs(dv));
+        } else {
+            all_finite = false;
         }
     }
 
-    if (!any_finite) {
-        if (return_cost)
-            return py::make_tuple(T(0), py::array(), py::array());
-        else
-            return py::make_tuple(py::array(), py::array());
-    }
+    if (!any_finite)
+        return;
 
     const int r = std::min<int>(nrows, ncols);
     const int n = std::max<int>(nrows, ncols);
@@ -76,18 +85,61 @@ py::tuple solve_dense_wrap(py::array_t<T, ExtraFlags> input1, bool return_cost =
         LARGE_COST = static_cast<T>(cap);
     }
 
-    // Build square cost matrix with ZERO padding for dummy rows/columns (fast for rectangular).
-    // Only set LARGE_COST for forbidden entries inside the original MxN region.
-    std::vector<std::vector<T>> costs(n, std::vector<T>(n, T(0)));
+    if (lapjvc_prefer_rect(r, n)) {
+        // Skewed rectangular: solve_rect() on the r x n matrix, rows <= cols.
+        // Tall inputs are transposed; forbidden entries become LARGE_COST.
+        const bool transposed = nrows > ncols;
+        std::vector<T> work;
+        const T *costs = data;
+        if (transposed || !all_finite) {
+            work.resize((size_t)r * n);
+            for (int i = 0; i < r; ++i) {
+                T *wptr = work.data() + (size_t)i * n;
+                for (int j = 0; j < n; ++j) {
+                    const T c = transposed ? data[(size_t)j * ncols + i] : data[(size_t)i * ncols + j];
+                    wptr[j] = std::isfinite(static_cast<double>(c)) ? c : LARGE_COST;
+                }
+            }
+            costs = work.data();
+        }
+        std::vector<int> Lmate, Rmate;
+        T *u_w = transposed ? v : u;
+        T *v_w = transposed ? u : v;
+        solve_rect(costs, r, n, Lmate, Rmate, u_w, v_w);
+
+        T total_cost = T(0);
+        for (int i = 0; i < r; ++i) {
+            const int mate = Lmate[i];
+            const T c = costs[(size_t)i * n + mate];
+            if (c == LARGE_COST) continue;
+            const int ri = transposed ? mate : i;
+            const int cj = transposed ? i : mate;
+            x[ri] = cj;
+            y[cj] = ri;
+            total_cost = static_cast<T>(static_cast<double>(total_cost) + static_cast<double>(c));
+        }
+        *total = total_cost;
+        return;
+    }
 
-    for (int i = 0; i < nrows; ++i) {
-        T *cptr = data + i * ncols;
-        for (int j = 0; j < ncols; ++j) {
-            const T c = cptr[j];
-            // For floats: non-finite => forbidden. For integers: always finite => allowed.
-            bool finite = std::isfinite(static_cast<double>(c));
-            costs[i][j] = finite ? c : LARGE_COST;
+    // A square matrix without forbidden entries is solved in place. Otherwise build
+    // one flat n x n buffer with ZERO padding for dummy rows/columns (fast for
+    // rectangular) and LARGE_COST only for forbidden entries inside the original MxN region.
+    std::vector<T> padded;
+    const T *costs = data;
+    if (nrows != ncols || !all_finite) {
+        padded.assign((size_t)n * n, T(0));
+        for (int i = 0; i < nrows; ++i) {
+            const T *cptr = data + (size_t)i * ncols;
+            T *pptr = padded.data() + (size_t)i * n;
+            for (int j = 0; j < ncols; ++j) {
+                const T c = cptr[j];
+                // For floats: non-finite => forbidden. For integers: always finite => allowed.
+                bool finite = std::isfinite(static_cast<double>(c));
+                pptr[j] = finite ? c : LARGE_COST;
+            }
         }
+        costs = padded.data();
     }
     // Note:
     // - If nrows < ncols, rows [nrows..n-1] remain zero => dummy rows.
@@ -95,26 +147,73 @@ py::tuple solve_dense_wrap(py::array_t<T, ExtraFlags> input1, bool return_cost =
     // This avoids filling the entire padded area with LARGE_COST and speeds up rectangular cases.
 
     std::vector<int> Lmate, Rmate;
-    solve_dense(costs, Lmate, Rmate);
+    std::vector<T> u_all, v_all;
+    if (u || v) {
+        u_all.resize(n);
+        v_all.resize(n);
+    }
+    solve_dense(costs, n, Lmate, Rmate,
+                u_all.empty() ? nullptr : u_all.data(), v_all.empty() ? nullptr : v_all.data());
+    if (u) std::copy(u_all.begin(), u_all.begin() + nrows, u);
+    if (v) std::copy(v_all.begin(), v_all.begin() + ncols, v);
 
-    std::vector<int> rowids, colids;
+    // Keep only real (row, col) matches. Exclude dummy columns (j >= ncols) and forbidden.
     T total_cost = T(0);
-
-    // Collect only real (row, col) matches. Exclude dummy columns (j >= ncols) and forbidden.
     for (int i = 0; i < nrows; ++i) {
         int mate = Lmate[i];
-        if (mate >= 0 && mate < ncols && costs[i][mate] != LARGE_COST) {
+        const T c = mate >= 0 ? costs[(size_t)i * n + mate] : LARGE_COST;
+        if (mate >= 0 && mate < ncols && c != LARGE_COST) {
+            x[i] = mate;
+            y[mate] = i;
+            total_cost = static_cast<T>(static_cast<double>(total_cost) + static_cast<double>(c));
+        }
+    }
+    *total = total_cost;
+}
+
+template<typename T, int ExtraFlags>
+py::tuple solve_dense_wrap(py::array_t<T, ExtraFlags> input1, bool return_cost = true,
+                           bool return_duals = false) {
+    auto buf1 = input1.request();
+
+    if (buf1.ndim != 2)
+        throw std::runtime_error("Number of dimensions must be two");
+
+    const int nrows = int(buf1.shape[0]);
+    const int ncols = int(buf1.shape[1]);
+
+    std::vector<int> x(nrows), y(ncols);
+    T total_cost = T(0);
+    // The duals are written straight into the returned arrays.
+    py::array_t<T> u(return_duals ? nrows : 0), v(return_duals ? ncols : 0);
+    T *u_ptr = return_duals ? u.mutable_data() : nullptr;
+    T *v_ptr = return_duals ? v.mutable_data() : nullptr;
+    {
+        // input1 keeps the buffer alive; the pre-scan and the solve need no Python objects.
+        py::gil_scoped_release release;
+        lapjvc_solve_one<T>((const T *)buf1.ptr, nrows, ncols, x.data(), y.data(), &total_cost,
+                            u_ptr, v_ptr);
+    }
+
+    std::vector<int> rowids, colids;
+    for (int i = 0; i < nrows; ++i) {
+        if (x[i] >= 0) {
             rowids.push_back(i);
-            colids.push_back(mate);
-            total_cost = static_cast<T>(static_cast<double>(total_cost) + static_cast<double>(costs[i][mate]));
+            colids.push_back(x[i]);
         }
     }
 
+    py::array rows, cols;
+    if (!rowids.empty()) {
+        rows = py::array(rowids.size(), rowids.data());
+        cols = py::array(colids.size(), colids.data());
+    }
+    if (return_duals) {
+        if (return_cost)
+            return py::make_tuple(total_cost, rows, cols, u, v);
+        return py::make_tuple(rows, cols, u, v);
+    }
     if (return_cost)
-        return py::make_tuple(total_cost,
-                              py::array(rowids.size(), rowids.data()),
-                              py::array(colids.size(), colids.data()));
-    else
-        return py::make_tuple(py::array(rowids.size(), rowids.data()),
-                              py::array(colids.size(), colids.data()));
-}
\ No newline at end of file
+        return py::make_tuple(total_cost, rows, cols);
+    return py::make_tuple(rows, cols);
+}
@@ -1,6 +1,7 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include "dense_wrap.hpp"
+#include "batch_wrap.hpp"
 
 namespace py = pybind11;
 
@@ -10,6 +11,7 @@ void register_lapjvc(py::module_& m) {
         &solve_dense_wrap<int32_t, py::array::c_style>,
         py::arg("costs").noconvert(),
         py::arg("return_cost") = true,
+        py::arg("return_duals") = false,
         R"pbdoc(
 Solve the Linear Assignment Problem using the classic dense Jonker-Volgenant algorithm (O(n³)).
 
@@ -26,6 +28,8 @@ Args:
     costs (numpy.ndarray): 2D cost matrix (MxN), convertible to float64, float32, int32, or int64.
     return_cost (bool): If True (default), return (total_cost, row_indices, col_indices).
                         If False, return only (row_indices, col_indices).
+    return_duals (bool): If True, also return the row/column duals u (M,) and v (N,) in the
+                         cost dtype, appended to the tuple.
 
 Returns:
     tuple: (total_cost, row_indices, col_indices), or (row_indices, col_indices) if return_cost=False.
@@ -53,19 +57,39 @@ References:
         "lapjvc",
         &solve_dense_wrap<int64_t, py::array::c_style>,
         py::arg("costs").noconvert(),
-        py::arg("return_cost") = true
+        py::arg("return_cost") = true,
+        py::arg("return_duals") = false
     );
     m.def(
         "lapjvc",
         &solve_dense_wrap<float, py::array::c_style>,
         py::arg("costs").noconvert(),
-        py::arg("return_cost") = true
+        py::arg("return_cost") = true,
+        py::arg("return_duals") = false
     );
     m.def(
         "lapjvc",
         &solve_dense_wrap<double, py::array::c_style>,
         py::arg("costs"),
-        py::arg("return_cost") = true
+        py::arg("return_cost") = true,
+        py::arg("return_duals") = false
+    );
+    m.def(
+        "lapjvc_batch",
+        &lapjvc_batch_dense_wrap,
+        py::arg("costs"),
+        py::arg("n_threads") = 0,
+        "Solve a (B, N, M) int32/int64/float32/float64 batch on native threads. "
+        "Returns (totals, x, y) with totals in the input dtype and int32 x (B, N), y (B, M)."
+    );
+    m.def(
+        "lapjvc_batch_ragged",
+        &lapjvc_batch_ragged_wrap,
+        py::arg("costs"),
+        py::arg("dtype"),
+        py::arg("n_threads") = 0,
+        "Solve a list of 2D cost matrices of any shapes (cast to `dtype`) on native threads. "
+        "Returns (totals, x, y) with x/y packed back to back."
     );
 }
 
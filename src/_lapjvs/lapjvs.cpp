@@ -1,25 +1,45 @@
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
 #include <functional>
+#include <limits>
 #include <memory>
+#include <new>
+#include <type_traits>
+#include <vector>
 #include <Python.h>
 #define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
 #include <numpy/arrayobject.h>
 #include "lapjvs.h"
+#include "parallel.h"
 
 static char module_docstring[] =
     "This module wraps LAPJVS - Jonker-Volgenant linear sum assignment algorithm (Scalar-only, no AVX2/SIMD).";
 static char lapjvs_native_docstring[] =
-    "Solves the linear sum assignment problem following the input dtype (float32 or float64). Returns (row_ind, col_ind).";
+    "Solves the linear sum assignment problem following the input dtype (float32, float64, int32 or int64; integer costs get exact int64 duals). Returns (row_ind, col_ind), plus the column duals v if return_v. Rows < cols is solved without padding (no init_v).";
 static char lapjvs_float32_docstring[] =
-    "Solves the linear sum assignment problem in float32 (casts inputs if needed). Returns (row_ind, col_ind).";
+    "Solves the linear sum assignment problem in float32 (casts inputs if needed). Returns (row_ind, col_ind), plus the column duals v if return_v. Rows < cols is solved without padding (no init_v).";
 static char lapjvsa_native_docstring[] =
-    "Solves the linear sum assignment problem following the input dtype (float32 or float64). Returns pairs (K,2).";
+    "Solves the linear sum assignment problem following the input dtype (float32, float64, int32 or int64). Returns pairs (K,2). Rows < cols is solved without padding.";
 static char lapjvsa_float32_docstring[] =
-    "Solves the linear sum assignment problem in float32 (casts inputs if needed). Returns pairs (K,2).";
+    "Solves the linear sum assignment problem in float32 (casts inputs if needed). Returns pairs (K,2). Rows < cols is solved without padding.";
+static char lapjvs_batch_native_docstring[] =
+    "Solves a (B,N,M) batch following the input dtype (float32 or float64) on native threads. Returns (totals, x, y), plus duals (u, v) if return_duals.";
+static char lapjvs_batch_float32_docstring[] =
+    "Solves a (B,N,M) batch with the float32 kernel on native threads. Returns (totals, x, y), plus duals (u, v) if return_duals.";
+static char lapjvs_ragged_native_docstring[] =
+    "Solves a list of 2D cost matrices of any shapes following each input dtype on native threads. Returns (totals, x, y) with x/y packed, plus packed duals (u, v) if return_duals.";
+static char lapjvs_ragged_float32_docstring[] =
+    "Solves a list of 2D cost matrices of any shapes with the float32 kernel on native threads. Returns (totals, x, y) with x/y packed, plus packed duals (u, v) if return_duals.";
 
 static PyObject *py_lapjvs_native(PyObject *self, PyObject *args, PyObject *kwargs);
 static PyObject *py_lapjvs_float32(PyObject *self, PyObject *args, PyObject *kwargs);
 static PyObject *py_lapjvsa_native(PyObject *self, PyObject *args, PyObject *kwargs);
 static PyObject *py_lapjvsa_float32(PyObject *self, PyObject *args, PyObject *kwargs);
+static PyObject *py_lapjvs_batch_native(PyObject *self, PyObject *args, PyObject *kwargs);
+static PyObject *py_lapjvs_batch_float32(PyObject *self, PyObject *args, PyObject *kwargs);
+static PyObject *py_lapjvs_ragged_native(PyObject *self, PyObject *args, PyObject *kwargs);
+static PyObject *py_lapjvs_ragged_float32(PyObject *self, PyObject *args, PyObject *kwargs);
 
 static PyMethodDef module_functions[] = {
   {"lapjvs", reinterpret_cast<PyCFunction>(py_lapjvs_native),
@@ -34,6 +54,14 @@ static PyMethodDef module_functions[] = {
    METH_VARARGS | METH_KEYWORDS, lapjvsa_native_docstring},
   {"lapjvsa_float32", reinterpret_cast<PyCFunction>(py_lapjvsa_float32),
    METH_VARARGS | METH_KEYWORDS, lapjvsa_float32_docstring},
+  {"lapjvs_batch_native", reinterpret_cast<PyCFunction>(py_lapjvs_batch_native),
+   METH_VARARGS | METH_KEYWORDS, lapjvs_batch_native_docstring},
+  {"lapjvs_batch_float32", reinterpret_cast<PyCFunction>(py_lapjvs_batch_float32),
+   METH_VARARGS | METH_KEYWORDS, lapjvs_batch_float32_docstring},
+  {"lapjvs_ragged_native", reinterpret_cast<PyCFunction>(py_lapjvs_ragged_native),
+   METH_VARARGS | METH_KEYWORDS, lapjvs_ragged_native_docstring},
+  {"lapjvs_ragged_float32", reinterpret_cast<PyCFunction>(py_lapjvs_ragged_float32),
+   METH_VARARGS | METH_KEYWORDS, lapjvs_ragged_float32_docstring},
   {NULL, NULL, 0, NULL}
 };
 
@@ -74,29 +102,158 @@ class _pyobj : public pyobj_parent<O> {
 using pyobj = _pyobj<PyObject>;
 using pyarray = _pyobj<PyArrayObject>;
 
-template <typename F>
-static always_inline void call_lap(int dim, const void *restrict cost_matrix,
+// Shape of a 2D cost matrix with rows <= cols (n_rows < dim: rectangular,
+// solved by lapjvs_rect()); sets a ValueError and returns false otherwise.
+static bool get_dims(const pyarray &cost_matrix_array, int *n_rows, int *dim) {
+  if (PyArray_NDIM(cost_matrix_array.get()) != 2) {
+    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a 2D numpy array");
+    return false;
+  }
+  auto dims = PyArray_DIMS(cost_matrix_array.get());
+  if (dims[0] > dims[1]) {
+    PyErr_SetString(PyExc_ValueError,
+                    "\"cost_matrix\" must be square or have fewer rows than columns");
+    return false;
+  }
+  *n_rows = static_cast<int>(dims[0]);
+  *dim = static_cast<int>(dims[1]);
+  if (*n_rows < 0 || *dim < 0 || static_cast<npy_intp>(*dim) != dims[1]) {
+    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\"'s shape is too large or invalid");
+    return false;
+  }
+  return true;
+}
+
+// Warm-start column duals for the kernel, tightened in T (float64, or int64
+// for integer costs): with u[i] = min_c(w[i][c] - vd[c]) over the rows of
+// the working matrix w, v[c] = min_i(w[i][c] - u[i]) (shifted so max(v) =
+// 0). v >= vd stays feasible and spans at most twice the cost range, so
+// far-off duals survive the cast to a float32 kernel and do not drag out
+// the row reduction. w is dim wide with n stored rows, w[i][c] = a[i * rs +
+// c * cs]; rows n..dim-1 are zero padding. vd may alias v.
+template <typename F, typename K, typename T>
+static void lapjvs_tighten_v(int n, int dim, const F *restrict a, size_t rs, size_t cs,
+                             const T *vd, K *v) {
+  static thread_local std::vector<T> vt;
+  vt.assign(dim, std::numeric_limits<T>::max());
+  for (int i = 0; i < n; i++) {
+    const F *ai = a + i * rs;
+    T u = static_cast<T>(ai[0]) - vd[0];
+    for (int c = 1; c < dim; c++) u = std::min(u, static_cast<T>(ai[c * cs]) - vd[c]);
+    for (int c = 0; c < dim; c++) vt[c] = std::min(vt[c], static_cast<T>(ai[c * cs]) - u);
+  }
+  if (n < dim) {
+    // Zero rows: u = -max(vd), so v[c] <= max(vd)
+    const T top = *std::max_element(vd, vd + dim);
+    for (int c = 0; c < dim; c++) vt[c] = std::min(vt[c], top);
+  }
+  const T top = *std::max_element(vt.begin(), vt.end());
+  for (int c = 0; c < dim; c++) v[c] = static_cast<K>(vt[c] - top);
+}
+
+// n_threads != 1 splits the inner scans of large solves over a thread team.
+// warm: v holds initial duals to start from (see lapjvs()); square only.
+// Warm duals are tightened by lapjvs_tighten_v() first: integer ones in
+// place, float ones from init_vd, their float64 values (may be null).
+// n_rows < dim solves the n_rows x dim matrix with lapjvs_rect().
+// A is the type of the duals v: F for float costs, int64_t for integer ones.
+template <typename F, typename A = F>
+static always_inline void call_lap(int n_rows, int dim, const void *restrict cost_matrix,
                                    bool verbose,
                                    int *restrict row_ind, int *restrict col_ind,
-                                   void *restrict v) {
+                                   void *restrict v, int n_threads = 1,
+                                   bool warm = false,
+                                   const double *restrict init_vd = nullptr) {
   Py_BEGIN_ALLOW_THREADS
   auto cost_matrix_typed = reinterpret_cast<const F*>(cost_matrix);
-  auto v_typed = reinterpret_cast<F*>(v);
-  if (verbose) {
-    lapjvs<true>(dim, cost_matrix_typed, row_ind, col_ind, v_typed);
+  auto v_typed = reinterpret_cast<A*>(v);
+  if constexpr (std::is_integral<A>::value) {
+    if (warm) lapjvs_tighten_v<F, A, A>(dim, dim, cost_matrix_typed, dim, 1, v_typed, v_typed);
   } else {
-    lapjvs<false>(dim, cost_matrix_typed, row_ind, col_ind, v_typed);
+    if (warm && init_vd) {
+      lapjvs_tighten_v<F, A, double>(dim, dim, cost_matrix_typed, dim, 1, init_vd, v_typed);
+    }
+  }
+  std::unique_ptr<lapx::Team> team;
+  if (n_threads != 1 && (size_t)dim >= lapx::kMinParallelScan) {
+    try {
+      team.reset(new lapx::Team(n_threads));
+    } catch (...) {
+      team.reset();  // fall back to the serial path
+    }
+    if (team && team->size() == 1) team.reset();
+  }
+  if (n_rows < dim) {
+    if (verbose) {
+      lapjvs_rect<true>(n_rows, dim, cost_matrix_typed, row_ind, col_ind, v_typed, team.get());
+    } else {
+      lapjvs_rect<false>(n_rows, dim, cost_matrix_typed, row_ind, col_ind, v_typed, team.get());
+    }
+  } else if (verbose) {
+    lapjvs<true>(dim, cost_matrix_typed, row_ind, col_ind, v_typed, team.get(), warm);
+  } else {
+    lapjvs<false>(dim, cost_matrix_typed, row_ind, col_ind, v_typed, team.get(), warm);
   }
   Py_END_ALLOW_THREADS
 }
 
+// Kernel dtype for a cost array of NumPy type `typ`: float32, float64, int32
+// or int64 (integer costs are solved exactly with int64 duals), or -1.
+static int kernel_type(int typ) {
+  if (typ == NPY_FLOAT32 || typ == NPY_FLOAT64) return typ;
+  if (PyArray_EquivTypenums(typ, NPY_INT32)) return NPY_INT32;
+  if (PyArray_EquivTypenums(typ, NPY_INT64)) return NPY_INT64;
+  return -1;
+}
+
+// Column duals buffer of the kernel dtype `typ` as a NumPy array, so it can
+// be returned without a copy. With `init_v_obj` (not None) it holds a copy of
+// the initial duals and *warm is set.
+static pyarray make_v_array(PyObject *init_v_obj, int typ, int dim, bool *warm) {
+  npy_intp v_dims[] = {dim};
+  *warm = init_v_obj != NULL && init_v_obj != Py_None;
+  if (!*warm) {
+    return pyarray(PyArray_SimpleNew(1, v_dims, typ));
+  }
+  pyarray v(PyArray_FROM_OTF(init_v_obj, typ,
+                             NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST | NPY_ARRAY_ENSURECOPY));
+  if (v && (PyArray_NDIM(v.get()) != 1 || PyArray_DIM(v.get(), 0) != dim)) {
+    PyErr_SetString(PyExc_ValueError, "\"init_v\" must be a 1D array with one dual per column");
+    v.reset(NULL);
+  }
+  return v;
+}
+
+// float64 copy of init_v for lapjvs_tighten_v(), or null when cold; its
+// shape is checked by make_v_array().
+static pyarray make_vd_array(PyObject *init_v_obj) {
+  if (init_v_obj == NULL || init_v_obj == Py_None) {
+    return pyarray();
+  }
+  return pyarray(PyArray_FROM_OTF(init_v_obj, NPY_FLOAT64,
+                                  NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST));
+}
+
+// (row_ind, col_ind), plus the column duals v when requested.
+static PyObject *build_result(const pyarray &row_ind, const pyarray &col_ind,
+                              const pyarray &v, bool return_v) {
+  if (return_v) {
+    return Py_BuildValue("(OOO)", row_ind.get(), col_ind.get(), v.get());
+  }
+  return Py_BuildValue("(OO)", row_ind.get(), col_ind.get());
+}
+
 // Zero-copy: preallocate NumPy outputs, write directly
 static PyObject *py_lapjvs_native(PyObject *self, PyObject *args, PyObject *kwargs) {
   PyObject *cost_matrix_obj;
   int verbose = 0;
-  static const char *kwlist[] = {"cost_matrix", "verbose", NULL};
-  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|p", const_cast<char**>(kwlist),
-                                   &cost_matrix_obj, &verbose)) {
+  int n_threads = 1;
+  PyObject *init_v_obj = NULL;
+  int return_v = 0;
+  static const char *kwlist[] = {"cost_matrix", "verbose", "n_threads", "init_v", "return_v", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|piOp", const_cast<char**>(kwlist),
+                                   &cost_matrix_obj, &verbose, &n_threads,
+                                   &init_v_obj, &return_v)) {
     return NULL;
   }
 
@@ -105,61 +262,88 @@ static PyObject *py_lapjvs_native(PyObject *self, PyObject *args, PyObject *kwar
     PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a numpy array");
     return NULL;
   }
-  int typ = PyArray_TYPE(cost_matrix_array.get());
-  if (typ != NPY_FLOAT32 && typ != NPY_FLOAT64) {
-    PyErr_SetString(PyExc_TypeError, "\"cost_matrix\" must be float32 or float64");
+  int typ = kernel_type(PyArray_TYPE(cost_matrix_array.get()));
+  if (typ < 0) {
+    PyErr_SetString(PyExc_TypeError,
+                    "\"cost_matrix\" must be float32, float64, int32 or int64");
     return NULL;
   }
-  auto ndims = PyArray_NDIM(cost_matrix_array.get());
-  if (ndims != 2) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a square 2D numpy array");
+  int n_rows, dim;
+  if (!get_dims(cost_matrix_array, &n_rows, &dim)) {
     return NULL;
   }
-  auto dims = PyArray_DIMS(cost_matrix_array.get());
-  if (dims[0] != dims[1]) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a square 2D numpy array");
+
+  bool warm;
+  const bool integer = typ == NPY_INT32 || typ == NPY_INT64;
+  pyarray v_array(make_v_array(init_v_obj, integer ? NPY_INT64 : typ, dim, &warm));
+  if (!v_array) {
     return NULL;
   }
-  int dim = static_cast<int>(dims[0]);
-  if (dim < 0) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\"'s shape is too large or invalid");
+
+  if (warm && n_rows < dim) {
+    PyErr_SetString(PyExc_ValueError, "\"init_v\" requires a square \"cost_matrix\"");
     return NULL;
   }
 
-  if (dim == 0) {
-    npy_intp ret_dims[] = {0};
-    pyarray row_ind_array(PyArray_SimpleNew(1, ret_dims, NPY_INT));
-    pyarray col_ind_array(PyArray_SimpleNew(1, ret_dims, NPY_INT));
-    return Py_BuildValue("(OO)", row_ind_array.get(), col_ind_array.get());
+  if (n_rows == 0) {
+    npy_intp row_dims[] = {0};
+    npy_intp col_dims[] = {dim};
+    pyarray row_ind_array(PyArray_SimpleNew(1, row_dims, NPY_INT));
+    pyarray col_ind_array(PyArray_SimpleNew(1, col_dims, NPY_INT));
+    if (!warm) {
+      std::memset(PyArray_DATA(v_array.get()), 0, PyArray_NBYTES(v_array.get()));
+    }
+    std::fill_n(reinterpret_cast<int*>(PyArray_DATA(col_ind_array.get())), dim, -1);
+    return build_result(row_ind_array, col_ind_array, v_array, return_v);
   }
 
   auto cost_matrix = PyArray_DATA(cost_matrix_array.get());
 
   // Zero-copy outputs
-  npy_intp ret_dims[] = {dim};
-  pyarray row_ind_array(PyArray_SimpleNew(1, ret_dims, NPY_INT));
-  pyarray col_ind_array(PyArray_SimpleNew(1, ret_dims, NPY_INT));
+  npy_intp row_dims[] = {n_rows};
+  npy_intp col_dims[] = {dim};
+  pyarray row_ind_array(PyArray_SimpleNew(1, row_dims, NPY_INT));
+  pyarray col_ind_array(PyArray_SimpleNew(1, col_dims, NPY_INT));
   auto row_ind = reinterpret_cast<int*>(PyArray_DATA(row_ind_array.get()));
   auto col_ind = reinterpret_cast<int*>(PyArray_DATA(col_ind_array.get()));
 
+  // Float kernels tighten the warm start from its float64 values
+  pyarray vd_array;
+  if (warm && !integer) {
+    vd_array = make_vd_array(init_v_obj);
+    if (!vd_array) {
+      return NULL;
+    }
+  }
+  auto vd = warm && !integer ? reinterpret_cast<const double*>(PyArray_DATA(vd_array.get()))
+                             : nullptr;
+  auto v = PyArray_DATA(v_array.get());
   if (typ == NPY_FLOAT32) {
-    std::unique_ptr<float[]> v(new float[dim]);
-    call_lap<float>(dim, cost_matrix, verbose, row_ind, col_ind, v.get());
+    call_lap<float>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v, n_threads, warm, vd);
+  } else if (typ == NPY_INT32) {
+    call_lap<int32_t, int64_t>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v,
+                               n_threads, warm);
+  } else if (typ == NPY_INT64) {
+    call_lap<int64_t, int64_t>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v,
+                               n_threads, warm);
   } else {
-    std::unique_ptr<double[]> v(new double[dim]);
-    call_lap<double>(dim, cost_matrix, verbose, row_ind, col_ind, v.get());
+    call_lap<double>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v, n_threads, warm, vd);
   }
 
-  return Py_BuildValue("(OO)", row_ind_array.get(), col_ind_array.get());
+  return build_result(row_ind_array, col_ind_array, v_array, return_v);
 }
 
 // Zero-copy: write into NumPy outputs directly
 static PyObject *py_lapjvs_float32(PyObject *self, PyObject *args, PyObject *kwargs) {
   PyObject *cost_matrix_obj;
   int verbose = 0;
-  static const char *kwlist[] = {"cost_matrix", "verbose", NULL};
-  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|p", const_cast<char**>(kwlist),
-                                   &cost_matrix_obj, &verbose)) {
+  int n_threads = 1;
+  PyObject *init_v_obj = NULL;
+  int return_v = 0;
+  static const char *kwlist[] = {"cost_matrix", "verbose", "n_threads", "init_v", "return_v", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|piOp", const_cast<char**>(kwlist),
+                                   &cost_matrix_obj, &verbose, &n_threads,
+                                   &init_v_obj, &return_v)) {
     return NULL;
   }
 
@@ -170,51 +354,66 @@ static PyObject *py_lapjvs_float32(PyObject *self, PyObject *args, PyObject *kwa
     return NULL;
   }
 
-  auto ndims = PyArray_NDIM(cost_matrix_array.get());
-  if (ndims != 2) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a square 2D numpy array");
+  int n_rows, dim;
+  if (!get_dims(cost_matrix_array, &n_rows, &dim)) {
     return NULL;
   }
-  auto dims = PyArray_DIMS(cost_matrix_array.get());
-  if (dims[0] != dims[1]) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a square 2D numpy array");
+
+  bool warm;
+  pyarray v_array(make_v_array(init_v_obj, NPY_FLOAT32, dim, &warm));
+  if (!v_array) {
     return NULL;
   }
-  int dim = static_cast<int>(dims[0]);
-  if (dim < 0) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\"'s shape is too large or invalid");
+
+  if (warm && n_rows < dim) {
+    PyErr_SetString(PyExc_ValueError, "\"init_v\" requires a square \"cost_matrix\"");
     return NULL;
   }
 
-  if (dim == 0) {
-    npy_intp ret_dims[] = {0};
-    pyarray row_ind_array(PyArray_SimpleNew(1, ret_dims, NPY_INT));
-    pyarray col_ind_array(PyArray_SimpleNew(1, ret_dims, NPY_INT));
-    return Py_BuildValue("(OO)", row_ind_array.get(), col_ind_array.get());
+  if (n_rows == 0) {
+    npy_intp row_dims[] = {0};
+    npy_intp col_dims[] = {dim};
+    pyarray row_ind_array(PyArray_SimpleNew(1, row_dims, NPY_INT));
+    pyarray col_ind_array(PyArray_SimpleNew(1, col_dims, NPY_INT));
+    if (!warm) {
+      std::memset(PyArray_DATA(v_array.get()), 0, PyArray_NBYTES(v_array.get()));
+    }
+    std::fill_n(reinterpret_cast<int*>(PyArray_DATA(col_ind_array.get())), dim, -1);
+    return build_result(row_ind_array, col_ind_array, v_array, return_v);
   }
 
   auto cost_matrix = PyArray_DATA(cost_matrix_array.get());
 
   // Zero-copy outputs
-  npy_intp ret_dims[] = {dim};
-  pyarray row_ind_array(PyArray_SimpleNew(1, ret_dims, NPY_INT));
-  pyarray col_ind_array(PyArray_SimpleNew(1, ret_dims, NPY_INT));
+  npy_intp row_dims[] = {n_rows};
+  npy_intp col_dims[] = {dim};
+  pyarray row_ind_array(PyArray_SimpleNew(1, row_dims, NPY_INT));
+  pyarray col_ind_array(PyArray_SimpleNew(1, col_dims, NPY_INT));
   auto row_ind = reinterpret_cast<int*>(PyArray_DATA(row_ind_array.get()));
   auto col_ind = reinterpret_cast<int*>(PyArray_DATA(col_ind_array.get()));
 
-  std::unique_ptr<float[]> v(new float[dim]);
-  call_lap<float>(dim, cost_matrix, verbose, row_ind, col_ind, v.get());
+  pyarray vd_array;
+  if (warm) {
+    vd_array = make_vd_array(init_v_obj);
+    if (!vd_array) {
+      return NULL;
+    }
+  }
+  call_lap<float>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind,
+                  PyArray_DATA(v_array.get()), n_threads, warm,
+                  warm ? reinterpret_cast<const double*>(PyArray_DATA(vd_array.get())) : nullptr);
 
-  return Py_BuildValue("(OO)", row_ind_array.get(), col_ind_array.get());
+  return build_result(row_ind_array, col_ind_array, v_array, return_v);
 }
 
 // Zero-copy for pairs: write mapping into NumPy arrays directly, then build pairs
 static PyObject *py_lapjvsa_native(PyObject *self, PyObject *args, PyObject *kwargs) {
   PyObject *cost_matrix_obj;
   int verbose = 0;
-  static const char *kwlist[] = {"cost_matrix", "verbose", NULL};
-  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|p", const_cast<char**>(kwlist),
-                                   &cost_matrix_obj, &verbose)) {
+  int n_threads = 1;
+  static const char *kwlist[] = {"cost_matrix", "verbose", "n_threads", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|pi", const_cast<char**>(kwlist),
+                                   &cost_matrix_obj, &verbose, &n_threads)) {
     return NULL;
   }
 
@@ -223,52 +422,52 @@ static PyObject *py_lapjvsa_native(PyObject *self, PyObject *args, PyObject *kwa
     PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a numpy array");
     return NULL;
   }
-  int typ = PyArray_TYPE(cost_matrix_array.get());
-  if (typ != NPY_FLOAT32 && typ != NPY_FLOAT64) {
-    PyErr_SetString(PyExc_TypeError, "\"cost_matrix\" must be float32 or float64");
-    return NULL;
-  }
-  auto ndims = PyArray_NDIM(cost_matrix_array.get());
-  if (ndims != 2) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a square 2D numpy array");
-    return NULL;
-  }
-  auto dims = PyArray_DIMS(cost_matrix_array.get());
-  if (dims[0] != dims[1]) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a square 2D numpy array");
+  int typ = kernel_type(PyArray_TYPE(cost_matrix_array.get()));
+  if (typ < 0) {
+    PyErr_SetString(PyExc_TypeError,
+                    "\"cost_matrix\" must be float32, float64, int32 or int64");
     return NULL;
   }
-  int dim = static_cast<int>(dims[0]);
-  if (dim < 0) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\"'s shape is too large or invalid");
+  int n_rows, dim;
+  if (!get_dims(cost_matrix_array, &n_rows, &dim)) {
     return NULL;
   }
   auto cost_matrix = PyArray_DATA(cost_matrix_array.get());
 
-  if (dim == 0) {
+  if (n_rows == 0) {
     npy_intp pdims[] = {0, 2};
     pyarray pairs(PyArray_SimpleNew(2, pdims, NPY_INT));
     return reinterpret_cast<PyObject*>(pairs.release());
   }
 
   // Zero-copy mapping outputs
-  npy_intp odims[] = {dim};
-  pyarray row_ind_array(PyArray_SimpleNew(1, odims, NPY_INT));
-  pyarray col_ind_array(PyArray_SimpleNew(1, odims, NPY_INT));
+  npy_intp row_dims[] = {n_rows};
+  npy_intp col_dims[] = {dim};
+  pyarray row_ind_array(PyArray_SimpleNew(1, row_dims, NPY_INT));
+  pyarray col_ind_array(PyArray_SimpleNew(1, col_dims, NPY_INT));
   auto row_ind = reinterpret_cast<int*>(PyArray_DATA(row_ind_array.get()));
   auto col_ind = reinterpret_cast<int*>(PyArray_DATA(col_ind_array.get()));
 
   if (typ == NPY_FLOAT32) {
     std::unique_ptr<float[]> v(new float[dim]);
-    call_lap<float>(dim, cost_matrix, verbose, row_ind, col_ind, v.get());
+    call_lap<float>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v.get(), n_threads);
+  } else if (typ == NPY_INT32 || typ == NPY_INT64) {
+    std::unique_ptr<int64_t[]> v(new int64_t[dim]);
+    if (typ == NPY_INT32) {
+      call_lap<int32_t, int64_t>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v.get(),
+                                 n_threads);
+    } else {
+      call_lap<int64_t, int64_t>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v.get(),
+                                 n_threads);
+    }
   } else {
     std::unique_ptr<double[]> v(new double[dim]);
-    call_lap<double>(dim, cost_matrix, verbose, row_ind, col_ind, v.get());
+    call_lap<double>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v.get(), n_threads);
   }
 
   // Count K
   npy_intp K = 0;
-  for (int i = 0; i < dim; ++i) {
+  for (int i = 0; i < n_rows; ++i) {
     int j = row_ind[i];
     if (j >= 0 && j < dim) ++K;
   }
@@ -278,7 +477,7 @@ static PyObject *py_lapjvsa_native(PyObject *self, PyObject *args, PyObject *kwa
   pyarray pairs(PyArray_SimpleNew(2, pdims, NPY_INT));
   auto* pdata = reinterpret_cast<int*>(PyArray_DATA(pairs.get()));
   npy_intp w = 0;
-  for (int i = 0; i < dim; ++i) {
+  for (int i = 0; i < n_rows; ++i) {
     int j = row_ind[i];
     if (j >= 0 && j < dim) {
       pdata[w * 2 + 0] = i;
@@ -293,9 +492,10 @@ static PyObject *py_lapjvsa_native(PyObject *self, PyObject *args, PyObject *kwa
 static PyObject *py_lapjvsa_float32(PyObject *self, PyObject *args, PyObject *kwargs) {
   PyObject *cost_matrix_obj;
   int verbose = 0;
-  static const char *kwlist[] = {"cost_matrix", "verbose", NULL};
-  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|p", const_cast<char**>(kwlist),
-                                   &cost_matrix_obj, &verbose)) {
+  int n_threads = 1;
+  static const char *kwlist[] = {"cost_matrix", "verbose", "n_threads", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|pi", const_cast<char**>(kwlist),
+                                   &cost_matrix_obj, &verbose, &n_threads)) {
     return NULL;
   }
 
@@ -305,42 +505,32 @@ static PyObject *py_lapjvsa_float32(PyObject *self, PyObject *args, PyObject *kw
     PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be convertible to float32");
     return NULL;
   }
-  auto ndims = PyArray_NDIM(cost_matrix_array.get());
-  if (ndims != 2) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a square 2D numpy array");
-    return NULL;
-  }
-  auto dims = PyArray_DIMS(cost_matrix_array.get());
-  if (dims[0] != dims[1]) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\" must be a square 2D numpy array");
-    return NULL;
-  }
-  int dim = static_cast<int>(dims[0]);
-  if (dim < 0) {
-    PyErr_SetString(PyExc_ValueError, "\"cost_matrix\"'s shape is too large or invalid");
+  int n_rows, dim;
+  if (!get_dims(cost_matrix_array, &n_rows, &dim)) {
     return NULL;
   }
   auto cost_matrix = PyArray_DATA(cost_matrix_array.get());
 
-  if (dim == 0) {
+  if (n_rows == 0) {
     npy_intp pdims[] = {0, 2};
     pyarray pairs(PyArray_SimpleNew(2, pdims, NPY_INT));
     return reinterpret_cast<PyObject*>(pairs.release());
   }
 
   // Zero-copy mapping outputs
-  npy_intp odims[] = {dim};
-  pyarray row_ind_array(PyArray_SimpleNew(1, odims, NPY_INT));
-  pyarray col_ind_array(PyArray_SimpleNew(1, odims, NPY_INT));
+  npy_intp row_dims[] = {n_rows};
+  npy_intp col_dims[] = {dim};
+  pyarray row_ind_array(PyArray_SimpleNew(1, row_dims, NPY_INT));
+  pyarray col_ind_array(PyArray_SimpleNew(1, col_dims, NPY_INT));
   auto row_ind = reinterpret_cast<int*>(PyArray_DATA(row_ind_array.get()));
   auto col_ind = reinterpret_cast<int*>(PyArray_DATA(col_ind_array.get()));
 
   std::unique_ptr<float[]> v(new float[dim]);
-  call_lap<float>(dim, cost_matrix, verbose, row_ind, col_ind, v.get());
+  call_lap<float>(n_rows, dim, cost_matrix, verbose, row_ind, col_ind, v.get(), n_threads);
 
   // Count/build pairs
   npy_intp K = 0;
-  for (int i = 0; i < dim; ++i) {
+  for (int i = 0; i < n_rows; ++i) {
     int j = row_ind[i];
     if (j >= 0 && j < dim) ++K;
   }
@@ -348,7 +538,7 @@ static PyObject *py_lapjvsa_float32(PyObject *self, PyObject *args, PyObject *kw
   pyarray pairs(PyArray_SimpleNew(2, pdims, NPY_INT));
   auto* pdata = reinterpret_cast<int*>(PyArray_DATA(pairs.get()));
   npy_intp w = 0;
-  for (int i = 0; i < dim; ++i) {
+  for (int i = 0; i < n_rows; ++i) {
     int j = row_ind[i];
     if (j >= 0 && j < dim) {
       pdata[w * 2 + 0] = i;
@@ -358,3 +548,440 @@ static PyObject *py_lapjvsa_float32(PyObject *self, PyObject *args, PyObject *kw
   }
   return reinterpret_cast<PyObject*>(pairs.release());
 }
+
+
+// Solve one (n0, m0) instance exactly like the lapjvs() Python wrapper does:
+// the kernel sees rows <= cols, skewed rectangular inputs are solved by
+// lapjvs_rect() (others, and warm starts, are zero-padded to square), and
+// results are mapped back to the ORIGINAL orientation as x/y vectors.
+// F is the input dtype, K the kernel dtype; the total is accumulated in
+// float64 from the original input. Scratch buffers are thread_local.
+// init_v (m0 column duals of the ORIGINAL matrix, may be null) warm-starts
+// the kernel; when it solves the transpose, its columns are the original
+// rows and start from the row reduction min_j(a[i][j] - init_v[j]). u_out/
+// v_out (n0/m0 entries, may be null) receive the duals of the solution in
+// the ORIGINAL orientation: u[i] + v[j] <= a[i][j], equal on matches.
+template <typename F, typename K>
+static void lapjvs_solve_one(int n0, int m0, const F *restrict a,
+                             int *restrict x_out, int *restrict y_out,
+                             double *restrict total,
+                             const double *restrict init_v = nullptr,
+                             double *restrict u_out = nullptr,
+                             double *restrict v_out = nullptr) {
+  static thread_local std::vector<K> work;
+  static thread_local std::vector<K> v;
+  static thread_local std::vector<int> rowsol;
+  static thread_local std::vector<int> colsol;
+
+  for (int i = 0; i < n0; i++) x_out[i] = -1;
+  for (int j = 0; j < m0; j++) y_out[j] = -1;
+  *total = 0.0;
+  if (n0 == 0 || m0 == 0) {
+    if (u_out && v_out) {
+      for (int i = 0; i < n0; i++) u_out[i] = 0.0;
+      for (int j = 0; j < m0; j++) v_out[j] = 0.0;
+    }
+    return;
+  }
+
+  const bool transposed = n0 > m0;
+  const int n = transposed ? m0 : n0;  // working rows (<= cols)
+  const int dim = transposed ? n0 : m0;  // working cols == padded size
+
+  // Rows actually stored in the kernel matrix: n for lapjvs_rect(), else dim
+  const bool rect = init_v == nullptr && lapjvs_prefer_rect(n, dim);
+  const int n_work = rect ? n : dim;
+
+  const K *kernel_cost;
+  if (!transposed && (n == dim || rect) && std::is_same<F, K>::value) {
+    kernel_cost = reinterpret_cast<const K *>(a);
+  } else {
+    work.resize(static_cast<size_t>(n_work) * dim);
+    K *w = work.data();
+    for (int i = 0; i < n_work; i++) {
+      K *wi = w + static_cast<size_t>(i) * dim;
+      if (i >= n) {
+        for (int j = 0; j < dim; j++) wi[j] = K(0);
+      } else if (transposed) {
+        for (int j = 0; j < dim; j++) wi[j] = static_cast<K>(a[static_cast<size_t>(j) * m0 + i]);
+      } else {
+        const F *ai = a + static_cast<size_t>(i) * m0;
+        for (int j = 0; j < dim; j++) wi[j] = static_cast<K>(ai[j]);
+      }
+    }
+    kernel_cost = w;
+  }
+
+  v.resize(dim);
+  rowsol.resize(dim);
+  colsol.resize(dim);
+  if (init_v) {
+    // Working duals in float64 (the row reduction when transposed), then
+    // tightened into v by lapjvs_tighten_v()
+    static thread_local std::vector<double> vd;
+    vd.resize(dim);
+    for (int c = 0; c < dim; c++) {
+      if (!transposed) {
+        vd[c] = init_v[c];
+        continue;
+      }
+      const F *ac = a + static_cast<size_t>(c) * m0;
+      double m = static_cast<double>(ac[0]) - init_v[0];
+      for (int j = 1; j < m0; j++) m = std::min(m, static_cast<double>(ac[j]) - init_v[j]);
+      vd[c] = m;
+    }
+    if (transposed) {
+      lapjvs_tighten_v<F, K, double>(n, dim, a, 1, static_cast<size_t>(m0), vd.data(),
+                                     v.data());
+    } else {
+      lapjvs_tighten_v<F, K, double>(n, dim, a, static_cast<size_t>(m0), 1, vd.data(),
+                                     v.data());
+    }
+  }
+  if (rect) {
+    lapjvs_rect<false, int, K>(n, dim, kernel_cost, rowsol.data(), colsol.data(), v.data());
+  } else {
+    lapjvs<false, int, K>(dim, kernel_cost, rowsol.data(), colsol.data(), v.data(),
+                          nullptr, init_v != nullptr);
+  }
+  if (u_out && v_out) {
+    double *row_duals = transposed ? v_out : u_out;
+    double *col_duals = transposed ? u_out : v_out;
+    for (int i = 0; i < n; i++) {
+      const int j = rowsol[i];
+      row_duals[i] = static_cast<double>(kernel_cost[static_cast<size_t>(i) * dim + j]) -
+                     static_cast<double>(v[j]);
+    }
+    for (int j = 0; j < dim; j++) col_duals[j] = static_cast<double>(v[j]);
+  }
+
+  for (int i = 0; i < n; i++) {
+    const int j = rowsol[i];
+    if (j < 0 || j >= dim) continue;
+    if (transposed) {
+      x_out[j] = i;
+      y_out[i] = j;
+    } else {
+      x_out[i] = j;
+      y_out[j] = i;
+    }
+  }
+  double acc = 0.0;
+  for (int i = 0; i < n0; i++) {
+    if (x_out[i] >= 0) acc += static_cast<double>(a[static_cast<size_t>(i) * m0 + x_out[i]]);
+  }
+  *total = acc;
+}
+
+// Estimated work of one instance for the batch scheduler: cube of the padded
+// size, or min^2 * max for the skewed shapes solved by lapjvs_rect().
+static inline double lapjvs_work(int n0, int m0) {
+  const double lo = n0 < m0 ? n0 : m0;
+  const double hi = n0 > m0 ? n0 : m0;
+  if (lapjvs_prefer_rect(static_cast<int>(lo), static_cast<int>(hi))) {
+    return lo * lo * hi;
+  }
+  return hi * hi * hi;
+}
+
+// Batch entry point: one GIL release for the whole (B, N, M) buffer, instances
+// spread over native threads. Returns (totals, x, y) where x is (B, N) and y
+// is (B, M), both int32 with -1 for unassigned.
+template <typename K>
+static PyObject *lapjvs_batch_impl(PyObject *args, PyObject *kwargs,
+                                   bool follow_input_dtype) {
+  PyObject *cost_matrices_obj;
+  int n_threads = 0;
+  PyObject *init_v_obj = NULL;
+  int return_duals = 0;
+  static const char *kwlist[] = {"cost_matrices", "n_threads", "init_v", "return_duals", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|iOp", const_cast<char**>(kwlist),
+                                   &cost_matrices_obj, &n_threads, &init_v_obj, &return_duals)) {
+    return NULL;
+  }
+
+  pyarray costs_array(PyArray_FROM_OTF(cost_matrices_obj, NPY_NOTYPE, NPY_ARRAY_IN_ARRAY));
+  if (!costs_array) {
+    PyErr_SetString(PyExc_ValueError, "\"cost_matrices\" must be a numpy array");
+    return NULL;
+  }
+  int typ = PyArray_TYPE(costs_array.get());
+  if (typ != NPY_FLOAT32 && typ != NPY_FLOAT64) {
+    PyErr_SetString(PyExc_TypeError, "\"cost_matrices\" must be float32 or float64");
+    return NULL;
+  }
+  if (PyArray_NDIM(costs_array.get()) != 3) {
+    PyErr_SetString(PyExc_ValueError, "\"cost_matrices\" must be a 3D numpy array [B, N, M]");
+    return NULL;
+  }
+  auto dims = PyArray_DIMS(costs_array.get());
+  const npy_intp n_batch = dims[0];
+  const int n0 = static_cast<int>(dims[1]);
+  const int m0 = static_cast<int>(dims[2]);
+  if (n0 < 0 || m0 < 0 || n0 != dims[1] || m0 != dims[2]) {
+    PyErr_SetString(PyExc_ValueError, "\"cost_matrices\"'s shape is too large or invalid");
+    return NULL;
+  }
+
+  npy_intp x_dims[] = {n_batch, n0};
+  npy_intp y_dims[] = {n_batch, m0};
+  npy_intp t_dims[] = {n_batch};
+  pyarray x_array(PyArray_SimpleNew(2, x_dims, NPY_INT));
+  pyarray y_array(PyArray_SimpleNew(2, y_dims, NPY_INT));
+  pyarray totals_array(PyArray_SimpleNew(1, t_dims, NPY_FLOAT64));
+  if (!x_array || !y_array || !totals_array) {
+    return NULL;
+  }
+  auto x = reinterpret_cast<int*>(PyArray_DATA(x_array.get()));
+  auto y = reinterpret_cast<int*>(PyArray_DATA(y_array.get()));
+  auto totals = reinterpret_cast<double*>(PyArray_DATA(totals_array.get()));
+  const void *data = PyArray_DATA(costs_array.get());
+  const size_t stride = static_cast<size_t>(n0) * m0;
+
+  // Optional warm start (B, M) and duals u (B, N), v (B, M), all float64
+  pyarray init_v_array, u_array, v_array;
+  const double *init_v = nullptr;
+  double *u = nullptr, *v = nullptr;
+  if (init_v_obj != NULL && init_v_obj != Py_None) {
+    init_v_array.reset(PyArray_FROM_OTF(init_v_obj, NPY_FLOAT64, NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST));
+    if (!init_v_array) {
+      return NULL;
+    }
+    if (PyArray_NDIM(init_v_array.get()) != 2 || PyArray_DIM(init_v_array.get(), 0) != n_batch ||
+        PyArray_DIM(init_v_array.get(), 1) != m0) {
+      PyErr_SetString(PyExc_ValueError, "\"init_v\" must have shape (B, M), one dual per column");
+      return NULL;
+    }
+    init_v = reinterpret_cast<const double*>(PyArray_DATA(init_v_array.get()));
+  }
+  if (return_duals) {
+    u_array.reset(PyArray_ZEROS(2, x_dims, NPY_FLOAT64, 0));
+    v_array.reset(PyArray_ZEROS(2, y_dims, NPY_FLOAT64, 0));
+    if (!u_array || !v_array) {
+      return NULL;
+    }
+    u = reinterpret_cast<double*>(PyArray_DATA(u_array.get()));
+    v = reinterpret_cast<double*>(PyArray_DATA(v_array.get()));
+  }
+
+  const double work = lapjvs_work(n0, m0);
+  auto weight = [work](size_t) { return work; };
+  auto duals = [&](size_t b, const double **v0, double **ub, double **vb) {
+    *v0 = init_v ? init_v + b * m0 : nullptr;
+    *ub = u ? u + b * n0 : nullptr;
+    *vb = v ? v + b * m0 : nullptr;
+  };
+
+  int status = 0;
+  Py_BEGIN_ALLOW_THREADS
+  try {
+    if (typ == NPY_FLOAT32) {
+      auto a = reinterpret_cast<const float*>(data);
+      lapx::parallel_for_weighted(n_batch, n_threads, weight, [&](size_t b) {
+        const double *v0; double *ub, *vb;
+        duals(b, &v0, &ub, &vb);
+        lapjvs_solve_one<float, float>(n0, m0, a + b * stride, x + b * n0, y + b * m0, totals + b,
+                                       v0, ub, vb);
+      });
+    } else if (follow_input_dtype) {
+      auto a = reinterpret_cast<const double*>(data);
+      lapx::parallel_for_weighted(n_batch, n_threads, weight, [&](size_t b) {
+        const double *v0; double *ub, *vb;
+        duals(b, &v0, &ub, &vb);
+        lapjvs_solve_one<double, double>(n0, m0, a + b * stride, x + b * n0, y + b * m0, totals + b,
+                                         v0, ub, vb);
+      });
+    } else {
+      auto a = reinterpret_cast<const double*>(data);
+      lapx::parallel_for_weighted(n_batch, n_threads, weight, [&](size_t b) {
+        const double *v0; double *ub, *vb;
+        duals(b, &v0, &ub, &vb);
+        lapjvs_solve_one<double, K>(n0, m0, a + b * stride, x + b * n0, y + b * m0, totals + b,
+                                    v0, ub, vb);
+      });
+    }
+  } catch (const std::bad_alloc &) {
+    status = -1;
+  } catch (...) {
+    status = -2;
+  }
+  Py_END_ALLOW_THREADS
+
+  if (status == -1) {
+    return PyErr_NoMemory();
+  } else if (status != 0) {
+    PyErr_SetString(PyExc_RuntimeError, "lapjvs batch solver failed");
+    return NULL;
+  }
+  if (return_duals) {
+    return Py_BuildValue("(OOOOO)", totals_array.get(), x_array.get(), y_array.get(),
+                         u_array.get(), v_array.get());
+  }
+  return Py_BuildValue("(OOO)", totals_array.get(), x_array.get(), y_array.get());
+}
+
+// Kernel follows the input dtype (float32 or float64)
+static PyObject *py_lapjvs_batch_native(PyObject *self, PyObject *args, PyObject *kwargs) {
+  return lapjvs_batch_impl<double>(args, kwargs, true);
+}
+
+// Kernel runs in float32; totals are still accumulated from the original input
+static PyObject *py_lapjvs_batch_float32(PyObject *self, PyObject *args, PyObject *kwargs) {
+  return lapjvs_batch_impl<float>(args, kwargs, false);
+}
+
+// Ragged entry point: `cost_matrices` is a sequence of 2D float32/float64
+// arrays whose shapes may differ. Contiguous inputs are read in place. Returns
+// (totals, x, y) where x holds sum(N_b) and y holds sum(M_b) int32 entries,
+// packed back to back in batch order (-1 for unassigned).
+template <typename K>
+static PyObject *lapjvs_ragged_impl(PyObject *args, PyObject *kwargs,
+                                    bool follow_input_dtype) {
+  PyObject *cost_matrices_obj;
+  int n_threads = 0;
+  PyObject *init_v_obj = NULL;
+  int return_duals = 0;
+  static const char *kwlist[] = {"cost_matrices", "n_threads", "init_v", "return_duals", NULL};
+  if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|iOp", const_cast<char**>(kwlist),
+                                   &cost_matrices_obj, &n_threads, &init_v_obj, &return_duals)) {
+    return NULL;
+  }
+
+  pyobj seq(PySequence_Fast(cost_matrices_obj, "\"cost_matrices\" must be a sequence of 2D arrays"));
+  if (!seq) {
+    return NULL;
+  }
+  const Py_ssize_t n_batch = PySequence_Fast_GET_SIZE(seq.get());
+  std::vector<pyarray> mats;
+  std::vector<const void*> data(n_batch);
+  std::vector<int> types(n_batch), n_rows(n_batch), n_cols(n_batch);
+  std::vector<size_t> x_off(n_batch + 1, 0), y_off(n_batch + 1, 0);
+  mats.reserve(n_batch);
+  for (Py_ssize_t b = 0; b < n_batch; b++) {
+    PyObject *item = PySequence_Fast_GET_ITEM(seq.get(), b);
+    mats.emplace_back(PyArray_FROM_OTF(item, NPY_NOTYPE, NPY_ARRAY_IN_ARRAY));
+    PyArrayObject *arr = mats.back().get();
+    if (!arr) {
+      PyErr_SetString(PyExc_ValueError, "\"cost_matrices\" items must be numpy arrays");
+      return NULL;
+    }
+    types[b] = PyArray_TYPE(arr);
+    if (types[b] != NPY_FLOAT32 && types[b] != NPY_FLOAT64) {
+      PyErr_SetString(PyExc_TypeError, "\"cost_matrices\" items must be float32 or float64");
+      return NULL;
+    }
+    if (PyArray_NDIM(arr) != 2) {
+      PyErr_SetString(PyExc_ValueError, "\"cost_matrices\" items must be 2D numpy arrays");
+      return NULL;
+    }
+    auto dims = PyArray_DIMS(arr);
+    n_rows[b] = static_cast<int>(dims[0]);
+    n_cols[b] = static_cast<int>(dims[1]);
+    if (n_rows[b] < 0 || n_cols[b] < 0 || n_rows[b] != dims[0] || n_cols[b] != dims[1]) {
+      PyErr_SetString(PyExc_ValueError, "\"cost_matrices\"'s shape is too large or invalid");
+      return NULL;
+    }
+    data[b] = PyArray_DATA(arr);
+    x_off[b + 1] = x_off[b] + n_rows[b];
+    y_off[b + 1] = y_off[b] + n_cols[b];
+  }
+
+  npy_intp x_dims[] = {static_cast<npy_intp>(x_off[n_batch])};
+  npy_intp y_dims[] = {static_cast<npy_intp>(y_off[n_batch])};
+  npy_intp t_dims[] = {n_batch};
+  pyarray x_array(PyArray_SimpleNew(1, x_dims, NPY_INT));
+  pyarray y_array(PyArray_SimpleNew(1, y_dims, NPY_INT));
+  pyarray totals_array(PyArray_SimpleNew(1, t_dims, NPY_FLOAT64));
+  if (!x_array || !y_array || !totals_array) {
+    return NULL;
+  }
+  auto x = reinterpret_cast<int*>(PyArray_DATA(x_array.get()));
+  auto y = reinterpret_cast<int*>(PyArray_DATA(y_array.get()));
+  auto totals = reinterpret_cast<double*>(PyArray_DATA(totals_array.get()));
+
+  // Optional warm start (one (M_b,) array per instance) and packed duals
+  std::vector<pyarray> init_vs;
+  pyarray u_array, v_array;
+  double *u = nullptr, *v = nullptr;
+  if (init_v_obj != NULL && init_v_obj != Py_None) {
+    pyobj v_seq(PySequence_Fast(init_v_obj, "\"init_v\" must be a sequence of 1D arrays"));
+    if (!v_seq) {
+      return NULL;
+    }
+    if (PySequence_Fast_GET_SIZE(v_seq.get()) != n_batch) {
+      PyErr_SetString(PyExc_ValueError, "\"init_v\" must hold one array per instance");
+      return NULL;
+    }
+    init_vs.reserve(n_batch);
+    for (Py_ssize_t b = 0; b < n_batch; b++) {
+      init_vs.emplace_back(PyArray_FROM_OTF(PySequence_Fast_GET_ITEM(v_seq.get(), b), NPY_FLOAT64,
+                                            NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST));
+      PyArrayObject *arr = init_vs.back().get();
+      if (!arr) {
+        return NULL;
+      }
+      if (PyArray_NDIM(arr) != 1 || PyArray_DIM(arr, 0) != n_cols[b]) {
+        PyErr_SetString(PyExc_ValueError, "\"init_v\" items must have shape (M_b,), one dual per column");
+        return NULL;
+      }
+    }
+  }
+  if (return_duals) {
+    u_array.reset(PyArray_ZEROS(1, x_dims, NPY_FLOAT64, 0));
+    v_array.reset(PyArray_ZEROS(1, y_dims, NPY_FLOAT64, 0));
+    if (!u_array || !v_array) {
+      return NULL;
+    }
+    u = reinterpret_cast<double*>(PyArray_DATA(u_array.get()));
+    v = reinterpret_cast<double*>(PyArray_DATA(v_array.get()));
+  }
+
+  int status = 0;
+  Py_BEGIN_ALLOW_THREADS
+  try {
+    auto weight = [&](size_t b) { return lapjvs_work(n_rows[b], n_cols[b]); };
+    lapx::parallel_for_weighted(n_batch, n_threads, weight, [&](size_t b) {
+      int *xb = x + x_off[b];
+      int *yb = y + y_off[b];
+      const double *v0 = init_vs.empty() ? nullptr
+          : reinterpret_cast<const double*>(PyArray_DATA(init_vs[b].get()));
+      double *ub = u ? u + x_off[b] : nullptr;
+      double *vb = v ? v + y_off[b] : nullptr;
+      if (types[b] == NPY_FLOAT32) {
+        lapjvs_solve_one<float, float>(n_rows[b], n_cols[b],
+            reinterpret_cast<const float*>(data[b]), xb, yb, totals + b, v0, ub, vb);
+      } else if (follow_input_dtype) {
+        lapjvs_solve_one<double, double>(n_rows[b], n_cols[b],
+            reinterpret_cast<const double*>(data[b]), xb, yb, totals + b, v0, ub, vb);
+      } else {
+        lapjvs_solve_one<double, K>(n_rows[b], n_cols[b],
+            reinterpret_cast<const double*>(data[b]), xb, yb, totals + b, v0, ub, vb);
+      }
+    });
+  } catch (const std::bad_alloc &) {
+    status = -1;
+  } catch (...) {
+    status = -2;
+  }
+  Py_END_ALLOW_THREADS
+
+  if (status == -1) {
+    return PyErr_NoMemory();
+  } else if (status != 0) {
+    PyErr_SetString(PyExc_RuntimeError, "lapjvs ragged batch solver failed");
+    return NULL;
+  }
+  if (return_duals) {
+    return Py_BuildValue("(OOOOO)", totals_array.get(), x_array.get(), y_array.get(),
+                         u_array.get(), v_array.get());
+  }
+  return Py_BuildValue("(OOO)", totals_array.get(), x_array.get(), y_array.get());
+}
+
+static PyObject *py_lapjvs_ragged_native(PyObject *self, PyObject *args, PyObject *kwargs) {
+  return lapjvs_ragged_impl<double>(args, kwargs, true);
+}
+
+static PyObject *py_lapjvs_ragged_float32(PyObject *self, PyObject *args, PyObject *kwargs) {
+  return lapjvs_ragged_impl<float>(args, kwargs, false);
+}
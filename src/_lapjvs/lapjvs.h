@@ -1,9 +1,14 @@
+#include <algorithm>
 #include <cassert>
+#include <cstdint>
 #include <cstdio>
 #include <limits>
 #include <memory>
+#include <tuple>
 #include <vector>
 
+#include "parallel.h"
+
 #ifdef __GNUC__
 #define always_inline __attribute__((always_inline)) inline
 #define restrict __restrict__
@@ -15,18 +20,18 @@
 #define restrict
 #endif
 
-template <typename idx, typename cost>
-always_inline std::tuple<cost, cost, idx, idx>
+template <typename idx, typename cost, typename acc>
+always_inline std::tuple<acc, acc, idx, idx>
 find_umins_regular(
     idx dim, idx i, const cost *restrict assign_cost,
-    const cost *restrict v) {
+    const acc *restrict v) {
   const cost *local_cost = &assign_cost[i * dim];
-  cost umin = local_cost[0] - v[0];
+  acc umin = local_cost[0] - v[0];
   idx j1 = 0;
   idx j2 = -1;
-  cost usubmin = std::numeric_limits<cost>::max();
+  acc usubmin = std::numeric_limits<acc>::max();
   for (idx j = 1; j < dim; j++) {
-    cost h = local_cost[j] - v[j];
+    acc h = local_cost[j] - v[j];
     if (h < usubmin) {
       if (h >= umin) {
         usubmin = h;
@@ -42,134 +47,77 @@ find_umins_regular(
   return std::make_tuple(umin, usubmin, j1, j2);
 }
 
-template <typename idx, typename cost>
-always_inline std::tuple<cost, cost, idx, idx>
-find_umins(
+/// @brief find_umins_regular() split over a team, with identical results.
+///
+/// The serial scan keeps the two smallest (value, column) pairs in
+/// lexicographic order, so each member scans its part from scratch and the
+/// parts' best two pairs are fed, in column order, into the serial state.
+template <typename idx, typename cost, typename acc>
+std::tuple<acc, acc, idx, idx>
+find_umins_team(
     idx dim, idx i, const cost *restrict assign_cost,
-    const cost *restrict v) {
-  return find_umins_regular(dim, i, assign_cost, v);
-}
-
-/// @brief Exact Jonker-Volgenant algorithm (scalar-only).
-/// @param dim in problem size
-/// @param assign_cost in cost matrix
-/// @param verbose in indicates whether to report the progress to stdout
-/// @param rowsol out column assigned to row in solution / size dim
-/// @param colsol out row assigned to column in solution / size dim
-/// @param v inout dual variables, column reduction numbers / size dim
-template <bool verbose, typename idx, typename cost>
-void lapjvs(int dim, const cost *restrict assign_cost, idx *restrict rowsol, 
-    idx *restrict colsol, cost *restrict v) {
-  // Reuse per-thread buffers to avoid per-call allocations
-  static thread_local std::vector<idx> collist_vec;
-  static thread_local std::vector<idx> matches_vec;
-  static thread_local std::vector<idx> pred_vec;
-  static thread_local std::vector<cost> d_vec;
-
-  if ((int)collist_vec.size() < dim) collist_vec.resize(dim);
-  if ((int)matches_vec.size() < dim) matches_vec.resize(dim);
-  if ((int)pred_vec.size() < dim) pred_vec.resize(dim);
-  if ((int)d_vec.size() < dim) d_vec.resize(dim);
-
-  idx *restrict collist = collist_vec.data();  // list of columns to be scanned.
-  idx *restrict matches = matches_vec.data();  // counts how many times a row could be assigned.
-  cost *restrict d = d_vec.data();             // 'cost-distance' in augmenting path calculation.
-  idx *restrict pred = pred_vec.data();        // row-predecessor of column in augmenting/alternating path.
-
-  // init how many times a row will be assigned in the column reduction.
-  for (idx i = 0; i < dim; i++) {
-    matches[i] = 0;
-  }
-
-  // COLUMN REDUCTION
-  for (idx j = dim - 1; j >= 0; j--) {  // reverse order gives better results.
-    // find minimum cost over rows.
-    cost min = assign_cost[j];
-    idx imin = 0;
-    for (idx i = 1; i < dim; i++) {
-      const cost *local_cost = &assign_cost[i * dim];
-      if (local_cost[j] < min) {
-        min = local_cost[j];
-        imin = i;
+    const acc *restrict v, lapx::Team *team) {
+  struct top2 { acc umin, usubmin; idx j1, j2; };
+  auto feed = [](top2 &s, acc h, idx j) {
+    if (h < s.usubmin) {
+      if (h >= s.umin) {
+        s.usubmin = h;
+        s.j2 = j;
+      } else {
+        s.usubmin = s.umin;
+        s.umin = h;
+        s.j2 = s.j1;
+        s.j1 = j;
       }
     }
-    v[j] = min;
-
-    if (++matches[imin] == 1) {
-      // init assignment if minimum row assigned for the first time.
-      rowsol[imin] = j;
-      colsol[j] = imin;
-    } else {
-      colsol[j] = -1;  // row already assigned, column not assigned.
-    }
-  }
-  if (verbose) {
-    printf("lapjvs: COLUMN REDUCTION finished\n");
-  }
-
-  // REDUCTION TRANSFER
-  idx *restrict free_rows = matches;  // list of unassigned rows (reuse matches' storage).
-  idx numfree = 0;
-  for (idx i = 0; i < dim; i++) {
-    const cost *local_cost = &assign_cost[i * dim];
-    if (matches[i] == 0) {  // fill list of unassigned 'free' rows.
-      free_rows[numfree++] = i;
-    } else if (matches[i] == 1) {  // transfer reduction from rows assigned once.
-      idx j1 = rowsol[i];
-      cost min = std::numeric_limits<cost>::max();
-      for (idx j = 0; j < dim; j++) {
-        if (j != j1) {
-          cost cand = local_cost[j] - v[j];
-          if (cand < min) min = cand;
-        }
-      }
-      v[j1] = v[j1] - min;
+  };
+  const cost *local_cost = &assign_cost[i * dim];
+  const acc inf = std::numeric_limits<acc>::has_infinity
+      ? std::numeric_limits<acc>::infinity() : std::numeric_limits<acc>::max();
+  std::vector<top2> part(team->size(), top2{inf, inf, -1, -1});
+  auto fn = [&](int t) {
+    size_t lo, hi;
+    lapx::split_range(dim, t, team->size(), &lo, &hi);
+    top2 &s = part[t];
+    for (idx j = (t == 0 ? 1 : (idx)lo); j < (idx)hi; j++) {
+      feed(s, local_cost[j] - v[j], j);
     }
+  };
+  team->run(fn);
+  top2 s = {local_cost[0] - v[0], std::numeric_limits<acc>::max(), 0, -1};
+  for (const top2 &p : part) {
+    const bool first_is_lower = p.j2 < 0 || p.j1 < p.j2;
+    const idx a = first_is_lower ? p.j1 : p.j2, b = first_is_lower ? p.j2 : p.j1;
+    if (a >= 0) feed(s, first_is_lower ? p.umin : p.usubmin, a);
+    if (b >= 0) feed(s, first_is_lower ? p.usubmin : p.umin, b);
   }
-  if (verbose) {
-    printf("lapjvs: REDUCTION TRANSFER finished\n");
-  }
-
-  // AUGMENTING ROW REDUCTION
-  for (int loopcnt = 0; loopcnt < 2; loopcnt++) {  // loop to be done twice.
-    idx k = 0;
-    idx prevnumfree = numfree;
-    numfree = 0;  // start list of rows still free after augmenting row reduction.
-    while (k < prevnumfree) {
-      idx i = free_rows[k++];
-
-      // find minimum and second minimum reduced cost over columns.
-      cost umin, usubmin;
-      idx j1, j2;
-      std::tie(umin, usubmin, j1, j2) = find_umins(dim, i, assign_cost, v);
-
-      idx i0 = colsol[j1];
-      cost vj1_new = v[j1] - (usubmin - umin);
-      bool vj1_lowers = vj1_new < v[j1];  // the trick to eliminate the epsilon bug
-      if (vj1_lowers) {
-        v[j1] = vj1_new;
-      } else if (i0 >= 0) {  // minimum and subminimum equal.
-        j1 = j2;
-        i0 = colsol[j2];
-      }
-
-      rowsol[i] = j1;
-      colsol[j1] = i;
+  return std::make_tuple(s.umin, s.usubmin, s.j1, s.j2);
+}
 
-      if (i0 >= 0) {
-        if (vj1_lowers) {
-          free_rows[--k] = i0;
-        } else {
-          free_rows[numfree++] = i0;
-        }
-      }
-    }
-    if (verbose) {
-      printf("lapjvs: AUGMENTING ROW REDUCTION %d / %d\n", loopcnt + 1, 2);
-    }
+template <typename idx, typename cost, typename acc>
+always_inline std::tuple<acc, acc, idx, idx>
+find_umins(
+    idx dim, idx i, const cost *restrict assign_cost,
+    const acc *restrict v, lapx::Team *team = nullptr) {
+  if (team != nullptr && (size_t)dim >= lapx::kMinParallelScan) {
+    return find_umins_team(dim, i, assign_cost, v, team);
   }
+  return find_umins_regular(dim, i, assign_cost, v);
+}
 
-  // AUGMENT SOLUTION for each free row.
+/// @brief AUGMENT SOLUTION phase of lapjvs(): one Dijkstra shortest
+/// augmenting path per free row, over `dim` columns of a row-major matrix
+/// with `dim` columns (the rows may be fewer). Columns on a path get their
+/// duals lowered; free columns never do.
+/// @param team in optional thread team for the relaxation scans; only
+///   passed once dim >= lapx::kMinParallelScan
+template <bool verbose, typename idx, typename cost, typename acc>
+void augment_free_rows(idx dim, const cost *restrict assign_cost,
+    const idx *restrict free_rows, idx numfree, idx *restrict rowsol,
+    idx *restrict colsol, acc *restrict v, idx *restrict collist,
+    idx *restrict pred, acc *restrict d, lapx::Team *team) {
+  const bool split = team != nullptr;
+  std::vector<std::vector<idx>> hits(split ? team->size() : 0);
   for (idx f = 0; f < numfree; f++) {
     idx endofpath;
     idx freerow = free_rows[f];  // start row of augmenting path.
@@ -189,14 +137,14 @@ void lapjvs(int dim, const cost *restrict assign_cost, idx *restrict rowsol,
     idx up = 0;
     bool unassigned_found = false;
     idx last = 0;
-    cost min = 0;
+    acc min = 0;
     do {
       if (up == low) {
         last = low - 1;
         min = d[collist[up++]];
         for (idx k = up; k < dim; k++) {
           idx j = collist[k];
-          cost h = d[j];
+          acc h = d[j];
           if (h <= min) {
             if (h < min) {
               up = low;
@@ -220,10 +168,47 @@ void lapjvs(int dim, const cost *restrict assign_cost, idx *restrict rowsol,
         low++;
         idx i = colsol[j1];
         const cost *local_cost = &assign_cost[i * dim];
-        cost h = local_cost[j1] - v[j1] - min;
+        acc h = local_cost[j1] - v[j1] - min;
+        if (split && (size_t)(dim - up) >= lapx::kMinParallelScan) {
+          // Relax in parallel, recording where d drops to min, then replay
+          // those positions in order exactly like the serial loop below.
+          // Columns the serial loop would skip after its break get relaxed
+          // too; they are neither on the path nor among the ready columns.
+          const idx todo = up;
+          auto fn = [&](int t) {
+            size_t lo, hi;
+            lapx::split_range(dim - todo, t, team->size(), &lo, &hi);
+            std::vector<idx> &hit = hits[t];
+            hit.clear();
+            for (idx k = todo + (idx)lo; k < todo + (idx)hi; k++) {
+              idx j = collist[k];
+              acc v2 = local_cost[j] - v[j] - h;
+              if (v2 < d[j]) {
+                pred[j] = i;
+                d[j] = v2;
+                if (v2 == min) hit.push_back(k);
+              }
+            }
+          };
+          team->run(fn);
+          for (const std::vector<idx> &hit : hits) {
+            for (idx k : hit) {
+              idx j = collist[k];
+              if (colsol[j] < 0) {
+                endofpath = j;
+                unassigned_found = true;
+                break;
+              }
+              collist[k] = collist[up];
+              collist[up++] = j;
+            }
+            if (unassigned_found) break;
+          }
+          continue;
+        }
         for (idx k = up; k < dim; k++) {
           idx j = collist[k];
-          cost v2 = local_cost[j] - v[j] - h;
+          acc v2 = local_cost[j] - v[j] - h;
           if (v2 < d[j]) {
             pred[j] = i;
             if (v2 == min) {
@@ -258,10 +243,293 @@ void lapjvs(int dim, const cost *restrict assign_cost, idx *restrict rowsol,
       } while (i != freerow);
     }
   }
+}
+
+/// @brief Exact Jonker-Volgenant algorithm (scalar-only).
+/// @param dim in problem size
+/// @param assign_cost in cost matrix
+/// @param verbose in indicates whether to report the progress to stdout
+/// @param rowsol out column assigned to row in solution / size dim
+/// @param colsol out row assigned to column in solution / size dim
+/// @param v inout dual variables, column reduction numbers / size dim; of
+///   type acc, which is int64_t for integer costs so that dual updates are
+///   exact and cannot overflow
+/// @param team in optional thread team splitting the O(dim) inner scans once
+///   dim >= lapx::kMinParallelScan; the solution does not depend on it
+/// @param warm in if true, v holds initial duals (e.g. from a previous solve):
+///   the column reduction is skipped and rows start matched to their
+///   cheapest column under v where it is free. Any v is a valid start, so
+///   the solution is still optimal.
+template <bool verbose, typename idx, typename cost, typename acc = cost>
+void lapjvs(int dim, const cost *restrict assign_cost, idx *restrict rowsol, 
+    idx *restrict colsol, acc *restrict v, lapx::Team *team = nullptr,
+    bool warm = false) {
+  // Reuse per-thread buffers to avoid per-call allocations
+  static thread_local std::vector<idx> collist_vec;
+  static thread_local std::vector<idx> matches_vec;
+  static thread_local std::vector<idx> pred_vec;
+  static thread_local std::vector<acc> d_vec;
+  const bool split = team != nullptr && (size_t)dim >= lapx::kMinParallelScan;
+
+  if ((int)collist_vec.size() < dim) collist_vec.resize(dim);
+  if ((int)matches_vec.size() < dim) matches_vec.resize(dim);
+  if ((int)pred_vec.size() < dim) pred_vec.resize(dim);
+  if ((int)d_vec.size() < dim) d_vec.resize(dim);
+
+  idx *restrict collist = collist_vec.data();  // list of columns to be scanned.
+  idx *restrict matches = matches_vec.data();  // counts how many times a row could be assigned.
+  acc *restrict d = d_vec.data();              // 'cost-distance' in augmenting path calculation.
+  idx *restrict pred = pred_vec.data();        // row-predecessor of column in augmenting/alternating path.
+
+  idx *restrict free_rows = matches;  // list of unassigned rows (reuse matches' storage).
+  idx numfree = 0;
+  if (warm) {
+    // Every row takes its cheapest column under v (a tight edge) if that
+    // column is still free; the rest go to the augmenting row reduction.
+    for (idx j = 0; j < dim; j++) {
+      colsol[j] = -1;
+    }
+    for (idx i = 0; i < dim; i++) {
+      const cost *local_cost = &assign_cost[i * dim];
+      idx j1 = 0;
+      acc h1 = local_cost[0] - v[0];
+      for (idx j = 1; j < dim; j++) {
+        const acc h = local_cost[j] - v[j];
+        if (h < h1) {
+          h1 = h;
+          j1 = j;
+        }
+      }
+      if (colsol[j1] < 0) {
+        rowsol[i] = j1;
+        colsol[j1] = i;
+      } else {
+        rowsol[i] = -1;
+        free_rows[numfree++] = i;
+      }
+    }
+    if (verbose) {
+      printf("lapjvs: WARM START from given duals\n");
+    }
+  } else {
+    // init how many times a row will be assigned in the column reduction.
+    for (idx i = 0; i < dim; i++) {
+      matches[i] = 0;
+    }
+
+    // COLUMN REDUCTION
+    if (split) {
+      // Column minima are independent: find them in parallel (v[j] and the
+      // arg-min in pred[j]), then assign in the serial order below.
+      auto fn = [&](int t) {
+        size_t lo, hi;
+        lapx::split_range(dim, t, team->size(), &lo, &hi);
+        for (idx j = (idx)lo; j < (idx)hi; j++) {
+          v[j] = assign_cost[j];
+          pred[j] = 0;
+        }
+        for (idx i = 1; i < dim; i++) {
+          const cost *local_cost = &assign_cost[i * dim];
+          for (idx j = (idx)lo; j < (idx)hi; j++) {
+            if (local_cost[j] < v[j]) {
+              v[j] = local_cost[j];
+              pred[j] = i;
+            }
+          }
+        }
+      };
+      team->run(fn);
+    }
+    for (idx j = dim - 1; j >= 0; j--) {  // reverse order gives better results.
+      idx imin = 0;
+      if (split) {
+        imin = pred[j];
+      } else {
+        // find minimum cost over rows.
+        cost min = assign_cost[j];
+        for (idx i = 1; i < dim; i++) {
+          const cost *local_cost = &assign_cost[i * dim];
+          if (local_cost[j] < min) {
+            min = local_cost[j];
+            imin = i;
+          }
+        }
+        v[j] = min;
+      }
+
+      if (++matches[imin] == 1) {
+        // init assignment if minimum row assigned for the first time.
+        rowsol[imin] = j;
+        colsol[j] = imin;
+      } else {
+        colsol[j] = -1;  // row already assigned, column not assigned.
+      }
+    }
+    if (verbose) {
+      printf("lapjvs: COLUMN REDUCTION finished\n");
+    }
+
+    // REDUCTION TRANSFER
+    for (idx i = 0; i < dim; i++) {
+      const cost *local_cost = &assign_cost[i * dim];
+      if (matches[i] == 0) {  // fill list of unassigned 'free' rows.
+        free_rows[numfree++] = i;
+      } else if (matches[i] == 1) {  // transfer reduction from rows assigned once.
+        idx j1 = rowsol[i];
+        auto scan = [&](idx lo, idx hi) {
+          acc min = std::numeric_limits<acc>::max();
+          for (idx j = lo; j < hi; j++) {
+            if (j != j1) {
+              acc cand = local_cost[j] - v[j];
+              if (cand < min) min = cand;
+            }
+          }
+          return min;
+        };
+        acc min;
+        if (split) {
+          std::vector<acc> part(team->size());
+          auto fn = [&](int t) {
+            size_t lo, hi;
+            lapx::split_range(dim, t, team->size(), &lo, &hi);
+            part[t] = scan((idx)lo, (idx)hi);
+          };
+          team->run(fn);
+          min = *std::min_element(part.begin(), part.end());
+        } else {
+          min = scan(0, dim);
+        }
+        if (min != std::numeric_limits<acc>::max()) {  // dim == 1: no other column
+          v[j1] = v[j1] - min;
+        }
+      }
+    }
+    if (verbose) {
+      printf("lapjvs: REDUCTION TRANSFER finished\n");
+    }
+  }
+
+  // AUGMENTING ROW REDUCTION
+  for (int loopcnt = 0; loopcnt < 2; loopcnt++) {  // loop to be done twice.
+    idx k = 0;
+    idx prevnumfree = numfree;
+    numfree = 0;  // start list of rows still free after augmenting row reduction.
+    // Warm starts bound the reductions as _carr_dense does: far-off duals
+    // would otherwise take about spread / cost gap of them. Cold starts
+    // (column reduction duals) keep the unbounded loop.
+    uint64_t rr_cnt = 0;
+    while (k < prevnumfree) {
+      idx i = free_rows[k++];
+      rr_cnt++;
+
+      // find minimum and second minimum reduced cost over columns.
+      acc umin, usubmin;
+      idx j1, j2;
+      std::tie(umin, usubmin, j1, j2) = find_umins(dim, i, assign_cost, v, team);
+
+      idx i0 = colsol[j1];
+      if (!warm || rr_cnt < (uint64_t)k * dim) {
+        // Without a second column (j2 < 0) any decrease keeps j1; this also
+        // keeps usubmin - umin from overflowing for integer costs.
+        acc vj1_new = j2 >= 0 ? v[j1] - (usubmin - umin) : v[j1] - 1;
+        bool vj1_lowers = vj1_new < v[j1];  // the trick to eliminate the epsilon bug
+        if (vj1_lowers) {
+          v[j1] = vj1_new;
+        } else if (i0 >= 0) {  // minimum and subminimum equal.
+          j1 = j2;
+          i0 = colsol[j2];
+        }
+        if (i0 >= 0) {
+          if (vj1_lowers) {
+            free_rows[--k] = i0;
+          } else {
+            free_rows[numfree++] = i0;
+          }
+        }
+      } else if (i0 >= 0) {
+        // Over the bound: take the tight column j1, leave i0 to augmentation.
+        free_rows[numfree++] = i0;
+      }
+
+      rowsol[i] = j1;
+      colsol[j1] = i;
+    }
+    if (verbose) {
+      printf("lapjvs: AUGMENTING ROW REDUCTION %d / %d\n", loopcnt + 1, 2);
+    }
+  }
+
+  // AUGMENT SOLUTION for each free row.
+  augment_free_rows<verbose, idx, cost, acc>(dim, assign_cost, free_rows, numfree, rowsol,
+                                             colsol, v, collist, pred, d, split ? team : nullptr);
   if (verbose) {
     printf("lapjvs: AUGMENT SOLUTION finished\n");
   }
 
   // Final cost and row duals (u) are not computed here anymore, since the Python
   // wrapper recomputes the total cost from the original input for numeric parity.
-}
\ No newline at end of file
+}
+
+/// @brief Whether lapjvs_rect() should solve an n_rows x n_cols problem
+/// (n_rows <= n_cols): closer to square than 2:3, lapjvs() on the
+/// zero-padded square matrix is faster.
+inline bool lapjvs_prefer_rect(int n_rows, int n_cols) {
+  return n_rows < n_cols && 2.0 * n_cols >= 3.0 * n_rows;
+}
+
+/// @brief Rectangular Jonker-Volgenant: assigns every row of an n_rows x
+/// n_cols matrix (n_rows <= n_cols) without padding it to a square, in
+/// O(n_rows^2 n_cols). Duals start at 0 and every row takes its cheapest
+/// column if still free; the others are assigned by augment_free_rows(),
+/// which never lowers the dual of a free column. The result is optimal for
+/// the zero-padded square problem, and v (size n_cols) is 0 on the columns
+/// left free.
+/// @param rowsol out column assigned to row / size n_rows
+/// @param colsol out row assigned to column, -1 if free / size n_cols
+/// @param v out column duals / size n_cols
+/// @param team in optional thread team, as in lapjvs()
+template <bool verbose, typename idx, typename cost, typename acc = cost>
+void lapjvs_rect(int n_rows, int n_cols, const cost *restrict assign_cost,
+    idx *restrict rowsol, idx *restrict colsol, acc *restrict v,
+    lapx::Team *team = nullptr) {
+  static thread_local std::vector<idx> collist_vec;
+  static thread_local std::vector<idx> free_vec;
+  static thread_local std::vector<idx> pred_vec;
+  static thread_local std::vector<acc> d_vec;
+  const bool split = team != nullptr && (size_t)n_cols >= lapx::kMinParallelScan;
+
+  if ((int)collist_vec.size() < n_cols) collist_vec.resize(n_cols);
+  if ((int)free_vec.size() < n_rows) free_vec.resize(n_rows);
+  if ((int)pred_vec.size() < n_cols) pred_vec.resize(n_cols);
+  if ((int)d_vec.size() < n_cols) d_vec.resize(n_cols);
+  idx *restrict free_rows = free_vec.data();
+
+  for (idx j = 0; j < n_cols; j++) {
+    v[j] = 0;
+    colsol[j] = -1;
+  }
+  idx numfree = 0;
+  for (idx i = 0; i < n_rows; i++) {
+    acc umin, usubmin;
+    idx j1, j2;
+    std::tie(umin, usubmin, j1, j2) = find_umins(
+        (idx)n_cols, i, assign_cost, v, split ? team : nullptr);
+    if (colsol[j1] < 0) {
+      rowsol[i] = j1;
+      colsol[j1] = i;
+    } else {
+      rowsol[i] = -1;
+      free_rows[numfree++] = i;
+    }
+  }
+  if (verbose) {
+    printf("lapjvs_rect: ROW REDUCTION finished, %d free rows\n", (int)numfree);
+  }
+
+  augment_free_rows<verbose, idx, cost, acc>(n_cols, assign_cost, free_rows, numfree, rowsol,
+                                             colsol, v, collist_vec.data(), pred_vec.data(),
+                                             d_vec.data(), split ? team : nullptr);
+  if (verbose) {
+    printf("lapjvs_rect: AUGMENT SOLUTION finished\n");
+  }
+}
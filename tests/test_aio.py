@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+import lap
+import lap.aio
+
+
+def test_aio_solvers_match_sync():
+    rng = np.random.RandomState(5)
+    cost = rng.rand(12, 17)
+    batch = rng.rand(6, 8, 5)
+
+    async def main():
+        return await asyncio.gather(
+            lap.aio.lapjvx(cost, extend_cost=True),
+            lap.aio.lapjvs(cost),
+            lap.aio.lapjvc(cost),
+            lap.aio.lapjvx_batch(batch, extend_cost=True, output="packed"),
+        )
+
+    jvx, jvs, jvc, jvx_b = asyncio.run(main())
+    for got, ref in [
+        (jvx, lap.lapjvx(cost, extend_cost=True)),
+        (jvs, lap.lapjvs(cost)),
+        (jvc, lap.lapjvc(cost)),
+        (jvx_b, lap.lapjvx_batch(batch, extend_cost=True, output="packed")),
+    ]:
+        assert np.allclose(got[0], ref[0])
+        for a, b in zip(got[1:], ref[1:]):
+            assert np.array_equal(a, b)
+    assert lap.aio.lapjvx.__name__ == "lapjvx"
+
+
+def test_aio_concurrency_cap_and_cancellation():
+    release = threading.Event()
+    running = []
+    peak = []
+
+    def slow(x):
+        running.append(x)
+        peak.append(len(running))
+        release.wait(5)
+        running.remove(x)
+        return x
+
+    async def main():
+        sem_loop = asyncio.get_running_loop()
+        first = asyncio.ensure_future(lap.aio._run(slow, 1))
+        second = asyncio.ensure_future(lap.aio._run(slow, 2))
+        await asyncio.sleep(0.05)
+        assert running == [1]  # the second call waits for the single slot
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        release.set()
+        assert await first == 1
+        assert await lap.aio._run(slow, 3) == 3
+        return lap.aio._limiters[sem_loop]
+
+    with lap.SolverPool(n_threads=2) as pool:
+        lap.aio.configure(pool=pool, max_concurrency=1)
+        try:
+            sem = asyncio.run(main())
+        finally:
+            lap.aio.configure()
+        assert max(peak) == 1
+        assert 2 not in running
+    assert not sem.locked()
+
+    with pytest.raises(ValueError):
+        lap.aio.configure(max_concurrency=0)
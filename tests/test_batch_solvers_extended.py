@@ -101,3 +101,369 @@ def test_batch_square_no_extend_equivalence_on_views(B, M, N):
             assert np.isclose(cs[b], c_s)
             assert np.array_equal(rs[b], r_s)
             assert np.array_equal(cs_[b], c_s_)
+
+
+@pytest.mark.parametrize("B,M,N", [(64, 12, 12), (33, 9, 14), (33, 14, 9)])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_native_batch_many_instances_matches_single(B, M, N, dtype):
+    # Many instances on several native threads must still match the single solvers
+    batch = np.random.RandomState(777).rand(B, M, N).astype(dtype)
+    extend = (M != N)
+
+    cx, rx, kx = lap.lapjvx_batch(batch, extend_cost=extend, return_cost=True, n_threads=4)
+    cs, rs, ks = lap.lapjvs_batch(batch, extend_cost=extend, return_cost=True, n_threads=4)
+    for b in range(B):
+        c1, r1, k1 = lap.lapjvx(batch[b], extend_cost=extend, return_cost=True)
+        assert np.isclose(cx[b], c1)
+        assert np.array_equal(rx[b], r1) and np.array_equal(kx[b], k1)
+        c2, r2, k2 = lap.lapjvs(batch[b], extend_cost=extend, return_cost=True, jvx_like=True)
+        assert np.isclose(cs[b], c2)
+        assert np.array_equal(rs[b], r2) and np.array_equal(ks[b], k2)
+        assert rx[b].dtype == np.int64 and kx[b].dtype == np.int64
+
+
+@pytest.mark.parametrize("B,M,N", [(8, 6, 6), (8, 5, 9), (8, 9, 5)])
+def test_lapjvx_batch_cost_limit_matches_single(B, M, N):
+    batch = np.random.RandomState(4242).rand(B, M, N)
+    costs_b, rows_b, cols_b = lap.lapjvx_batch(batch, cost_limit=0.25, return_cost=True, n_threads=3)
+    for b in range(B):
+        c_s, r_s, k_s = lap.lapjvx(batch[b], cost_limit=0.25, return_cost=True)
+        assert np.isclose(costs_b[b], c_s)
+        assert np.array_equal(rows_b[b], r_s)
+        assert np.array_equal(cols_b[b], k_s)
+
+
+@pytest.mark.parametrize("solver", [lap.lapjvx_batch, lap.lapjvxa_batch, lap.lapjvs_batch, lap.lapjvsa_batch])
+def test_batch_empty_inputs(solver):
+    out = solver(np.zeros((0, 4, 4)), extend_cost=True, return_cost=True)
+    assert out[0].shape == (0,)
+    assert all(len(o) == 0 for o in out[1:])
+
+    out = solver(np.zeros((3, 0, 4)), extend_cost=True, return_cost=True)
+    assert np.array_equal(out[0], np.zeros(3))
+    for o in out[1:]:
+        assert len(o) == 3 and all(a.shape[0] == 0 for a in o)
+
+
+def test_batch_rectangular_requires_extend_cost():
+    batch = np.random.RandomState(5).rand(2, 3, 4)
+    for solver in (lap.lapjvx_batch, lap.lapjvxa_batch, lap.lapjvs_batch, lap.lapjvsa_batch):
+        with pytest.raises(ValueError):
+            solver(batch, extend_cost=False)
+
+
+_RAGGED_SHAPES = [(5, 5), (3, 7), (8, 4), (0, 3), (6, 6), (1, 1), (9, 2), (4, 0)]
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("cost_limit", [np.inf, 0.3])
+def test_ragged_list_matches_single(dtype, cost_limit):
+    rng = np.random.RandomState(99)
+    mats = [rng.rand(*s).astype(dtype) for s in _RAGGED_SHAPES]
+
+    cx, rx, kx = lap.lapjvx_batch(mats, extend_cost=True, cost_limit=cost_limit, n_threads=3)
+    assert len(rx) == len(mats) and cx.shape == (len(mats),)
+    for b, m in enumerate(mats):
+        if m.size == 0:
+            assert cx[b] == 0 and rx[b].shape == (0,) and kx[b].shape == (0,)
+            continue
+        c1, r1, k1 = lap.lapjvx(m, extend_cost=True, cost_limit=cost_limit)
+        assert np.isclose(cx[b], c1)
+        assert np.array_equal(rx[b], r1) and np.array_equal(kx[b], k1)
+
+    if cost_limit == np.inf:
+        cs, ps = lap.lapjvsa_batch(mats, extend_cost=True, n_threads=3)
+        for b, m in enumerate(mats):
+            if m.size == 0:
+                assert ps[b].shape == (0, 2)
+                continue
+            c2, p2 = lap.lapjvsa(m, extend_cost=True)
+            assert np.isclose(cs[b], c2)
+            assert np.array_equal(ps[b], p2)
+
+
+@pytest.mark.parametrize("solver", [lap.lapjvx_batch, lap.lapjvs_batch])
+def test_ragged_packed_buffer_matches_list(solver):
+    rng = np.random.RandomState(3)
+    mats = [rng.rand(*s) for s in _RAGGED_SHAPES]
+    shapes = np.array(_RAGGED_SHAPES)
+    packed = np.concatenate([m.ravel() for m in mats])
+
+    ref = solver(mats, extend_cost=True)
+    out = solver(packed, extend_cost=True, shapes=shapes)
+    assert np.allclose(ref[0], out[0])
+    for a, b in zip(ref[1] + ref[2], out[1] + out[2]):
+        assert np.array_equal(a, b)
+
+    # Explicit offsets with gaps between instances
+    sizes = shapes[:, 0] * shapes[:, 1]
+    offsets = np.cumsum(sizes + 2) - (sizes + 2)
+    gapped = np.full(int(sizes.sum() + 2 * len(mats)), np.nan)
+    for o, m in zip(offsets, mats):
+        gapped[o:o + m.size] = m.ravel()
+    out = solver(gapped, extend_cost=True, shapes=shapes, offsets=offsets)
+    assert np.allclose(ref[0], out[0])
+    for a, b in zip(ref[1] + ref[2], out[1] + out[2]):
+        assert np.array_equal(a, b)
+
+
+def test_ragged_validation():
+    mats = [np.zeros((2, 2)), np.zeros((2, 3))]
+    for solver in (lap.lapjvx_batch, lap.lapjvxa_batch, lap.lapjvs_batch, lap.lapjvsa_batch):
+        with pytest.raises(ValueError):
+            solver(mats, extend_cost=False)
+        with pytest.raises(ValueError):
+            solver([np.zeros(3)], extend_cost=True)
+        with pytest.raises(ValueError):
+            solver(np.zeros(5), extend_cost=True, shapes=[[2, 3]])
+        out = solver([], extend_cost=True)
+        assert out[0].shape == (0,)
+
+
+@pytest.mark.parametrize("ragged", [False, True], ids=["dense", "ragged"])
+@pytest.mark.parametrize("family", ["x", "s"])
+def test_batch_output_modes(family, ragged):
+    rng = np.random.RandomState(11)
+    if ragged:
+        costs = [rng.rand(*s) for s in _RAGGED_SHAPES]
+    else:
+        costs = rng.rand(6, 5, 8)
+    solve = lap.lapjvx_batch if family == "x" else lap.lapjvs_batch
+    solve_a = lap.lapjvxa_batch if family == "x" else lap.lapjvsa_batch
+    B = len(costs)
+
+    totals, rows_list, cols_list = solve(costs, extend_cost=True)
+    counts = np.array([len(r) for r in rows_list])
+
+    t, offsets, rows, cols = solve(costs, extend_cost=True, output="packed")
+    assert np.allclose(t, totals)
+    assert offsets.shape == (B + 1,) and offsets[0] == 0
+    assert np.array_equal(np.diff(offsets), counts)
+    for b in range(B):
+        assert np.array_equal(rows[offsets[b]:offsets[b + 1]], rows_list[b])
+        assert np.array_equal(cols[offsets[b]:offsets[b + 1]], cols_list[b])
+
+    rows_p, cols_p = solve(costs, extend_cost=True, return_cost=False, output="padded")
+    assert rows_p.shape == cols_p.shape == (B, counts.max())
+    for b in range(B):
+        assert np.array_equal(rows_p[b, :counts[b]], rows_list[b])
+        assert np.array_equal(cols_p[b, :counts[b]], cols_list[b])
+        assert np.all(rows_p[b, counts[b]:] == -1) and np.all(cols_p[b, counts[b]:] == -1)
+
+    _, x, y = solve(costs, extend_cost=True, output="xy")
+    assert x.shape[0] == y.shape[0] == B
+    for b in range(B):
+        assert np.array_equal(np.nonzero(x[b] >= 0)[0], np.sort(rows_list[b]))
+        assert np.array_equal(x[b, rows_list[b]], cols_list[b])
+        assert np.array_equal(y[b, cols_list[b]], rows_list[b])
+
+    offsets_a, pairs = solve_a(costs, extend_cost=True, return_cost=False, output="packed")
+    assert np.array_equal(offsets_a, offsets)
+    assert np.array_equal(pairs, np.stack([rows, cols], axis=1))
+    pairs_p = solve_a(costs, extend_cost=True, return_cost=False, output="padded")
+    assert np.array_equal(pairs_p, np.stack([rows_p, cols_p], axis=2))
+
+    with pytest.raises(ValueError):
+        solve(costs, extend_cost=True, output="dict")
+
+
+def test_solver_pool_matches_direct_calls():
+    from concurrent.futures import ThreadPoolExecutor
+
+    rng = np.random.RandomState(21)
+    dense = rng.rand(37, 9, 13)
+    ragged = [rng.rand(*s) for s in _RAGGED_SHAPES * 3]
+
+    with lap.SolverPool(n_threads=3) as pool:
+        for _ in range(2):  # reuse the same workers across calls
+            for solver in (lap.lapjvx_batch, lap.lapjvs_batch):
+                for costs in (dense, ragged):
+                    ref = solver(costs, extend_cost=True, output="packed", n_threads=1)
+                    out = solver(costs, extend_cost=True, output="packed", pool=pool)
+                    assert np.allclose(ref[0], out[0])
+                    for a, b in zip(ref[1:], out[1:]):
+                        assert np.array_equal(a, b)
+        pairs = lap.lapjvxa_batch(dense, extend_cost=True, return_cost=False, pool=pool)
+        assert len(pairs) == dense.shape[0]
+    assert pool.closed
+    with pytest.raises(RuntimeError):
+        lap.lapjvx_batch(dense, extend_cost=True, pool=pool)
+
+    # A caller-supplied executor is used but never shut down by the pool
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        pool = lap.SolverPool(executor=ex)
+        assert pool.n_threads == 2
+        totals, _ = lap.lapjvsa_batch(dense, extend_cost=True, output="padded", pool=pool)
+        assert np.allclose(totals, lap.lapjvsa_batch(dense, extend_cost=True)[0])
+        pool.close()
+        assert ex.submit(lambda: 7).result() == 7
+
+
+@pytest.mark.parametrize("solver", [lap.lapjvx_batch, lap.lapjvs_batch])
+def test_heterogeneous_batch_scheduling_keeps_order(solver):
+    # A few big instances buried among many tiny ones: the size-aware
+    # scheduler reorders the work but results must stay in batch order.
+    rng = np.random.RandomState(8)
+    sizes = [3] * 40 + [120] + [2] * 40 + [90, 5, 150] + [4] * 20
+    mats = [rng.rand(n, n + (k % 3)) for k, n in enumerate(sizes)]
+
+    ref = solver(mats, extend_cost=True, output="packed", n_threads=1)
+    outs = [solver(mats, extend_cost=True, output="packed", n_threads=4)]
+    with lap.SolverPool(n_threads=4) as pool:
+        outs.append(solver(mats, extend_cost=True, output="packed", pool=pool))
+    for out in outs:
+        assert np.allclose(ref[0], out[0])
+        for a, b in zip(ref[1:], out[1:]):
+            assert np.array_equal(a, b)
+
+
+@pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32, np.float64])
+def test_lapjvc_batch_matches_single(dtype):
+    rng = np.random.RandomState(13)
+    for shape in [(6, 6), (4, 9), (9, 4)]:
+        costs = (rng.rand(5, *shape) * 100).astype(dtype)
+        if np.issubdtype(dtype, np.floating):
+            costs[1, 0, 0] = np.nan  # forbidden entry, as in lapjvc
+        totals, rows, cols = lap.lapjvc_batch(costs, n_threads=2)
+        assert totals.dtype == dtype
+        for b in range(costs.shape[0]):
+            t, r, c = lap.lapjvc(costs[b])
+            assert totals[b] == t
+            assert np.array_equal(rows[b], r)
+            assert np.array_equal(cols[b], c)
+
+    mats = [(rng.rand(*s) * 100).astype(dtype) for s in _RAGGED_SHAPES]
+    totals, offsets, rows, cols = lap.lapjvc_batch(mats, output="packed")
+    for b, m in enumerate(mats):
+        t, r, c = lap.lapjvc(m)
+        assert totals[b] == t
+        assert np.array_equal(rows[offsets[b]:offsets[b + 1]], r)
+        assert np.array_equal(cols[offsets[b]:offsets[b + 1]], c)
+
+
+def _sparse_instance(rng, n, density=0.5):
+    dense = rng.rand(n, n) * 10 + 0.01
+    mask = rng.rand(n, n) < density
+    mask[np.arange(n), rng.permutation(n)] = True  # keep it feasible
+    ii = np.concatenate([[0], np.cumsum(mask.sum(axis=1))]).astype(np.int32)
+    kk = np.nonzero(mask)[1].astype(np.int32)
+    return dense[mask], ii, kk
+
+
+def test_lapmod_batch_matches_single():
+    rng = np.random.RandomState(17)
+    sizes = [5, 12, 1, 30, 8]
+    triples = [_sparse_instance(rng, n) for n in sizes]
+
+    totals, rows, cols = lap.lapmod_batch(triples, n_threads=2)
+    x_all, y_all = lap.lapmod_batch(triples, return_cost=False, output="xy")
+    for b, (cc, ii, kk) in enumerate(triples):
+        t, x, y = lap.lapmod(sizes[b], cc, ii, kk)
+        assert np.isclose(totals[b], t)
+        assert np.array_equal(rows[b], np.arange(sizes[b]))
+        assert np.array_equal(cols[b], x)
+        assert np.array_equal(x_all[b, :sizes[b]], x)
+        assert np.array_equal(y_all[b, :sizes[b]], y)
+
+    # The same instances as one block-diagonal CSR matrix (global columns)
+    starts = np.cumsum(sizes) - sizes
+    cc = np.concatenate([t[0] for t in triples])
+    kk = np.concatenate([t[2] + s for t, s in zip(triples, starts)])
+    ii = np.concatenate([[0], np.cumsum(np.concatenate([np.diff(t[1]) for t in triples]))])
+    with lap.SolverPool(n_threads=2) as pool:
+        out = lap.lapmod_batch((cc, ii, kk), sizes=sizes, pool=pool)
+    assert np.allclose(out[0], totals)
+    for a, b in zip(out[2], cols):
+        assert np.array_equal(a, b)
+
+
+def test_lapmod_batch_validation():
+    rng = np.random.RandomState(3)
+    good = _sparse_instance(rng, 4)
+    cc, ii, kk = good
+    with pytest.raises(ValueError, match="instance 1"):
+        lap.lapmod_batch([good, (-cc, ii, kk)])
+    with pytest.raises(ValueError, match="instance 0"):
+        lap.lapmod_batch([(cc[:0], np.zeros(1, np.int32), kk[:0])])
+    # Two 4x4 blocks; then move the first entry of row 0 into the second block
+    big_ii = np.concatenate([ii, ii[1:] + ii[-1]])
+    big_kk = np.concatenate([kk, kk + 4])
+    big_cc = np.concatenate([cc, cc])
+    out = lap.lapmod_batch((big_cc, big_ii, big_kk), sizes=[4, 4])
+    assert np.allclose(out[0], lap.lapmod(4, cc, ii, kk)[0])
+    bad_kk = big_kk.copy()
+    bad_kk[0] += 4
+    with pytest.raises(ValueError, match="outside the diagonal blocks"):
+        lap.lapmod_batch((big_cc, big_ii, bad_kk), sizes=[4, 4])
+    with pytest.raises(ValueError):
+        lap.lapmod_batch((big_cc, big_ii, big_kk), sizes=[4, 3])
+
+
+def test_solve_stream_ordered_and_unordered():
+    rng = np.random.RandomState(31)
+    mats = [rng.rand(n, n + 2) for n in (30, 3, 12, 1, 25, 7) * 4]
+    pulled = []
+
+    def gen():
+        for i, m in enumerate(mats):
+            pulled.append(i)
+            yield m
+
+    ref = [lap.lapjvx(m, extend_cost=True) for m in mats]
+    stream = lap.solve_stream(gen(), n_threads=2, max_in_flight=3, extend_cost=True)
+    for i, got in enumerate(stream):
+        assert len(pulled) <= i + 3  # never more than max_in_flight ahead
+        assert np.isclose(got[0], ref[i][0])
+        assert np.array_equal(got[1], ref[i][1]) and np.array_equal(got[2], ref[i][2])
+
+    with lap.SolverPool(n_threads=2) as pool:
+        seen = {}
+        for i, got in lap.solve_stream(iter(mats), solver="lapjvc", ordered=False, pool=pool):
+            seen[i] = got
+        assert sorted(seen) == list(range(len(mats)))
+        for i, m in enumerate(mats):
+            assert np.array_equal(seen[i][2], lap.lapjvc(m)[2])
+        assert not pool.closed  # a caller's pool is left open
+
+    with pytest.raises(ValueError):
+        lap.solve_stream(mats, solver="hungarian")
+    with pytest.raises(ValueError):
+        lap.solve_stream(mats, max_in_flight=0)
+    with pytest.raises(ValueError):
+        # lapjv rejects rectangular input without extend_cost
+        list(lap.solve_stream(mats, solver="lapjv"))
+
+
+@pytest.mark.parametrize("solver", ["lapjvx_batch", "lapjvs_batch"])
+@pytest.mark.parametrize("output", ["list", "packed", "padded", "xy"])
+def test_batch_warm_start_round_trips_duals(solver, output):
+    rng = np.random.default_rng(14)
+    fn = getattr(lap, solver)
+    kwargs = {"extend_cost": True}
+    if solver == "lapjvs_batch":
+        kwargs["prefer_float32"] = False
+
+    dense = rng.random((5, 6, 8))
+    res = fn(dense, output=output, return_duals=True, **kwargs)
+    u, v = res[-2:]
+    assert u.shape == (5, 6) and v.shape == (5, 8)
+    for b in range(5):
+        # Random float costs: the optimal matching is unique.
+        _, rows, cols = lap.lapjvx(dense[b], extend_cost=True)
+        reduced = dense[b] - u[b][:, None] - v[b][None, :]
+        assert reduced.min() >= -1e-9
+        assert np.allclose(reduced[rows, cols], 0.0)
+    moved = dense + 0.05 * rng.random(dense.shape)
+    assert np.allclose(fn(moved, init_v=v, **kwargs)[0], fn(moved, **kwargs)[0])
+
+    ragged = [rng.random((n, m)) for n, m in [(3, 5), (6, 4), (1, 1), (5, 5)]]
+    res = fn(ragged, output=output, return_duals=True, **kwargs)
+    u, v = res[-2:]
+    moved = [c + 0.05 * rng.random(c.shape) for c in ragged]
+    ref = fn(moved, **kwargs)[0]
+    assert np.allclose(fn(moved, init_v=v, **kwargs)[0], ref)
+    with lap.SolverPool(n_threads=2) as pool:
+        assert np.allclose(fn(moved, init_v=v, pool=pool, **kwargs)[0], ref)
+
+    with pytest.raises(ValueError):
+        fn(dense, init_v=np.zeros((5, 7)), **kwargs)
@@ -1,3 +1,6 @@
+import time
+import tracemalloc
+
 import numpy as np
 import pytest
 
@@ -176,3 +179,722 @@ def test_large_integer_ranges(solver_name, dtype, lo, hi):
     # Recompute total in float to avoid dtype overflow concerns in Python
     tot_chk = _pairs_total(C.astype(np.float64), r, c)
     assert np.isclose(float(tot), tot_chk, rtol=1e-6, atol=1e-6)
+
+
+def test_lapjvc_from_threads_matches_serial():
+    # lapjvc releases the GIL while solving; concurrent calls must not interfere.
+    from concurrent.futures import ThreadPoolExecutor
+
+    rng = np.random.default_rng(7)
+    mats = [rng.random((n, n + k)) for n in (10, 40, 25) for k in (0, 3, -3)]
+    mats[1][2, :] = np.inf
+    serial = [lap.lapjvc(C) for C in mats]
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        threaded = list(ex.map(lap.lapjvc, mats))
+    for (t1, r1, c1), (t2, r2, c2) in zip(serial, threaded):
+        assert t1 == t2
+        assert np.array_equal(r1, r2)
+        assert np.array_equal(c1, c2)
+
+
+@pytest.mark.parametrize("solver_name", ["lapjv", "lapjvx", "lapjvs", "lapjvsa"])
+def test_intra_instance_threads_same_result(solver_name):
+    # Large enough for the inner scans to be split; integer-valued costs make
+    # plenty of ties, so any change in tie-breaking would show up.
+    rng = np.random.default_rng(11)
+    C = rng.integers(0, 40, size=(4200, 4200)).astype(np.float64)
+    kwargs = {"prefer_float32": False} if solver_name.startswith("lapjvs") else {}
+    solver = getattr(lap, solver_name)
+    serial = solver(C, n_threads=1, **kwargs)
+    threaded = solver(C, n_threads=3, **kwargs)
+    assert serial[0] == threaded[0]
+    for a, b in zip(serial[1:], threaded[1:]):
+        assert np.array_equal(a, b)
+
+
+@pytest.mark.parametrize("shape,kwargs", [
+    ((30, 30), {}),
+    ((24, 37), {"extend_cost": True}),
+    ((37, 24), {"extend_cost": True}),
+    ((20, 31), {"cost_limit": 50.0}),
+], ids=["square", "wide", "tall", "cost_limit"])
+def test_auction_matches_lapjvx_on_integer_costs(shape, kwargs):
+    # Integer costs: the default eps makes the auction exact.
+    rng = np.random.default_rng(5)
+    C = rng.integers(0, 100, size=shape).astype(np.float64)
+    total, rows, cols = lap.auction(C, **kwargs)
+    ref_total, ref_rows, _ = lap.lapjvx(C, **kwargs)
+    assert total == ref_total
+    assert len(rows) == len(ref_rows)
+    assert _valid_pairs(rows, cols, *shape)
+    assert total == _pairs_total(C, rows, cols)
+
+
+def test_auction_float_costs_eps_scale_and_threads():
+    rng = np.random.default_rng(6)
+    C = rng.random((600, 600))
+    ref = lap.lapjvx(C)[0]
+    total, rows, cols = lap.auction(C, n_threads=1)
+    assert ref <= total <= ref + 600 * 1e-7
+    assert lap.auction(C, scale=1e6)[0] <= ref + 600 * 1e-6
+    threaded = lap.auction(C, n_threads=3)
+    assert threaded[0] == total
+    assert np.array_equal(threaded[2], cols)
+    rows2, cols2 = lap.auction(C, return_cost=False)
+    assert np.array_equal(rows2, rows) and np.array_equal(cols2, cols)
+
+    with pytest.raises(ValueError):
+        lap.auction(np.array([[0.0, np.inf], [1.0, 2.0]]))
+    with pytest.raises(ValueError):
+        lap.auction(C[:3, :4])
+    with pytest.raises(ValueError):
+        lap.auction(C, eps=0.0)
+
+
+def _assert_duals(C, u, v, rows, cols, tol=1e-9):
+    # Dual feasibility everywhere, complementary slackness on the matches.
+    reduced = C - u[:, None] - v[None, :]
+    assert reduced.min() >= -tol
+    assert np.all(np.abs(reduced[rows, cols]) <= tol)
+
+
+@pytest.mark.parametrize("solver_name", ["lapjv", "lapjvx", "lapjvs"])
+@pytest.mark.parametrize("shape", [(12, 12), (9, 14), (14, 9)], ids=["square", "wide", "tall"])
+def test_warm_start_from_previous_duals_is_exact(solver_name, shape):
+    rng = np.random.default_rng(12)
+    C = rng.random(shape)
+    C2 = C + 0.05 * rng.random(shape)  # the next, slightly changed frame
+    solver = getattr(lap, solver_name)
+    if solver_name == "lapjvs":
+        kwargs = {"prefer_float32": False, "jvx_like": True}
+    else:
+        kwargs = {"extend_cost": shape[0] != shape[1]}
+
+    out = solver(C, return_duals=True, **kwargs)
+    u, v = out[-2:]
+    assert u.shape == (shape[0],) and v.shape == (shape[1],)
+    cold = solver(C2, **kwargs)
+    warm = solver(C2, init_v=v, return_duals=True, **kwargs)
+    assert np.isclose(warm[0], cold[0])
+
+    if solver_name == "lapjv":
+        rows = np.nonzero(warm[1] >= 0)[0]
+        cols = warm[1][rows]
+    else:
+        rows, cols = warm[1], warm[2]
+    _assert_duals(C2, warm[3], warm[4], rows, cols)
+
+    with pytest.raises(ValueError):
+        solver(C2, init_v=v[:-1], **kwargs)
+
+
+@pytest.mark.parametrize("scale", [1e5, 1e6, 1e8])
+def test_lapjvs_warm_start_far_off_duals(scale):
+    # Duals far from the cost scale used to crawl through the row reduction
+    # and, in float32, lose the cost differences altogether.
+    rng = np.random.default_rng(15)
+    Cs = rng.random((8, 10, 10))
+    V = rng.normal(0.0, scale, (8, 10))
+    ref = [lap.lapjvx(C)[0] for C in Cs]
+    start = time.perf_counter()
+    single = [lap.lapjvs(C, init_v=v)[0] for C, v in zip(Cs, V)]
+    batch = lap.lapjvs_batch(Cs, init_v=V)[0]
+    A = rng.random((50, 50))
+    v = lap.lapjvs(A * 1000, return_duals=True)[4]
+    warm = lap.lapjvs(A, init_v=v)[0]
+    assert time.perf_counter() - start < 2.0
+    assert np.allclose(single, ref, atol=1e-5)
+    assert np.allclose(batch, ref, atol=1e-5)
+    assert np.isclose(warm, lap.lapjvx(A)[0], atol=1e-5)
+
+
+def test_warm_start_with_cost_limit():
+    rng = np.random.default_rng(13)
+    C = rng.random((10, 13)) * 10
+    total, rows, cols, u, v = lap.lapjvx(C, cost_limit=4.0, return_duals=True)
+    _assert_duals(C, u, v, rows, cols)
+    C2 = C + rng.random(C.shape)
+    cold = lap.lapjvx(C2, cost_limit=4.0)
+    warm = lap.lapjvx(C2, cost_limit=4.0, init_v=v)
+    # Compare the augmented objective: every unmatched row/column pays 2.0
+    objective = lambda t, k: t + 2.0 * (C.shape[0] + C.shape[1] - 2 * k)
+    assert np.isclose(objective(warm[0], len(warm[1])), objective(cold[0], len(cold[1])))
+
+
+def _objective(C, cost_limit, rows):
+    # lapjvx objective including the cost_limit/2 paid by unmatched rows/columns
+    if cost_limit == np.inf:
+        return 0.0
+    return cost_limit / 2.0 * (C.shape[0] + C.shape[1] - 2 * len(rows))
+
+
+@pytest.mark.parametrize("cost_limit", [np.inf, 30.0], ids=["no_limit", "cost_limit"])
+def test_incremental_assignment_matches_full_solve(cost_limit):
+    rng = np.random.default_rng(14)
+    inc = lap.IncrementalAssignment(rng.random((6, 8)) * 50, cost_limit=cost_limit)
+    for step in range(60):
+        N, M = inc.shape
+        op = step % 5
+        if op == 0:
+            new = inc.add_rows(rng.random((2, M)) * 50)
+            assert np.array_equal(new, [N, N + 1])
+        elif op == 1:
+            new = inc.add_cols(rng.random((N, 1)) * 50)
+            assert np.array_equal(new, [M])
+        elif op == 2 and N > 1:
+            inc.remove_rows(rng.choice(N, 2, replace=False))
+        elif op == 3 and M > 1:
+            inc.remove_cols([rng.integers(M)])
+        elif op == 4:
+            inc.update_costs(rng.integers(N, size=3), rng.integers(M, size=3), rng.random(3) * 50)
+
+        C = np.array(inc.cost)
+        total, rows, cols = inc.solution()
+        ref = lap.lapjvx(C, extend_cost=True, cost_limit=cost_limit)
+        assert np.isclose(total + _objective(C, cost_limit, rows),
+                          ref[0] + _objective(C, cost_limit, ref[1]))
+        assert np.isclose(total, C[rows, cols].sum())
+        assert np.array_equal(inc.x[rows], cols) and np.array_equal(inc.y[cols], rows)
+        u, v = inc.duals()
+        _assert_duals(C, u, v, rows, cols, tol=1e-7)
+
+
+def test_incremental_assignment_edge_cases():
+    inc = lap.IncrementalAssignment(np.empty((0, 0)))
+    assert inc.solution()[0] == 0.0
+    inc.add_cols(np.empty((0, 3)))
+    inc.add_rows([[3.0, 1.0, 2.0]])
+    total, rows, cols = inc.solution()
+    assert total == 1.0 and rows.tolist() == [0] and cols.tolist() == [1]
+    inc.update_costs(0, 1, 9.0)
+    assert inc.solution(return_cost=False)[1].tolist() == [2]
+    inc.remove_cols([2])
+    assert inc.x.tolist() == [0] and inc.y.tolist() == [0, -1]
+
+    with pytest.raises(ValueError):
+        lap.IncrementalAssignment(np.ones(3))
+    with pytest.raises(ValueError):
+        inc.add_rows(np.ones((1, 3)))
+    with pytest.raises(ValueError):
+        inc.add_cols([[np.nan]])
+    with pytest.raises(ValueError):
+        inc.remove_rows([5])
+    with pytest.raises(ValueError):
+        inc.update_costs(0, 0, np.inf)
+    assert inc.cost[0, 0] == 3.0  # a rejected edit leaves the costs alone
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32, np.int64])
+@pytest.mark.parametrize("shape", [(8, 8), (6, 10), (10, 6)], ids=["square", "wide", "tall"])
+def test_lapjvc_return_duals(dtype, shape):
+    rng = np.random.default_rng(15)
+    C = (rng.random(shape) * 100).astype(dtype)
+    total, rows, cols, u, v = lap.lapjvc(C, return_duals=True)
+    assert u.dtype == dtype and u.shape == (shape[0],) and v.shape == (shape[1],)
+    ref = lap.lapjvc(C)
+    assert total == ref[0] and np.array_equal(rows, ref[1]) and np.array_equal(cols, ref[2])
+    tol = 1e-3 if dtype == np.float32 else 1e-9
+    _assert_duals(C.astype(np.float64), u.astype(np.float64), v.astype(np.float64), rows, cols, tol)
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_lapmod_return_duals(fast):
+    rng = np.random.default_rng(16)
+    n = 25
+    C = rng.random((n, n)) * 10
+    stored = rng.random((n, n)) < 0.3
+    stored[np.arange(n), rng.permutation(n)] = True
+    ii = np.concatenate([[0], np.cumsum(stored.sum(axis=1))])
+    kk = np.nonzero(stored)[1]
+    cc = C[stored]
+    total, x, y, u, v = lap.lapmod(n, cc, ii, kk, fast=fast, return_duals=True)
+    assert total == lap.lapmod(n, cc, ii, kk, fast=fast)[0]
+    # Feasibility only covers stored entries; the others are infinite
+    reduced = np.where(stored, C - u[:, None] - v[None, :], np.inf)
+    assert reduced.min() >= -1e-9
+    assert np.all(np.abs(reduced[np.arange(n), x]) <= 1e-9)
+
+
+def test_lapmod_from_threads_matches_serial():
+    # The fast lapmod path releases the GIL; concurrent calls must not interfere.
+    from concurrent.futures import ThreadPoolExecutor
+
+    rng = np.random.default_rng(8)
+    problems = []
+    for n in (10, 60, 35, 80):
+        stored = rng.random((n, n)) < 0.2
+        stored[np.arange(n), rng.permutation(n)] = True
+        ii = np.concatenate([[0], np.cumsum(stored.sum(axis=1))])
+        problems.append((n, rng.random((n, n))[stored], ii, np.nonzero(stored)[1]))
+    serial = [lap.lapmod(*p) for p in problems]
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        threaded = list(ex.map(lambda p: lap.lapmod(*p), problems))
+    for (t1, x1, y1), (t2, x2, y2) in zip(serial, threaded):
+        assert t1 == t2
+        assert np.array_equal(x1, x2) and np.array_equal(y1, y2)
+
+
+@pytest.mark.parametrize("fmt", ["csr_matrix", "csc_matrix", "csr_array", "csc_array"])
+@pytest.mark.parametrize("shape", [(30, 30), (12, 40), (40, 12)], ids=["square", "wide", "tall"])
+def test_lapmod_scipy_sparse(fmt, shape):
+    sparse = pytest.importorskip("scipy.sparse")
+    scipy_opt = pytest.importorskip("scipy.optimize")
+    rng = np.random.default_rng(31)
+    C = rng.random(shape) * 10
+    stored = rng.random(shape) < 0.3
+    k = min(shape)
+    stored[rng.permutation(shape[0])[:k], rng.permutation(shape[1])[:k]] = True
+    C[stored & (rng.random(shape) < 0.05)] = 0.0  # explicit zeros are edges
+    M = getattr(sparse, fmt)((C[stored], np.nonzero(stored)), shape=shape)
+    rows, cols = scipy_opt.linear_sum_assignment(np.where(stored, C, 1e9))
+
+    total, x, y, u, v = lap.lapmod(M, return_duals=True)
+    assert np.isclose(total, C[rows, cols].sum())
+    assert x.shape == (shape[0],) and y.shape == (shape[1],)
+    assigned = np.flatnonzero(x >= 0)
+    assert len(assigned) == k and np.array_equal(y[x[assigned]], assigned)
+    reduced = np.where(stored, C - u[:, None] - v[None, :], np.inf)
+    assert reduced.min() >= -1e-9
+    assert np.all(np.abs(reduced[assigned, x[assigned]]) <= 1e-9)
+    assert lap.lapmod(M, fast=False)[0] == pytest.approx(total)
+
+
+def test_lapmod_scipy_sparse_infeasible_and_unsorted():
+    sparse = pytest.importorskip("scipy.sparse")
+    # Rows 2 and 3 can only use column 1: no complete assignment exists
+    M = sparse.csr_matrix(([1.0, 2.0, 3.0, 4.0], ([0, 1, 2, 3], [0, 1, 1, 1])), shape=(4, 6))
+    total, x, y = lap.lapmod(M)
+    assigned = np.flatnonzero(x >= 0)
+    assert total == np.inf and len(assigned) == 2
+    assert np.all(M.toarray()[assigned, x[assigned]] > 0)  # only stored pairs
+    assert np.array_equal(y[x[assigned]], assigned) and np.count_nonzero(y >= 0) == 2
+    # Nothing stored: infeasible, not an error
+    for fmt, shape in [("csr_matrix", (2, 2)), ("csr_matrix", (2, 3)), ("csc_matrix", (3, 2))]:
+        total, x, y = lap.lapmod(getattr(sparse, fmt)(shape))
+        assert total == np.inf and (x == -1).all() and (y == -1).all()
+        assert x.shape == (shape[0],) and y.shape == (shape[1],)
+    # Unsorted column indices and duplicates (summed, as in scipy)
+    M = sparse.csr_matrix((np.array([5.0, 1.0, 2.0, 1.0, 4.0]), np.array([1, 0, 1, 0, 1]),
+                           np.array([0, 2, 5])), shape=(2, 2))
+    assert not M.has_canonical_format
+    total, x, y = lap.lapmod(M)
+    assert total == 6.0 and list(x) == [1, 0]
+    with pytest.raises(ValueError):
+        lap.lapmod(M, M.data, M.indptr, M.indices)
+
+
+def _peak_traced_bytes(fn, *args, **kwargs):
+    # Peak memory traced (NumPy arrays included) while running fn
+    tracemalloc.start()
+    try:
+        out = fn(*args, **kwargs)
+        return out, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _skewed_edges(n_rows, n_cols, per_row, seed):
+    rng = np.random.default_rng(seed)
+    rows = np.repeat(np.arange(n_rows), per_row)
+    cols = rng.integers(0, n_cols, rows.size)
+    return rows, cols, rng.random(rows.size) * 10
+
+
+def test_lapmod_scipy_sparse_rectangular_memory_scales_with_nnz():
+    sparse = pytest.importorskip("scipy.sparse")
+    # Squaring 4000 x 16000 up would add 12000 * 4001 entries (~0.5 GB)
+    rows, cols, costs = _skewed_edges(4000, 16000, 4, 61)
+    M = sparse.csr_matrix((costs, (rows, cols)), shape=(4000, 16000))
+    for A in (M, M.T.tocsc(), M.T.tocsr()):
+        (total, x, y), peak = _peak_traced_bytes(lap.lapmod, A)
+        assert peak < 64 * (M.nnz + sum(A.shape))
+        assigned = np.flatnonzero(x >= 0)
+        assert np.isfinite(total) and len(assigned) == 4000
+        assert np.isclose(np.asarray(A[assigned, x[assigned]]).sum(), total)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("topk", [None, 2])
+def test_gate_matches_numpy(dtype, topk):
+    rng = np.random.default_rng(37)
+    C = (rng.random((60, 45)) * 10).astype(dtype)
+    C[rng.random(C.shape) < 0.05] = np.inf
+    C[3] = 20.0  # row with no gated entry
+    for n_threads in (1, 4):
+        cc, ii, kk = lap.gate(C, 4.0, topk=topk, n_threads=n_threads)
+        assert cc.dtype == dtype and ii.dtype == kk.dtype == np.int32
+        assert ii[0] == 0 and ii[4] == ii[3]
+        for i in range(C.shape[0]):
+            js = np.flatnonzero(C[i] <= 4.0)
+            if topk is not None:
+                js = np.sort(js[np.argsort(C[i, js], kind="stable")[:topk]])
+            assert np.array_equal(kk[ii[i]:ii[i + 1]], js)
+            assert np.array_equal(cc[ii[i]:ii[i + 1]], C[i, js])
+
+
+@pytest.mark.parametrize("shape", [(40, 40), (25, 60), (60, 25)], ids=["square", "wide", "tall"])
+def test_lapmod_dense_matches_masked_solve(shape):
+    scipy_opt = pytest.importorskip("scipy.optimize")
+    rng = np.random.default_rng(41)
+    C = rng.random(shape) * 10
+    rows, cols = scipy_opt.linear_sum_assignment(np.where(C <= 6.0, C, 1e9))
+    total, x, y = lap.lapmod_dense(C, 6.0)
+    assert np.isclose(total, C[rows, cols].sum())
+    assigned = np.flatnonzero(x >= 0)
+    assert len(assigned) == min(shape) and np.all(C[assigned, x[assigned]] <= 6.0)
+    assert np.array_equal(y[x[assigned]], assigned)
+    # Nothing below the threshold on the smaller side: no complete assignment
+    if shape[0] <= shape[1]:
+        C[0] = 100.0
+    else:
+        C[:, 0] = 100.0
+    assert lap.lapmod_dense(C, 6.0)[0] == np.inf
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_lapmod_dense_infeasible_keeps_allowed_pairs(fast):
+    # Nothing under the threshold at all
+    total, x, y, u, v = lap.lapmod_dense([[5, 6], [7, 8]], 1.0, fast=fast, return_duals=True)
+    assert total == np.inf and list(x) == [-1, -1] and list(y) == [-1, -1]
+    assert np.isnan(u).all() and np.isnan(v).all()
+    # Both rows can only use column 0: one of them stays unassigned
+    for C in (np.array([[1.0, 9.0], [2.0, 9.0]]), np.array([[1.0, 2.0], [9.0, 9.0]])):
+        total, x, y = lap.lapmod_dense(C, 5.0, fast=fast)
+        assert total == np.inf
+        assigned = np.flatnonzero(x >= 0)
+        assert np.all(C[assigned, x[assigned]] <= 5.0)
+        assert np.array_equal(y[x[assigned]], assigned)
+        assert np.count_nonzero(y >= 0) == len(assigned)
+    C = np.array([[1.0, 2.0, 9.0], [2.0, 1.0, 9.0], [1.0, 1.0, 9.0]])
+    total, x, y = lap.lapmod_dense(C, 5.0, fast=fast)
+    assigned = np.flatnonzero(x >= 0)
+    assert total == np.inf and len(assigned) == 2
+    assert np.all(C[assigned, x[assigned]] <= 5.0)
+
+
+def test_lapmod_dense_skewed_gating_memory_scales_with_nnz():
+    # A tight gate on a wide matrix leaves ~12 entries per row; the solve
+    # must not add the (M - N) * (N + 1) entries of squaring it up (~0.4 GB).
+    rng = np.random.default_rng(67)
+    C = rng.random((2000, 12000))
+    nnz = len(lap.gate(C, 1e-3)[0])
+    for A in (C, np.ascontiguousarray(C.T)):
+        (total, x, y), peak = _peak_traced_bytes(lap.lapmod_dense, A, 1e-3)
+        assert peak < 64 * (nnz + sum(A.shape))
+        assigned = np.flatnonzero(x >= 0)
+        assert np.isfinite(total) and len(assigned) == 2000
+        assert np.all(A[assigned, x[assigned]] <= 1e-3)
+        assert np.isclose(A[assigned, x[assigned]].sum(), total)
+
+
+def test_gate_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        lap.gate(np.zeros(4), 1.0)
+    with pytest.raises(ValueError):
+        lap.gate(np.zeros((2, 2)), np.nan)
+    with pytest.raises(ValueError):
+        lap.gate(np.zeros((2, 2)), 1.0, topk=0)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_edges_to_csr_sorts_and_merges(dtype):
+    rng = np.random.default_rng(43)
+    rows = rng.integers(0, 30, 400)
+    cols = rng.integers(0, 20, 400)
+    costs = rng.integers(0, 50, 400).astype(dtype)
+    cc, ii, kk = lap.edges_to_csr(rows, cols, costs, shape=(32, 20))
+    assert cc.dtype == dtype and ii.dtype == kk.dtype == np.int32 and len(ii) == 33
+    dense = np.full((32, 20), np.inf)
+    np.minimum.at(dense, (rows, cols), costs)
+    for i in range(32):
+        js = np.flatnonzero(np.isfinite(dense[i]))
+        assert np.array_equal(kk[ii[i]:ii[i + 1]], js)
+        assert np.array_equal(cc[ii[i]:ii[i + 1]], dense[i, js])
+
+
+@pytest.mark.parametrize("shape", [(40, 40), (25, 60), (60, 25)], ids=["square", "wide", "tall"])
+def test_lapmod_edges_matches_dense_solve(shape):
+    rng = np.random.default_rng(47)
+    C = rng.random(shape) * 10
+    rows, cols = np.nonzero(C <= 6.0)
+    order = rng.permutation(len(rows))
+    rows, cols = np.r_[rows[order], rows[:5]], np.r_[cols[order], cols[:5]]
+    costs = np.r_[C[rows[:-5], cols[:-5]], np.full(5, 9.0)]  # repeats cost more
+    total, x, y = lap.lapmod_edges(rows, cols, costs, shape=shape)
+    assert np.isclose(total, lap.lapmod_dense(C, 6.0)[0])
+    assigned = np.flatnonzero(x >= 0)
+    assert len(assigned) == min(shape) and np.isclose(C[assigned, x[assigned]].sum(), total)
+    assert np.array_equal(y[x[assigned]], assigned)
+
+
+def test_lapmod_edges_memory_scales_with_edges():
+    # 4 edges per row over 40000 columns: squaring up would add ~0.3e9 entries
+    rows, cols, costs = _skewed_edges(8000, 40000, 4, 71)
+    for shape, (r, c) in [((8000, 40000), (rows, cols)), ((40000, 8000), (cols, rows))]:
+        (total, x, y), peak = _peak_traced_bytes(lap.lapmod_edges, r, c, costs, shape=shape)
+        assert peak < 64 * (len(costs) + sum(shape))
+        assigned = np.flatnonzero(x >= 0)
+        assert np.isfinite(total) and len(assigned) == 8000
+        assert np.array_equal(y[x[assigned]], assigned)
+
+
+def test_lapmod_edges_empty_is_infeasible():
+    for shape in [(2, 2), (2, 3), (3, 2)]:
+        total, x, y = lap.lapmod_edges([], [], [], shape=shape)
+        assert total == np.inf
+        assert list(x) == [-1] * shape[0] and list(y) == [-1] * shape[1]
+    x, y, u, v = lap.lapmod_edges([0], [1], [1.0], shape=(2, 2), return_cost=False,
+                                  return_duals=True)
+    assert list(x) in ([1, -1], [-1, -1]) and np.array_equal(y[x[x >= 0]], np.flatnonzero(x >= 0))
+    assert np.isnan(u).all() and np.isnan(v).all()
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_lapmod_int64_indices_match_int32(dtype):
+    rng = np.random.default_rng(53)
+    C = (rng.random((50, 50)) * 10).astype(dtype)
+    cc, ii, kk = lap.gate(C, 5.0)
+    ref = lap.lapmod(50, cc, ii, kk, return_duals=True)
+    for fp_version in (lap.FP_1, lap.FP_2, lap.FP_DYNAMIC):
+        out = lap.lapmod(50, cc, ii.astype(np.int64), kk.astype(np.int64),
+                         fp_version=fp_version, return_duals=True)
+        assert np.isclose(out[0], ref[0])
+        assert np.isclose(C[np.arange(50), out[1]].sum(), ref[0], rtol=1e-5)
+    out = lap.lapmod(50, cc, ii.astype(np.int64), kk.astype(np.int64), return_duals=True)
+    for a, b in zip(out[1:], ref[1:]):
+        assert np.array_equal(a, b)
+
+
+def test_lapmod_scipy_sparse_int64_indices():
+    sparse = pytest.importorskip("scipy.sparse")
+    rng = np.random.default_rng(59)
+    C = rng.random((30, 45)) * 10
+    for shape in [(30, 45), (45, 30)]:
+        D = C if shape[0] == 30 else C.T
+        M = sparse.csr_matrix(np.where(D <= 6.0, D, 0.0))
+        M.indptr, M.indices = M.indptr.astype(np.int64), M.indices.astype(np.int64)
+        total, x, y = lap.lapmod(M)
+        assert np.isclose(total, lap.lapmod_dense(D, 6.0)[0])
+        assert np.isclose(lap.lapmod(M.tocsc())[0], total)
+
+
+def test_edges_to_csr_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        lap.edges_to_csr([0, 1], [0], [1.0, 2.0])
+    with pytest.raises(ValueError):
+        lap.edges_to_csr([0, 2], [0, 1], [1.0, 2.0], shape=(2, 2))
+    with pytest.raises(ValueError):
+        lap.edges_to_csr([0, -1], [0, 1], [1.0, 2.0], shape=(2, 2))
+    with pytest.raises(ValueError):
+        lap.edges_to_csr([], [], [])
+    with pytest.raises(ValueError):
+        lap.edges_to_csr([0.5], [0], [1.0])
+
+
+def test_lapmod_rejects_bad_values():
+    ii = np.array([0, 2, 4])
+    kk = np.array([0, 1, 0, 1])
+    for bad in (-1.0, 2e6):
+        cc = np.array([1.0, 2.0, bad, 3.0])
+        for fast in (True, False):
+            with pytest.raises(ValueError):
+                lap.lapmod(2, cc, ii, kk, fast=fast)
+        with pytest.raises(ValueError):
+            lap.lapmod(2, cc.astype(np.float32), ii, kk)
+
+
+
+@pytest.mark.parametrize("solver_name", ["lapjv", "lapjvx"])
+@pytest.mark.parametrize("shape", [(30, 30), (20, 45), (45, 20)], ids=["square", "wide", "tall"])
+def test_cost_limit_native_matches_augmented(solver_name, shape):
+    scipy_opt = pytest.importorskip("scipy.optimize")
+    rng = np.random.default_rng(19)
+    C = rng.random(shape) * 10
+    limit = 6.0
+    # Reference: the (N+M) augmented matrix with cost_limit/2 rejects
+    N, M = shape
+    W = np.full((N + M, N + M), limit / 2)
+    W[N:, M:] = 0.0
+    W[:N, :M] = C
+    rr, cc = scipy_opt.linear_sum_assignment(W)
+    ref = W[rr, cc].sum()
+
+    out = getattr(lap, solver_name)(C, cost_limit=limit, return_duals=True)
+    total, u, v = out[0], out[-2], out[-1]
+    if solver_name == "lapjv":
+        x, y = out[1], out[2]
+        rows = np.nonzero(x >= 0)[0]
+        cols = x[rows]
+        assert np.array_equal(y[cols], rows)
+        assert np.sum(y >= 0) == rows.size
+    else:
+        rows, cols = out[1], out[2]
+    assert np.isclose(total, C[rows, cols].sum())
+    assert np.isclose(total + limit / 2 * (N + M - 2 * rows.size), ref)
+    # Duals of the reject model: rejects cost cost_limit/2 on either side
+    _assert_duals(C, u, v, rows, cols)
+    assert u.max() <= limit / 2 + 1e-9 and v.max() <= limit / 2 + 1e-9
+    assert np.allclose(np.delete(u, rows), limit / 2)
+    assert np.allclose(np.delete(v, cols), limit / 2)
+
+
+
+@pytest.mark.parametrize("solver_name", ["lapjv", "lapjvx"])
+@pytest.mark.parametrize("shape", [(6, 300), (300, 6), (40, 90)], ids=["wide", "tall", "skewed"])
+def test_rectangular_native_matches_scipy(solver_name, shape):
+    scipy_opt = pytest.importorskip("scipy.optimize")
+    rng = np.random.default_rng(20)
+    for C in (rng.random(shape), rng.integers(0, 5, shape).astype(float)):
+        rr, cc = scipy_opt.linear_sum_assignment(C)
+        out = getattr(lap, solver_name)(C, extend_cost=True, return_duals=True)
+        assert np.isclose(out[0], C[rr, cc].sum())
+        if solver_name == "lapjv":
+            rows = np.nonzero(out[1] >= 0)[0]
+            cols = out[1][rows]
+        else:
+            rows, cols = out[1], out[2]
+        assert rows.size == min(shape)
+        _assert_duals(C, out[-2], out[-1], rows, cols)
+
+
+@pytest.mark.parametrize("solver_name", ["lapjvs", "lapjvsa", "lapjvc"])
+@pytest.mark.parametrize("shape", [(5, 200), (200, 5), (30, 80)], ids=["wide", "tall", "skewed"])
+def test_rectangular_native_lapjvs_lapjvc(solver_name, shape):
+    scipy_opt = pytest.importorskip("scipy.optimize")
+    rng = np.random.default_rng(21)
+    for C in (rng.random(shape), rng.integers(0, 5, shape).astype(float)):
+        rr, cc = scipy_opt.linear_sum_assignment(C)
+        if solver_name == "lapjvsa":
+            total, pairs = lap.lapjvsa(C, prefer_float32=False)
+            assert len(pairs) == min(shape)
+        else:
+            kwargs = {"prefer_float32": False} if solver_name == "lapjvs" else {}
+            total, rows, cols, u, v = getattr(lap, solver_name)(C, return_duals=True, **kwargs)
+            assert rows.size == min(shape)
+            _assert_duals(C, u, v, rows, cols)
+        assert np.isclose(total, C[rr, cc].sum())
+
+
+@pytest.mark.parametrize("solver_name", ["lapjv", "lapjvx", "lapjvs", "lapjvsa"])
+@pytest.mark.parametrize("dtype", [np.int16, np.int32, np.int64, np.uint32])
+@pytest.mark.parametrize("shape", [(40, 40), (10, 60), (60, 25)], ids=["square", "wide", "tall"])
+def test_integer_costs_exact(solver_name, dtype, shape):
+    scipy_opt = pytest.importorskip("scipy.optimize")
+    rng = np.random.default_rng(22)
+    high = min(np.iinfo(dtype).max // 2, 10**12)
+    C = rng.integers(0 if dtype == np.uint32 else -high, high, shape).astype(dtype)
+    rr, cc = scipy_opt.linear_sum_assignment(C.astype(np.float64))
+    expected = int(C.astype(np.int64)[rr, cc].sum())
+    solver = getattr(lap, solver_name)
+    if solver_name == "lapjvsa":
+        total, pairs = solver(C)
+        assert len(pairs) == min(shape)
+    else:
+        out = solver(C, extend_cost=True, return_duals=True)
+        if solver_name == "lapjv":
+            rows = np.nonzero(out[1] >= 0)[0]
+            cols = out[1][rows]
+        else:
+            rows, cols = out[1], out[2]
+        assert rows.size == min(shape)
+        _assert_duals(C.astype(np.float64), out[-2], out[-1], rows, cols)
+        total = out[0]
+    assert total == expected
+
+
+def test_integer_costs_beyond_float_precision():
+    # int64 costs that float64 cannot represent exactly
+    C = np.array([[2**53 + 1, 2**53], [2**53, 2**53 + 3]], dtype=np.int64)
+    for solver in (lap.lapjv, lap.lapjvx, lap.lapjvs):
+        assert solver(C)[0] == 2**54
+    total, x, y, u, v = lap.lapjv(C, return_duals=True)
+    assert list(x) == [1, 0]
+    total_warm, x_warm, _ = lap.lapjv(C, init_v=v)
+    assert list(x_warm) == [1, 0]
+
+
+@pytest.mark.parametrize("solver_name", ["lapjv", "lapjvx", "lapjvxa"])
+@pytest.mark.parametrize("shape", [(50, 50), (10, 70), (70, 25)], ids=["square", "wide", "tall"])
+@pytest.mark.parametrize("cost_limit", [np.inf, 0.6])
+def test_float32_kernel(solver_name, shape, cost_limit):
+    rng = np.random.default_rng(23)
+    C32 = rng.random(shape, dtype=np.float32)
+    C64 = C32.astype(np.float64)
+    kw = dict(extend_cost=True, cost_limit=cost_limit)
+    if solver_name == "lapjvxa":
+        ref_total, ref = lap.lapjvxa(C64, **kw)
+        for A, prefer in ((C32, False), (C64, True)):
+            total, pairs = lap.lapjvxa(A, prefer_float32=prefer, **kw)
+            assert len(pairs) == len(ref)
+            assert np.isclose(total, ref_total, rtol=1e-5)
+        return
+    solver = getattr(lap, solver_name)
+    ref = solver(C64, **kw)
+    for A, prefer in ((C32, False), (C64, True)):
+        out = solver(A, prefer_float32=prefer, **kw)
+        assert np.isclose(out[0], ref[0], rtol=1e-5)
+        if solver_name == "lapjv":
+            assert np.count_nonzero(out[1] >= 0) == np.count_nonzero(ref[1] >= 0)
+        else:
+            assert len(out[1]) == len(ref[1])
+
+
+def test_float32_lapmod_matches_float64():
+    rng = np.random.default_rng(29)
+    n = 60
+    C = rng.random((n, n), dtype=np.float32)
+    ii = np.arange(0, n * n + 1, n)
+    kk = np.tile(np.arange(n), n)
+    total32, x32, y32 = lap.lapmod(n, C.ravel(), ii, kk)
+    total64, x64, y64 = lap.lapmod(n, C.ravel().astype(np.float64), ii, kk)
+    # float32 costs are read as is, the duals stay float64: same solution
+    assert np.array_equal(x32, x64) and np.array_equal(y32, y64)
+    assert np.isclose(total32, total64)
+
+
+def _all_objectives(C):
+    # Objectives of every complete assignment of a small wide matrix.
+    import itertools
+    N, M = C.shape
+    return sorted(C[np.arange(N), list(p)].sum() for p in itertools.permutations(range(M), N))
+
+
+@pytest.mark.parametrize("shape", [(4, 4), (3, 5), (5, 3)], ids=["square", "wide", "tall"])
+def test_kbest_matches_enumeration(shape):
+    rng = np.random.default_rng(17)
+    C = rng.integers(0, 10, shape).astype(float)
+    ref = _all_objectives(C if shape[0] <= shape[1] else C.T)
+    totals, rows_list, cols_list = lap.kbest(C, 10, extend_cost=True)
+    assert np.allclose(totals, ref[:10])
+    assert totals[0] == lap.lapjvx(C, extend_cost=True)[0]
+    pairs = {(tuple(r), tuple(c)) for r, c in zip(rows_list, cols_list)}
+    assert len(pairs) == 10
+    for total, rows, cols in zip(totals, rows_list, cols_list):
+        assert total == C[rows, cols].sum()
+    # Fewer assignments exist than asked for
+    assert len(lap.kbest(C, 1000, extend_cost=True)[0]) == len(ref)
+
+
+def test_kbest_cost_limit_threads_and_errors():
+    rng = np.random.default_rng(18)
+    C = rng.random((30, 25)) * 10
+    kwargs = dict(cost_limit=3.0, return_cost=True)
+    totals, rows_list, cols_list = lap.kbest(C, 25, n_threads=1, **kwargs)
+    # Ranked by the lapjvx objective, unassigned rows/columns paying 1.5 each
+    objective = [t + 1.5 * (55 - 2 * len(r)) for t, r in zip(totals, rows_list)]
+    assert np.all(np.diff(objective) >= -1e-9)
+    first = lap.lapjvx(C, cost_limit=3.0)
+    assert np.array_equal(rows_list[0], first[1]) and np.array_equal(cols_list[0], first[2])
+
+    threaded = lap.kbest(C, 25, n_threads=4, **kwargs)
+    assert np.array_equal(threaded[0], totals)
+    assert all(np.array_equal(a, b) for a, b in zip(threaded[2], cols_list))
+
+    rows_list, cols_list = lap.kbest(np.empty((0, 0)), 3, return_cost=False)
+    assert len(rows_list) == 1 and rows_list[0].size == 0 and cols_list[0].size == 0
+    with pytest.raises(ValueError):
+        lap.kbest(C, 5)
+    with pytest.raises(ValueError):
+        lap.kbest(C[:5, :5], 0)
+    with pytest.raises(ValueError):
+        lap.kbest(np.array([[np.nan]]), 1)